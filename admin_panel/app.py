@@ -4,63 +4,43 @@
 """
 import sys
 import os
+import io
+import csv
 import logging
 from datetime import datetime
+from types import SimpleNamespace
 from typing import Optional, List, Dict, Any
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI, Depends, HTTPException, Query, Request
-from fastapi.responses import HTMLResponse, Response, JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy import func, text
-from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import and_, func, text, update
+from sqlalchemy.orm import aliased, joinedload, selectinload
 from pydantic import BaseModel
-import httpx
 
-from database.database import get_db
+from database.database import get_db, get_read_db, db_writer
+from database.case_search import search_cases
+from admin_panel.application import create_app
+from admin_panel.events import dialog_events
+from admin_panel.payout_notifier import payout_notifier
+from admin_panel.response_cache import response_cache
+from admin_panel.revenue_import import RevenueImportError, import_revenues
+from admin_panel.static_bundle import static_bundle
+from admin_panel.telegram_sender import telegram_sender
 from database.models import (
     User, PartnerProfile, CaseQuestionnaire, ServiceRequest,
-    PartnerRevenue, ReferralPayout, ReferralRelationship,
+    PartnerRevenue, ReferralPayout, ReferralRelationship, ReferralClosure,
     ReferralLink, CaseMessage, CaseQuestionnaireDocument
 )
 from config.settings import settings
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-# URL message_server для отправки уведомлений клиентам
-MESSAGE_SERVER_URL = os.getenv("MESSAGE_SERVER_URL", "http://127.0.0.1:8002")
-
-app = FastAPI(
-    title="Admin Panel for Law Bot",
-    description="Админ-панель для управления юридическим ботом",
-    version="2.0.0"
-)
-
-# Глобальный обработчик исключений
-@app.exception_handler(Exception)
-async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Необработанное исключение на {request.url}: {exc}", exc_info=True)
-    return JSONResponse(
-        status_code=500,
-        content={"detail": "Внутренняя ошибка сервера", "error": str(exc)}
-    )
-
-# Добавляем CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Маршруты админ-панели; приложение собирается в конце модуля (см. admin_panel/application.py)
+router = APIRouter()
 
 
 # ============================================
@@ -113,36 +93,38 @@ class BatchPayRequest(BaseModel):
 # ============================================
 
 async def send_notification_to_client(telegram_id: int, message: str) -> bool:
-    """Отправить уведомление клиенту через Telegram bot"""
+    """Отправить уведомление клиенту через общий клиент Telegram Bot API"""
     try:
-        # Проверка настроек бота
-        if not settings.BOT_TOKEN:
-            logger.error("BOT_TOKEN не настроен в конфигурации")
-            return False
-            
-        from aiogram import Bot
-        from aiogram.client.session.aiohttp import AiohttpSession
-        
-        session = AiohttpSession()
-        bot = Bot(token=settings.BOT_TOKEN, session=session)
-        
-        try:
-            await bot.send_message(
-                chat_id=telegram_id,
-                text=message,
-                parse_mode="HTML",
-                disable_web_page_preview=True
-            )
-            logger.info(f"Уведомление отправлено пользователю {telegram_id}")
-            return True
-        finally:
-            await bot.session.close()
-            
+        await telegram_sender.send_message(telegram_id, message)
+        logger.info(f"Уведомление отправлено пользователю {telegram_id}")
+        return True
     except Exception as e:
         logger.error(f"Исключение при отправке уведомления: {e}")
         return False
 
 
+def payout_notification_text(payouts: List[Any]) -> str:
+    """Текст уведомления партнёру о выплатах (строки с amount, month, year)"""
+    if len(payouts) == 1:
+        payout = payouts[0]
+        return (
+            f"💰 <b>Вам начислено вознаграждение!</b>\n\n"
+            f"Сумма: {payout.amount:,} ₽\n"
+            f"За период: {payout.month:02d}.{payout.year}\n\n"
+            f"Спасибо за участие в реферальной программе!"
+        )
+    periods = "\n".join(
+        f"• {payout.month:02d}.{payout.year}: {payout.amount:,} ₽"
+        for payout in sorted(payouts, key=lambda payout: (payout.year, payout.month))
+    )
+    return (
+        f"💰 <b>Вам начислено вознаграждение!</b>\n\n"
+        f"Сумма: {sum(payout.amount for payout in payouts):,} ₽\n"
+        f"За периоды:\n{periods}\n\n"
+        f"Спасибо за участие в реферальной программе!"
+    )
+
+
 def format_user_display_name(user: Any, profile: Any = None) -> str:
     """Форматирует отображаемое имя пользователя"""
     if profile and profile.full_name:
@@ -154,6 +136,34 @@ def format_user_display_name(user: Any, profile: Any = None) -> str:
     return f"ID: {user.telegram_id}"
 
 
+def format_dialog_name(user: User) -> str:
+    """Имя собеседника в списке диалогов"""
+    return (
+        f"{user.first_name or ''} (@{user.username})"
+        if user.username else f"{user.first_name or 'Клиент'} (ID:{user.telegram_id})"
+    ).strip()
+
+
+def publish_dialog_message(user: User, message: CaseMessage) -> None:
+    """
+    Публикует новое сообщение диалога подключенным страницам диалогов
+
+    Args:
+        user: Пользователь, к диалогу которого относится сообщение (CaseMessage.sender)
+        message: Сохраненное сообщение
+    """
+    dialog_events.publish("message", {
+        "id": message.id,
+        "telegram_id": user.telegram_id,
+        "display_name": format_dialog_name(user),
+        "sender_type": message.sender_type,
+        "content": message.message_content,
+        "created_at": serialize_datetime(message.created_at)
+    })
+    if message.sender_type == "client":
+        dialog_events.publish("unread", {"telegram_id": user.telegram_id, "delta": 1})
+
+
 def serialize_datetime(dt) -> Optional[str]:
     """Сериализует datetime в ISO формат"""
     if not dt:
@@ -163,37 +173,124 @@ def serialize_datetime(dt) -> Optional[str]:
     return dt.isoformat() if hasattr(dt, 'isoformat') else str(dt)
 
 
-# ============================================
-# HTML шаблоны
-# ============================================
+def apply_payout_filters(
+    query,
+    status: Optional[str] = None,
+    month: Optional[int] = None,
+    year: Optional[int] = None,
+    referrer_id: Optional[int] = None,
+    search: Optional[str] = None,
+):
+    """
+    Применяет фильтры списка выплат к запросу
+
+    Для фильтра search таблица users должна быть присоединена к запросу.
+    """
+    if status:
+        query = query.where(ReferralPayout.status == status)
+    if month:
+        query = query.where(ReferralPayout.month == month)
+    if year:
+        query = query.where(ReferralPayout.year == year)
+    if referrer_id:
+        query = query.where(ReferralPayout.referrer_id == referrer_id)
+    if search:
+        query = query.where(User.first_name.ilike(f"%{search}%"))
+    return query
+
+
+# Длина превью предмета спора в списке заявок
+REQUEST_PREVIEW_LENGTH = 120
+
+
+def request_list_query():
+    """
+    Запрос краткого представления заявок: только нужные списку колонки
+
+    Длинные текстовые поля анкеты не читаются, от предмета спора
+    берется только начало (substr выполняется на стороне БД).
+    """
+    return (
+        select(
+            CaseQuestionnaire.id,
+            CaseQuestionnaire.user_id,
+            CaseQuestionnaire.status,
+            CaseQuestionnaire.created_at,
+            CaseQuestionnaire.sent_at,
+            func.substr(CaseQuestionnaire.dispute_subject, 1, REQUEST_PREVIEW_LENGTH + 1).label("subject_preview"),
+            User.telegram_id,
+            User.username,
+            User.first_name,
+            User.last_name,
+        )
+        .outerjoin(User, CaseQuestionnaire.user_id == User.id)
+    )
 
-# Загружаем HTML при старте
-SIMPLE_TEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "simple_test.html")
-try:
-    with open(SIMPLE_TEST_PATH, "r", encoding="utf-8") as f:
-        SIMPLE_TEST_HTML = f.read()
-except FileNotFoundError:
-    SIMPLE_TEST_HTML = "<html><body><h1>Файл simple_test.html не найден</h1></body></html>"
-    logger.warning("Файл simple_test.html не найден")
+
+def serialize_request_row(row) -> Dict[str, Any]:
+    """Сериализует строку request_list_query (datetime сериализует ответ)"""
+    preview = row.subject_preview
+    if preview and len(preview) > REQUEST_PREVIEW_LENGTH:
+        preview = preview[:REQUEST_PREVIEW_LENGTH].rstrip() + "…"
+    return {
+        "id": row.id,
+        "user_id": row.user_id,
+        "status": row.status,
+        "created_at": row.created_at,
+        "sent_at": row.sent_at,
+        "subject_preview": preview,
+        "user": {
+            "id": row.user_id,
+            "telegram_id": row.telegram_id,
+            "username": row.username,
+            "first_name": row.first_name,
+            "last_name": row.last_name
+        } if row.telegram_id is not None else None
+    }
+
+
+def serialize_request(req: CaseQuestionnaire) -> Dict[str, Any]:
+    """Сериализует заявку (анкету дела) вместе с пользователем"""
+    return {
+        "id": req.id,
+        "user_id": req.user_id,
+        "parties_info": req.parties_info,
+        "dispute_subject": req.dispute_subject,
+        "legal_basis": req.legal_basis,
+        "chronology": req.chronology,
+        "evidence": req.evidence,
+        "procedural_history": req.procedural_history,
+        "client_goal": req.client_goal,
+        "status": req.status,
+        "created_at": serialize_datetime(req.created_at),
+        "sent_at": serialize_datetime(req.sent_at),
+        "user": {
+            "id": req.user.id,
+            "telegram_id": req.user.telegram_id,
+            "username": req.user.username,
+            "first_name": req.user.first_name,
+            "last_name": req.user.last_name
+        } if req.user else None
+    }
 
 
 # ============================================
 # Базовые маршруты
 # ============================================
 
-@app.get("/test", response_class=HTMLResponse)
-async def simple_test():
+@router.get("/test", response_class=HTMLResponse)
+async def simple_test(request: Request):
     """Простой тест админ-панели"""
-    return HTMLResponse(content=SIMPLE_TEST_HTML)
+    return static_bundle.response(request, "index.html")
 
 
-@app.get("/favicon.ico")
+@router.get("/favicon.ico")
 async def favicon():
     """Возвращаем пустой ответ для favicon"""
     return Response(content="", media_type="image/x-icon")
 
 
-@app.get("/api/test-db")
+@router.get("/api/test-db")
 async def test_database():
     """Тест подключения к базе данных"""
     try:
@@ -207,60 +304,127 @@ async def test_database():
         return {"status": "error", "message": str(e)}
 
 
-@app.get("/js-test", response_class=HTMLResponse)
-async def js_test():
+@router.get("/js-test", response_class=HTMLResponse)
+async def js_test(request: Request):
     """Простой тест JavaScript"""
-    js_test_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "simple_js_test.html")
-    try:
-        with open(js_test_path, "r", encoding="utf-8") as f:
-            return HTMLResponse(content=f.read())
-    except FileNotFoundError:
-        return HTMLResponse(content="<html><body><h1>Файл не найден</h1></body></html>")
+    return static_bundle.response(request, "simple_js_test.html")
+
+
+@router.get("/static/admin/{name}")
+async def static_file(request: Request, name: str):
+    """Стили и скрипты страниц (только файлы из STATIC_FILES)"""
+    return static_bundle.response(request, name)
 
 
 # ============================================
 # API заявок (Case Questionnaires)
 # ============================================
 
-@app.get("/api/requests")
-async def get_requests():
-    """Получить список всех заявок"""
+@router.get("/api/requests")
+async def get_requests(
+    request: Request,
+    cursor: Optional[int] = Query(None, ge=1, description="ID последней заявки предыдущей страницы"),
+    limit: int = Query(50, ge=1, le=200),
+    status: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """
+    Получить страницу заявок (краткое представление)
+
+    Заявки отдаются от новых к старым. Для следующей страницы передайте
+    next_cursor из ответа в параметре cursor. Полный текст анкеты и документы
+    возвращает /api/requests/{request_id}.
+    """
+    return await response_cache.respond(
+        request, "requests", lambda: load_requests_page(cursor, limit, status, date_from, date_to)
+    )
+
+
+async def load_requests_page(cursor: Optional[int], limit: int, status: Optional[str],
+                             date_from: Optional[datetime], date_to: Optional[datetime]) -> Dict[str, Any]:
+    """Страница заявок для /api/requests"""
     try:
-        async with get_db() as db:
-            result = await db.execute(
-                select(CaseQuestionnaire)
-                .options(selectinload(CaseQuestionnaire.user))
-                .order_by(CaseQuestionnaire.created_at.desc())
-            )
-            requests = result.unique().scalars().all()
-
-            return [{
-                "id": req.id,
-                "user_id": req.user_id,
-                "parties_info": req.parties_info,
-                "dispute_subject": req.dispute_subject,
-                "legal_basis": req.legal_basis,
-                "chronology": req.chronology,
-                "evidence": req.evidence,
-                "procedural_history": req.procedural_history,
-                "client_goal": req.client_goal,
-                "status": req.status,
-                "created_at": serialize_datetime(req.created_at),
-                "sent_at": serialize_datetime(req.sent_at),
-                "user": {
-                    "id": req.user.id,
-                    "telegram_id": req.user.telegram_id,
-                    "username": req.user.username,
-                    "first_name": req.user.first_name,
-                    "last_name": req.user.last_name
-                } if req.user else None
-            } for req in requests]
+        async with get_read_db() as db:
+            query = request_list_query()
+            if cursor:
+                query = query.where(CaseQuestionnaire.id < cursor)
+            if status:
+                query = query.where(CaseQuestionnaire.status == status)
+            if date_from:
+                query = query.where(CaseQuestionnaire.created_at >= date_from)
+            if date_to:
+                query = query.where(CaseQuestionnaire.created_at <= date_to)
+
+            # Берем на одну запись больше, чтобы узнать, есть ли следующая страница
+            result = await db.execute(query.order_by(CaseQuestionnaire.id.desc()).limit(limit + 1))
+            rows = result.all()
+
+            items = [serialize_request_row(row) for row in rows[:limit]]
+            next_cursor = items[-1]["id"] if len(rows) > limit else None
+            return {"items": items, "next_cursor": next_cursor}
     except Exception as e:
         logger.error(f"Ошибка в /api/requests: {e}", exc_info=True)
         raise
 
 
-@app.put("/api/requests/{request_id}")
+@router.get("/api/requests/search")
+async def search_requests(
+    q: str = Query(..., min_length=1, max_length=500),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Полнотекстовый поиск по заявкам с ранжированием по релевантности"""
+    async with get_read_db() as db:
+        total, ranked = await search_cases(db, q, limit=limit, offset=skip)
+
+        rows_by_id = {}
+        if ranked:
+            result = await db.execute(
+                request_list_query().where(CaseQuestionnaire.id.in_([case_id for case_id, _ in ranked]))
+            )
+            rows_by_id = {row.id: row for row in result.all()}
+
+        items = []
+        for case_id, rank in ranked:
+            row = rows_by_id.get(case_id)
+            if row:
+                items.append({**serialize_request_row(row), "rank": rank})
+
+        return {"total": total, "skip": skip, "limit": limit, "items": items}
+
+
+@router.get("/api/requests/{request_id}")
+async def get_request(request_id: int):
+    """Получить заявку с полным текстом анкеты и списком документов"""
+    async with get_read_db() as db:
+        result = await db.execute(
+            select(CaseQuestionnaire)
+            .options(
+                selectinload(CaseQuestionnaire.user),
+                selectinload(CaseQuestionnaire.documents)
+            )
+            .filter(CaseQuestionnaire.id == request_id)
+        )
+        request = result.scalar_one_or_none()
+
+        if not request:
+            raise HTTPException(status_code=404, detail="Заявка не найдена")
+
+        return {
+            **serialize_request(request),
+            "documents": [{
+                "id": doc.id,
+                "section": doc.section,
+                "file_path": doc.file_path,
+                "file_type": doc.file_type,
+                "original_name": doc.original_name,
+                "uploaded_at": serialize_datetime(doc.uploaded_at)
+            } for doc in request.documents]
+        }
+
+
+@router.put("/api/requests/{request_id}")
 async def update_request_status(request_id: int, status_data: dict):
     """Обновить статус заявки"""
     async with get_db() as db:
@@ -274,6 +438,7 @@ async def update_request_status(request_id: int, status_data: dict):
         
         request.status = status_data.get("status", request.status)
         await db.commit()
+        response_cache.invalidate("requests")
         logger.info(f"Статус заявки #{request_id} обновлен на {request.status}")
         
     return {"message": "Статус заявки обновлен"}
@@ -283,10 +448,15 @@ async def update_request_status(request_id: int, status_data: dict):
 # API партнёров
 # ============================================
 
-@app.get("/api/partners")
-async def get_partners():
+@router.get("/api/partners")
+async def get_partners(request: Request):
     """Получить список всех партнёров"""
-    async with get_db() as db:
+    return await response_cache.respond(request, "partners", load_partners)
+
+
+async def load_partners() -> List[Dict[str, Any]]:
+    """Список партнёров для /api/partners"""
+    async with get_read_db() as db:
         result = await db.execute(
             select(PartnerProfile)
             .join(User, PartnerProfile.user_id == User.id)
@@ -304,8 +474,8 @@ async def get_partners():
             "specialization": partner.specialization,
             "experience": partner.experience,
             "consent_to_share_data": partner.consent_to_share_data,
-            "created_at": serialize_datetime(partner.created_at),
-            "updated_at": serialize_datetime(partner.updated_at)
+            "created_at": partner.created_at,
+            "updated_at": partner.updated_at
         } for partner in partners]
 
 
@@ -313,10 +483,10 @@ async def get_partners():
 # API выручки
 # ============================================
 
-@app.get("/api/revenues")
+@router.get("/api/revenues")
 async def get_revenues():
     """Получить список всей выручки партнёров"""
-    async with get_db() as db:
+    async with get_read_db() as db:
         result = await db.execute(
             select(PartnerRevenue)
             .join(User, PartnerRevenue.partner_id == User.id)
@@ -338,13 +508,13 @@ async def get_revenues():
                 "amount": revenue.amount,
                 "description": revenue.description,
                 "client_reference": revenue.client_reference,
-                "created_at": serialize_datetime(revenue.created_at)
+                "created_at": revenue.created_at
             })
         
-        return revenues_data
+        return ORJSONResponse(revenues_data)
 
 
-@app.post("/api/revenues")
+@router.post("/api/revenues")
 async def add_revenue(revenue_data: RevenueRequest):
     """Добавить выручку партнёру"""
     if not revenue_data.partner_id or not revenue_data.amount:
@@ -366,10 +536,40 @@ async def add_revenue(revenue_data: RevenueRequest):
     return {"message": "Выручка добавлена", "id": new_revenue.id}
 
 
-@app.get("/api/revenues/{partner_id}")
+@router.post("/api/revenues/import")
+async def import_revenues_csv(request: Request, dry_run: bool = False):
+    """
+    Импорт выручки из CSV в теле запроса (Content-Type: text/csv)
+
+    Тело читается потоком, формат колонок - в admin_panel/revenue_import.py.
+    Строки с ошибками пропускаются и перечисляются в ответе; dry_run=true
+    только проверяет файл.
+
+    Пример:
+        curl -X POST --data-binary @revenues.csv -H "Content-Type: text/csv" \\
+            http://localhost:8001/api/revenues/import
+    """
+    error = None
+    async with get_db() as db:
+        try:
+            report = await import_revenues(db, request.stream(), dry_run=dry_run)
+        except RevenueImportError as e:
+            # Вставка идет после разбора всего файла, откатывать нечего
+            error = str(e)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    logger.info(
+        "Импорт выручки: %s строк, добавлено %s, ошибок %s, %s строк/с",
+        report["rows"], report["imported"], report["errors_total"], report["rows_per_second"]
+    )
+    return report
+
+
+@router.get("/api/revenues/{partner_id}")
 async def get_partner_revenues(partner_id: int):
     """Получить выручку конкретного партнёра"""
-    async with get_db() as db:
+    async with get_read_db() as db:
         result = await db.execute(
             select(PartnerRevenue)
             .filter(PartnerRevenue.partner_id == partner_id)
@@ -390,7 +590,7 @@ async def get_partner_revenues(partner_id: int):
 # API выплат
 # ============================================
 
-@app.get("/api/payouts")
+@router.get("/api/payouts")
 async def get_payouts(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
@@ -401,19 +601,9 @@ async def get_payouts(
     search: Optional[str] = None,
 ):
     """Получить список выплат с фильтрацией"""
-    async with get_db() as db:
+    async with get_read_db() as db:
         query = select(ReferralPayout).join(User, ReferralPayout.referrer_id == User.id)
-        
-        if status:
-            query = query.where(ReferralPayout.status == status)
-        if month:
-            query = query.where(ReferralPayout.month == month)
-        if year:
-            query = query.where(ReferralPayout.year == year)
-        if referrer_id:
-            query = query.where(ReferralPayout.referrer_id == referrer_id)
-        if search:
-            query = query.where(User.first_name.ilike(f"%{search}%"))
+        query = apply_payout_filters(query, status, month, year, referrer_id, search)
         
         query = query.order_by(ReferralPayout.created_at.desc())
         query = query.offset(skip).limit(limit)
@@ -436,14 +626,14 @@ async def get_payouts(
                 "month": payout.month,
                 "year": payout.year,
                 "status": payout.status,
-                "paid_at": serialize_datetime(payout.paid_at),
-                "created_at": serialize_datetime(payout.created_at)
+                "paid_at": payout.paid_at,
+                "created_at": payout.created_at
             })
         
-        return payouts_data
+        return ORJSONResponse(payouts_data)
 
 
-@app.get("/api/payouts/count")
+@router.get("/api/payouts/count")
 async def get_payouts_count(
     status: Optional[str] = None,
     month: Optional[int] = None,
@@ -452,20 +642,11 @@ async def get_payouts_count(
     search: Optional[str] = None,
 ):
     """Получить количество выплат"""
-    async with get_db() as db:
+    async with get_read_db() as db:
         query = select(func.count(ReferralPayout.id))
-        
-        if status:
-            query = query.where(ReferralPayout.status == status)
-        if month:
-            query = query.where(ReferralPayout.month == month)
-        if year:
-            query = query.where(ReferralPayout.year == year)
-        if referrer_id:
-            query = query.where(ReferralPayout.referrer_id == referrer_id)
         if search:
             query = query.join(User, ReferralPayout.referrer_id == User.id)
-            query = query.where(User.first_name.ilike(f"%{search}%"))
+        query = apply_payout_filters(query, status, month, year, referrer_id, search)
         
         result = await db.execute(query)
         count = result.scalar_one_or_none()
@@ -473,7 +654,7 @@ async def get_payouts_count(
         return {"count": count or 0}
 
 
-@app.post("/api/payouts")
+@router.post("/api/payouts")
 async def create_payout(payout_data: PayoutRequest):
     """Создать выплату рефереру"""
     async with get_db() as db:
@@ -493,7 +674,7 @@ async def create_payout(payout_data: PayoutRequest):
         return {"message": "Выплата создана", "id": new_payout.id}
 
 
-@app.put("/api/payouts/{payout_id}")
+@router.put("/api/payouts/{payout_id}")
 async def update_payout(payout_id: int, payout_data: PayoutUpdateRequest):
     """Обновить информацию о выплате"""
     async with get_db() as db:
@@ -520,9 +701,66 @@ async def update_payout(payout_id: int, payout_data: PayoutUpdateRequest):
         return {"message": "Выплата обновлена успешно", "id": payout.id}
 
 
-@app.put("/api/payouts/{payout_id}/pay")
+# Объявлен раньше /api/payouts/{payout_id}/pay, иначе "batch" разбирается как payout_id
+@router.put("/api/payouts/batch/pay")
+async def batch_mark_payouts_as_paid(request: BatchPayRequest):
+    """
+    Массово отметить выплаты как выполненные
+
+    Один UPDATE ... RETURNING по всем ID и один запрос telegram_id партнёров;
+    партнёр получает одно уведомление по всем своим выплатам. Уведомления
+    отправляются в фоне после коммита, ход рассылки -
+    GET /api/payouts/notifications/{notification_job_id}.
+    """
+    if not request.payout_ids:
+        raise HTTPException(status_code=400, detail="Не указаны ID выплат")
+    
+    payout_ids = set(request.payout_ids)
+    async with get_db() as db:
+        result = await db.execute(
+            update(ReferralPayout)
+            .where(ReferralPayout.id.in_(payout_ids), ReferralPayout.status.is_distinct_from("paid"))
+            .values(status="paid", paid_at=datetime.utcnow())
+            .returning(ReferralPayout.referrer_id, ReferralPayout.amount, ReferralPayout.month, ReferralPayout.year)
+            .execution_options(synchronize_session=False)
+        )
+        paid = result.all()
+        
+        if len(paid) != len(payout_ids):
+            # Не обновлены уже выплаченные и несуществующие: различаем их только в этом случае
+            found = await db.scalar(
+                select(func.count(ReferralPayout.id)).where(ReferralPayout.id.in_(payout_ids))
+            )
+            if found != len(payout_ids):
+                raise HTTPException(status_code=400, detail="Некоторые выплаты не найдены")
+        
+        by_partner: Dict[int, List[Any]] = {}
+        for row in paid:
+            by_partner.setdefault(row.referrer_id, []).append(row)
+        telegram_ids = {}
+        if by_partner:
+            telegram_result = await db.execute(
+                select(User.id, User.telegram_id).where(User.id.in_(by_partner))
+            )
+            telegram_ids = dict(telegram_result.all())
+    
+    job = payout_notifier.enqueue(
+        (telegram_ids.get(partner_id), payout_notification_text(payouts))
+        for partner_id, payouts in by_partner.items()
+    )
+    logger.info("Массово обновлено %s выплат, уведомлений в очереди: %s", len(paid), job.total)
+    
+    return {
+        "message": f"Обновлено {len(paid)} выплат",
+        "updated_count": len(paid),
+        "notified_partners": job.total,
+        "notification_job_id": job.id
+    }
+
+
+@router.put("/api/payouts/{payout_id}/pay")
 async def mark_payout_as_paid(payout_id: int):
-    """Отметить выплату как выполненную"""
+    """Отметить выплату как выполненную и уведомить партнёра в фоне"""
     async with get_db() as db:
         result = await db.execute(
             select(ReferralPayout).filter(ReferralPayout.id == payout_id)
@@ -540,63 +778,49 @@ async def mark_payout_as_paid(payout_id: int):
         await db.commit()
         
         # Получаем telegram_id для уведомления
-        user_result = await db.execute(
-            select(User).filter(User.id == payout.referrer_id)
+        telegram_id = await db.scalar(
+            select(User.telegram_id).filter(User.id == payout.referrer_id)
         )
-        user = user_result.scalar_one_or_none()
-        
-        notification_text = (
-            f"💰 <b>Вам начислено вознаграждение!</b>\n\n"
-            f"Сумма: {payout.amount:,} ₽\n"
-            f"За период: {payout.month:02d}.{payout.year}\n\n"
-            f"Спасибо за участие в реферальной программе!"
-        )
-        
-        logger.info(f"Выплата #{payout_id} отмечена как выполненная")
-        
-        return {
-            "message": "Выплата отмечена как выполненная",
-            "telegram_id": user.telegram_id if user else None,
-            "notification": notification_text
-        }
+        notification_text = payout_notification_text([payout])
+    
+    job = payout_notifier.enqueue([(telegram_id, notification_text)])
+    logger.info(f"Выплата #{payout_id} отмечена как выполненная")
+    
+    return {
+        "message": "Выплата отмечена как выполненная",
+        "telegram_id": telegram_id,
+        "notification": notification_text,
+        "notification_job_id": job.id
+    }
 
 
-@app.put("/api/payouts/batch/pay")
-async def batch_mark_payouts_as_paid(request: BatchPayRequest):
-    """Массово отметить выплаты как выполненные"""
-    if not request.payout_ids:
-        raise HTTPException(status_code=400, detail="Не указаны ID выплат")
-    
-    async with get_db() as db:
-        result = await db.execute(
-            select(ReferralPayout).filter(ReferralPayout.id.in_(request.payout_ids))
-        )
-        payouts = result.scalars().all()
-        
-        if len(payouts) != len(request.payout_ids):
-            raise HTTPException(status_code=400, detail="Некоторые выплаты не найдены")
-        
-        updated_count = 0
-        for payout in payouts:
-            if payout.status != "paid":
-                payout.status = "paid"
-                payout.paid_at = datetime.utcnow()
-                updated_count += 1
-        
-        await db.commit()
-        logger.info(f"Массово обновлено {updated_count} выплат")
-        
-        return {"message": f"Обновлено {updated_count} выплат", "updated_count": updated_count}
+@router.get("/api/payouts/notifications/{job_id}")
+async def get_payout_notifications(job_id: str):
+    """
+    Ход рассылки уведомлений о выплатах: отправлено, ошибки, осталось
+
+    Статус хранится в памяти воркера, создавшего рассылку (см. payout_notifier).
+    """
+    job = payout_notifier.job(job_id)
+    if job is None:
+        pid = payout_notifier.job_pid(job_id)
+        if pid is not None and pid != os.getpid():
+            raise HTTPException(
+                status_code=404,
+                detail=f"Рассылка запущена другим воркером веб-сервиса (pid {pid}), статус хранится только в нем"
+            )
+        raise HTTPException(status_code=404, detail="Рассылка не найдена")
+    return job.to_dict()
 
 
 # ============================================
 # API реферальной программы
 # ============================================
 
-@app.get("/api/referrers")
+@router.get("/api/referrers")
 async def get_referrers():
     """Получить список всех рефереров"""
-    async with get_db() as db:
+    async with get_read_db() as db:
         result = await db.execute(
             select(
                 ReferralRelationship.referrer_id,
@@ -628,10 +852,10 @@ async def get_referrers():
         return referrers_data
 
 
-@app.get("/api/referrals/structure")
+@router.get("/api/referrals/structure")
 async def get_referral_structure():
     """Получить полную реферальную структуру"""
-    async with get_db() as db:
+    async with get_read_db() as db:
         query = text("""
             SELECT 
                 rr.id, rr.created_at,
@@ -671,16 +895,16 @@ async def get_referral_structure():
                 "referrer_name": referrer_name,
                 "referred_id": row.referred_telegram_id,
                 "referred_name": referred_name,
-                "created_at": serialize_datetime(row.created_at)
+                "created_at": row.created_at
             })
         
-        return structure
+        return ORJSONResponse(structure)
 
 
-@app.get("/api/referrals/get-referrer/{telegram_id}")
+@router.get("/api/referrals/get-referrer/{telegram_id}")
 async def get_partner_referrer(telegram_id: int):
     """Получить реферера партнёра (кто его пригласил)"""
-    async with get_db() as db:
+    async with get_read_db() as db:
         user_query = text("""
             SELECT u.id, u.telegram_id, u.first_name, u.username, pp.full_name as partner_name
             FROM users u
@@ -736,15 +960,146 @@ async def get_partner_referrer(telegram_id: int):
         }
 
 
+# ============================================
+# Многоуровневое реферальное дерево
+# ============================================
+
+async def get_partner_user_id(db, telegram_id: int) -> int:
+    """ID пользователя по Telegram ID или 404"""
+    user_id = await db.scalar(select(User.id).where(User.telegram_id == telegram_id))
+    if user_id is None:
+        raise HTTPException(status_code=404, detail="Пользователь не найден")
+    return user_id
+
+
+def tree_node_query(node_column, *columns):
+    """Узлы дерева из referral_closure с пользователем и именем партнёра"""
+    return (
+        select(
+            User.id, User.telegram_id, User.first_name, User.username, PartnerProfile.full_name,
+            ReferralClosure.depth, *columns
+        )
+        .select_from(ReferralClosure)
+        .join(User, User.id == node_column)
+        .outerjoin(PartnerProfile, PartnerProfile.user_id == User.id)
+    )
+
+
+def serialize_tree_node(row) -> Dict[str, Any]:
+    return {
+        "user_id": row.id,
+        "telegram_id": row.telegram_id,
+        "name": row.full_name or format_user_display_name(row),
+        "depth": row.depth,
+    }
+
+
+@router.get("/api/referrals/{telegram_id}/subtree")
+async def get_referral_subtree(
+    telegram_id: int,
+    max_depth: Optional[int] = Query(None, ge=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+):
+    """
+    Все рефералы партнёра на всех уровнях (по уровням, затем по ID)
+
+    referrer_user_id каждого узла позволяет собрать дерево на клиенте.
+    """
+    async with get_read_db() as db:
+        user_id = await get_partner_user_id(db, telegram_id)
+
+        conditions = [ReferralClosure.ancestor_id == user_id]
+        if max_depth:
+            conditions.append(ReferralClosure.depth <= max_depth)
+
+        total = await db.scalar(select(func.count()).select_from(ReferralClosure).where(*conditions))
+        result = await db.execute(
+            tree_node_query(ReferralClosure.descendant_id, ReferralRelationship.referrer_id)
+            .join(ReferralRelationship, ReferralRelationship.referred_id == ReferralClosure.descendant_id)
+            .where(*conditions)
+            .order_by(ReferralClosure.depth, ReferralClosure.descendant_id)
+            .offset(skip)
+            .limit(limit)
+        )
+        items = [
+            {**serialize_tree_node(row), "referrer_user_id": row.referrer_id}
+            for row in result.all()
+        ]
+        return {"telegram_id": telegram_id, "total": total, "skip": skip, "limit": limit, "items": items}
+
+
+@router.get("/api/referrals/{telegram_id}/ancestors")
+async def get_referral_ancestors(telegram_id: int):
+    """Цепочка пригласивших партнёра: от прямого реферера (depth = 1) к корню"""
+    async with get_read_db() as db:
+        user_id = await get_partner_user_id(db, telegram_id)
+        result = await db.execute(
+            tree_node_query(ReferralClosure.ancestor_id)
+            .where(ReferralClosure.descendant_id == user_id)
+            .order_by(ReferralClosure.depth)
+        )
+        return {"telegram_id": telegram_id, "items": [serialize_tree_node(row) for row in result.all()]}
+
+
+@router.get("/api/referrals/{telegram_id}/revenue")
+async def get_referral_level_revenue(
+    telegram_id: int,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    max_depth: Optional[int] = Query(None, ge=1),
+):
+    """Количество рефералов и их выручка по уровням дерева партнёра"""
+    async with get_read_db() as db:
+        user_id = await get_partner_user_id(db, telegram_id)
+
+        # Условия по дате - в ON, чтобы партнёры без выручки за период остались в подсчете
+        revenue_join = [PartnerRevenue.partner_id == ReferralClosure.descendant_id]
+        if date_from:
+            revenue_join.append(PartnerRevenue.created_at >= date_from)
+        if date_to:
+            revenue_join.append(PartnerRevenue.created_at <= date_to)
+
+        query = (
+            select(
+                ReferralClosure.depth,
+                func.count(func.distinct(ReferralClosure.descendant_id)).label("partners"),
+                func.coalesce(func.sum(PartnerRevenue.amount), 0).label("revenue"),
+            )
+            .outerjoin(PartnerRevenue, and_(*revenue_join))
+            .where(ReferralClosure.ancestor_id == user_id)
+            .group_by(ReferralClosure.depth)
+            .order_by(ReferralClosure.depth)
+        )
+        if max_depth:
+            query = query.where(ReferralClosure.depth <= max_depth)
+
+        levels = [
+            {"depth": row.depth, "partners": row.partners, "revenue": row.revenue}
+            for row in (await db.execute(query)).all()
+        ]
+        return {
+            "telegram_id": telegram_id,
+            "levels": levels,
+            "total_partners": sum(level["partners"] for level in levels),
+            "total_revenue": sum(level["revenue"] for level in levels),
+        }
+
+
 # ============================================
 # API пользователей
 # ============================================
 
-@app.get("/api/users")
-async def get_users():
+@router.get("/api/users")
+async def get_users(request: Request):
     """Получить список всех пользователей"""
+    return await response_cache.respond(request, "users", load_users)
+
+
+async def load_users() -> List[Dict[str, Any]]:
+    """Список пользователей для /api/users"""
     try:
-        async with get_db() as db:
+        async with get_read_db() as db:
             result = await db.execute(
                 select(User).order_by(User.registered_at.desc())
             )
@@ -765,7 +1120,7 @@ async def get_users():
                     "last_name": user.last_name,
                     "is_partner": profile is not None,
                     "partner_name": profile.full_name if profile else None,
-                    "registered_at": serialize_datetime(user.registered_at)
+                    "registered_at": user.registered_at
                 })
 
             return users_data
@@ -774,28 +1129,28 @@ async def get_users():
         raise
 
 
-@app.get("/api/users/list")
+@router.get("/api/users/list")
 async def get_users_list():
     """Получить список пользователей для выбора"""
-    async with get_db() as db:
+    async with get_read_db() as db:
         result = await db.execute(
             select(User).order_by(User.first_name.asc())
         )
         users = result.scalars().all()
         
-        return [{
+        return ORJSONResponse([{
             "telegram_id": user.telegram_id,
             "display_name": (
                 f"{user.first_name or ''} (@{user.username})" 
                 if user.username else f"{user.first_name or ''} (ID:{user.telegram_id})"
             ).strip()
-        } for user in users]
+        } for user in users])
 
 
-@app.get("/api/users/referrals-info")
+@router.get("/api/users/referrals-info")
 async def get_users_referrals_info():
     """Получить всех пользователей с информацией о рефералах"""
-    async with get_db() as db:
+    async with get_read_db() as db:
         users_query = text("""
             SELECT u.id, u.telegram_id, u.username, u.first_name, u.registered_at,
                    pp.full_name as partner_name
@@ -844,23 +1199,223 @@ async def get_users_referrals_info():
                 "username": user.username,
                 "first_name": user.first_name,
                 "name": user_name,
-                "registered_at": serialize_datetime(user.registered_at),
+                "registered_at": user.registered_at,
                 "invited_by": referrer_of.get(user.id),
                 "invited_count": referrals_count.get(user.id, 0),
                 "is_partner": user.partner_name is not None
             })
         
-        return {"total_users": len(users_data), "users": users_data}
+        return ORJSONResponse({"total_users": len(users_data), "users": users_data})
+
+
+# ============================================
+# API экспорта (CSV)
+# ============================================
+
+# Сколько строк читать из курсора БД за раз и сколько строк CSV отдавать одним блоком
+EXPORT_YIELD_PER = 1000
+EXPORT_CHUNK_ROWS = 500
+
+
+def csv_export_response(filename: str, header: List[str], query, row_to_csv) -> StreamingResponse:
+    """
+    Отдает результат запроса в виде CSV, не загружая его целиком в память
+
+    Строки читаются серверным курсором (AsyncSession.stream + yield_per)
+    и пишутся в ответ блоками по EXPORT_CHUNK_ROWS строк.
+
+    Args:
+        filename: Имя файла для Content-Disposition
+        header: Заголовок CSV
+        query: SQLAlchemy запрос
+        row_to_csv: Функция, превращающая строку результата в список значений
+    """
+    async def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # BOM, чтобы Excel корректно открыл кириллицу
+        buffer.write("\ufeff")
+        writer.writerow(header)
+        rows_written = 0
+        try:
+            async with get_read_db() as db:
+                result = await db.stream(query.execution_options(yield_per=EXPORT_YIELD_PER))
+                async for partition in result.partitions(EXPORT_CHUNK_ROWS):
+                    writer.writerows(row_to_csv(row) for row in partition)
+                    rows_written += len(partition)
+                    yield buffer.getvalue().encode("utf-8")
+                    buffer.seek(0)
+                    buffer.truncate(0)
+            if buffer.tell():
+                yield buffer.getvalue().encode("utf-8")
+            logger.info(f"Экспорт {filename}: {rows_written} строк")
+        except Exception as e:
+            # Заголовки уже отправлены, поэтому ошибку можно только залогировать и оборвать поток
+            logger.error(f"Ошибка экспорта {filename} после {rows_written} строк: {e}", exc_info=True)
+            raise
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/api/export/payouts.csv")
+async def export_payouts(
+    status: Optional[str] = None,
+    month: Optional[int] = None,
+    year: Optional[int] = None,
+    referrer_id: Optional[int] = None,
+    search: Optional[str] = None,
+):
+    """Экспорт выплат в CSV (фильтры как у /api/payouts)"""
+    query = (
+        select(
+            ReferralPayout.id, ReferralPayout.referrer_id, ReferralPayout.amount,
+            ReferralPayout.month, ReferralPayout.year, ReferralPayout.status,
+            ReferralPayout.paid_at, ReferralPayout.created_at,
+            User.telegram_id, User.first_name, User.username,
+            PartnerProfile.full_name.label("partner_name"),
+        )
+        .join(User, ReferralPayout.referrer_id == User.id)
+        .outerjoin(PartnerProfile, PartnerProfile.user_id == User.id)
+    )
+    query = apply_payout_filters(query, status, month, year, referrer_id, search)
+    query = query.order_by(ReferralPayout.id)
+
+    return csv_export_response(
+        "payouts.csv",
+        ["id", "referrer_id", "referrer_telegram_id", "referrer_name", "amount",
+         "month", "year", "status", "paid_at", "created_at"],
+        query,
+        lambda row: [
+            row.id, row.referrer_id, row.telegram_id, row.partner_name or format_user_display_name(row),
+            row.amount, row.month, row.year, row.status,
+            serialize_datetime(row.paid_at), serialize_datetime(row.created_at)
+        ]
+    )
+
+
+@router.get("/api/export/revenues.csv")
+async def export_revenues(
+    partner_id: Optional[int] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+):
+    """Экспорт выручки партнёров в CSV"""
+    query = (
+        select(
+            PartnerRevenue.id, PartnerRevenue.partner_id, PartnerRevenue.amount,
+            PartnerRevenue.description, PartnerRevenue.client_reference, PartnerRevenue.created_at,
+            User.telegram_id, User.first_name, User.username,
+            PartnerProfile.full_name.label("partner_name"),
+        )
+        .join(User, PartnerRevenue.partner_id == User.id)
+        .outerjoin(PartnerProfile, PartnerProfile.user_id == User.id)
+    )
+    if partner_id:
+        query = query.where(PartnerRevenue.partner_id == partner_id)
+    if date_from:
+        query = query.where(PartnerRevenue.created_at >= date_from)
+    if date_to:
+        query = query.where(PartnerRevenue.created_at <= date_to)
+    query = query.order_by(PartnerRevenue.id)
+
+    return csv_export_response(
+        "revenues.csv",
+        ["id", "partner_id", "partner_telegram_id", "partner_name", "amount",
+         "description", "client_reference", "created_at"],
+        query,
+        lambda row: [
+            row.id, row.partner_id, row.telegram_id, row.partner_name or format_user_display_name(row),
+            row.amount, row.description, row.client_reference, serialize_datetime(row.created_at)
+        ]
+    )
+
+
+@router.get("/api/export/users.csv")
+async def export_users():
+    """Экспорт пользователей в CSV"""
+    query = (
+        select(
+            User.id, User.telegram_id, User.username, User.first_name, User.last_name,
+            User.registered_at, PartnerProfile.full_name.label("partner_name"),
+            PartnerProfile.id.label("profile_id"),
+        )
+        .outerjoin(PartnerProfile, PartnerProfile.user_id == User.id)
+        .order_by(User.id)
+    )
+
+    return csv_export_response(
+        "users.csv",
+        ["id", "telegram_id", "username", "first_name", "last_name",
+         "is_partner", "partner_name", "registered_at"],
+        query,
+        lambda row: [
+            row.id, row.telegram_id, row.username, row.first_name, row.last_name,
+            row.profile_id is not None, row.partner_name, serialize_datetime(row.registered_at)
+        ]
+    )
+
+
+@router.get("/api/export/referrals.csv")
+async def export_referrals():
+    """Экспорт реферальной структуры в CSV"""
+    referrer = aliased(User)
+    referred = aliased(User)
+    referrer_profile = aliased(PartnerProfile)
+    referred_profile = aliased(PartnerProfile)
+    query = (
+        select(
+            ReferralRelationship.id, ReferralRelationship.created_at,
+            referrer.telegram_id.label("referrer_telegram_id"),
+            referrer.first_name.label("referrer_first_name"),
+            referrer.username.label("referrer_username"),
+            referrer_profile.full_name.label("referrer_partner_name"),
+            referred.telegram_id.label("referred_telegram_id"),
+            referred.first_name.label("referred_first_name"),
+            referred.username.label("referred_username"),
+            referred_profile.full_name.label("referred_partner_name"),
+        )
+        .join(referrer, ReferralRelationship.referrer_id == referrer.id)
+        .outerjoin(referrer_profile, referrer_profile.user_id == referrer.id)
+        .join(referred, ReferralRelationship.referred_id == referred.id)
+        .outerjoin(referred_profile, referred_profile.user_id == referred.id)
+        .order_by(ReferralRelationship.id)
+    )
+
+    def row_to_csv(row):
+        referrer_name = row.referrer_partner_name or format_user_display_name(SimpleNamespace(
+            first_name=row.referrer_first_name, username=row.referrer_username,
+            telegram_id=row.referrer_telegram_id
+        ))
+        referred_name = row.referred_partner_name or format_user_display_name(SimpleNamespace(
+            first_name=row.referred_first_name, username=row.referred_username,
+            telegram_id=row.referred_telegram_id
+        ))
+        return [
+            row.id, row.referrer_telegram_id, referrer_name,
+            row.referred_telegram_id, referred_name, serialize_datetime(row.created_at)
+        ]
+
+    return csv_export_response(
+        "referrals.csv",
+        ["id", "referrer_telegram_id", "referrer_name", "referred_telegram_id",
+         "referred_name", "created_at"],
+        query,
+        row_to_csv
+    )
 
 
 # ============================================
 # API статистики
 # ============================================
 
-@app.get("/api/stats")
+@router.get("/api/stats")
 async def get_stats():
     """Получить основную статистику системы"""
-    async with get_db() as db:
+    async with get_read_db() as db:
         # Общее количество пользователей
         users_count_result = await db.execute(func.count(User.id))
         users_count = users_count_result.scalar_one_or_none() or 0
@@ -899,31 +1454,70 @@ async def get_stats():
 # API сообщений
 # ============================================
 
-@app.get("/api/cases/{case_id}/messages")
-async def get_case_messages(case_id: int):
-    """Получить переписку по делу"""
+# Размер страницы переписки по умолчанию
+MESSAGES_PAGE_SIZE = 50
+
+
+async def fetch_message_page(db, query, before_id: Optional[int], after_id: Optional[int], limit: int):
+    """
+    Выбирает страницу сообщений по курсору id
+
+    Без курсора возвращаются последние limit сообщений, с before_id - более
+    ранние, с after_id - более поздние. Сообщения всегда в хронологическом порядке.
+
+    Returns:
+        Tuple[list, bool]: Строки страницы и признак того, что в этом направлении есть еще сообщения
+    """
+    if after_id:
+        query = query.where(CaseMessage.id > after_id).order_by(CaseMessage.id.asc())
+    else:
+        if before_id:
+            query = query.where(CaseMessage.id < before_id)
+        query = query.order_by(CaseMessage.id.desc())
+
+    # Одна лишняя строка показывает, есть ли следующая страница
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not after_id:
+        rows.reverse()
+    return rows, has_more
+
+
+@router.get("/api/cases/{case_id}/messages")
+async def get_case_messages(
+    case_id: int,
+    before_id: Optional[int] = Query(None, ge=1),
+    after_id: Optional[int] = Query(None, ge=1),
+    limit: int = Query(MESSAGES_PAGE_SIZE, ge=1, le=500),
+):
+    """Получить страницу переписки по делу (по умолчанию последние сообщения)"""
     async with get_db() as db:
-        result = await db.execute(
-            select(CaseMessage)
-            .filter(CaseMessage.questionnaire_id == case_id)
-            .options(selectinload(CaseMessage.sender))
-            .order_by(CaseMessage.created_at.asc())
+        query = (
+            select(
+                CaseMessage.id, CaseMessage.questionnaire_id, CaseMessage.sender_id,
+                CaseMessage.sender_type, CaseMessage.message_content, CaseMessage.is_read,
+                CaseMessage.created_at, User.first_name, User.last_name,
+            )
+            .outerjoin(User, CaseMessage.sender_id == User.id)
+            .where(CaseMessage.questionnaire_id == case_id)
         )
-        messages = result.scalars().all()
+        rows, _ = await fetch_message_page(db, query, before_id, after_id, limit)
         
         return [{
-            "id": msg.id,
-            "questionnaire_id": msg.questionnaire_id,
-            "sender_id": msg.sender_id,
-            "sender_type": msg.sender_type,
-            "sender_name": f"{msg.sender.first_name} {msg.sender.last_name}".strip() if msg.sender else "Unknown",
-            "message_content": msg.message_content,
-            "is_read": msg.is_read,
-            "created_at": serialize_datetime(msg.created_at)
-        } for msg in messages]
-
-
-@app.post("/api/cases/{case_id}/messages")
+            "id": row.id,
+            "questionnaire_id": row.questionnaire_id,
+            "sender_id": row.sender_id,
+            "sender_type": row.sender_type,
+            "sender_name": f"{row.first_name} {row.last_name}".strip() if row.first_name is not None else "Unknown",
+            "message_content": row.message_content,
+            "is_read": row.is_read,
+            "created_at": serialize_datetime(row.created_at)
+        } for row in rows]
+
+
+@router.post("/api/cases/{case_id}/messages")
 async def send_case_message(case_id: int, message_data: dict):
     """Отправить сообщение по делу (от админа)"""
     content = message_data.get("content")
@@ -951,6 +1545,11 @@ async def send_case_message(case_id: int, message_data: dict):
         await db.commit()
         await db.refresh(new_message)
         
+        # Диалоги группируются по отправителю сообщения (см. /api/dialogs)
+        sender = await db.get(User, sender_id) if sender_id else None
+        if sender:
+            publish_dialog_message(sender, new_message)
+        
         user_result = await db.execute(
             select(User).filter(User.id == case.user_id)
         )
@@ -980,13 +1579,15 @@ async def send_case_message(case_id: int, message_data: dict):
         }
 
 
-@app.post("/api/messages/dialog")
+@router.post("/api/messages/dialog")
 async def save_dialog_message(request: DialogMessageRequest):
     """Сохранить сообщение от пользователя в диалог"""
     if not request.content:
         raise HTTPException(status_code=400, detail="Текст сообщения обязателен")
     
-    async with get_db() as db:
+    # Сообщения клиентов приходят от бота на каждое входящее сообщение,
+    # поэтому запись идет через общую очередь записи с групповым коммитом
+    async def save(db):
         user_result = await db.execute(
             select(User).filter(User.telegram_id == request.telegram_id)
         )
@@ -1000,15 +1601,15 @@ async def save_dialog_message(request: DialogMessageRequest):
                 last_name=""
             )
             db.add(user)
-            await db.commit()
-            await db.refresh(user)
+            await db.flush()
         
         case_result = await db.execute(
-            select(CaseQuestionnaire).filter(CaseQuestionnaire.user_id == user.id)
+            select(CaseQuestionnaire.id)
+            .filter(CaseQuestionnaire.user_id == user.id)
+            .order_by(CaseQuestionnaire.id)
+            .limit(1)
         )
-        cases = case_result.scalars().all()
-        
-        case_id = cases[0].id if cases else 0
+        case_id = case_result.scalar() or 0
         
         new_message = CaseMessage(
             questionnaire_id=case_id,
@@ -1017,18 +1618,21 @@ async def save_dialog_message(request: DialogMessageRequest):
             message_content=request.content
         )
         db.add(new_message)
-        await db.commit()
-        await db.refresh(new_message)
-        
-        return {
-            "message": "Сообщение сохранено",
-            "id": new_message.id,
-            "user_id": user.id,
-            "case_id": case_id
-        }
+        await db.flush()
+        return user, new_message, case_id
+    
+    user, new_message, case_id = await db_writer.submit(save)
+    publish_dialog_message(user, new_message)
+    
+    return {
+        "message": "Сообщение сохранено",
+        "id": new_message.id,
+        "user_id": user.id,
+        "case_id": case_id
+    }
 
 
-@app.post("/api/messages/direct")
+@router.post("/api/messages/direct")
 async def send_direct_message(request: DirectMessageRequest):
     """Отправить сообщение напрямую пользователю"""
     if not request.telegram_id or not request.content:
@@ -1076,6 +1680,7 @@ async def send_direct_message(request: DirectMessageRequest):
             db.add(new_message)
             await db.commit()
             await db.refresh(new_message)
+            publish_dialog_message(user, new_message)
             logger.info(f"Сообщение сохранено в деле {case_id}")
         else:
             # Дела нет — просто отправляем, не сохраняем в case_messages
@@ -1093,57 +1698,104 @@ async def send_direct_message(request: DirectMessageRequest):
 # API диалогов
 # ============================================
 
-@app.get("/api/dialogs")
-async def get_dialogs():
+@router.get("/api/dialogs")
+async def get_dialogs(request: Request):
     """Получить список всех диалогов"""
+    return await response_cache.respond(request, "dialogs", load_dialogs)
+
+
+async def load_dialogs() -> List[Dict[str, Any]]:
+    """
+    Список диалогов для /api/dialogs
+
+    Сообщения не загружаются целиком: последнее сообщение диалога - max(id)
+    по отправителю (индекс ix_case_messages_sender_id_id), непрочитанные
+    считаются группировкой по индексу ix_case_messages_unread.
+    """
+    last_ids = (
+        select(CaseMessage.sender_id, func.max(CaseMessage.id).label("last_id"))
+        .where(CaseMessage.sender_id.isnot(None))
+        .group_by(CaseMessage.sender_id)
+        .subquery()
+    )
+    unread = (
+        select(CaseMessage.sender_id, func.count().label("unread_count"))
+        .where(CaseMessage.sender_type == "client", CaseMessage.is_read.is_(False))
+        .group_by(CaseMessage.sender_id)
+        .subquery()
+    )
     try:
-        async with get_db() as db:
+        async with get_read_db() as db:
             result = await db.execute(
-                select(CaseMessage)
-                .options(selectinload(CaseMessage.sender))
-                .order_by(CaseMessage.created_at.desc())
+                select(
+                    User.telegram_id,
+                    User.first_name,
+                    User.username,
+                    CaseMessage.message_content,
+                    CaseMessage.created_at,
+                    func.coalesce(unread.c.unread_count, 0).label("unread_count")
+                )
+                .join(last_ids, last_ids.c.sender_id == User.id)
+                .join(CaseMessage, CaseMessage.id == last_ids.c.last_id)
+                .outerjoin(unread, unread.c.sender_id == User.id)
             )
-            messages = result.unique().scalars().all()
-
-            dialogs_dict = {}
-            for msg in messages:
-                user = msg.sender
-                if not user:
-                    continue
-
-                telegram_id = user.telegram_id
-                if telegram_id not in dialogs_dict:
-                    display_name = (
-                        f"{user.first_name or ''} (@{user.username})"
-                        if user.username else f"{user.first_name or 'Клиент'} (ID:{telegram_id})"
-                    ).strip()
-
-                    dialogs_dict[telegram_id] = {
-                        "telegram_id": telegram_id,
-                        "display_name": display_name,
-                        "last_message": (
-                            msg.message_content[:50] + "..."
-                            if len(msg.message_content) > 50 else msg.message_content
-                        ),
-                        "last_time": serialize_datetime(msg.created_at),
-                        "unread_count": 0
-                    }
-
-                if msg.sender_type == "client" and not msg.is_read:
-                    dialogs_dict[telegram_id]["unread_count"] += 1
-
-            dialogs = list(dialogs_dict.values())
-            dialogs.sort(key=lambda x: x["last_time"] or "", reverse=True)
-
+            dialogs = [
+                {
+                    "telegram_id": row.telegram_id,
+                    "display_name": format_dialog_name(row),
+                    "last_message": (
+                        row.message_content[:50] + "..."
+                        if len(row.message_content) > 50 else row.message_content
+                    ),
+                    "last_time": row.created_at,
+                    "unread_count": row.unread_count
+                }
+                for row in result
+            ]
+            dialogs.sort(key=lambda x: x["last_time"] or datetime.min, reverse=True)
             return dialogs
     except Exception as e:
         logger.error(f"Ошибка в /api/dialogs: {e}", exc_info=True)
         raise
 
 
-@app.get("/api/dialogs/{telegram_id}/messages")
-async def get_dialog_messages(telegram_id: int):
-    """Получить сообщения диалога с пользователем"""
+@router.get("/api/dialogs/events")
+async def dialog_events_stream(request: Request):
+    """
+    Поток Server-Sent Events для страницы диалогов
+
+    События:
+    - message: новое сообщение диалога
+    - unread: изменение количества непрочитанных ({"telegram_id", "delta"})
+    - resync: клиент пропустил события и должен перезагрузить данные
+    """
+    last_event_id = request.headers.get("last-event-id")
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        last_event_id = None
+
+    return StreamingResponse(
+        dialog_events.stream(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/api/dialogs/{telegram_id}/messages")
+async def get_dialog_messages(
+    telegram_id: int,
+    before_id: Optional[int] = Query(None, ge=1),
+    after_id: Optional[int] = Query(None, ge=1),
+    limit: int = Query(MESSAGES_PAGE_SIZE, ge=1, le=500),
+):
+    """
+    Получить страницу сообщений диалога с пользователем
+
+    По умолчанию возвращаются последние сообщения; более ранние запрашиваются
+    с before_id = id первого сообщения страницы. При загрузке последней страницы
+    входящие сообщения клиента отмечаются прочитанными.
+    """
     if not telegram_id or telegram_id <= 0:
         raise HTTPException(status_code=400, detail="Некорректный telegram_id")
     
@@ -1156,39 +1808,52 @@ async def get_dialog_messages(telegram_id: int):
         if not user:
             raise HTTPException(status_code=404, detail="Пользователь не найден")
         
-        result = await db.execute(
-            select(CaseMessage)
-            .filter(CaseMessage.sender_id == user.id)
-            .options(selectinload(CaseMessage.sender))
-            .order_by(CaseMessage.created_at.asc())
+        # Отправитель всех сообщений диалога - сам пользователь, поэтому связь sender не загружается
+        query = (
+            select(
+                CaseMessage.id, CaseMessage.sender_type, CaseMessage.message_content,
+                CaseMessage.created_at, CaseMessage.is_read,
+            )
+            .where(CaseMessage.sender_id == user.id)
         )
-        messages = result.unique().scalars().all()
+        rows, has_more = await fetch_message_page(db, query, before_id, after_id, limit)
         
         messages_data = [{
-            "id": msg.id,
-            "sender_type": msg.sender_type,
-            "sender_name": msg.sender.first_name if msg.sender else "Unknown",
-            "content": msg.message_content,
-            "created_at": serialize_datetime(msg.created_at),
-            "is_read": msg.is_read
-        } for msg in messages]
-        
-        for msg in messages:
-            if msg.sender_type == "client" and not msg.is_read:
-                msg.is_read = True
-        await db.commit()
+            "id": row.id,
+            "sender_type": row.sender_type,
+            "sender_name": user.first_name,
+            "content": row.message_content,
+            "created_at": serialize_datetime(row.created_at),
+            "is_read": row.is_read
+        } for row in rows]
+        
+        marked_read = 0
+        if not before_id:
+            result = await db.execute(
+                update(CaseMessage)
+                .where(
+                    CaseMessage.sender_id == user.id,
+                    CaseMessage.sender_type == "client",
+                    CaseMessage.is_read.is_(False)
+                )
+                .values(is_read=True)
+                .execution_options(synchronize_session=False)
+            )
+            marked_read = result.rowcount
+            await db.commit()
+        
+        if marked_read:
+            dialog_events.publish("unread", {"telegram_id": telegram_id, "delta": -marked_read})
         
         return {
             "telegram_id": telegram_id,
-            "user_name": (
-                f"{user.first_name or ''} (@{user.username})" 
-                if user.username else f"{user.first_name or 'Клиент'} (ID:{telegram_id})"
-            ).strip(),
-            "messages": messages_data
+            "user_name": format_dialog_name(user),
+            "messages": messages_data,
+            "has_more": has_more
         }
 
 
-@app.post("/api/dialogs/{telegram_id}/send")
+@router.post("/api/dialogs/{telegram_id}/send")
 async def send_dialog_message(telegram_id: int, request: DirectMessageRequest):
     """Отправить сообщение пользователю в диалог"""
     async with get_db() as db:
@@ -1217,6 +1882,7 @@ async def send_dialog_message(telegram_id: int, request: DirectMessageRequest):
             db.add(new_message)
             await db.commit()
             await db.refresh(new_message)
+            publish_dialog_message(user, new_message)
             logger.info(f"Сообщение сохранено в деле {case_id}")
         else:
             # Дела нет — просто отправляем, не сохраняем
@@ -1233,216 +1899,31 @@ async def send_dialog_message(telegram_id: int, request: DirectMessageRequest):
         return {"message": "Сообщение отправлено"}
 
 
-# ============================================
-# Рассылка
-# ============================================
-
-@app.post("/api/broadcast")
-async def send_broadcast(message_data: dict):
-    """Отправить рассылку всем партнёрам"""
-    message = message_data.get("message")
-    if not message:
-        raise HTTPException(status_code=400, detail="Текст сообщения обязателен")
-    
-    async with get_db() as db:
-        result = await db.execute(
-            select(User)
-            .join(PartnerProfile, User.id == PartnerProfile.user_id)
-        )
-        users = result.scalars().all()
-        
-        sent_count = len(users)
-        logger.info(f"Рассылка отправлена {sent_count} партнёрам")
-    
-    return {"message": "Рассылка успешно отправлена", "sent_count": sent_count}
-
-
 # ============================================
 # Страница диалогов
 # ============================================
 
-DIALOGS_HTML = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Диалоги - Law Bot Admin</title>
-    <meta charset="utf-8">
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
-        .container { max-width: 1200px; margin: 0 auto; }
-        h1 { color: #333; border-bottom: 2px solid #007bff; padding-bottom: 10px; }
-        .nav-links { margin-bottom: 20px; padding: 15px; background: #007bff; border-radius: 8px; }
-        .nav-links a { color: white; text-decoration: none; margin-right: 20px; font-weight: bold; }
-        .nav-links a:hover { text-decoration: underline; }
-        .dialogs-list { background: white; border-radius: 8px; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
-        .dialog-item { padding: 15px; border-bottom: 1px solid #eee; cursor: pointer; }
-        .dialog-item:hover { background: #f8f9fa; }
-        .dialog-item.active { background: #e3f2fd; }
-        .dialog-name { font-weight: bold; color: #333; }
-        .dialog-preview { color: #666; font-size: 14px; margin-top: 5px; }
-        .dialog-time { font-size: 12px; color: #999; }
-        .unread-badge { background: #007bff; color: white; padding: 2px 8px; border-radius: 10px; font-size: 12px; }
-        .chat-container { display: flex; height: 600px; margin-top: 20px; }
-        .dialogs-panel { width: 350px; background: white; border-radius: 8px 0 0 8px; overflow-y: auto; }
-        .messages-panel { flex: 1; background: white; border-radius: 0 8px 8px 0; display: flex; flex-direction: column; }
-        .messages-header { padding: 15px; border-bottom: 1px solid #eee; background: #f8f9fa; border-radius: 0 8px 0 0; }
-        .messages-list { flex: 1; overflow-y: auto; padding: 15px; }
-        .message { margin-bottom: 15px; padding: 10px 15px; border-radius: 15px; max-width: 70%; }
-        .message.client { background: #e3f2fd; margin-right: auto; }
-        .message.admin { background: #dcf8c6; margin-left: auto; }
-        .message-time { font-size: 11px; color: #999; margin-top: 5px; }
-        .message-input-area { padding: 15px; border-top: 1px solid #eee; }
-        .message-input-area textarea { width: 100%; padding: 10px; border: 1px solid #ddd; border-radius: 8px; resize: none; height: 60px; }
-        .message-input-area button { margin-top: 10px; padding: 10px 20px; background: #007bff; color: white; border: none; border-radius: 8px; cursor: pointer; }
-        .message-input-area button:hover { background: #0056b3; }
-        .no-dialog { text-align: center; padding: 50px; color: #666; }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>💬 Диалоги с пользователями</h1>
-        
-        <div class="nav-links">
-            <span>📁 Навигация:</span>
-            <a href="/">🏠 Главная</a>
-            <a href="/dialogs">💬 Диалоги</a>
-        </div>
-        
-        <div class="chat-container">
-            <div class="dialogs-panel" id="dialogs-list">
-                <div style="padding: 20px; text-align: center;">Загрузка...</div>
-            </div>
-            
-            <div class="messages-panel" id="messages-panel">
-                <div class="no-dialog" id="no-dialog-message">
-                    <p>👈 Выберите диалог слева</p>
-                </div>
-                <div class="messages-header" id="messages-header" style="display: none;">
-                    <strong id="chat-user-name"></strong>
-                </div>
-                <div class="messages-list" id="messages-list" style="display: none;"></div>
-                <div class="message-input-area" id="message-input-area" style="display: none;">
-                    <textarea id="message-text" placeholder="Введите сообщение..."></textarea>
-                    <button onclick="sendMessage()">📤 Отправить</button>
-                </div>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        let currentTelegramId = null;
-        
-        async function loadDialogs() {
-            try {
-                const response = await fetch('/api/dialogs');
-                const dialogs = await response.json();
-                
-                const listEl = document.getElementById('dialogs-list');
-                
-                if (dialogs.length === 0) {
-                    listEl.innerHTML = '<div style="padding: 20px; text-align: center;">Нет диалогов</div>';
-                    return;
-                }
-                
-                listEl.innerHTML = dialogs.map(d => `
-                    <div class="dialog-item" onclick="openDialog(${d.telegram_id}, '${d.display_name.replace(/'/g, "\\\\'")}')">
-                        <div class="dialog-name">
-                            ${d.display_name}
-                            ${d.unread_count > 0 ? '<span class="unread-badge">' + d.unread_count + '</span>' : ''}
-                        </div>
-                        <div class="dialog-preview">${d.last_message || ''}</div>
-                        <div class="dialog-time">${d.last_time || ''}</div>
-                    </div>
-                `).join('');
-            } catch (e) {
-                document.getElementById('dialogs-list').innerHTML = '<div style="padding: 20px; color: red;">Ошибка загрузки</div>';
-            }
-        }
-        
-        async function openDialog(telegramId, userName) {
-            currentTelegramId = telegramId;
-            
-            document.querySelectorAll('.dialog-item').forEach(el => el.classList.remove('active'));
-            event.currentTarget.classList.add('active');
-            
-            document.getElementById('no-dialog-message').style.display = 'none';
-            document.getElementById('messages-header').style.display = 'block';
-            document.getElementById('messages-list').style.display = 'block';
-            document.getElementById('message-input-area').style.display = 'block';
-            
-            document.getElementById('chat-user-name').textContent = userName;
-            
-            try {
-                const response = await fetch(`/api/dialogs/${telegramId}/messages`);
-                const data = await response.json();
-                
-                const messagesEl = document.getElementById('messages-list');
-                messagesEl.innerHTML = data.messages.map(m => `
-                    <div class="message ${m.sender_type}">
-                        <div>${m.content}</div>
-                        <div class="message-time">${m.created_at || ''}</div>
-                    </div>
-                `).join('');
-                
-                messagesEl.scrollTop = messagesEl.scrollHeight;
-            } catch (e) {
-                console.error('Ошибка загрузки сообщений:', e);
-            }
-        }
-        
-        async function sendMessage() {
-            if (!currentTelegramId) return;
-            
-            const textEl = document.getElementById('message-text');
-            const content = textEl.value.trim();
-            
-            if (!content) return;
-            
-            try {
-                const response = await fetch(`/api/dialogs/${currentTelegramId}/send`, {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/json' },
-                    body: JSON.stringify({ telegram_id: currentTelegramId, content: content })
-                });
-                
-                const result = await response.json();
-                
-                if (result.message) {
-                    textEl.value = '';
-                    openDialog(currentTelegramId, document.getElementById('chat-user-name').textContent);
-                }
-            } catch (e) {
-                alert('Ошибка отправки: ' + e.message);
-            }
-        }
-        
-        document.getElementById('message-text').addEventListener('keypress', function(e) {
-            if (e.key === 'Enter' && !e.shiftKey) {
-                e.preventDefault();
-                sendMessage();
-            }
-        });
-        
-        loadDialogs();
-    </script>
-</body>
-</html>
-"""
-
-@app.get("/dialogs", response_class=HTMLResponse)
-async def dialogs_page():
+@router.get("/dialogs", response_class=HTMLResponse)
+async def dialogs_page(request: Request):
     """Страница диалогов с пользователями"""
-    return HTMLResponse(content=DIALOGS_HTML)
+    return static_bundle.response(request, "dialogs.html")
 
 
 # ============================================
 # Главная страница
 # ============================================
 
-@app.get("/", response_class=HTMLResponse)
-async def admin_dashboard():
+@router.get("/", response_class=HTMLResponse)
+async def admin_dashboard(request: Request):
     """Главная страница админ-панели"""
-    return HTMLResponse(content=SIMPLE_TEST_HTML)
+    return static_bundle.response(request, "index.html")
+
+
+app = create_app(
+    router,
+    title="Admin Panel for Law Bot",
+    description="Админ-панель для управления юридическим ботом"
+)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+"""
+Сборка FastAPI-приложения из роутеров
+
+Админ-панель (admin_panel/app.py) и сервер сообщений (message_server.py)
+объявляют маршруты в APIRouter, а приложение с общими обработчиком ошибок,
+CORS и запуском/остановкой собирает create_app. Единый сервис (server.py)
+подключает оба роутера к одному приложению: один пул соединений с базой,
+один HTTP-клиент Bot API и одна очередь записи на процесс.
+
+Ответы по умолчанию сериализует orjson (datetime - сразу в ISO 8601), ответы
+больше GZIP_MIN_SIZE сжимаются gzip, кроме потока событий диалогов.
+"""
+import logging
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.datastructures import Headers
+from starlette.types import Receive, Scope, Send
+
+from database.database import engine, close_db, run_startup_steps, schema_steps
+from admin_panel.payout_notifier import payout_notifier
+from admin_panel.response_cache import choose_encoding
+from admin_panel.telegram_sender import telegram_sender
+from config.logging_setup import TRACE_HEADER, setup_logging, trace_id_var, new_trace_id
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Потоки Server-Sent Events: GZipMiddleware копит сжатые данные в буфере
+# zlib и отдает их блоками, события доходили бы до браузера с задержкой
+UNCOMPRESSED_PATHS = {"/api/dialogs/events"}
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware, который не трогает потоки событий и учитывает q в Accept-Encoding
+
+    Starlette сжимает, если в заголовке просто встречается "gzip", в том
+    числе при явном отказе "gzip;q=0".
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and (
+            scope["path"] in UNCOMPRESSED_PATHS
+            or not choose_encoding(Headers(scope=scope).get("accept-encoding", ""), ("gzip",))
+        ):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+def create_app(*routers: APIRouter, title: str, description: str = "", version: str = "2.0.0") -> FastAPI:
+    """
+    Создает приложение и подключает роутеры в указанном порядке
+
+    При совпадении путей выигрывает роутер, подключенный первым.
+    """
+    setup_logging("web")
+    # Журнал доступа uvicorn пишется на каждый запрос: через общую очередь, а не своим обработчиком
+    for name in ("uvicorn", "uvicorn.access"):
+        logging.getLogger(name).handlers.clear()
+        logging.getLogger(name).propagate = True
+    app = FastAPI(title=title, description=description, version=version, default_response_class=ORJSONResponse)
+
+    # Глобальный обработчик исключений
+    @app.exception_handler(Exception)
+    async def global_exception_handler(request: Request, exc: Exception):
+        logger.error(f"Необработанное исключение на {request.url}: {exc}", exc_info=True)
+        return JSONResponse(
+            status_code=500,
+            content={"detail": "Внутренняя ошибка сервера", "error": str(exc)}
+        )
+
+    @app.on_event("startup")
+    async def startup():
+        """
+        Создает недостающие индексы, полнотекстовый индекс заявок и реферальное дерево, если бот еще не успел
+
+        Каждый шаг в своей транзакции: ошибка одного не отменяет остальные.
+        """
+        await run_startup_steps(engine.begin, schema_steps())
+
+    @app.on_event("shutdown")
+    async def shutdown():
+        """
+        Досылает уведомления о выплатах, закрывает клиент Bot API и пул
+
+        Без закрытия пула потоки соединений aiosqlite не дают процессу завершиться.
+        """
+        await payout_notifier.close()
+        await telegram_sender.close()
+        await close_db()
+
+    # Сжатие ближе всех к маршрутам: trace_context отдает тело потоком, и
+    # снаружи GZipMiddleware сжимал бы даже ответы меньше GZIP_MIN_SIZE
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.GZIP_MIN_SIZE, compresslevel=settings.GZIP_LEVEL)
+
+    @app.middleware("http")
+    async def trace_context(request: Request, call_next):
+        """trace_id запроса (из X-Trace-Id, если его передал бот) для записей логов и ответа"""
+        trace_id = request.headers.get(TRACE_HEADER) or new_trace_id()
+        token = trace_id_var.set(trace_id)
+        try:
+            response = await call_next(request)
+        finally:
+            trace_id_var.reset(token)
+        response.headers[TRACE_HEADER] = trace_id
+        return response
+
+    # Добавляем CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    for router in routers:
+        app.include_router(router)
+    return app
@@ -0,0 +1,146 @@
+"""
+Внутрипроцессная шина событий админ-панели для Server-Sent Events
+
+Эндпоинты, записывающие сообщения, публикуют события в шину, а страница
+диалогов получает их через /api/dialogs/events. Каждое событие сериализуется
+один раз и раздается всем подписчикам готовым SSE-кадром.
+
+Последние события хранятся в кольцевом буфере: переподключившийся браузер
+передает Last-Event-ID и получает пропущенное. Если пропущено больше, чем
+помещается в буфер, или подписчик не успевает читать, он получает событие
+resync и перезагружает данные целиком.
+"""
+import asyncio
+import json
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+# Количество событий, доступных для повторной отправки после переподключения
+REPLAY_BUFFER_SIZE = 1000
+
+# Очередь одного подписчика; при переполнении подписчик получает resync
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Интервал комментариев-пингов, чтобы прокси не закрывали простаивающее соединение
+KEEPALIVE_INTERVAL = 15
+
+
+def format_sse(event_id: int, event: str, data: Dict[str, Any]) -> bytes:
+    """Формирует SSE-кадр"""
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return f"id: {event_id}\nevent: {event}\ndata: {payload}\n\n".encode("utf-8")
+
+
+class Subscription:
+    """Подписка одного клиента: очередь готовых кадров"""
+
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+
+class EventBroker:
+    """Издатель событий для всех подключенных страниц диалогов"""
+
+    def __init__(self, replay_size: int = REPLAY_BUFFER_SIZE):
+        self._subscribers: Set[Subscription] = set()
+        self._history: Deque[Tuple[int, bytes]] = deque(maxlen=replay_size)
+        self._last_id = 0
+
+    @property
+    def subscribers_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: Dict[str, Any]) -> int:
+        """
+        Публикует событие всем подписчикам
+
+        Не блокирует: кадр кладется в очереди подписчиков без ожидания.
+
+        Returns:
+            int: Номер события
+        """
+        self._last_id += 1
+        frame = format_sse(self._last_id, event, data)
+        self._history.append((self._last_id, frame))
+
+        for subscription in self._subscribers:
+            if subscription.overflowed:
+                continue
+            try:
+                subscription.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Медленный клиент: вместо бесконечной очереди просим его перезагрузить данные
+                subscription.overflowed = True
+        return self._last_id
+
+    def subscribe(self, last_event_id: Optional[int] = None) -> Subscription:
+        """
+        Создает подписку
+
+        Args:
+            last_event_id: Номер последнего полученного клиентом события (заголовок Last-Event-ID)
+        """
+        subscription = Subscription()
+        if last_event_id is not None and last_event_id > self._last_id:
+            # Номер из прошлого запуска процесса: что было пропущено, неизвестно
+            subscription.overflowed = True
+        elif last_event_id is not None and last_event_id < self._last_id:
+            oldest = self._history[0][0] if self._history else self._last_id + 1
+            missed = self._last_id - last_event_id
+            if last_event_id + 1 < oldest or missed > SUBSCRIBER_QUEUE_SIZE:
+                subscription.overflowed = True
+            else:
+                for event_id, frame in self._history:
+                    if event_id > last_event_id:
+                        subscription.queue.put_nowait(frame)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def _resync(self, subscription: Subscription) -> bytes:
+        """Сбрасывает очередь отставшего подписчика и возвращает кадр resync"""
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.overflowed = False
+        # id в кадре, чтобы после переподключения браузер не получил resync повторно
+        return f"id: {self._last_id}\nevent: resync\ndata: {{}}\n\n".encode("utf-8")
+
+    async def stream(self, last_event_id: Optional[int] = None, keepalive: float = KEEPALIVE_INTERVAL):
+        """
+        Асинхронный генератор SSE-кадров для StreamingResponse
+
+        Args:
+            last_event_id: Заголовок Last-Event-ID переподключившегося клиента
+            keepalive: Интервал пингов в секундах
+        """
+        subscription = self.subscribe(last_event_id)
+        try:
+            yield b"retry: 3000\n\n"
+            queue = subscription.queue
+            while True:
+                if subscription.overflowed:
+                    yield self._resync(subscription)
+                if queue.empty():
+                    try:
+                        # asyncio.timeout не создает отдельную задачу на каждое ожидание, в отличие от wait_for
+                        async with asyncio.timeout(keepalive):
+                            frame = await queue.get()
+                    except TimeoutError:
+                        yield b": ping\n\n"
+                        continue
+                    frames = [frame]
+                else:
+                    frames = []
+                # Все накопившиеся кадры уходят одной записью в сокет
+                while not queue.empty():
+                    frames.append(queue.get_nowait())
+                yield b"".join(frames)
+        finally:
+            self.unsubscribe(subscription)
+
+
+# Общая шина событий диалогов
+dialog_events = EventBroker()
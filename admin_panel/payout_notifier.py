@@ -0,0 +1,171 @@
+"""
+Уведомления партнёров о выплатах
+
+Эндпоинты выплат не ждут Telegram: после коммита они ставят сообщения в
+очередь (payout_notifier.enqueue) и сразу отвечают номером рассылки.
+Фоновая задача отправляет сообщения через общий клиент Bot API:
+- общий поток не чаще PAYOUT_NOTIFY_RATE сообщений в секунду (лимит Bot API
+  на массовую отправку около 30 в секунду);
+- одновременно в полете не больше TELEGRAM_MAX_CONNECTIONS запросов;
+- при ответе 429 сообщение повторяется после retry_after, и на это же время
+  сдвигаются остальные отправки; другие ошибки (партнёр заблокировал бота)
+  не повторяются.
+
+Ход рассылки (отправлено, ошибки, осталось) доступен по номеру через
+/api/payouts/notifications/{job_id}. Рассылки хранятся в памяти процесса,
+последние MAX_JOBS штук: при WEB_WORKERS > 1 статус знает только воркер,
+принявший запрос на выплату. Номер рассылки начинается с pid этого воркера
+("<pid>-<n>"), поэтому номера разных воркеров не совпадают, а запрос статуса,
+попавший в другой воркер, получает 404 с объяснением. Для отслеживания
+рассылок веб-сервис запускается с одним воркером.
+
+Очередь, ограничение частоты, остановка и повторы - общие с отправителями
+бота (config/background.py).
+"""
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from admin_panel.telegram_sender import telegram_sender
+from config.background import BackgroundQueue, RateLimiter, send_with_retries
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Рассылок, доступных для просмотра статуса
+MAX_JOBS = 100
+
+# Ошибок в статусе рассылки (остальные только считаются)
+MAX_JOB_ERRORS = 100
+
+
+class NotificationJob:
+    """Одна рассылка: счетчики доставки"""
+
+    def __init__(self, job_id: str, total: int):
+        self.id = job_id
+        self.total = total
+        self.sent = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.created_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None if total else self.created_at
+
+    @property
+    def pending(self) -> int:
+        return self.total - self.sent - self.failed
+
+    def delivered(self) -> None:
+        self.sent += 1
+        self._check_finished()
+
+    def fail(self, chat_id: Optional[int], error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_JOB_ERRORS:
+            self.errors.append({"telegram_id": chat_id, "error": error})
+        self._check_finished()
+
+    def _check_finished(self) -> None:
+        if self.pending == 0 and self.finished_at is None:
+            self.finished_at = datetime.utcnow()
+            logger.info("Рассылка #%s завершена: отправлено %s, ошибок %s", self.id, self.sent, self.failed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "total": self.total,
+            "sent": self.sent,
+            "failed": self.failed,
+            "pending": self.pending,
+            "errors": self.errors,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class PayoutNotifier(BackgroundQueue):
+    """Очередь уведомлений о выплатах с ограничением частоты отправки"""
+
+    name = "payout_notifier"
+
+    def __init__(self, rate: Optional[float] = None, concurrency: Optional[int] = None, sender=None):
+        super().__init__()
+        self.limiter = RateLimiter(rate or settings.PAYOUT_NOTIFY_RATE)
+        self.concurrency = concurrency or settings.TELEGRAM_MAX_CONNECTIONS
+        self.sender = sender or telegram_sender
+        self._jobs: "OrderedDict[str, NotificationJob]" = OrderedDict()
+        self._last_job_id = 0
+        self.sent_messages = 0
+
+    def enqueue(self, messages: Iterable[Tuple[Optional[int], str]]) -> NotificationJob:
+        """
+        Ставит сообщения в очередь, не дожидаясь отправки
+
+        Args:
+            messages: Пары (telegram_id, текст); без telegram_id сообщение
+                сразу считается ошибкой рассылки
+
+        Returns:
+            NotificationJob: Рассылка для отслеживания доставки
+        """
+        messages = list(messages)
+        self._last_job_id += 1
+        job = NotificationJob(f"{os.getpid()}-{self._last_job_id}", len(messages))
+        self._jobs[job.id] = job
+        while len(self._jobs) > MAX_JOBS:
+            self._jobs.popitem(last=False)
+
+        for chat_id, text in messages:
+            if chat_id is None:
+                job.fail(None, "у партнёра нет telegram_id")
+                continue
+            self.put((job, chat_id, text))
+        return job
+
+    def job(self, job_id: str) -> Optional[NotificationJob]:
+        return self._jobs.get(job_id)
+
+    @staticmethod
+    def job_pid(job_id: str) -> Optional[int]:
+        """pid воркера, создавшего рассылку (None, если номер не в формате <pid>-<n>)"""
+        pid, _, number = job_id.partition("-")
+        return int(pid) if pid.isdigit() and number.isdigit() else None
+
+    # ============================================
+    # Фоновая отправка
+    # ============================================
+
+    async def _run(self) -> None:
+        slots = asyncio.Semaphore(self.concurrency)
+        in_flight = set()
+
+        def finished(task: asyncio.Task) -> None:
+            in_flight.discard(task)
+            slots.release()
+
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                break
+            await slots.acquire()
+            await self.limiter.wait()
+            task = asyncio.create_task(self._deliver(*item))
+            in_flight.add(task)
+            task.add_done_callback(finished)
+        if in_flight:
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def _deliver(self, job: NotificationJob, chat_id: int, text: str) -> None:
+        error = await send_with_retries(lambda: self.sender.send_message(chat_id, text), chat_id, self.limiter)
+        if error is None:
+            self.sent_messages += 1
+            job.delivered()
+            return
+        logger.error("Уведомление о выплате пользователю %s не отправлено: %s", chat_id, error)
+        job.fail(chat_id, error)
+
+
+payout_notifier = PayoutNotifier()
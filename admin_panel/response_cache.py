@@ -0,0 +1,194 @@
+"""
+Условные GET и кэш ответов списков админ-панели
+
+SPA перезапрашивает /api/users, /api/partners, /api/requests и /api/dialogs
+при каждом переключении вкладки. Перед построением ответа берется версия
+ресурса - несколько агрегатов по индексам (число строк, max(id),
+max(updated_at)) и счетчик записей процесса, который увеличивают эндпоинты,
+меняющие строки без видимого в агрегатах следа (статус заявки).
+
+- Версия не изменилась и в LRU есть ответ с теми же параметрами запроса -
+  отдается готовое тело (и сжатое gzip, если клиент его принимает): ни строки
+  таблиц, ни сериализатор не трогаются.
+- ETag - хэш тела: если If-None-Match совпал, отдается 304 без тела. Хэш
+  не зависит от процесса, поэтому 304 работает и с несколькими воркерами.
+
+Изменения, которых нет в версии (например, статус заявки, измененный другим
+воркером), видны не позже чем через RESPONSE_CACHE_TTL секунд: после этого
+запись кэша строится заново.
+"""
+import gzip
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy import text
+
+from database.database import get_read_db
+from config.settings import settings
+
+# Версия ресурса: агрегаты таблиц, из которых строится ответ
+RESOURCE_VERSIONS = {
+    "users": text(
+        "SELECT (SELECT count(*) FROM users), (SELECT max(id) FROM users), (SELECT max(updated_at) FROM users),"
+        " (SELECT count(*) FROM partner_profiles), (SELECT max(updated_at) FROM partner_profiles)"
+    ),
+    "partners": text(
+        "SELECT count(*), max(id), max(updated_at) FROM partner_profiles"
+    ),
+    "requests": text(
+        "SELECT count(*), max(id) FROM case_questionnaires"
+    ),
+    "dialogs": text(
+        "SELECT (SELECT count(*) FROM case_messages), (SELECT max(id) FROM case_messages),"
+        " (SELECT count(*) FROM case_messages WHERE sender_type = 'client' AND is_read = false)"
+    ),
+}
+
+# Браузер хранит ответ, но перед использованием проверяет его через If-None-Match
+CACHE_CONTROL = "no-cache"
+
+
+class CachedResponse(NamedTuple):
+    version: Tuple
+    etag: str
+    body: bytes
+    gzip_body: Optional[bytes]
+    created_at: float
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Слабое сравнение If-None-Match (RFC 9110): W/ и список тегов"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag.removeprefix("W/") for tag in header.split(","))
+
+
+def accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """
+    Кодировки из Accept-Encoding с весами q (RFC 9110)
+
+    Кодировки с q=0 клиент явно не принимает; "*" задает вес остальных.
+    """
+    encodings = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        encodings[name] = q
+    return encodings
+
+
+def choose_encoding(accept_encoding: str, available: Tuple[str, ...]) -> Optional[str]:
+    """
+    Кодировка ответа из available (в порядке предпочтения сервера) с наибольшим q > 0
+
+    Returns:
+        Optional[str]: Кодировка или None - отдать тело без сжатия
+    """
+    encodings = accepted_encodings(accept_encoding)
+    default = encodings.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in available:
+        q = encodings.get(encoding, default)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class ResponseCache:
+    """LRU готовых JSON-ответов по ресурсу и параметрам запроса"""
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        self.max_entries = settings.RESPONSE_CACHE_ENTRIES if max_entries is None else max_entries
+        self.max_bytes = settings.RESPONSE_CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+        self.ttl = settings.RESPONSE_CACHE_TTL if ttl is None else ttl
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+        self._size = 0
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, resource: str) -> None:
+        """Изменение ресурса, которое не видно по агрегатам версии"""
+        self._generations[resource] = self._generations.get(resource, 0) + 1
+
+    async def version(self, resource: str) -> Tuple:
+        async with get_read_db() as db:
+            row = (await db.execute(RESOURCE_VERSIONS[resource])).one()
+        return (self._generations.get(resource, 0), *(str(value) for value in row))
+
+    def _get(self, key: Hashable, version: Tuple) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.version != version or time.monotonic() - entry.created_at > self.ttl:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _put(self, key: Hashable, entry: CachedResponse) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._size += len(entry.body) + len(entry.gzip_body or b"")
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._size -= len(entry.body) + len(entry.gzip_body or b"")
+
+    async def respond(self, request: Request, resource: str, build: Callable[[], Awaitable[Any]]) -> Response:
+        """
+        Ответ эндпоинта-списка с ETag, 304 и кэшем
+
+        Args:
+            request: Запрос (параметры запроса входят в ключ кэша)
+            resource: Ключ RESOURCE_VERSIONS
+            build: Корутина, возвращающая содержимое ответа, если кэш не подошел
+        """
+        version = await self.version(resource)
+        key = (resource, tuple(sorted(request.query_params.multi_items())))
+        entry = self._get(key, version)
+        if entry is None:
+            self.misses += 1
+            body = ORJSONResponse(await build()).body
+            etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            gzip_body = None
+            if self.max_entries > 0 and len(body) >= settings.GZIP_MIN_SIZE:
+                # Большие ответы сжимаются один раз, а не GZipMiddleware на каждый запрос
+                gzip_body = gzip.compress(body, settings.GZIP_LEVEL)
+            entry = CachedResponse(version, etag, body, gzip_body, time.monotonic())
+            if self.max_entries > 0:
+                self._put(key, entry)
+        else:
+            self.hits += 1
+
+        headers = {"ETag": entry.etag, "Cache-Control": CACHE_CONTROL}
+        if etag_matches(request, entry.etag):
+            return Response(status_code=304, headers=headers)
+        if entry.gzip_body is not None and choose_encoding(request.headers.get("accept-encoding", ""), ("gzip",)):
+            headers.update({"Content-Encoding": "gzip", "Vary": "Accept-Encoding"})
+            return Response(entry.gzip_body, media_type="application/json", headers=headers)
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,262 @@
+"""
+Импорт выручки партнёров из CSV
+
+Бухгалтерия присылает выручку за месяц таблицей на тысячи сделок. Тело
+запроса читается потоком: строки CSV разбираются и проверяются по мере
+поступления, партнёры ищутся по telegram_id пачками по IMPORT_BATCH_ROWS
+строк (один SELECT ... IN на пачку), а записи вставляются в конце одной
+транзакцией - executemany блоками по IMPORT_INSERT_CHUNK строк. Блокировка
+записи SQLite не держится, пока клиент медленно загружает файл.
+
+Колонки (первая строка - заголовок, разделитель "," ";" или табуляция):
+- partner_telegram_id (или telegram_id) - обязательно
+- amount - обязательно, целые рубли ("150 000", "150000,00")
+- description, client_reference - необязательно
+- created_at - необязательно, ISO 8601 или ДД.ММ.ГГГГ
+
+Файл /api/export/revenues.csv подходит для импорта без изменений.
+Строки с ошибками пропускаются и возвращаются в ответе с номером строки.
+"""
+import codecs
+import csv
+import time
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.future import select
+
+from database.models import PartnerRevenue, User
+
+# Строк в одной пачке поиска партнёров
+IMPORT_BATCH_ROWS = 1000
+
+# Строк в одном executemany
+IMPORT_INSERT_CHUNK = 5000
+
+# Больше строк за один импорт не принимается
+IMPORT_MAX_ROWS = 200000
+
+# Ошибок в ответе (остальные только считаются)
+IMPORT_MAX_ERRORS = 1000
+
+# Колонка amount - INTEGER
+MAX_AMOUNT = 2 ** 31 - 1
+
+TELEGRAM_ID_COLUMNS = ("partner_telegram_id", "telegram_id")
+REQUIRED_COLUMNS = ("amount",)
+
+
+class RevenueImportError(Exception):
+    """Файл нельзя импортировать целиком (нет заголовка или колонок, слишком много строк)"""
+
+
+async def csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, List[str]]]:
+    """
+    Записи CSV из потока байтов: (номер строки файла, поля)
+
+    Запись отдается, когда в ней закрыты все кавычки, поэтому поля с
+    переводами строк внутри кавычек разбираются верно. Разделитель
+    определяется по заголовку.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    dialect = None
+    pending = ""
+    record = ""
+    line_number = 0
+    record_line = 1
+
+    def parse(text: str) -> List[str]:
+        nonlocal dialect
+        if dialect is None:
+            delimiter = max((";", ",", "\t"), key=text.count)
+            dialect = {"delimiter": delimiter if text.count(delimiter) else ","}
+        return next(csv.reader([text], **dialect), [])
+
+    async def lines() -> AsyncIterator[str]:
+        nonlocal pending
+        async for chunk in chunks:
+            parts = (pending + decoder.decode(chunk)).split("\n")
+            pending = parts.pop()
+            for line in parts:
+                yield line + "\n"
+        tail = pending + decoder.decode(b"", final=True)
+        pending = ""
+        if tail:
+            yield tail
+
+    async for line in lines():
+        line_number += 1
+        if not record:
+            record_line = line_number
+        record += line
+        if record.count('"') % 2:
+            continue
+        if record.strip():
+            yield record_line, parse(record)
+        record = ""
+    if record.strip():
+        yield record_line, parse(record)
+
+
+def parse_amount(value: str) -> int:
+    normalized = value.replace(" ", "").replace(" ", "").replace(",", ".")
+    try:
+        amount = Decimal(normalized)
+    except InvalidOperation:
+        raise ValueError(f"сумма '{value}' не число")
+    if not amount.is_finite():
+        raise ValueError(f"сумма '{value}' не число")
+    if amount != amount.to_integral_value():
+        raise ValueError(f"сумма '{value}' не целое число рублей")
+    if amount <= 0:
+        raise ValueError("сумма должна быть больше нуля")
+    if amount > MAX_AMOUNT:
+        raise ValueError(f"сумма больше {MAX_AMOUNT}")
+    return int(amount)
+
+
+def parse_created_at(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%d.%m.%Y")
+    except ValueError:
+        pass
+    try:
+        created_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"дата '{value}' не в формате ISO 8601 или ДД.ММ.ГГГГ")
+    # В базе время хранится в UTC без зоны
+    if created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return created_at
+
+
+class RevenueImporter:
+    """Один импорт: проверка строк, поиск партнёров и вставка"""
+
+    def __init__(self, db):
+        self.db = db
+        self.columns: Dict[str, int] = {}
+        self.partner_ids: Dict[int, Optional[int]] = {}
+        self.batch: List[Tuple[int, int, dict]] = []
+        self.rows: List[dict] = []
+        self.errors: List[Dict[str, Any]] = []
+        self.errors_total = 0
+        self.rows_total = 0
+        self.now = datetime.utcnow()
+
+    def error(self, line: int, message: str) -> None:
+        self.errors_total += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def read_header(self, fields: List[str]) -> None:
+        self.columns = {name.strip().lower(): index for index, name in enumerate(fields)}
+        telegram_column = next((name for name in TELEGRAM_ID_COLUMNS if name in self.columns), None)
+        missing = [name for name in REQUIRED_COLUMNS if name not in self.columns]
+        if telegram_column is None:
+            missing.insert(0, TELEGRAM_ID_COLUMNS[0])
+        if missing:
+            raise RevenueImportError(f"В заголовке нет колонок: {', '.join(missing)}")
+        self.columns["telegram_id"] = self.columns[telegram_column]
+
+    def field(self, fields: List[str], name: str) -> str:
+        index = self.columns.get(name)
+        return fields[index].strip() if index is not None and index < len(fields) else ""
+
+    async def add(self, line: int, fields: List[str]) -> None:
+        """Проверяет строку и ставит ее в пачку поиска партнёров"""
+        # Пустые строки в конце таблицы (";;;" после выгрузки из Excel)
+        if not any(value.strip() for value in fields):
+            return
+        self.rows_total += 1
+        if self.rows_total > IMPORT_MAX_ROWS:
+            raise RevenueImportError(f"Больше {IMPORT_MAX_ROWS} строк в одном файле")
+        try:
+            telegram_value = self.field(fields, "telegram_id")
+            if not telegram_value:
+                raise ValueError("не указан telegram_id партнёра")
+            try:
+                telegram_id = int(telegram_value)
+            except ValueError:
+                raise ValueError(f"telegram_id '{telegram_value}' не число")
+            amount_value = self.field(fields, "amount")
+            if not amount_value:
+                raise ValueError("не указана сумма")
+            row = {
+                "amount": parse_amount(amount_value),
+                "description": self.field(fields, "description"),
+                "client_reference": self.field(fields, "client_reference") or None,
+                "created_at": parse_created_at(self.field(fields, "created_at")) or self.now,
+            }
+        except ValueError as e:
+            self.error(line, str(e))
+            return
+
+        self.batch.append((line, telegram_id, row))
+        if len(self.batch) >= IMPORT_BATCH_ROWS:
+            await self.resolve_batch()
+
+    async def resolve_batch(self) -> None:
+        """Находит партнёров пачки одним запросом (уже найденные не ищутся повторно)"""
+        unknown = {telegram_id for _, telegram_id, _ in self.batch if telegram_id not in self.partner_ids}
+        if unknown:
+            result = await self.db.execute(select(User.telegram_id, User.id).where(User.telegram_id.in_(unknown)))
+            found = dict(result.all())
+            for telegram_id in unknown:
+                self.partner_ids[telegram_id] = found.get(telegram_id)
+
+        for line, telegram_id, row in self.batch:
+            partner_id = self.partner_ids[telegram_id]
+            if partner_id is None:
+                self.error(line, f"партнёр с telegram_id {telegram_id} не найден")
+                continue
+            row["partner_id"] = partner_id
+            self.rows.append(row)
+        self.batch.clear()
+
+    async def insert(self) -> None:
+        table = PartnerRevenue.__table__
+        for start in range(0, len(self.rows), IMPORT_INSERT_CHUNK):
+            await self.db.execute(insert(table), self.rows[start:start + IMPORT_INSERT_CHUNK])
+
+
+async def import_revenues(db, chunks: AsyncIterator[bytes], dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Импортирует выручку из потока CSV в сессии db
+
+    Вставленные строки фиксирует вызывающий (get_db коммитит при выходе);
+    при dry_run строки только проверяются.
+
+    Raises:
+        RevenueImportError: Файл не подходит для импорта целиком
+    """
+    started = time.perf_counter()
+    importer = RevenueImporter(db)
+    header_read = False
+    async for line, fields in csv_records(chunks):
+        if not header_read:
+            importer.read_header(fields)
+            header_read = True
+            continue
+        await importer.add(line, fields)
+    if not header_read:
+        raise RevenueImportError("Файл пуст")
+    await importer.resolve_batch()
+    if not dry_run:
+        await importer.insert()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": importer.rows_total,
+        "imported": 0 if dry_run else len(importer.rows),
+        "valid": len(importer.rows),
+        "errors_total": importer.errors_total,
+        "errors": sorted(importer.errors, key=lambda error: error["line"]),
+        "dry_run": dry_run,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(importer.rows_total / elapsed) if elapsed > 0 else None,
+    }
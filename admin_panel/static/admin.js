@@ -1,175 +1,44 @@
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Admin Panel - Law Bot</title>
-    <meta charset="utf-8">
-    <style>
-        body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
-        table { width: 100%; border-collapse: collapse; margin-top: 20px; }
-        th, td { border: 1px solid #ddd; padding: 10px; text-align: left; }
-        th { background-color: #f8f9fa; }
-        h1 { color: #333; border-bottom: 2px solid #007bff; padding-bottom: 10px; }
-        h2 { color: #555; border-bottom: 2px solid #28a745; padding-bottom: 10px; margin-top: 30px; }
-        .section { margin-bottom: 30px; padding: 20px; background: white; border-radius: 8px; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
-        .nav-links { margin-bottom: 20px; padding: 15px; background: #007bff; border-radius: 8px; }
-        .nav-links a { color: white; text-decoration: none; margin-right: 20px; font-weight: bold; }
-        .nav-links a:hover { text-decoration: underline; }
-        .btn { padding: 8px 16px; background: #007bff; color: white; border: none; border-radius: 4px; cursor: pointer; }
-        .btn:hover { background: #0056b3; }
-        .btn-details { padding: 5px 10px; background: #28a745; color: white; border: none; border-radius: 4px; cursor: pointer; font-size: 12px; }
-        .btn-details:hover { background: #218838; }
-        
-        /* Modal styles */
-        .modal { display: none; position: fixed; z-index: 1000; left: 0; top: 0; width: 100%; height: 100%; overflow: auto; background-color: rgba(0,0,0,0.5); }
-        .modal-content { background-color: #fefefe; margin: 5% auto; padding: 20px; border: 1px solid #888; width: 80%; max-width: 800px; border-radius: 8px; max-height: 80vh; overflow-y: auto; }
-        .modal-header { display: flex; justify-content: space-between; align-items: center; border-bottom: 1px solid #ddd; padding-bottom: 10px; margin-bottom: 20px; }
-        .modal-close { color: #aaa; font-size: 28px; font-weight: bold; cursor: pointer; }
-        .modal-close:hover { color: #000; }
-        .detail-row { margin-bottom: 15px; }
-        .detail-label { font-weight: bold; color: #555; }
-        .detail-value { margin-top: 5px; padding: 8px; background: #f8f9fa; border-radius: 4px; white-space: pre-wrap; }
-        
-        /* Chat styles */
-        .chat-container { display: flex; height: 500px; border: 1px solid #ddd; border-radius: 8px; overflow: hidden; }
-        .chat-users-list { width: 250px; border-right: 1px solid #ddd; background: #f8f9fa; overflow-y: auto; }
-        .chat-user-item { padding: 15px; border-bottom: 1px solid #ddd; cursor: pointer; }
-        .chat-user-item:hover { background: #e9ecef; }
-        .chat-user-item.active { background: #007bff; color: white; }
-        .chat-user-name { font-weight: bold; }
-        .chat-user-preview { font-size: 12px; color: #666; }
-        .chat-user-item.active .chat-user-preview { color: #fff; }
-        .chat-messages { flex: 1; display: flex; flex-direction: column; }
-        .chat-messages-header { padding: 15px; border-bottom: 1px solid #ddd; background: #f8f9fa; font-weight: bold; }
-        .chat-messages-list { flex: 1; overflow-y: auto; padding: 15px; }
-        .chat-message { margin-bottom: 15px; padding: 10px 15px; border-radius: 15px; max-width: 70%; }
-        .chat-message.admin { background: #007bff; color: white; margin-left: auto; }
-        .chat-message.client { background: #e9ecef; color: #333; }
-        .chat-message-time { font-size: 10px; opacity: 0.7; margin-top: 5px; }
-        .chat-input-area { padding: 15px; border-top: 1px solid #ddd; display: flex; gap: 10px; }
-        .chat-input { flex: 1; padding: 10px; border: 1px solid #ddd; border-radius: 20px; outline: none; }
-        .chat-input:focus { border-color: #007bff; }
-        .chat-send-btn { padding: 10px 20px; background: #007bff; color: white; border: none; border-radius: 20px; cursor: pointer; }
-        .chat-send-btn:hover { background: #0056b3; }
-    </style>
-</head>
-<body>
-    <h1>📋 Admin Panel - Law Bot</h1>
-    
-    <div class="nav-links">
-        <span>📁 Навигация:</span>
-        <a href="#" onclick="switchTab('home'); return false;">🏠 Главная</a>
-        <a href="#" onclick="switchTab('dialogs'); return false;">💬 Диалоги с пользователями</a>
-        <a href="#" onclick="reloadPage(); return false;">🔄 Перезагрузить</a>
-    </div>
-    
-    <p>Дата и время загрузки: <span id="load-time"></span></p>
-    
-    <div class="section">
-        <h2>Пользователи и рефералы</h2>
-        <table id="users-referrals-table">
-            <thead>
-                <tr>
-                    <th>Имя</th>
-                    <th>Логин</th>
-                    <th>Кто его пригласил (Реферал)</th>
-                    <th>Количество рефералов</th>
-                </tr>
-            </thead>
-            <tbody id="users-referrals-body">
-                <tr><td colspan="4">Загрузка...</td></tr>
-            </tbody>
-        </table>
-    </div>
-    
-    <div class="section">
-        <h2>Анкеты дел (API: /api/requests)</h2>
-        <table id="requests-table">
-            <thead>
-                <tr>
-                    <th>ID</th>
-                    <th>Клиент</th>
-                    <th>Предмет спора</th>
-                    <th>Статус</th>
-                    <th>Дата отправки</th>
-                    <th>Действие</th>
-                </tr>
-            </thead>
-            <tbody id="requests-body">
-                <tr><td colspan="6">Загрузка...</td></tr>
-            </tbody>
-        </table>
-    </div>
-    
-    <div class="section">
-        <h2>Партнёры (API: /api/partners)</h2>
-        <table id="partners-table">
-            <thead>
-                <tr>
-                    <th>ID</th>
-                    <th>ФИО</th>
-                    <th>Компания</th>
-                    <th>Email</th>
-                    <th>Действие</th>
-                </tr>
-            </thead>
-            <tbody id="partners-body">
-                <tr><td colspan="5">Загрузка...</td></tr>
-            </tbody>
-        </table>
-    </div>
-    
-    <div class="section">
-        <h2>Отправить сообщение пользователю</h2>
-        <form id="direct-message-form">
-            <select id="user-select" style="padding: 8px; margin-right: 10px;">
-                <option value="">Загрузка...</option>
-            </select>
-            <input type="text" id="message-text" placeholder="Текст сообщения" style="padding: 8px; width: 300px; margin-right: 10px;">
-            <button type="submit" class="btn">Отправить</button>
-        </form>
-        <p id="send-result"></p>
-    </div>
-    
-    <div class="section">
-        <h2>💬 Диалоги с пользователями</h2>
-        <div class="chat-container">
-            <div class="chat-users-list" id="chat-users-list">
-                <div style="padding: 15px; color: #666;">Загрузка...</div>
-            </div>
-            <div class="chat-messages">
-                <div class="chat-messages-header" id="chat-header">Выберите пользователя</div>
-                <div class="chat-messages-list" id="chat-messages-list">
-                    <div style="padding: 20px; text-align: center; color: #666;">Выберите пользователя из списка, чтобы начать диалог</div>
-                </div>
-                <div class="chat-input-area">
-                    <input type="text" id="chat-input" class="chat-input" placeholder="Введите сообщение..." disabled>
-                    <button id="chat-send-btn" class="chat-send-btn" disabled>Отправить</button>
-                </div>
-            </div>
-        </div>
-    </div>
-    
-    <div class="section">
-        <h2>Отладочная информация</h2>
-        <pre id="debug-info" style="background: #f5f5f5; padding: 10px; overflow-x: auto;"></pre>
-    </div>
-
-    <script>
         // Устанавливаем время загрузки
         document.getElementById('load-time').textContent = new Date().toLocaleString();
-        
-        // Глобальная переменная для хранения всех анкет
-        let allRequests = [];
-        
+
+        // Курсор следующей страницы анкет (null - страниц больше нет)
+        let requestsCursor = null;
+
+        // Загрузка очередной страницы анкет (краткое представление)
+        async function loadRequestsPage() {
+            const url = requestsCursor ? `/api/requests?cursor=${requestsCursor}` : '/api/requests';
+            const response = await fetch(url);
+            const page = await response.json();
+
+            let requestsHtml = '';
+            for (const req of page.items) {
+                const client = req.user ? req.user.first_name : 'N/A';
+                const subject = req.subject_preview || '-';
+                const date = req.sent_at ? new Date(req.sent_at).toLocaleString() : '-';
+                requestsHtml += `<tr><td>${req.id}</td><td>${client}</td><td>${subject}</td><td>${req.status}</td><td>${date}</td><td><button class="btn-details" onclick="showCaseDetails(${req.id})">Подробнее</button></td></tr>`;
+            }
+
+            const body = document.getElementById('requests-body');
+            if (!requestsCursor) {
+                body.innerHTML = requestsHtml || '<tr><td colspan="6">Нет анкет</td></tr>';
+            } else {
+                body.insertAdjacentHTML('beforeend', requestsHtml);
+            }
+
+            requestsCursor = page.next_cursor;
+            document.getElementById('requests-more').style.display = requestsCursor ? 'inline-block' : 'none';
+            return page.items.length;
+        }
+
         // Загрузка списка пользователей для select
         async function loadUsersList() {
             const select = document.getElementById('user-select');
             try {
                 const response = await fetch('/api/users');
                 const users = await response.json();
-                
+
                 select.innerHTML = '<option value="">Выберите пользователя...</option>';
-                
+
                 users.forEach(user => {
                     const option = document.createElement('option');
                     option.value = user.telegram_id;
@@ -183,22 +52,22 @@
                 console.error('Ошибка загрузки пользователей:', e);
             }
         }
-        
+
         // Обработчик формы отправки сообщения
         document.getElementById('direct-message-form').addEventListener('submit', async function(e) {
             e.preventDefault();
             const telegramId = document.getElementById('user-select').value;
             const message = document.getElementById('message-text').value;
             const resultEl = document.getElementById('send-result');
-            
+
             if (!telegramId) {
                 resultEl.textContent = '❌ Выберите пользователя';
                 resultEl.style.color = 'red';
                 return;
             }
-            
+
             resultEl.textContent = 'Отправка...';
-            
+
             try {
                 const response = await fetch('/api/messages/direct', {
                     method: 'POST',
@@ -210,7 +79,7 @@
                         content: message
                     })
                 });
-                
+
                 if (response.ok) {
                     resultEl.textContent = '✅ Сообщение отправлено!';
                     resultEl.style.color = 'green';
@@ -224,13 +93,13 @@
                 resultEl.style.color = 'red';
             }
         });
-        
+
         // Загружаем список пользователей при загрузке страницы
         loadUsersList();
-        
+
         // Глобальная переменная для хранения всех партнёров
         let allPartners = [];
-        
+
         // Функция для показа деталей партнёра
         function showPartnerDetails(partnerId) {
             const partner = allPartners.find(p => p.id === partnerId);
@@ -238,10 +107,10 @@
                 alert('Партнёр не найден');
                 return;
             }
-            
+
             const modal = document.getElementById('partner-details-modal');
             const content = document.getElementById('partner-details-content');
-            
+
             content.innerHTML = `
                 <div class="detail-row"><div class="detail-label">ID:</div><div class="detail-value">${partner.id}</div></div>
                 <div class="detail-row"><div class="detail-label">ФИО:</div><div class="detail-value">${partner.full_name || '-'}</div></div>
@@ -254,27 +123,28 @@
                 <div class="detail-row"><div class="detail-label">Дата создания:</div><div class="detail-value">${partner.created_at ? new Date(partner.created_at).toLocaleString() : '-'}</div></div>
                 <div class="detail-row"><div class="detail-label">Дата обновления:</div><div class="detail-value">${partner.updated_at ? new Date(partner.updated_at).toLocaleString() : '-'}</div></div>
             `;
-            
+
             modal.style.display = 'block';
         }
-        
+
         function closePartnerModal() {
             document.getElementById('partner-details-modal').style.display = 'none';
         }
-        
+
         // Функция для показа деталей дела
-        function showCaseDetails(requestId) {
-            const req = allRequests.find(r => r.id === requestId);
-            if (!req) {
+        async function showCaseDetails(requestId) {
+            const response = await fetch(`/api/requests/${requestId}`);
+            if (!response.ok) {
                 alert('Заявка не найдена');
                 return;
             }
-            
+            const req = await response.json();
+
             const modal = document.getElementById('case-details-modal');
             const content = document.getElementById('case-details-content');
-            
+
             const userInfo = req.user ? `${req.user.first_name || ''} ${req.user.last_name || ''} (@${req.user.username || 'нет'})` : 'N/A';
-            
+
             content.innerHTML = `
                 <div class="detail-row"><div class="detail-label">ID заявки:</div><div class="detail-value">${req.id}</div></div>
                 <div class="detail-row"><div class="detail-label">Клиент:</div><div class="detail-value">${userInfo}</div></div>
@@ -288,46 +158,31 @@
                 <div class="detail-row"><div class="detail-label">Доказательства:</div><div class="detail-value">${req.evidence || '-'}</div></div>
                 <div class="detail-row"><div class="detail-label">Процессуальная история:</div><div class="detail-value">${req.procedural_history || '-'}</div></div>
                 <div class="detail-row"><div class="detail-label">Цель клиента:</div><div class="detail-value">${req.client_goal || '-'}</div></div>
+                <div class="detail-row"><div class="detail-label">Документы:</div><div class="detail-value">${req.documents.length ? req.documents.map(d => d.original_name || d.file_path).join('<br>') : '-'}</div></div>
             `;
-            
+
             modal.style.display = 'block';
         }
-        
+
         function closeModal() {
             document.getElementById('case-details-modal').style.display = 'none';
         }
-        
+
         window.onclick = function(event) {
             const modal = document.getElementById('case-details-modal');
             if (event.target === modal) modal.style.display = 'none';
         }
-        
+
         // Загружаем данные через fetch
         async function loadData() {
             const debug = [];
-            
+
             try {
                 // Загружаем анкеты
                 debug.push('Загрузка анкет...');
-                const requestsRes = await fetch('/api/requests');
-                debug.push('Статус ответа анкет: ' + requestsRes.status);
-                allRequests = await requestsRes.json();
-                debug.push('Получено анкет: ' + allRequests.length);
-                
-                let requestsHtml = '';
-                if (allRequests.length === 0) {
-                    requestsHtml = '<tr><td colspan="6">Нет анкет</td></tr>';
-                } else {
-                    for (const req of allRequests) {
-                        const client = req.user ? req.user.first_name : 'N/A';
-                        const subject = (req.dispute_subject || '-').substring(0, 30);
-                        const status = req.status;
-                        const date = req.sent_at ? new Date(req.sent_at).toLocaleString() : '-';
-                        requestsHtml += `<tr><td>${req.id}</td><td>${client}</td><td>${subject}...</td><td>${status}</td><td>${date}</td><td><button class="btn-details" onclick="showCaseDetails(${req.id})">Подробнее</button></td></tr>`;
-                    }
-                }
-                document.getElementById('requests-body').innerHTML = requestsHtml;
-                
+                const requestsCount = await loadRequestsPage();
+                debug.push('Получено анкет: ' + requestsCount);
+
                 // Загружаем партнёров
                 debug.push('');
                 debug.push('Загрузка партнёров...');
@@ -335,7 +190,7 @@
                 debug.push('Статус ответа партнёров: ' + partnersRes.status);
                 allPartners = await partnersRes.json();
                 debug.push('Получено партнёров: ' + allPartners.length);
-                
+
                 let partnersHtml = '';
                 if (allPartners.length === 0) {
                     partnersHtml = '<tr><td colspan="5">Нет партнёров</td></tr>';
@@ -345,7 +200,7 @@
                     }
                 }
                 document.getElementById('partners-body').innerHTML = partnersHtml;
-                
+
                 // Загружаем пользователей и рефералов
                 debug.push('');
                 debug.push('Загрузка пользователей и рефералов...');
@@ -354,7 +209,7 @@
                 const usersResponse = await usersRes.json();
                 const usersData = usersResponse.users || usersResponse;
                 debug.push('Получено пользователей: ' + usersData.length);
-                
+
                 let usersHtml = '';
                 if (usersData.length === 0) {
                     usersHtml = '<tr><td colspan="4">Нет пользователей</td></tr>';
@@ -366,36 +221,36 @@
                     }
                 }
                 document.getElementById('users-referrals-body').innerHTML = usersHtml;
-                
+
             } catch (e) {
                 debug.push('Ошибка: ' + e.message);
             }
-            
+
             // Показываем отладочную информацию
             document.getElementById('debug-info').textContent = debug.join('\n');
         }
-        
+
         // Запускаем загрузку
         loadData();
-        
+
     // Tab switching functionality
     function switchTab(tabName) {
         // Hide all content sections
         const sections = document.querySelectorAll('.section');
         sections.forEach(section => section.style.display = 'none');
-        
+
         // Hide chat container if it's not the dialogs tab
         const chatContainer = document.querySelector('.chat-container');
         if (chatContainer) {
             chatContainer.style.display = tabName === 'dialogs' ? 'flex' : 'none';
         }
-        
+
         // Show selected section
         if (tabName === 'home') {
             // Show all sections for home tab
             sections.forEach(section => section.style.display = 'block');
         }
-        
+
         // Update active tab
         const tabs = document.querySelectorAll('.nav-links a');
         tabs.forEach(tab => tab.classList.remove('active'));
@@ -403,22 +258,22 @@
     }
 
 loadChatDialogs();
-        
+
         // Chat functionality
         let currentChatUserId = null;
         let chatDialogs = [];
-        
+
         async function loadChatDialogs() {
             const usersList = document.getElementById('chat-users-list');
             try {
                 const response = await fetch('/api/dialogs');
                 chatDialogs = await response.json();
-                
+
                 if (chatDialogs.length === 0) {
                     usersList.innerHTML = '<div style="padding: 15px; color: #666;">Нет пользователей</div>';
                     return;
                 }
-                
+
                 let html = '';
                 chatDialogs.forEach(dialog => {
                     const displayName = dialog.display_name || 'Пользователь ' + dialog.telegram_id;
@@ -434,33 +289,33 @@ loadChatDialogs();
                 console.error('Ошибка загрузки диалогов:', e);
             }
         }
-        
+
         function selectChatUser(userId, userName) {
             currentChatUserId = userId;
-            
+
             // Update active state
             document.querySelectorAll('.chat-user-item').forEach(item => item.classList.remove('active'));
             event.currentTarget.classList.add('active');
-            
+
             // Update header
             document.getElementById('chat-header').textContent = 'Диалог с ' + userName;
-            
+
             // Enable input
             document.getElementById('chat-input').disabled = false;
             document.getElementById('chat-send-btn').disabled = false;
-            
+
             // Load messages
             loadChatMessages(userId);
         }
-        
+
         async function loadChatMessages(userId) {
             const messagesList = document.getElementById('chat-messages-list');
             messagesList.innerHTML = '<div style="padding: 20px; text-align: center; color: #666;">Загрузка сообщений...</div>';
-            
+
             try {
                 const response = await fetch(`/api/dialogs/${userId}/messages`);
                 const data = await response.json();
-                
+
                 // Гарантируем, что messages - это массив
                 let messages = [];
                 if (data && typeof data === 'object' && Array.isArray(data.messages)) {
@@ -468,12 +323,12 @@ loadChatDialogs();
                 } else if (Array.isArray(data)) {
                     messages = data;
                 }
-                
+
                 if (messages.length === 0) {
                     messagesList.innerHTML = '<div style="padding: 20px; text-align: center; color: #666;">Нет сообщений. Начните диалог!</div>';
                     return;
                 }
-                
+
                 let html = '';
                 messages.forEach(msg => {
                     const time = msg.created_at ? new Date(msg.created_at).toLocaleString() : 'Нет даты';
@@ -491,17 +346,17 @@ loadChatDialogs();
                 console.error('Ошибка загрузки сообщений:', e);
             }
         }
-        
+
         async function sendChatMessage() {
             if (!currentChatUserId) return;
-            
+
             const input = document.getElementById('chat-input');
             const message = input.value.trim();
-            
+
             if (!message) return;
-            
+
             input.value = '';
-            
+
             try {
                 const response = await fetch(`/api/dialogs/${currentChatUserId}/send`, {
                     method: 'POST',
@@ -511,7 +366,7 @@ loadChatDialogs();
                         content: message
                     })
                 });
-                
+
                 if (response.ok) {
                     loadChatMessages(currentChatUserId);
                     loadChatDialogs(); // Refresh the list
@@ -522,17 +377,17 @@ loadChatDialogs();
                 alert('Ошибка: ' + e.message);
             }
         }
-        
+
         // Chat send button
         document.getElementById('chat-send-btn').addEventListener('click', sendChatMessage);
-        
+
         // Chat enter key
         document.getElementById('chat-input').addEventListener('keypress', function(e) {
             if (e.key === 'Enter') {
                 sendChatMessage();
             }
         });
-        
+
         // Switch tab functionality
         // Перезагрузка страницы
         function reloadPage() {
@@ -543,7 +398,7 @@ loadChatDialogs();
             // Hide all sections
             const sections = document.querySelectorAll('.section');
             sections.forEach(section => section.style.display = 'none');
-            
+
             // Show selected section
             if (tabName === 'home') {
                 // Show all sections except chat
@@ -571,28 +426,3 @@ loadChatDialogs();
             div.textContent = text;
             return div.innerHTML;
         }
-    </script>
-    
-    <!-- Modal for case details -->
-    <div id="case-details-modal" class="modal">
-        <div class="modal-content">
-            <div class="modal-header">
-                <h2>Детали заявки</h2>
-                <span class="modal-close" onclick="closeModal()">&times;</span>
-            </div>
-            <div id="case-details-content"></div>
-        </div>
-    </div>
-    
-    <!-- Modal for partner details -->
-    <div id="partner-details-modal" class="modal">
-        <div class="modal-content">
-            <div class="modal-header">
-                <h2>Детали партнёра</h2>
-                <span class="modal-close" onclick="closePartnerModal()">&times;</span>
-            </div>
-            <div id="partner-details-content"></div>
-        </div>
-    </div>
-</body>
-</html>
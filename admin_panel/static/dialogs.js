@@ -0,0 +1,201 @@
+let currentTelegramId = null;
+// telegram_id -> диалог из /api/dialogs, обновляется событиями SSE
+const dialogs = new Map();
+// id сообщений, уже показанных в открытом диалоге
+let renderedMessageIds = new Set();
+// id самого раннего загруженного сообщения (курсор для более ранних страниц)
+let oldestMessageId = null;
+
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text || '';
+    return div.innerHTML;
+}
+
+function renderDialogs() {
+    const listEl = document.getElementById('dialogs-list');
+    const items = Array.from(dialogs.values())
+        .sort((a, b) => (b.last_time || '').localeCompare(a.last_time || ''));
+
+    if (items.length === 0) {
+        listEl.innerHTML = '<div style="padding: 20px; text-align: center;">Нет диалогов</div>';
+        return;
+    }
+
+    listEl.innerHTML = items.map(d => `
+        <div class="dialog-item ${d.telegram_id === currentTelegramId ? 'active' : ''}" onclick="openDialog(${d.telegram_id})">
+            <div class="dialog-name">
+                ${escapeHtml(d.display_name)}
+                ${d.unread_count > 0 ? '<span class="unread-badge">' + d.unread_count + '</span>' : ''}
+            </div>
+            <div class="dialog-preview">${escapeHtml(d.last_message)}</div>
+            <div class="dialog-time">${d.last_time || ''}</div>
+        </div>
+    `).join('');
+}
+
+async function loadDialogs() {
+    try {
+        const response = await fetch('/api/dialogs');
+        const data = await response.json();
+        dialogs.clear();
+        data.forEach(d => dialogs.set(d.telegram_id, d));
+        renderDialogs();
+    } catch (e) {
+        document.getElementById('dialogs-list').innerHTML = '<div style="padding: 20px; color: red;">Ошибка загрузки</div>';
+    }
+}
+
+function messageHtml(m) {
+    return `
+        <div class="message ${m.sender_type}">
+            <div>${escapeHtml(m.content)}</div>
+            <div class="message-time">${m.created_at || ''}</div>
+        </div>
+    `;
+}
+
+function appendMessage(m) {
+    if (renderedMessageIds.has(m.id)) return;
+    renderedMessageIds.add(m.id);
+
+    const messagesEl = document.getElementById('messages-list');
+    const atBottom = messagesEl.scrollHeight - messagesEl.scrollTop - messagesEl.clientHeight < 50;
+    messagesEl.insertAdjacentHTML('beforeend', messageHtml(m));
+    if (atBottom) messagesEl.scrollTop = messagesEl.scrollHeight;
+}
+
+function renderOlderButton(hasMore) {
+    const old = document.getElementById('load-older');
+    if (old) old.remove();
+    if (hasMore) {
+        document.getElementById('messages-list').insertAdjacentHTML('afterbegin',
+            '<div id="load-older" style="text-align: center; margin-bottom: 15px;"><button onclick="loadOlderMessages()">Загрузить ранние сообщения</button></div>');
+    }
+}
+
+async function loadOlderMessages() {
+    const telegramId = currentTelegramId;
+    if (!telegramId || !oldestMessageId) return;
+
+    try {
+        const response = await fetch(`/api/dialogs/${telegramId}/messages?before_id=${oldestMessageId}`);
+        const data = await response.json();
+        if (telegramId !== currentTelegramId) return;
+
+        const messagesEl = document.getElementById('messages-list');
+        const heightBefore = messagesEl.scrollHeight;
+        const fresh = data.messages.filter(m => !renderedMessageIds.has(m.id));
+        fresh.forEach(m => renderedMessageIds.add(m.id));
+        if (data.messages.length) oldestMessageId = data.messages[0].id;
+
+        const button = document.getElementById('load-older');
+        if (button) button.remove();
+        messagesEl.insertAdjacentHTML('afterbegin', fresh.map(messageHtml).join(''));
+        renderOlderButton(data.has_more);
+        // Сохраняем положение прокрутки относительно уже показанных сообщений
+        messagesEl.scrollTop += messagesEl.scrollHeight - heightBefore;
+    } catch (e) {
+        console.error('Ошибка загрузки сообщений:', e);
+    }
+}
+
+async function openDialog(telegramId) {
+    currentTelegramId = telegramId;
+    const dialog = dialogs.get(telegramId);
+
+    document.getElementById('no-dialog-message').style.display = 'none';
+    document.getElementById('messages-header').style.display = 'block';
+    document.getElementById('messages-list').style.display = 'block';
+    document.getElementById('message-input-area').style.display = 'block';
+
+    document.getElementById('chat-user-name').textContent = dialog ? dialog.display_name : telegramId;
+    renderDialogs();
+
+    try {
+        const response = await fetch(`/api/dialogs/${telegramId}/messages`);
+        const data = await response.json();
+
+        if (telegramId !== currentTelegramId) return;
+        document.getElementById('messages-list').innerHTML = '';
+        renderedMessageIds = new Set();
+        oldestMessageId = data.messages.length ? data.messages[0].id : null;
+        data.messages.forEach(appendMessage);
+        renderOlderButton(data.has_more);
+
+        const messagesEl = document.getElementById('messages-list');
+        messagesEl.scrollTop = messagesEl.scrollHeight;
+    } catch (e) {
+        console.error('Ошибка загрузки сообщений:', e);
+    }
+}
+
+async function sendMessage() {
+    if (!currentTelegramId) return;
+
+    const textEl = document.getElementById('message-text');
+    const content = textEl.value.trim();
+
+    if (!content) return;
+
+    try {
+        const response = await fetch(`/api/dialogs/${currentTelegramId}/send`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ telegram_id: currentTelegramId, content: content })
+        });
+
+        const result = await response.json();
+
+        // Само сообщение придет событием message
+        if (result.message) {
+            textEl.value = '';
+        }
+    } catch (e) {
+        alert('Ошибка отправки: ' + e.message);
+    }
+}
+
+function connectEvents() {
+    const source = new EventSource('/api/dialogs/events');
+
+    source.addEventListener('message', e => {
+        const m = JSON.parse(e.data);
+        const dialog = dialogs.get(m.telegram_id);
+        if (!dialog) {
+            // Новый собеседник: список перезагружается целиком
+            loadDialogs();
+        } else {
+            dialog.last_message = m.content.length > 50 ? m.content.substring(0, 50) + '...' : m.content;
+            dialog.last_time = m.created_at;
+            renderDialogs();
+        }
+        if (m.telegram_id === currentTelegramId) {
+            appendMessage(m);
+        }
+    });
+
+    source.addEventListener('unread', e => {
+        const u = JSON.parse(e.data);
+        const dialog = dialogs.get(u.telegram_id);
+        if (dialog) {
+            dialog.unread_count = Math.max(0, (dialog.unread_count || 0) + u.delta);
+            renderDialogs();
+        }
+    });
+
+    source.addEventListener('resync', () => {
+        loadDialogs();
+        if (currentTelegramId) openDialog(currentTelegramId);
+    });
+}
+
+document.getElementById('message-text').addEventListener('keypress', function(e) {
+    if (e.key === 'Enter' && !e.shiftKey) {
+        e.preventDefault();
+        sendMessage();
+    }
+});
+
+loadDialogs();
+connectEvents();
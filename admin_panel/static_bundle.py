@@ -0,0 +1,134 @@
+"""
+Статические файлы админ-панели: страницы, стили и скрипты из admin_panel/static
+
+Файлы читаются и сжимаются (gzip и brotli, максимальный уровень) один раз
+при импорте, запросы отдают готовые байты. Отдаются только файлы из
+STATIC_FILES - исходный код рядом с ними по HTTP недоступен.
+
+Кэширование:
+- в страницах ссылки на /static/admin/<файл> дополняются хэшем содержимого
+  (?v=...); такие ответы браузер хранит год и повторно не запрашивает;
+- страницы и файлы без хэша в ссылке браузер проверяет при каждом открытии
+  через If-None-Match и при неизменном содержимом получает 304 без тела.
+"""
+import gzip
+import hashlib
+import logging
+import os
+import re
+from typing import Dict, NamedTuple, Optional
+
+import brotli
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+
+from admin_panel.response_cache import choose_encoding, etag_matches
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# Путь, по которому админ-панель отдает файлы (ссылки в страницах)
+STATIC_URL = "/static/admin"
+
+# Разрешенные файлы и их типы
+STATIC_FILES = {
+    "index.html": "text/html; charset=utf-8",
+    "admin.css": "text/css; charset=utf-8",
+    "admin.js": "application/javascript; charset=utf-8",
+    "dialogs.html": "text/html; charset=utf-8",
+    "dialogs.css": "text/css; charset=utf-8",
+    "dialogs.js": "application/javascript; charset=utf-8",
+    "message_api.js": "application/javascript; charset=utf-8",
+    "test.html": "text/html; charset=utf-8",
+    "simple_js_test.html": "text/html; charset=utf-8",
+}
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+ASSET_LINK = re.compile(re.escape(STATIC_URL) + r"/([\w.-]+)")
+
+
+class StaticAsset(NamedTuple):
+    media_type: str
+    body: bytes
+    gzip_body: bytes
+    brotli_body: bytes
+    etag: str
+    version: str
+
+
+def build_asset(media_type: str, body: bytes) -> StaticAsset:
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return StaticAsset(
+        media_type=media_type,
+        body=body,
+        gzip_body=gzip.compress(body, compresslevel=9),
+        brotli_body=brotli.compress(body, quality=11),
+        etag=f'"{digest}"',
+        version=digest[:12],
+    )
+
+
+class StaticBundle:
+    """Файлы STATIC_FILES в памяти, готовые к отдаче"""
+
+    def __init__(self, directory: str = STATIC_DIR, files: Optional[Dict[str, str]] = None):
+        self.assets: Dict[str, StaticAsset] = {}
+        files = STATIC_FILES if files is None else files
+        sources = {}
+        for name, media_type in files.items():
+            try:
+                with open(os.path.join(directory, name), "rb") as f:
+                    sources[name] = f.read()
+            except FileNotFoundError:
+                logger.warning(f"Статический файл {name} не найден")
+
+        # Сначала стили и скрипты: их хэши подставляются в ссылки страниц
+        for name, body in sources.items():
+            if not files[name].startswith("text/html"):
+                self.assets[name] = build_asset(files[name], body)
+        for name, body in sources.items():
+            if files[name].startswith("text/html"):
+                self.assets[name] = build_asset(files[name], self._versioned_links(body))
+
+    def _versioned_links(self, html: bytes) -> bytes:
+        def replace(match: re.Match) -> str:
+            asset = self.assets.get(match.group(1))
+            return f"{match.group(0)}?v={asset.version}" if asset else match.group(0)
+
+        return ASSET_LINK.sub(replace, html.decode("utf-8")).encode("utf-8")
+
+    def response(self, request: Request, name: str) -> Response:
+        """
+        Ответ с файлом: 304 по If-None-Match, brotli или gzip по Accept-Encoding (с учетом q)
+
+        Ответ по ссылке с актуальным ?v= кэшируется браузером надолго.
+        """
+        asset = self.assets.get(name)
+        if asset is None:
+            raise HTTPException(status_code=404, detail="Файл не найден")
+
+        immutable = request.query_params.get("v") == asset.version
+        headers = {
+            "ETag": asset.etag,
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(request, asset.etag):
+            return Response(status_code=304, headers=headers)
+
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""), ("br", "gzip"))
+        if encoding == "br":
+            body = asset.brotli_body
+        elif encoding == "gzip":
+            body = asset.gzip_body
+        else:
+            body = asset.body
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(body, media_type=asset.media_type, headers=headers)
+
+
+static_bundle = StaticBundle()
@@ -0,0 +1,95 @@
+"""
+Отправка сообщений клиентам через Telegram Bot API из веб-сервиса
+
+Один httpx.AsyncClient на процесс: соединения с Bot API переиспользуются
+(keep-alive), а не открываются заново на каждое сообщение. Клиент создается
+при первой отправке и закрывается при остановке приложения.
+"""
+import logging
+from typing import Any, Dict, Optional, Union
+
+import httpx
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TelegramSendError(Exception):
+    """Bot API вернул ошибку"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        # Пауза из ответа 429 «слишком много запросов»
+        self.retry_after = retry_after
+
+
+class TelegramSender:
+    """Общий клиент Bot API для всех роутеров приложения"""
+
+    def __init__(self, token: Optional[str] = None, base_url: Optional[str] = None, timeout: float = 30.0):
+        self.token = token or settings.BOT_TOKEN
+        self.base_url = (base_url or settings.TELEGRAM_API_URL).rstrip("/")
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.base_url}/bot{self.token}"
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=settings.TELEGRAM_MAX_CONNECTIONS)
+            )
+        return self._client
+
+    async def send_message(
+        self,
+        chat_id: Union[int, str],
+        text: str,
+        parse_mode: Optional[str] = "HTML",
+        disable_web_page_preview: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Отправляет сообщение
+
+        Returns:
+            Dict[str, Any]: Ответ Bot API
+
+        Raises:
+            TelegramSendError: Bot API вернул ошибку
+        """
+        if not self.token:
+            raise TelegramSendError("BOT_TOKEN не настроен в конфигурации")
+
+        payload = {
+            "chat_id": chat_id,
+            "text": text,
+            "disable_web_page_preview": disable_web_page_preview
+        }
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+
+        response = await self.client.post(f"{self.api_url}/sendMessage", json=payload)
+        try:
+            data = response.json()
+        except ValueError:
+            data = {}
+        if response.status_code != 200 or not data.get("ok"):
+            raise TelegramSendError(
+                f"Telegram API error: {data.get('description', response.status_code)}",
+                retry_after=(data.get("parameters") or {}).get("retry_after")
+            )
+        return data
+
+    async def close(self) -> None:
+        """Закрывает HTTP-клиент"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+telegram_sender = TelegramSender()
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк эндпоинтов админ-панели на синтетических данных
+
+Заполняет временную базу SQLite (или пустую базу из --database-url)
+генератором benchmarks/seed_data.py и вызывает эндпоинты приложения
+admin_panel.app в том же процессе через httpx.ASGITransport. Для каждого
+эндпоинта записываются:
+- время ответа (p50/p95/min/max по --repeat запросам после прогрева);
+- число SQL-запросов к базе на один HTTP-запрос;
+- пик памяти Python на запрос (tracemalloc, отдельный прогон);
+- размер ответа и байт на проводе (клиент принимает gzip, как браузер);
+- время условного запроса с If-None-Match (304), если эндпоинт отдает ETag.
+
+Кэш ответов (admin_panel/response_cache.py) по умолчанию выключен, чтобы
+замерять построение ответа; --cache включает его, и повторные запросы
+показывают время ответа из кэша.
+
+В конце выводится пиковый RSS процесса. С --json результаты сохраняются в
+файл вместе с параметрами генерации и коммитом, чтобы сравнивать прогоны.
+
+Использование:
+    python benchmarks/bench_admin_api.py [--users 10000] [--repeat 10] [--json results.json]
+    python benchmarks/bench_admin_api.py --endpoints /api/stats,/api/users
+    python benchmarks/bench_admin_api.py --cache --endpoints /api/users,/api/dialogs
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.seed_data import add_arguments, config_from_args
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = (
+    "/api/users",
+    "/api/dialogs",
+    "/api/payouts",
+    "/api/users/referrals-info",
+    "/api/referrals/structure",
+    "/api/stats",
+)
+
+
+class QueryCounter:
+    """Считает SQL-запросы всех движков приложения"""
+
+    def __init__(self):
+        self.count = 0
+
+    def attach(self) -> None:
+        from sqlalchemy import event
+        from database import database
+
+        engines = {id(engine.sync_engine): engine.sync_engine
+                   for engine in (database.engine, database.write_engine, database.read_engine) if engine is not None}
+        for sync_engine in engines.values():
+            event.listen(sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+
+def peak_rss_mib() -> float:
+    """Пиковый RSS процесса (Linux)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def percentile(values, share: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+async def measure(client, counter: QueryCounter, path: str, repeat: int) -> dict:
+    # Прогрев: пул соединений, кэши планов запросов
+    response = await client.get(path)
+    if response.status_code != 200:
+        return {"path": path, "status": response.status_code, "error": response.text[:200]}
+
+    timings, queries = [], []
+    for _ in range(repeat):
+        counter.count = 0
+        started = time.perf_counter()
+        response = await client.get(path)
+        timings.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count)
+
+    conditional = []
+    etag = response.headers.get("etag")
+    if etag:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await client.get(path, headers={"If-None-Match": etag})
+            conditional.append((time.perf_counter() - started) * 1000)
+
+    # Память отдельным прогоном: tracemalloc замедляет выполнение
+    tracemalloc.start()
+    response = await client.get(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "path": path,
+        "status": response.status_code,
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(percentile(timings, 0.95), 2),
+        "min_ms": round(min(timings), 2),
+        "max_ms": round(max(timings), 2),
+        "queries": max(queries),
+        "peak_kib": round(peak / 1024, 1),
+        "response_bytes": len(response.content),
+        "wire_bytes": response.num_bytes_downloaded,
+        "not_modified_p50_ms": round(statistics.median(conditional), 2) if conditional else None,
+    }
+
+
+async def run(args, config) -> dict:
+    import httpx
+    from benchmarks.seed_data import seed_database
+    from database.database import close_db
+
+    started = time.perf_counter()
+    counts = await seed_database(config)
+    seed_seconds = time.perf_counter() - started
+
+    from admin_panel.app import app
+
+    counter = QueryCounter()
+    counter.attach()
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        for path in args.endpoints:
+            results.append(await measure(client, counter, path, args.repeat))
+    await close_db()
+
+    return {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "database": args.database_url.split(":", 1)[0].split("+", 1)[0],
+        "seed": config._asdict(),
+        "rows": counts,
+        "seed_seconds": round(seed_seconds, 1),
+        "repeat": args.repeat,
+        "cache": args.cache,
+        "endpoints": results,
+        "peak_rss_mib": round(peak_rss_mib(), 1),
+    }
+
+
+def print_report(report: dict) -> None:
+    print("=" * 102)
+    rows = report["rows"]
+    print(f"{report['database']}: пользователей {rows['users']}, связей {rows['referral_relationships']}, "
+          f"выплат {rows['referral_payouts']}, сообщений {rows['case_messages']} "
+          f"(заполнено за {report['seed_seconds']} с), кэш ответов {'включен' if report['cache'] else 'выключен'}")
+    print("=" * 102)
+    print(f"{'Эндпоинт':<28}{'p50, мс':>9}{'p95, мс':>9}{'max, мс':>9}{'SQL':>7}{'память, КиБ':>13}"
+          f"{'ответ, КиБ':>12}{'сеть, КиБ':>11}{'304, мс':>8}")
+    for result in report["endpoints"]:
+        if result["status"] != 200:
+            print(f"{result['path']:<28}  HTTP {result['status']}: {result.get('error', '')}")
+            continue
+        print(f"{result['path']:<28}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}{result['max_ms']:>9.1f}"
+              f"{result['queries']:>7}{result['peak_kib']:>13.0f}{result['response_bytes'] / 1024:>12.0f}"
+              f"{result.get('wire_bytes', result['response_bytes']) / 1024:>11.0f}"
+              + (f"{result['not_modified_p50_ms']:>8.1f}" if result.get("not_modified_p50_ms") else f"{'-':>8}"))
+    print(f"Пиковый RSS процесса: {report['peak_rss_mib']} МБ")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=10, help="запросов на эндпоинт")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="пути через запятую")
+    parser.add_argument("--database-url", help="пустая база; по умолчанию временная SQLite")
+    parser.add_argument("--cache", action="store_true", help="включить кэш ответов списков")
+    parser.add_argument("--json", help="файл для результатов")
+    args = parser.parse_args()
+    args.endpoints = [path.strip() for path in args.endpoints.split(",") if path.strip()]
+    config = config_from_args(args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if not args.database_url:
+            args.database_url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        # URL базы должен быть задан до импорта database.database
+        os.environ["DATABASE_URL"] = args.database_url
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        if not args.cache:
+            os.environ["RESPONSE_CACHE_ENTRIES"] = "0"
+        report = asyncio.run(run(args, config))
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Результаты сохранены в {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк массовой отметки выплат и уведомлений партнёров
+
+Заполняет временную базу SQLite пользователями (benchmarks/seed_data.py) и
+--payouts выплатами в статусе pending у --partners партнёров, затем
+отмечает все выплаты оплаченными двумя способами:
+- orm: прежняя реализация - загрузка всех объектов ReferralPayout и
+  изменение по одному (воспроизведена в бенчмарке);
+- endpoint: PUT /api/payouts/batch/pay - один UPDATE ... RETURNING и один
+  запрос telegram_id; время ответа и число SQL-запросов.
+
+После ответа эндпоинта уведомления уходят в фоне на поддельный Bot API
+(benchmarks/loadtest/fake_bot_api.py, задержка --latency): выводится время
+до конца рассылки и сообщений в секунду. Рассылка ограничена --rate
+сообщений в секунду (в работе - PAYOUT_NOTIFY_RATE, по умолчанию 25).
+
+Использование:
+    python benchmarks/bench_batch_payouts.py [--payouts 10000] [--partners 2000] [--rate 200] [--latency 0.05]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.loadtest.fake_bot_api import FakeBotAPI
+
+BOT_TOKEN = "123456:bench"
+
+
+async def create_payouts(count: int, partners: int) -> list:
+    """Выплаты pending по месяцам: партнёр получает count / partners выплат"""
+    from sqlalchemy import insert
+    from database.database import engine
+    from database.models import ReferralPayout
+
+    rows = []
+    for n in range(count):
+        year, month = divmod(n // partners, 12)
+        rows.append({"referrer_id": n % partners + 1, "amount": 1000 + n % 50000,
+                     "month": month + 1, "year": 2020 + year, "status": "pending"})
+    async with engine.begin() as conn:
+        await conn.execute(ReferralPayout.__table__.delete())
+        result = await conn.execute(insert(ReferralPayout.__table__).returning(ReferralPayout.id), rows)
+        return [row[0] for row in result]
+
+
+async def reset_payouts() -> None:
+    from sqlalchemy import update
+    from database.database import engine
+    from database.models import ReferralPayout
+
+    async with engine.begin() as conn:
+        await conn.execute(update(ReferralPayout.__table__).values(status="pending", paid_at=None))
+
+
+async def legacy_batch_pay(payout_ids: list) -> int:
+    """Прежний batch_mark_payouts_as_paid без уведомлений"""
+    from datetime import datetime
+    from sqlalchemy.future import select
+    from database.database import get_db
+    from database.models import ReferralPayout
+
+    async with get_db() as db:
+        result = await db.execute(select(ReferralPayout).filter(ReferralPayout.id.in_(payout_ids)))
+        updated_count = 0
+        for payout in result.scalars().all():
+            if payout.status != "paid":
+                payout.status = "paid"
+                payout.paid_at = datetime.utcnow()
+                updated_count += 1
+        await db.commit()
+    return updated_count
+
+
+async def run(args, fake_api: FakeBotAPI) -> None:
+    from benchmarks.seed_data import SeedConfig, seed_database
+    from database.database import close_db
+
+    await seed_database(SeedConfig.scaled(max(args.partners, 1000), revenues=0, cases=0, messages=0))
+    from admin_panel.app import app
+    from admin_panel.payout_notifier import payout_notifier
+    from admin_panel.telegram_sender import telegram_sender
+
+    payout_notifier.limiter.rate = args.rate
+    try:
+        await measure(args, fake_api, app)
+    finally:
+        await payout_notifier.close()
+        await telegram_sender.close()
+        await close_db()
+
+
+async def measure(args, fake_api: FakeBotAPI, app) -> None:
+    import httpx
+    from benchmarks.bench_admin_api import QueryCounter
+
+    payout_ids = await create_payouts(args.payouts, args.partners)
+    counter = QueryCounter()
+    counter.attach()
+
+    counter.count = 0
+    started = time.perf_counter()
+    legacy_updated = await legacy_batch_pay(payout_ids)
+    legacy_seconds = time.perf_counter() - started
+    legacy_queries = counter.count
+    await reset_payouts()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        counter.count = 0
+        started = time.perf_counter()
+        response = await client.put("/api/payouts/batch/pay", json={"payout_ids": payout_ids})
+        endpoint_seconds = time.perf_counter() - started
+        endpoint_queries = counter.count
+        response.raise_for_status()
+        result = response.json()
+
+        while True:
+            job = (await client.get(f"/api/payouts/notifications/{result['notification_job_id']}")).json()
+            if job["pending"] == 0:
+                break
+            await asyncio.sleep(0.05)
+        notify_seconds = time.perf_counter() - started
+
+    print("=" * 72)
+    print(f"Выплат: {args.payouts}, партнёров: {args.partners}; Bot API: задержка {args.latency * 1000:.0f} мс, "
+          f"лимит {args.rate:g} сообщ./с")
+    print("=" * 72)
+    print(f"{'Способ':<10}{'обновлено':>12}{'время, мс':>12}{'SQL':>8}")
+    print(f"{'orm':<10}{legacy_updated:>12}{legacy_seconds * 1000:>12.1f}{legacy_queries:>8}")
+    print(f"{'endpoint':<10}{result['updated_count']:>12}{endpoint_seconds * 1000:>12.1f}{endpoint_queries:>8}")
+    print("=" * 72)
+    print(f"Уведомления: {job['total']}, отправлено {job['sent']}, ошибок {job['failed']}, "
+          f"sendMessage получено {fake_api.calls['sendMessage']}")
+    print(f"Рассылка закончена через {notify_seconds:.2f} с после запроса, "
+          f"{job['sent'] / notify_seconds:.0f} сообщ./с")
+
+
+async def main_async(args) -> None:
+    fake_api = FakeBotAPI(BOT_TOKEN, latency=args.latency)
+    api_url = await fake_api.start()
+    # Адрес Bot API и токен читаются настройками при импорте приложения
+    os.environ["TELEGRAM_API_URL"] = api_url
+    os.environ["BOT_TOKEN"] = BOT_TOKEN
+    try:
+        await run(args, fake_api)
+    finally:
+        await fake_api.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payouts", type=int, default=10000)
+    parser.add_argument("--partners", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=200, help="лимит уведомлений в секунду")
+    parser.add_argument("--latency", type=float, default=0.05, help="задержка ответа Bot API, с")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # URL базы должен быть задан до импорта database.database
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк полнотекстового поиска по анкетам дел
+
+Заполняет временную базу SQLite синтетическими анкетами (индекс FTS5
+обновляется триггерами при вставке) и сравнивает время поиска через
+search_cases с поиском перебором через LIKE по всем текстовым полям.
+
+Для PostgreSQL передайте --database-url postgresql+asyncpg://... (база будет заполнена!).
+
+Использование:
+    python benchmarks/bench_case_search.py [--cases 100000] [--queries 200]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = (
+    "договор поставки аренды подряда займа купли продажи услуг оказания взыскание долга неустойки "
+    "штрафа убытков пени задолженности расторжение исполнение обязательств претензия иск суд "
+    "арбитражный районный апелляция кассация решение определение постановление акт сверки счет "
+    "накладная платежное поручение переписка свидетель экспертиза оценка имущество квартира "
+    "земельный участок автомобиль наследство развод алименты раздел трудовой увольнение зарплата "
+    "работодатель работник налоговая проверка требование банк кредит залог поручительство "
+    "ответчик истец третье лицо общество директор учредитель доля устав банкротство кредитор"
+).split()
+
+
+def make_text(rnd: random.Random, words: int) -> str:
+    return " ".join(rnd.choices(WORDS, k=words)).capitalize()
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def run(cases: int, queries: int, chunk: int) -> None:
+    from sqlalchemy import insert, or_, select, func
+    from database.database import engine, get_db, init_db
+    from database.models import CaseQuestionnaire, User
+    from database.case_search import CASE_SEARCH_FIELDS, search_cases
+
+    rnd = random.Random(42)
+    await init_db()
+
+    start = time.perf_counter()
+    async with get_db() as db:
+        user = User(telegram_id=rnd.randint(10 ** 9, 10 ** 10), first_name="Bench")
+        db.add(user)
+        await db.flush()
+        for offset in range(0, cases, chunk):
+            rows = [{
+                "user_id": user.id,
+                "parties_info": make_text(rnd, 8),
+                "dispute_subject": make_text(rnd, 12),
+                "legal_basis": make_text(rnd, 10),
+                "chronology": make_text(rnd, 40),
+                "evidence": make_text(rnd, 15),
+                "procedural_history": make_text(rnd, 10),
+                "client_goal": make_text(rnd, 8),
+                "status": "отправлено",
+            } for _ in range(min(chunk, cases - offset))]
+            await db.execute(insert(CaseQuestionnaire), rows)
+    insert_seconds = time.perf_counter() - start
+
+    search_queries = [" ".join(rnd.sample(WORDS, rnd.randint(1, 3))) for _ in range(queries)]
+
+    fts_times = []
+    totals = []
+    async with get_db() as db:
+        for query in search_queries:
+            started = time.perf_counter()
+            total, _ = await search_cases(db, query, limit=20)
+            fts_times.append((time.perf_counter() - started) * 1000)
+            totals.append(total)
+
+    # Базовая линия: перебор через LIKE по каждому слову во всех полях
+    like_times = []
+    async with get_db() as db:
+        for query in search_queries[:max(1, queries // 10)]:
+            conditions = [
+                or_(*[getattr(CaseQuestionnaire, field).ilike(f"%{word}%") for field in CASE_SEARCH_FIELDS])
+                for word in query.split()
+            ]
+            started = time.perf_counter()
+            await db.execute(
+                select(CaseQuestionnaire.id).where(*conditions)
+                .order_by(CaseQuestionnaire.id.desc()).limit(20)
+            )
+            await db.execute(select(func.count()).select_from(CaseQuestionnaire).where(*conditions))
+            like_times.append((time.perf_counter() - started) * 1000)
+
+    await engine.dispose()
+
+    print("=" * 60)
+    print(f"Диалект: {engine.dialect.name}, анкет: {cases}, запросов: {queries}")
+    print("=" * 60)
+    print(f"Вставка с обновлением индекса: {insert_seconds:.1f} с ({cases / insert_seconds:.0f} анкет/с)")
+    print(f"Среднее число найденных анкет: {statistics.mean(totals):.0f}")
+    print(f"{'Способ':<20}{'p50, мс':>12}{'p95, мс':>12}{'max, мс':>12}")
+    for name, values in (("FTS (с подсчетом)", fts_times), ("LIKE (перебор)", like_times)):
+        print(f"{name:<20}{percentile(values, 0.5):>12.2f}{percentile(values, 0.95):>12.2f}{max(values):>12.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cases", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--chunk", type=int, default=5000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # URL базы должен быть задан до импорта database.database
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        asyncio.run(run(args.cases, args.queries, args.chunk))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Нагрузочная проверка SSE-потока страницы диалогов
+
+1. Шина событий: N подписчиков читают EventBroker.stream(), публикуется M событий;
+   замеряется задержка доставки (p50/p99) и проверяется, что каждый подписчик
+   получил все события по порядку.
+2. HTTP: админ-панель запускается через uvicorn на временной базе SQLite,
+   K клиентов подключаются к /api/dialogs/events, сообщения пишутся через
+   POST /api/messages/dialog; проверяется, что каждый клиент получил все
+   события message и unread.
+
+Использование:
+    python benchmarks/bench_dialog_events.py [--subscribers 2000] [--events 200] [--interval 0.01]
+                                             [--http-subscribers 200]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import socket
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def parse_frames(buffer: str):
+    """Разбирает полные SSE-кадры, возвращает ([(event, data)], остаток)"""
+    frames = []
+    while "\n\n" in buffer:
+        raw, buffer = buffer.split("\n\n", 1)
+        event, data = None, None
+        for line in raw.split("\n"):
+            if line.startswith("event: "):
+                event = line[7:]
+            elif line.startswith("data: "):
+                data = json.loads(line[6:])
+        if event:
+            frames.append((event, data))
+    return frames, buffer
+
+
+async def bench_broker(subscribers: int, events: int, interval: float) -> None:
+    from admin_panel.events import EventBroker
+
+    broker = EventBroker()
+    latencies = []
+    received = [0] * subscribers
+    in_order = [True] * subscribers
+
+    async def subscriber(index: int, ready: asyncio.Event):
+        expected = 0
+        stream = broker.stream()
+        await stream.__anext__()  # retry: подписка зарегистрирована
+        ready.set()
+        async for chunk in stream:
+            for event, data in parse_frames(chunk.decode("utf-8"))[0]:
+                if event != "message":
+                    continue
+                latencies.append(time.perf_counter() - data["sent"])
+                in_order[index] &= data["n"] == expected
+                expected += 1
+                received[index] += 1
+                if expected == events:
+                    return
+
+    readiness = [asyncio.Event() for _ in range(subscribers)]
+    tasks = [asyncio.create_task(subscriber(i, readiness[i])) for i in range(subscribers)]
+    await asyncio.gather(*(ready.wait() for ready in readiness))
+
+    started = time.perf_counter()
+    for n in range(events):
+        broker.publish("message", {"n": n, "sent": time.perf_counter()})
+        # Пауза между сообщениями, как при реальном потоке (0 - публикация пачкой)
+        await asyncio.sleep(interval)
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=120)
+    elapsed = time.perf_counter() - started
+
+    print("=" * 60)
+    print(f"Шина событий: подписчиков {subscribers}, событий {events}, интервал {interval * 1000:.0f} мс")
+    print("=" * 60)
+    print(f"Доставлено кадров: {sum(received)} из {subscribers * events}, по порядку: {all(in_order)}")
+    print(f"Время: {elapsed:.2f} с ({sum(received) / elapsed:,.0f} кадров/с)")
+    print(f"Задержка доставки: p50 {percentile(latencies, 0.5) * 1000:.2f} мс, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} мс")
+    print(f"Подписчиков после завершения: {broker.subscribers_count}")
+
+
+async def bench_http(subscribers: int, messages: int) -> None:
+    import httpx
+    import uvicorn
+    from database.database import init_db, close_db
+    from admin_panel.app import app
+    from admin_panel.events import dialog_events
+
+    await init_db()
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{port}"
+    expected_events = messages * 2  # message + unread на каждое сообщение клиента
+    counts = [0] * subscribers
+    limits = httpx.Limits(max_connections=subscribers + 10)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        async def subscriber(index: int):
+            buffer = ""
+            async with client.stream("GET", "/api/dialogs/events") as response:
+                async for chunk in response.aiter_text():
+                    frames, buffer = parse_frames(buffer + chunk)
+                    counts[index] += sum(1 for event, _ in frames if event in ("message", "unread"))
+                    if counts[index] >= expected_events:
+                        return
+
+        tasks = [asyncio.create_task(subscriber(i)) for i in range(subscribers)]
+        while dialog_events.subscribers_count < subscribers:
+            await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        for n in range(messages):
+            response = await client.post("/api/messages/dialog", json={
+                "telegram_id": 7_000_000 + n % 5, "content": f"Сообщение {n}"
+            })
+            response.raise_for_status()
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=120)
+        elapsed = time.perf_counter() - started
+
+    server.should_exit = True
+    await server_task
+    await close_db()
+
+    print("=" * 60)
+    print(f"HTTP: клиентов SSE {subscribers}, сообщений {messages}")
+    print("=" * 60)
+    print(f"Все клиенты получили все события: {all(count == expected_events for count in counts)}")
+    print(f"Время от первой записи до доставки последнего события: {elapsed:.2f} с")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=0.01, help="пауза между событиями, с")
+    parser.add_argument("--http-subscribers", type=int, default=200)
+    parser.add_argument("--http-messages", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # URL базы должен быть задан до импорта database.database
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        asyncio.run(bench_broker(args.subscribers, args.events, args.interval))
+        if args.http_subscribers:
+            asyncio.run(bench_http(args.http_subscribers, args.http_messages))
+
+
+if __name__ == "__main__":
+    main()
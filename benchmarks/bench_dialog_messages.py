@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк загрузки истории диалога
+
+Заполняет временную базу SQLite диалогами разной длины и замеряет время
+/api/dialogs/{telegram_id}/messages (последняя страница и страница из середины
+истории) и /api/cases/{case_id}/messages в сравнении с прежним способом:
+загрузка всей истории с selectinload(sender) и отметка прочитанных в цикле.
+
+Использование:
+    python benchmarks/bench_dialog_messages.py [--sizes 100,1000,10000,50000] [--repeat 20]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def seed(db_path: str, sizes) -> None:
+    """Пользователь i получает sizes[i] сообщений (половина - непрочитанные от клиента)"""
+    now = datetime.utcnow().isoformat(sep=" ")
+    conn = sqlite3.connect(db_path)
+    message_id = 0
+    for index, size in enumerate(sizes, start=1):
+        conn.execute(
+            "INSERT INTO users (id, telegram_id, first_name, registered_at, is_active) VALUES (?, ?, ?, ?, 1)",
+            (index, 5_000_000 + index, f"Клиент {index}", now)
+        )
+        conn.execute(
+            "INSERT INTO case_questionnaires (id, user_id, status, created_at, sent_at) VALUES (?, ?, 'отправлено', ?, ?)",
+            (index, index, now, now)
+        )
+        rows = []
+        for n in range(size):
+            message_id += 1
+            sender_type = "client" if n % 2 else "admin"
+            rows.append((message_id, index, index, sender_type, f"Сообщение {n} " * 5, 0, now))
+        conn.executemany(
+            "INSERT INTO case_messages (id, questionnaire_id, sender_id, sender_type, message_content, is_read, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+    conn.commit()
+    conn.close()
+
+
+async def legacy_dialog_messages(user_id: int) -> int:
+    """Прежняя реализация: вся история, связь sender на каждой строке, отметка в цикле"""
+    from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
+    from database.database import get_db
+    from database.models import CaseMessage
+
+    async with get_db() as db:
+        result = await db.execute(
+            select(CaseMessage)
+            .filter(CaseMessage.sender_id == user_id)
+            .options(selectinload(CaseMessage.sender))
+            .order_by(CaseMessage.created_at.asc())
+        )
+        messages = result.unique().scalars().all()
+        data = [{"id": msg.id, "content": msg.message_content, "name": msg.sender.first_name} for msg in messages]
+        for msg in messages:
+            if msg.sender_type == "client" and not msg.is_read:
+                msg.is_read = True
+        await db.commit()
+        return len(data)
+
+
+async def timed(coro_factory, repeat: int) -> float:
+    """Медиана времени выполнения в миллисекундах"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await coro_factory()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+async def run(sizes, repeat: int) -> None:
+    import httpx
+    from database.database import close_db
+    from admin_panel.app import app
+
+    print("=" * 72)
+    print(f"{'Сообщений':>10}{'последняя стр.':>16}{'середина':>12}{'дело':>10}{'прежний способ':>18}   (мс)")
+    print("=" * 72)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for index, size in enumerate(sizes, start=1):
+            telegram_id = 5_000_000 + index
+
+            async def latest():
+                response = await client.get(f"/api/dialogs/{telegram_id}/messages")
+                response.raise_for_status()
+
+            page = (await client.get(f"/api/dialogs/{telegram_id}/messages")).json()
+            middle_id = page["messages"][0]["id"] - size // 2 if page["messages"] else 1
+
+            async def middle():
+                response = await client.get(f"/api/dialogs/{telegram_id}/messages", params={"before_id": max(middle_id, 1)})
+                response.raise_for_status()
+
+            async def case():
+                response = await client.get(f"/api/cases/{index}/messages")
+                response.raise_for_status()
+
+            latest_ms = await timed(latest, repeat)
+            middle_ms = await timed(middle, repeat)
+            case_ms = await timed(case, repeat)
+            legacy_ms = await timed(lambda: legacy_dialog_messages(index), max(1, repeat // 5))
+            print(f"{size:>10}{latest_ms:>16.2f}{middle_ms:>12.2f}{case_ms:>10.2f}{legacy_ms:>18.2f}")
+
+    await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="100,1000,10000,50000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        # URL базы должен быть задан до импорта database.database
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+        from database.database import init_db, close_db
+
+        async def create_schema():
+            await init_db()
+            await close_db()
+
+        asyncio.run(create_schema())
+        seed(db_path, sizes)
+        asyncio.run(run(sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк потокового экспорта CSV
+
+Заполняет временную базу SQLite выплатами и в отдельных процессах
+выгружает их двумя способами, замеряя пиковый RSS процесса (VmHWM):
+- stream: эндпоинт /api/export/payouts.csv (серверный курсор + StreamingResponse)
+- materialize: весь результат запроса в памяти, затем CSV (как JSON-эндпоинты)
+
+Ответ читается напрямую из body_iterator, без HTTP-клиента, чтобы
+клиент не буферизовал тело ответа и не искажал замер.
+
+Использование:
+    python benchmarks/bench_exports.py [--rows 1000000]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import csv
+import io
+import json
+import random
+import sqlite3
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+
+def read_rss_kb(field: str) -> int:
+    """Читает поле VmRSS/VmHWM из /proc/self/status (в КБ)"""
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+def seed(db_path: str, rows: int) -> None:
+    """Создает схему через init_db и быстро вставляет выплаты напрямую через sqlite3"""
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    from database.database import init_db, close_db
+
+    async def create_schema():
+        await init_db()
+        await close_db()
+
+    asyncio.run(create_schema())
+
+    rnd = random.Random(42)
+    referrers = 1000
+    now = datetime.utcnow().isoformat(sep=" ")
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO users (id, telegram_id, first_name, username, registered_at, is_active) VALUES (?, ?, ?, ?, ?, 1)",
+        ((i, 10 ** 9 + i, f"Партнёр {i}", f"partner_{i}", now) for i in range(1, referrers + 1))
+    )
+    conn.executemany(
+        "INSERT INTO referral_payouts (referrer_id, amount, month, year, status, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+        ((rnd.randint(1, referrers), rnd.randint(100, 100000), rnd.randint(1, 12), 2024,
+          rnd.choice(("pending", "paid")), now) for _ in range(rows))
+    )
+    conn.commit()
+    conn.close()
+
+
+async def export_stream() -> int:
+    from admin_panel.app import export_payouts
+    from database.database import close_db
+
+    response = await export_payouts()
+    size = 0
+    async for chunk in response.body_iterator:
+        size += len(chunk)
+    await close_db()
+    return size
+
+
+async def export_materialize() -> int:
+    from sqlalchemy import select
+    from database.database import get_db, close_db
+    from database.models import ReferralPayout, User
+
+    async with get_db() as db:
+        result = await db.execute(
+            select(ReferralPayout, User).join(User, ReferralPayout.referrer_id == User.id)
+            .order_by(ReferralPayout.id)
+        )
+        rows = result.all()
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for payout, user in rows:
+            writer.writerow([payout.id, payout.referrer_id, user.telegram_id, user.first_name,
+                             payout.amount, payout.month, payout.year, payout.status,
+                             payout.paid_at, payout.created_at])
+        body = buffer.getvalue().encode("utf-8")
+    await close_db()
+    return len(body)
+
+
+def run_mode(mode: str, db_path: str) -> None:
+    """Выполняется в дочернем процессе: один экспорт и замер памяти"""
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    import admin_panel.app  # noqa: F401  импорт до замера базового RSS
+
+    baseline = read_rss_kb("VmRSS")
+    started = time.perf_counter()
+    size = asyncio.run(export_stream() if mode == "stream" else export_materialize())
+    print(json.dumps({
+        "seconds": time.perf_counter() - started,
+        "bytes": size,
+        "baseline_kb": baseline,
+        "peak_kb": read_rss_kb("VmHWM"),
+    }))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--mode", choices=("stream", "materialize"), help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.db)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        started = time.perf_counter()
+        seed(db_path, args.rows)
+        print(f"Заполнение базы: {args.rows} выплат за {time.perf_counter() - started:.1f} с")
+
+        print("=" * 60)
+        print(f"{'Способ':<14}{'время, с':>10}{'CSV, МБ':>10}{'пик RSS, МБ':>14}{'прирост, МБ':>13}")
+        for mode in ("stream", "materialize"):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--mode", mode, "--db", db_path],
+                capture_output=True, text=True, check=True
+            ).stdout.strip().splitlines()[-1]
+            stats = json.loads(output)
+            print(f"{mode:<14}{stats['seconds']:>10.1f}{stats['bytes'] / 2 ** 20:>10.1f}"
+                  f"{stats['peak_kb'] / 1024:>14.1f}{(stats['peak_kb'] - stats['baseline_kb']) / 1024:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Микробенчмарк поиска по FAQ
+
+Строит индекс из статических вопросов FAQ, дополненных синтетическими записями,
+и замеряет время построения индекса и время ответа на точные запросы и запросы с опечатками.
+
+Использование:
+    python benchmarks/bench_faq_search.py [--entries 5000] [--queries 2000]
+"""
+import sys
+import os
+import argparse
+import random
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.utils.faq_search import FaqEntry, FaqIndex, get_static_entries, normalize
+
+
+def make_typo(word: str, rnd: random.Random) -> str:
+    """Вносит одну опечатку (замена буквы) в слово длиннее 4 символов"""
+    if len(word) <= 4:
+        return word
+    pos = rnd.randrange(1, len(word) - 1)
+    return word[:pos] + rnd.choice("абвгдеиклмнопрст") + word[pos + 1:]
+
+
+def make_word(rnd: random.Random) -> str:
+    """Псевдослово из чередующихся согласных и гласных"""
+    return "".join(rnd.choice("бвгдзклмнпрст") + rnd.choice("аеиоу") for _ in range(rnd.randint(2, 5)))
+
+
+def build_entries(count: int, rnd: random.Random) -> list:
+    """
+    Статические записи FAQ + синтетические записи
+
+    Синтетические записи состоят в основном из псевдослов (как в реальной базе
+    вопросов, где словарь растет вместе с числом записей) с примесью слов из
+    статических вопросов, чтобы точные запросы конкурировали с шумом.
+    """
+    static = get_static_entries()
+    common = sorted({word for entry in static for word in normalize(entry.question + " " + entry.answer)})
+    vocabulary = [make_word(rnd) for _ in range(count * 4)]
+    entries = list(static)
+    for i in range(max(0, count - len(static))):
+        question = " ".join(rnd.choices(vocabulary, k=6) + rnd.choices(common, k=2)).capitalize() + "?"
+        answer = " ".join(rnd.choices(vocabulary, k=32) + rnd.choices(common, k=8))
+        entries.append(FaqEntry(f"synthetic:{i}", question, answer, "Разное"))
+    return entries
+
+
+def time_queries(index: FaqIndex, queries: list) -> float:
+    """Среднее время одного поиска в микросекундах"""
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+
+def main(entries_count: int, queries_count: int) -> None:
+    rnd = random.Random(42)
+    entries = build_entries(entries_count, rnd)
+
+    start = time.perf_counter()
+    index = FaqIndex(entries)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    static = get_static_entries()
+    exact = [rnd.choice(static).question for _ in range(queries_count)]
+    typos = [" ".join(make_typo(word, rnd) for word in query.split()) for query in exact]
+
+    # Холодный прогон заполняет кэш нечетких расширений, горячий показывает установившийся режим
+    typo_cold = time_queries(index, typos)
+    typo_hot = time_queries(index, typos)
+    exact_us = time_queries(index, exact)
+
+    hits = sum(1 for query, source in zip(typos, exact) if (index.search(query) or [None])[0]
+               and index.search(query)[0].entry.question == source)
+
+    print("=" * 60)
+    print(f"Записей в индексе: {len(index)}, запросов: {queries_count}")
+    print("=" * 60)
+    print(f"Построение индекса:              {build_ms:>10.1f} мс")
+    print(f"Точный запрос:                   {exact_us:>10.1f} мкс")
+    print(f"Запрос с опечатками (холодный):  {typo_cold:>10.1f} мкс")
+    print(f"Запрос с опечатками (горячий):   {typo_hot:>10.1f} мкс")
+    print(f"Top-1 совпадает с исходным вопросом при опечатках: {hits / queries_count:.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.entries, args.queries)
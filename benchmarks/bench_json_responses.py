@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк сериализации и сжатия больших JSON-ответов админ-панели
+
+Строит --rows строк в формате /api/users/referrals-info (пользователи
+генератора benchmarks/seed_data.py) и сравнивает способы получить тело ответа:
+- json: serialize_datetime по полям, jsonable_encoder и JSONResponse
+  (как FastAPI отдавал словари эндпоинтов раньше)
+- orjson: ORJSONResponse с datetime как есть, без jsonable_encoder
+- typeadapter: pydantic TypeAdapter по TypedDict строки, dump_json
+
+Затем тело ответа orjson сжимается gzip с разными уровнями: размер на
+проводе и время сжатия (его добавляет CompressionMiddleware к каждому ответу).
+
+Использование:
+    python benchmarks/bench_json_responses.py [--rows 50000] [--repeat 5]
+"""
+import sys
+import os
+import argparse
+import gzip
+import statistics
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from typing_extensions import TypedDict
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+from admin_panel.app import serialize_datetime
+from benchmarks.seed_data import SeedConfig, generate
+
+
+class InvitedBy(TypedDict):
+    telegram_id: int
+    name: str
+
+
+class UserRow(TypedDict):
+    id: int
+    telegram_id: int
+    username: Optional[str]
+    first_name: Optional[str]
+    name: str
+    registered_at: datetime
+    invited_by: Optional[InvitedBy]
+    invited_count: int
+    is_partner: bool
+
+
+def build_rows(count: int) -> List[dict]:
+    """Строки /api/users/referrals-info, registered_at - datetime"""
+    data = generate(SeedConfig.scaled(count, revenues=0, cases=0, messages=0), datetime.utcnow())
+    users = {user["id"]: user for user in data["users"]}
+    partners = {profile["user_id"]: profile["full_name"] for profile in data["partner_profiles"]}
+    referrer_of = {relationship["referred_id"]: relationship["referrer_id"]
+                   for relationship in data["referral_relationships"]}
+    invited = {}
+    for referrer_id in referrer_of.values():
+        invited[referrer_id] = invited.get(referrer_id, 0) + 1
+
+    def name(user):
+        return partners.get(user["id"]) or (
+            f"{user['first_name']} (@{user['username']})" if user["username"] else user["first_name"]
+        )
+
+    rows = []
+    for user in users.values():
+        referrer = users.get(referrer_of.get(user["id"]))
+        rows.append({
+            "id": user["id"],
+            "telegram_id": user["telegram_id"],
+            "username": user["username"],
+            "first_name": user["first_name"],
+            "name": name(user),
+            "registered_at": user["registered_at"],
+            "invited_by": {"telegram_id": referrer["telegram_id"], "name": name(referrer)} if referrer else None,
+            "invited_count": invited.get(user["id"], 0),
+            "is_partner": user["id"] in partners,
+        })
+    return rows
+
+
+def render_json(rows: List[dict]) -> bytes:
+    content = [{**row, "registered_at": serialize_datetime(row["registered_at"])} for row in rows]
+    return JSONResponse(jsonable_encoder({"total_users": len(content), "users": content})).body
+
+
+def render_orjson(rows: List[dict]) -> bytes:
+    return ORJSONResponse({"total_users": len(rows), "users": rows}).body
+
+
+USERS_ADAPTER = TypeAdapter(List[UserRow])
+
+
+def render_typeadapter(rows: List[dict]) -> bytes:
+    return b'{"total_users":%d,"users":%s}' % (len(rows), USERS_ADAPTER.dump_json(rows))
+
+
+RENDERERS = {
+    "json": render_json,
+    "orjson": render_orjson,
+    "typeadapter": render_typeadapter,
+}
+
+
+def timed(func, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows)
+    print("=" * 60)
+    print(f"Сериализация {len(rows)} строк /api/users/referrals-info (медиана из {args.repeat})")
+    print("=" * 60)
+    print(f"{'Способ':<16}{'время, мс':>12}{'размер, КиБ':>14}")
+    bodies = {}
+    for name, render in RENDERERS.items():
+        elapsed, body = timed(lambda: render(rows), args.repeat)
+        bodies[name] = body
+        print(f"{name:<16}{elapsed:>12.1f}{len(body) / 1024:>14.0f}")
+
+    body = bodies["orjson"]
+    print("=" * 60)
+    print(f"Сжатие тела orjson ({len(body) / 1024:.0f} КиБ)")
+    print("=" * 60)
+    print(f"{'Уровень gzip':<16}{'время, мс':>12}{'на проводе, КиБ':>18}{'доля':>8}")
+    for level in (1, 5, 6, 9):
+        elapsed, compressed = timed(lambda: gzip.compress(body, compresslevel=level), args.repeat)
+        print(f"{level:<16}{elapsed:>12.1f}{len(compressed) / 1024:>18.0f}{len(compressed) / len(body):>8.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Микробенчмарк кэша клавиатур
+
+Сравнивает сборку клавиатур через builder на каждом апдейте с выдачей
+замороженных клавиатур из кэша: время и пиковый объем памяти, выделяемой на один апдейт.
+
+Использование:
+    python benchmarks/bench_keyboards.py [--updates 2000]
+"""
+import sys
+import os
+import argparse
+import inspect
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.keyboards import keyboards
+
+
+# Набор клавиатур, который типичный апдейт запрашивает при навигации по меню
+UPDATE_CALLS = [
+    (keyboards.get_main_menu_keyboard, ()),
+    (keyboards.get_legal_services_keyboard, ()),
+    (keyboards.get_partner_profile_keyboard, ()),
+    (keyboards.get_faq_categories_keyboard, ()),
+    (keyboards.get_faq_questions_keyboard, ("faq_finance",)),
+    (keyboards.get_service_category_keyboard, ("legal_category_tax",)),
+    (keyboards.get_back_keyboard, ()),
+]
+
+
+def run(calls, updates: int) -> dict:
+    """Прогоняет updates апдейтов и возвращает время и память на апдейт"""
+    # Прогрев (в том числе заполнение кэша)
+    for func, args in calls:
+        func(*args)
+
+    start = time.perf_counter()
+    for _ in range(updates):
+        for func, args in calls:
+            func(*args)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for func, args in calls:
+        func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"us_per_update": elapsed / updates * 1e6, "peak_bytes": peak}
+
+
+def main(updates: int) -> None:
+    uncached_calls = [(inspect.unwrap(func), args) for func, args in UPDATE_CALLS]
+
+    uncached = run(uncached_calls, updates)
+    cached = run(UPDATE_CALLS, updates)
+
+    print("=" * 64)
+    print(f"Клавиатуры на апдейт: {len(UPDATE_CALLS)}, апдейтов: {updates}")
+    print("=" * 64)
+    print(f"{'Режим':<20}{'мкс/апдейт':>14}{'память на апдейт, байт':>26}")
+    for name, stats in (("builder", uncached), ("кэш", cached)):
+        print(f"{name:<20}{stats['us_per_update']:>14.1f}{stats['peak_bytes']:>26}")
+    print(f"Ускорение: x{uncached['us_per_update'] / cached['us_per_update']:.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.updates)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Задержка цикла событий при логировании
+
+Генератор создает --rate апдейтов в секунду; каждый апдейт пишет в лог
+столько же записей, сколько LoggingMiddleware и command_start_handler
+(вход, три строки обработчика, выход). Вывод логов идет в "медленный"
+поток: каждая запись в него занимает --write-latency секунд (переполненный
+канал stdout, медленный диск или сборщик логов). Параллельно задача-зонд
+засыпает на 5 мс и измеряет, насколько позже срока она просыпается.
+
+Варианты:
+- sync: logging.basicConfig и f-строки, как было (запись в поток в цикле событий)
+- queue: setup_logging (QueueHandler/QueueListener, отложенное форматирование)
+  без прореживания
+- queue+sampling: то же с прореживанием INFO сверх --sample-limit записей в секунду
+
+Использование:
+    python benchmarks/bench_logging.py [--rate 500] [--duration 5] [--write-latency 0.0005]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import logging
+import statistics
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROBE_INTERVAL = 0.005
+
+
+class SlowStream:
+    """Поток вывода, каждая запись в который блокирует вызывающий поток"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.lines = 0
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> None:
+        time.sleep(self.latency)
+        with self._lock:
+            self.lines += text.count("\n")
+
+    def flush(self) -> None:
+        pass
+
+
+async def update_fstrings(logger: logging.Logger, user_id: int) -> None:
+    """Прежний стиль: строки собираются до вызова логгера"""
+    logger.info(f"📥 Message from id={user_id}, username=@user{user_id}: text='/start'")
+    logger.info(f"Команда /start от пользователя {user_id}")
+    await asyncio.sleep(0)
+    logger.info(f"Создан новый пользователь: {user_id}")
+    logger.info(f"✅ Приветствие поставлено в очередь для пользователя {user_id}")
+    logger.info(f"✅ Message processed for id={user_id}, username=@user{user_id} in {0.012:.3f}s")
+
+
+async def update_lazy(logger: logging.Logger, user_id: int) -> None:
+    """Новый стиль: msg % args собирается в потоке вывода"""
+    logger.info("📥 %s from id=%s (@%s): %r", "Message", user_id, f"user{user_id}", "/start")
+    logger.info("Команда /start от пользователя %s", user_id)
+    await asyncio.sleep(0)
+    logger.info("Создан новый пользователь: %s", user_id)
+    logger.info("✅ Приветствие поставлено в очередь для пользователя %s", user_id)
+    logger.info("✅ %s processed for id=%s in %.3fs", "Message", user_id, 0.012)
+
+
+async def measure(update, rate: int, duration: float):
+    """Нагрузка и зонд; возвращает задержки зонда (мс) и число обработанных апдейтов"""
+    logger = logging.getLogger("bench")
+    lags = []
+    handled = 0
+    stop = time.perf_counter() + duration
+
+    async def probe():
+        while time.perf_counter() < stop:
+            expected = time.perf_counter() + PROBE_INTERVAL
+            await asyncio.sleep(PROBE_INTERVAL)
+            lags.append(max(0.0, time.perf_counter() - expected) * 1000)
+
+    async def one(user_id: int):
+        nonlocal handled
+        await update(logger, user_id)
+        handled += 1
+
+    async def generate():
+        tick = 0.01
+        per_tick = max(1, int(rate * tick))
+        user_id = 0
+        tasks = []
+        next_tick = time.perf_counter()
+        while time.perf_counter() < stop:
+            for _ in range(per_tick):
+                user_id += 1
+                tasks.append(asyncio.create_task(one(user_id)))
+            next_tick += tick
+            await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+        await asyncio.gather(*tasks)
+
+    await asyncio.gather(probe(), generate())
+    return lags, handled
+
+
+def percentile(values, share: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def reset_root() -> None:
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rate", type=int, default=500, help="апдейтов в секунду")
+    parser.add_argument("--duration", type=float, default=5.0, help="секунд на вариант")
+    parser.add_argument("--write-latency", type=float, default=0.0005, help="время одной записи в вывод, с")
+    parser.add_argument("--sample-limit", type=int, default=200, help="записей INFO в секунду до прореживания")
+    args = parser.parse_args()
+
+    os.environ["LOG_FORMAT"] = "json"
+    from config.settings import settings
+    from config.logging_setup import setup_logging, stop_logging
+
+    print("=" * 82)
+    print(f"Апдейтов в секунду: {args.rate}, записей на апдейт: 5, "
+          f"запись в вывод: {args.write_latency * 1000:.2f} мс")
+    print("=" * 82)
+    print(f"{'Вариант':<16}{'лаг p50, мс':>12}{'лаг p99, мс':>12}{'лаг max, мс':>12}"
+          f"{'апдейт/с':>10}{'строк':>10}{'дозапись, с':>12}")
+
+    variants = (
+        ("sync", update_fstrings, None),
+        ("queue", update_lazy, 0),
+        ("queue+sampling", update_lazy, args.sample_limit),
+    )
+    for name, update, sample_limit in variants:
+        stream = SlowStream(args.write_latency)
+        reset_root()
+        if sample_limit is None:
+            logging.basicConfig(
+                level=logging.INFO, stream=stream,
+                format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
+        else:
+            settings.LOG_SAMPLE_RATE_LIMIT = sample_limit
+            settings.LOG_QUEUE_SIZE = 10 ** 6
+            setup_logging("bench", stream=stream)
+
+        started = time.perf_counter()
+        lags, handled = asyncio.run(measure(update, args.rate, args.duration))
+        elapsed = time.perf_counter() - started
+
+        # Время, за которое поток вывода дописывает накопленную очередь
+        drain_started = time.perf_counter()
+        stop_logging()
+        drain = time.perf_counter() - drain_started
+
+        print(f"{name:<16}{statistics.median(lags):>12.1f}{percentile(lags, 0.99):>12.1f}{max(lags):>12.1f}"
+              f"{handled / elapsed:>10.0f}{stream.lines:>10}{drain:>12.1f}")
+
+    reset_root()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк многоуровневого реферального дерева (closure table)
+
+Строит во временной базе SQLite синтетическое дерево: каждый партнёр с
+вероятностью --root-share не имеет реферера, иначе его реферер - случайный
+ранее зарегистрированный партнёр. Замеряются:
+- перестройка referral_closure рекурсивным CTE (путь миграции существующей базы);
+- добавление новых связей с поддержкой замыкания триггерами;
+- эндпоинты поддерева, предков и выручки по уровням для крупного, среднего
+  и глубокого узла (через HTTP) в сравнении с рекурсивным CTE по
+  referral_relationships на каждый запрос (только SQL).
+
+Использование:
+    python benchmarks/bench_referral_tree.py [--nodes 1000000] [--root-share 0.05] [--repeat 5]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TRIGGERS = ("referral_closure_bi", "referral_closure_ai", "referral_closure_ad")
+
+# Выручка по уровням без замыкания: обход поддерева рекурсивным CTE на каждый запрос
+CTE_LEVEL_REVENUE = """
+    WITH RECURSIVE tree(user_id, depth) AS (
+        SELECT referred_id, 1 FROM referral_relationships WHERE referrer_id = :root
+        UNION ALL
+        SELECT rr.referred_id, tree.depth + 1
+        FROM tree JOIN referral_relationships rr ON rr.referrer_id = tree.user_id
+    )
+    SELECT tree.depth, COUNT(DISTINCT tree.user_id), COALESCE(SUM(pr.amount), 0)
+    FROM tree
+    LEFT JOIN partner_revenues pr ON pr.partner_id = tree.user_id
+    GROUP BY tree.depth
+"""
+
+CTE_ANCESTORS = """
+    WITH RECURSIVE chain(user_id, depth) AS (
+        SELECT referrer_id, 1 FROM referral_relationships WHERE referred_id = :node
+        UNION ALL
+        SELECT rr.referrer_id, chain.depth + 1
+        FROM chain JOIN referral_relationships rr ON rr.referred_id = chain.user_id
+    )
+    SELECT user_id, depth FROM chain
+"""
+
+
+def seed(db_path: str, nodes: int, root_share: float):
+    """Пользователи, связи и выручка напрямую через sqlite3, без триггеров замыкания"""
+    rnd = random.Random(42)
+    now = datetime.utcnow().isoformat(sep=" ")
+    conn = sqlite3.connect(db_path)
+    for trigger in TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+    conn.executemany(
+        "INSERT INTO users (id, telegram_id, first_name, registered_at, is_active) VALUES (?, ?, ?, ?, 1)",
+        ((i, 10 ** 9 + i, f"Партнёр {i}", now) for i in range(1, nodes + 1))
+    )
+    parents = {}
+    edges = []
+    for i in range(2, nodes + 1):
+        if rnd.random() >= root_share:
+            parents[i] = rnd.randint(1, i - 1)
+            edges.append((parents[i], i, now))
+    conn.executemany(
+        "INSERT INTO referral_relationships (referrer_id, referred_id, created_at) VALUES (?, ?, ?)", edges
+    )
+    conn.executemany(
+        "INSERT INTO partner_revenues (partner_id, amount, created_at) VALUES (?, ?, ?)",
+        ((rnd.randint(1, nodes), rnd.randint(1000, 100000), now) for _ in range(nodes // 2))
+    )
+    conn.commit()
+    conn.close()
+    return parents
+
+
+def pick_nodes(parents, nodes: int):
+    """Крупный корень, узел со средним поддеревом и самый глубокий лист"""
+    sizes = [1] * (nodes + 1)
+    depths = [0] * (nodes + 1)
+    for i in range(2, nodes + 1):
+        if i in parents:
+            depths[i] = depths[parents[i]] + 1
+    for i in range(nodes, 1, -1):
+        if i in parents:
+            sizes[parents[i]] += sizes[i]
+    big = max(range(1, nodes + 1), key=lambda i: sizes[i] if i not in parents else 0)
+    middle = min((i for i in range(1, nodes + 1) if sizes[i] >= 1000), key=lambda i: sizes[i])
+    deep = max(range(1, nodes + 1), key=lambda i: depths[i])
+    return {"крупный": big, "средний": middle, "глубокий": deep}, sizes, depths
+
+
+async def timed(coro_factory, repeat: int) -> float:
+    """Медиана времени выполнения в миллисекундах"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await coro_factory()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+async def run(nodes: int, parents, repeat: int) -> None:
+    import httpx
+    from sqlalchemy import text
+    from database.database import engine, get_read_db, close_db
+    from database.referral_tree import init_referral_tree, rebuild_referral_closure
+
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        rows = await rebuild_referral_closure(conn)
+    rebuild_seconds = time.perf_counter() - started
+
+    async with engine.begin() as conn:
+        await init_referral_tree(conn)
+
+    # Новые партнёры по ссылкам существующих: замыкание поддерживают триггеры
+    rnd = random.Random(7)
+    inserts = 2000
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        for n in range(inserts):
+            user_id = nodes + 1 + n
+            await conn.execute(
+                text("INSERT INTO users (id, telegram_id, first_name, is_active) VALUES (:id, :tg, 'Новый', 1)"),
+                {"id": user_id, "tg": 2 * 10 ** 9 + user_id}
+            )
+            await conn.execute(
+                text("INSERT INTO referral_relationships (referrer_id, referred_id) VALUES (:referrer, :referred)"),
+                {"referrer": rnd.randint(1, nodes), "referred": user_id}
+            )
+    insert_ms = (time.perf_counter() - started) * 1000 / inserts
+
+    print("=" * 72)
+    print(f"Узлов: {nodes:,}, связей: {len(parents):,}, пар в замыкании: {rows:,}")
+    print(f"Перестройка рекурсивным CTE: {rebuild_seconds:.1f} с")
+    print(f"Новая связь с триггерами замыкания: {insert_ms:.3f} мс (вставка пользователя и связи)")
+    print("=" * 72)
+
+    targets, sizes, depths = pick_nodes(parents, nodes)
+    from admin_panel.app import app
+
+    print(f"{'Узел':<10}{'поддерево':>10}{'глубина':>9}{'поддерево, 1 стр.':>19}{'выручка':>10}"
+          f"{'предки':>9}{'CTE выручка':>13}{'CTE предки':>12}   (мс)")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for name, node in targets.items():
+            telegram_id = 10 ** 9 + node
+
+            async def subtree():
+                (await client.get(f"/api/referrals/{telegram_id}/subtree")).raise_for_status()
+
+            async def revenue():
+                (await client.get(f"/api/referrals/{telegram_id}/revenue")).raise_for_status()
+
+            async def ancestors():
+                (await client.get(f"/api/referrals/{telegram_id}/ancestors")).raise_for_status()
+
+            async def cte_revenue():
+                async with get_read_db() as db:
+                    (await db.execute(text(CTE_LEVEL_REVENUE), {"root": node})).all()
+
+            async def cte_ancestors():
+                async with get_read_db() as db:
+                    (await db.execute(text(CTE_ANCESTORS), {"node": node})).all()
+
+            print(f"{name:<10}{sizes[node] - 1:>10,}{depths[node]:>9}"
+                  f"{await timed(subtree, repeat):>19.2f}{await timed(revenue, repeat):>10.2f}"
+                  f"{await timed(ancestors, repeat):>9.2f}{await timed(cte_revenue, repeat):>13.2f}"
+                  f"{await timed(cte_ancestors, repeat):>12.2f}")
+
+    await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--nodes", type=int, default=1000000)
+    parser.add_argument("--root-share", type=float, default=0.05, help="доля партнёров без реферера")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        # URL базы должен быть задан до импорта database.database
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+        from database.database import init_db, close_db
+
+        async def create_schema():
+            await init_db()
+            await close_db()
+
+        asyncio.run(create_schema())
+        started = time.perf_counter()
+        parents = seed(db_path, args.nodes, args.root_share)
+        print(f"Заполнение базы: {time.perf_counter() - started:.1f} с")
+        asyncio.run(run(args.nodes, parents, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
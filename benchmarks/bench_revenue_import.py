@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк импорта выручки из CSV
+
+Заполняет временную базу SQLite пользователями (benchmarks/seed_data.py),
+строит CSV на --rows сделок (часть строк с ошибками: неизвестный партнёр,
+дробная сумма) и сравнивает:
+- import: POST /api/revenues/import, тело отдается потоком блоками по 64 КиБ
+- single: POST /api/revenues на каждую сделку (первые --single-rows строк)
+
+Приложение admin_panel.app вызывается в том же процессе через
+httpx.ASGITransport. Выводятся строки в секунду и число SQL-запросов.
+
+Использование:
+    python benchmarks/bench_revenue_import.py [--rows 100000] [--users 10000] [--single-rows 2000]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_admin_api import QueryCounter
+
+CHUNK_BYTES = 64 * 1024
+
+
+def build_csv(rows: int, users: int, error_share: float, seed: int = 42) -> bytes:
+    """CSV выгрузки бухгалтерии: telegram_id партнёров из seed_data (10**9 + id)"""
+    rnd = random.Random(seed)
+    lines = ["partner_telegram_id;amount;description;client_reference;created_at"]
+    for n in range(rows):
+        telegram_id = 10 ** 9 + rnd.randint(1, users)
+        amount = f"{rnd.randint(1000, 500000)}"
+        if rnd.random() < error_share:
+            if rnd.random() < 0.5:
+                telegram_id = 1
+            else:
+                amount += ",5"
+        lines.append(f"{telegram_id};{amount};\"Сделка №{n}; консультация\";D-{n};"
+                     f"{rnd.randint(1, 28):02d}.{rnd.randint(1, 12):02d}.2024")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def run(args) -> None:
+    import httpx
+    from benchmarks.seed_data import SeedConfig, seed_database
+    from database.database import close_db
+
+    await seed_database(SeedConfig.scaled(args.users, revenues=0, cases=0, messages=0))
+    from admin_panel.app import app
+
+    data = build_csv(args.rows, args.users, args.error_share)
+    counter = QueryCounter()
+    counter.attach()
+
+    async def body():
+        for start in range(0, len(data), CHUNK_BYTES):
+            yield data[start:start + CHUNK_BYTES]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        counter.count = 0
+        started = time.perf_counter()
+        response = await client.post("/api/revenues/import", content=body(), headers={"Content-Type": "text/csv"})
+        import_seconds = time.perf_counter() - started
+        import_queries = counter.count
+        report = response.json()
+
+        single_rows = [line.split(";") for line in data.decode("utf-8").splitlines()[1:args.single_rows + 1]]
+        counter.count = 0
+        started = time.perf_counter()
+        for telegram_id, amount, *_ in single_rows:
+            # /api/revenues принимает partner_id (users.id): seed_data выдает telegram_id = 10**9 + id
+            await client.post("/api/revenues", json={"partner_id": int(telegram_id) - 10 ** 9,
+                                                     "amount": int(amount.split(",")[0]), "description": "Сделка"})
+        single_seconds = time.perf_counter() - started
+        single_queries = counter.count
+    await close_db()
+
+    print("=" * 72)
+    print(f"CSV: {args.rows} строк, {len(data) / 1024 / 1024:.1f} МБ; пользователей {args.users}")
+    print(f"Импорт: добавлено {report['imported']}, ошибок {report['errors_total']}, "
+          f"по отчету эндпоинта {report['rows_per_second']} строк/с")
+    print("=" * 72)
+    print(f"{'Способ':<10}{'строк':>10}{'время, с':>12}{'строк/с':>12}{'SQL':>10}")
+    print(f"{'import':<10}{args.rows:>10}{import_seconds:>12.2f}{args.rows / import_seconds:>12.0f}{import_queries:>10}")
+    print(f"{'single':<10}{len(single_rows):>10}{single_seconds:>12.2f}"
+          f"{len(single_rows) / single_seconds:>12.0f}{single_queries:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--error-share", type=float, default=0.01, help="доля строк с ошибками")
+    parser.add_argument("--single-rows", type=int, default=2000, help="сделок через POST /api/revenues")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # URL базы должен быть задан до импорта database.database
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
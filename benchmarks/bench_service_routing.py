@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк маршрутизации callback-запросов карточек услуг
+
+Сравнивает прежнюю схему (отдельный обработчик с фильтром F.data == "service_..."
+на каждую услугу) с текущей (один обработчик с фильтром по префиксу и поиском
+карточки в словаре каталога).
+
+Использование:
+    python benchmarks/bench_service_routing.py [--rounds 200]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aiogram import Router, F
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.types import CallbackQuery, User
+
+from bot.catalog import SERVICES, SERVICE_CALLBACK_PREFIX
+
+
+def build_legacy_router() -> Router:
+    """Роутер по старой схеме: один обработчик на каждую услугу"""
+    router = Router(name="legacy")
+
+    def make_handler(key):
+        async def handler(callback_query: CallbackQuery) -> str:
+            return key
+        return handler
+
+    for key in SERVICES:
+        router.callback_query.register(make_handler(key), F.data == key)
+    return router
+
+
+def build_catalog_router() -> Router:
+    """Роутер по новой схеме: префиксный фильтр и поиск по словарю"""
+    router = Router(name="catalog")
+
+    @router.callback_query(F.data.startswith(SERVICE_CALLBACK_PREFIX))
+    async def handler(callback_query: CallbackQuery) -> str:
+        card = SERVICES.get(callback_query.data)
+        if card is None:
+            raise SkipHandler()
+        return card.key
+
+    return router
+
+
+def make_event(data: str) -> CallbackQuery:
+    return CallbackQuery(
+        id="1",
+        from_user=User(id=1, is_bot=False, first_name="Bench"),
+        chat_instance="1",
+        data=data,
+    )
+
+
+async def measure(router: Router, events: list, rounds: int) -> dict:
+    """Возвращает среднее и худшее время маршрутизации одного события в микросекундах"""
+    per_key = []
+    for event in events:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await router.propagate_event("callback_query", event)
+        per_key.append((time.perf_counter() - start) / rounds * 1e6)
+    return {"avg": sum(per_key) / len(per_key), "max": max(per_key)}
+
+
+async def main(rounds: int) -> None:
+    events = [make_event(key) for key in SERVICES]
+
+    # Проверяем, что обе схемы находят одни и те же услуги
+    legacy = build_legacy_router()
+    catalog = build_catalog_router()
+    for event in events:
+        assert await legacy.propagate_event("callback_query", event) == event.data
+        assert await catalog.propagate_event("callback_query", event) == event.data
+
+    legacy_stats = await measure(legacy, events, rounds)
+    catalog_stats = await measure(catalog, events, rounds)
+
+    print("=" * 60)
+    print(f"Маршрутизация callback-запросов: {len(events)} услуг, {rounds} повторов")
+    print("=" * 60)
+    print(f"{'Схема':<28}{'среднее, мкс':>16}{'худшее, мкс':>16}")
+    print(f"{'F.data == ... на услугу':<28}{legacy_stats['avg']:>16.1f}{legacy_stats['max']:>16.1f}")
+    print(f"{'префикс + словарь':<28}{catalog_stats['avg']:>16.1f}{catalog_stats['max']:>16.1f}")
+    print(f"Ускорение (среднее): x{legacy_stats['avg'] / catalog_stats['avg']:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds))
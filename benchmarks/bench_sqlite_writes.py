@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк конкурентной записи в SQLite
+
+Несколько процессов (как бот, админ-панель и сервер сообщений) одновременно
+пишут сообщения в case_messages и читают последние сообщения. Сравниваются:
+- legacy: прежняя конфигурация (пул 5+10, журнал DELETE, без PRAGMA); пул
+  AsyncAdaptedQueuePool вместо прежнего синхронного QueuePool, который при
+  нагрузке больше 15 корутин блокирует цикл событий и зависает
+- profile: профиль SQLite (WAL, synchronous=NORMAL, busy_timeout, mmap, cache), запись через get_db
+- writer: профиль SQLite + запись через очередь db_writer с групповым коммитом
+
+Для каждого режима создается новая база. Выводится пропускная способность
+записи и доля операций, завершившихся ошибкой "database is locked".
+
+Использование:
+    python benchmarks/bench_sqlite_writes.py [--processes 3] [--concurrency 30] [--writes 20]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import subprocess
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MODES = ("legacy", "profile", "writer")
+
+
+def legacy_engine(url: str):
+    """Движок в прежней конфигурации database/database.py"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+    return create_async_engine(
+        url,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=1800,
+        connect_args={"check_same_thread": False}
+    )
+
+
+async def prepare(mode: str) -> None:
+    """Создает схему и одного пользователя с делом"""
+    from database.models import Base, CaseQuestionnaire, User
+
+    if mode == "legacy":
+        from sqlalchemy.ext.asyncio import AsyncSession
+        engine = legacy_engine(os.environ["DATABASE_URL"])
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as db:
+            db.add(User(id=1, telegram_id=1, first_name="Клиент"))
+            db.add(CaseQuestionnaire(id=1, user_id=1))
+            await db.commit()
+        await engine.dispose()
+    else:
+        from database.database import init_db, get_db, close_db
+        await init_db()
+        async with get_db() as db:
+            db.add(User(id=1, telegram_id=1, first_name="Клиент"))
+            db.add(CaseQuestionnaire(id=1, user_id=1))
+        await close_db()
+
+
+async def worker_process(mode: str, concurrency: int, writes: int, start_at: float) -> dict:
+    """Нагрузка одного процесса: concurrency корутин по writes итераций чтение + запись"""
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from database.models import CaseMessage
+
+    if mode == "legacy":
+        engine = legacy_engine(os.environ["DATABASE_URL"])
+
+        def session():
+            return AsyncSession(engine, expire_on_commit=False)
+    else:
+        from database.database import AsyncSessionLocal, db_writer, close_db
+
+        def session():
+            return AsyncSessionLocal()
+
+    stats = {"ok": 0, "locked": 0, "other": 0, "latencies": []}
+
+    async def read_recent():
+        async with session() as db:
+            await db.execute(
+                select(CaseMessage.id, CaseMessage.message_content)
+                .where(CaseMessage.sender_id == 1)
+                .order_by(CaseMessage.id.desc())
+                .limit(20)
+            )
+
+    async def write_message(n: int):
+        message = CaseMessage(questionnaire_id=1, sender_id=1, sender_type="client",
+                              message_content=f"Сообщение {os.getpid()}-{n}")
+        if mode == "writer":
+            async def save(db):
+                db.add(message)
+                await db.flush()
+            await db_writer.submit(save)
+        else:
+            async with session() as db:
+                db.add(message)
+                await db.commit()
+
+    async def user_loop(index: int):
+        for n in range(writes):
+            started = time.perf_counter()
+            try:
+                await read_recent()
+                await write_message(index * writes + n)
+                stats["ok"] += 1
+            except Exception as e:
+                stats["locked" if "locked" in str(e) else "other"] += 1
+            stats["latencies"].append(time.perf_counter() - started)
+
+    # Первое подключение до нагрузки: одновременные первые подключения блокируют
+    # обработчик first_connect диалекта SQLAlchemy
+    await read_recent()
+
+    # Все процессы стартуют одновременно
+    await asyncio.sleep(max(0.0, start_at - time.time()))
+    started = time.perf_counter()
+    await asyncio.gather(*(user_loop(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    if mode == "legacy":
+        await engine.dispose()
+    else:
+        await close_db()
+
+    latencies = sorted(stats.pop("latencies"))
+    stats["elapsed"] = elapsed
+    stats["p95"] = latencies[int(len(latencies) * 0.95)] if latencies else 0
+    return stats
+
+
+def run_mode(mode: str, processes: int, concurrency: int, writes: int, tmp: str) -> dict:
+    db_path = os.path.join(tmp, f"{mode}.db")
+    env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{db_path}")
+    script = os.path.abspath(__file__)
+
+    subprocess.run([sys.executable, script, "--child", "prepare", "--mode", mode],
+                   env=env, check=True, capture_output=True)
+
+    start_at = time.time() + 2
+    children = [
+        subprocess.Popen(
+            [sys.executable, script, "--child", "work", "--mode", mode,
+             "--concurrency", str(concurrency), "--writes", str(writes), "--start-at", str(start_at)],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        for _ in range(processes)
+    ]
+    results = [json.loads(child.communicate()[0].strip().splitlines()[-1]) for child in children]
+
+    total = processes * concurrency * writes
+    ok = sum(r["ok"] for r in results)
+    elapsed = max(r["elapsed"] for r in results)
+    return {
+        "writes_per_sec": ok / elapsed,
+        "locked_rate": sum(r["locked"] for r in results) / total,
+        "other_rate": sum(r["other"] for r in results) / total,
+        "p95": max(r["p95"] for r in results),
+        "elapsed": elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=30)
+    parser.add_argument("--writes", type=int, default=20)
+    parser.add_argument("--child", choices=("prepare", "work"), help=argparse.SUPPRESS)
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--start-at", type=float, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child == "prepare":
+        asyncio.run(prepare(args.mode))
+        return
+    if args.child == "work":
+        stats = asyncio.run(worker_process(args.mode, args.concurrency, args.writes, args.start_at))
+        print(json.dumps(stats))
+        return
+
+    print("=" * 72)
+    print(f"Процессов: {args.processes}, корутин в процессе: {args.concurrency}, "
+          f"итераций (чтение + запись): {args.writes}")
+    print("=" * 72)
+    print(f"{'Режим':<10}{'записей/с':>12}{'locked':>10}{'другие':>10}{'p95, мс':>12}{'время, с':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in MODES:
+            r = run_mode(mode, args.processes, args.concurrency, args.writes, tmp)
+            print(f"{mode:<10}{r['writes_per_sec']:>12.0f}{r['locked_rate']:>10.1%}{r['other_rate']:>10.1%}"
+                  f"{r['p95'] * 1000:>12.1f}{r['elapsed']:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
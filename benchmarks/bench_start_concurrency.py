@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Проверка регистрации по /start при одновременных запросах
+
+На временной базе SQLite одновременно выполняется N регистраций /start с
+реферальным кодом: каждый пользователь нажимает /start дважды (двойное
+нажатие, повторная доставка апдейта). Сравниваются:
+- legacy: прежний порядок (SELECT, SELECT + INSERT + COMMIT + refresh,
+  два SELECT + INSERT + COMMIT по реферальной ссылке)
+- upsert: register_user (INSERT ... ON CONFLICT ... RETURNING и
+  INSERT ... SELECT ... ON CONFLICT DO NOTHING в одной транзакции)
+
+Выводятся ошибки, итоговое число пользователей и реферальных связей,
+запросы и коммиты на один /start и общее время.
+
+Использование:
+    python benchmarks/bench_start_concurrency.py [--starts 1000]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REFERRAL_CODE = "benchref"
+REFERRER_TELEGRAM_ID = 1
+
+
+async def legacy_register(user_id: int, referral_code: str) -> None:
+    """Прежняя реализация command_start_handler + get_or_create_user + process_referral"""
+    from sqlalchemy import select
+    from database.database import get_db
+    from database.models import User, ReferralLink, ReferralRelationship
+
+    async with get_db() as db:
+        result = await db.execute(select(User).filter(User.telegram_id == user_id))
+        result.scalar_one_or_none()
+
+        result = await db.execute(select(User).filter(User.telegram_id == user_id))
+        user = result.scalar_one_or_none()
+        if not user:
+            user = User(telegram_id=user_id, first_name=f"Партнёр {user_id}")
+            db.add(user)
+            await db.commit()
+            await db.refresh(user)
+
+        result = await db.execute(select(ReferralLink).filter(ReferralLink.referral_code == referral_code))
+        referral_link = result.scalar_one_or_none()
+        if referral_link and referral_link.partner_id != user.id:
+            existing = await db.execute(
+                select(ReferralRelationship).filter(ReferralRelationship.referred_id == user.id)
+            )
+            if not existing.scalar_one_or_none():
+                db.add(ReferralRelationship(referrer_id=referral_link.partner_id, referred_id=user.id))
+                await db.commit()
+
+
+async def upsert_register(user_id: int, referral_code: str) -> None:
+    from bot.handlers.start import register_user
+
+    await register_user(user_id, None, f"Партнёр {user_id}", None, referral_code)
+
+
+async def reset() -> None:
+    """Пустые таблицы и один реферер со ссылкой"""
+    from sqlalchemy import delete
+    from database.database import get_db
+    from database.models import User, ReferralLink, ReferralRelationship
+
+    async with get_db() as db:
+        await db.execute(delete(ReferralRelationship))
+        await db.execute(delete(ReferralLink))
+        await db.execute(delete(User))
+        referrer = User(telegram_id=REFERRER_TELEGRAM_ID, first_name="Реферер")
+        db.add(referrer)
+        await db.flush()
+        db.add(ReferralLink(partner_id=referrer.id, referral_code=REFERRAL_CODE))
+
+
+async def counts():
+    from sqlalchemy import func, select
+    from database.database import get_db
+    from database.models import User, ReferralRelationship
+
+    async with get_db() as db:
+        users = await db.scalar(select(func.count(User.id)))
+        relationships = await db.scalar(select(func.count(ReferralRelationship.id)))
+    return users - 1, relationships
+
+
+async def run(starts: int) -> None:
+    from sqlalchemy import event
+    from database.database import init_db, close_db, engine
+
+    await init_db()
+
+    stats = {"statements": 0, "commits": 0}
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        stats["statements"] += 1
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def count_commit(conn):
+        stats["commits"] += 1
+
+    users = starts // 2
+    print("=" * 60)
+    print(f"Одновременных /start: {starts} ({users} пользователей, по два нажатия, с реферальным кодом)")
+    print("=" * 60)
+    print(f"{'Способ':<8}{'ошибки':>8}{'польз.':>8}{'связи':>8}{'запросов':>10}{'коммитов':>10}{'время, с':>10}")
+
+    for name, register in (("legacy", legacy_register), ("upsert", upsert_register)):
+        await reset()
+        stats.update(statements=0, commits=0)
+
+        async def start(n: int):
+            await register(1000 + n % users, REFERRAL_CODE)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(start(n) for n in range(starts)), return_exceptions=True)
+        elapsed = time.perf_counter() - started
+
+        errors = sum(isinstance(result, Exception) for result in results)
+        created_users, relationships = await counts()
+        print(f"{name:<8}{errors:>8}{created_users:>8}{relationships:>8}"
+              f"{stats['statements'] / starts:>10.1f}{stats['commits'] / starts:>10.1f}{elapsed:>10.2f}")
+
+    await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--starts", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # URL базы должен быть задан до импорта database.database
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        asyncio.run(run(args.starts))
+
+
+if __name__ == "__main__":
+    main()
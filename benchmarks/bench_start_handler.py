@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Время работы обработчика /start
+
+На временной базе SQLite N пользователей отправляют /start (часть
+одновременно), ответы Bot API имитируются с задержкой --api-latency.
+Сравниваются:
+- legacy: прежний обработчик (фото, приветствие, проценты и кнопка
+  инструкции последовательно, с паузами asyncio.sleep 0.3 и 0.5 с)
+- queued: command_start_handler (регистрация, затем сценарий знакомства
+  в очередь фоновой отправки)
+
+Выводятся время обработчика (p50/p95/max), время до доставки последнего
+сообщения приветствия пользователю и средний поток сообщений в Bot API
+(у Telegram лимит около 30 сообщений в секунду на бота, поток queued
+ограничен ONBOARDING_GLOBAL_RATE).
+
+Использование:
+    python benchmarks/bench_start_handler.py [--users 200] [--concurrency 20] [--api-latency 0.05]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import logging
+import statistics
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeBot:
+    """Bot API с фиксированной задержкой ответа; запоминает время последнего сообщения по чатам"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.delivered = {}
+        self.messages = 0
+
+    async def _call(self, chat_id: int) -> None:
+        await asyncio.sleep(self.latency)
+        self.delivered[chat_id] = time.perf_counter()
+        self.messages += 1
+
+    async def send_message(self, chat_id, text, **kwargs):
+        await self._call(chat_id)
+
+    async def send_photo(self, chat_id, photo, **kwargs):
+        await self._call(chat_id)
+
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.username = None
+        self.first_name = f"Партнёр {user_id}"
+        self.last_name = None
+
+
+class FakeChat:
+    def __init__(self, chat_id: int):
+        self.id = chat_id
+
+
+class FakeMessage:
+    def __init__(self, bot: FakeBot, user_id: int):
+        self.bot = bot
+        self.from_user = FakeUser(user_id)
+        self.chat = FakeChat(user_id)
+        self.text = "/start"
+
+    async def answer(self, text, **kwargs):
+        await self.bot.send_message(self.chat.id, text, **kwargs)
+
+    async def answer_photo(self, photo, **kwargs):
+        await self.bot.send_photo(self.chat.id, photo, **kwargs)
+
+
+async def legacy_start_handler(message: FakeMessage) -> None:
+    """Прежний command_start_handler: сообщения и паузы внутри обработчика"""
+    from bot.handlers.start import register_user, WELCOME_TEXT, REVENUE_PERCENT_TEXT, HOW_TO_EARN_PROMPT
+
+    user = message.from_user
+    await register_user(user.id, user.username, user.first_name, user.last_name, None)
+
+    # Фото есть на сервере (/app/uploads/start_image.jpg)
+    await message.answer_photo(photo=None)
+    await asyncio.sleep(0.3)
+    await message.answer(WELCOME_TEXT)
+    await asyncio.sleep(0.5)
+    await message.answer(REVENUE_PERCENT_TEXT)
+    await asyncio.sleep(0.5)
+    await message.answer(HOW_TO_EARN_PROMPT)
+
+
+def percentile(values, share: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+async def run(users: int, concurrency: int, latency: float) -> None:
+    from database.database import init_db, close_db
+    from bot.handlers import start
+    from bot.utils.onboarding import onboarding_sender
+
+    await init_db()
+    logging.getLogger().setLevel(logging.ERROR)
+    # Прогрев пула соединений до одновременной нагрузки
+    await start.register_user(1, None, "Прогрев", None, None)
+
+    # Фото на сервере есть: сценарий не должен пропускать первый шаг
+    with tempfile.NamedTemporaryFile(suffix=".jpg") as image:
+        start.START_ONBOARDING = (
+            start.START_ONBOARDING[0]._replace(content=image.name),
+        ) + start.START_ONBOARDING[1:]
+
+        print("=" * 82)
+        print(f"/start: {users} пользователей, одновременно {concurrency}, задержка Bot API {latency * 1000:.0f} мс")
+        print("=" * 82)
+        print(f"{'Обработчик':<10}{'p50, мс':>10}{'p95, мс':>10}{'max, мс':>10}"
+              f"{'доставка p50, мс':>18}{'доставка max, мс':>18}{'сообщ./с':>10}")
+
+        for offset, (name, handler) in enumerate(
+            (("legacy", legacy_start_handler), ("queued", start.command_start_handler))
+        ):
+            bot = FakeBot(latency)
+            semaphore = asyncio.Semaphore(concurrency)
+            durations = []
+            started_at = {}
+
+            async def one(user_id: int):
+                async with semaphore:
+                    message = FakeMessage(bot, user_id)
+                    started_at[user_id] = time.perf_counter()
+                    await handler(message)
+                    durations.append((time.perf_counter() - started_at[user_id]) * 1000)
+
+            base = 10 ** 6 * (offset + 1)
+            await asyncio.gather(*(one(base + n) for n in range(users)))
+            await onboarding_sender.close(timeout=600)
+
+            delivery = [(bot.delivered[user_id] - started) * 1000 for user_id, started in started_at.items()]
+            elapsed = max(bot.delivered.values()) - min(started_at.values())
+            print(f"{name:<10}{statistics.median(durations):>10.1f}{percentile(durations, 0.95):>10.1f}"
+                  f"{max(durations):>10.1f}{statistics.median(delivery):>18.1f}{max(delivery):>18.1f}"
+                  f"{bot.messages / elapsed:>10.1f}")
+
+    await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20, help="одновременно обрабатываемых апдейтов")
+    parser.add_argument("--api-latency", type=float, default=0.05, help="задержка ответа Bot API, с")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # URL базы должен быть задан до импорта database.database
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        asyncio.run(run(args.users, args.concurrency, args.api_latency))
+
+
+if __name__ == "__main__":
+    main()
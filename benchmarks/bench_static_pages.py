@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк загрузки страниц админ-панели: первый и повторный визит
+
+Простой браузер поверх httpx.ASGITransport (приложение admin_panel.app в том
+же процессе) открывает страницы: загружает HTML, затем стили и скрипты из
+ссылок /static/... Браузер хранит ответы с ETag и Cache-Control как
+настоящий: свежие по max-age не запрашивает, остальные проверяет через
+If-None-Match.
+
+Для каждой страницы выводятся запросы, байты на проводе и время сервера:
+- первый визит - пустой кэш;
+- повторный визит - кэш после первого визита (--repeat раз, медиана).
+
+Использование:
+    python benchmarks/bench_static_pages.py [--pages /,/dialogs] [--repeat 20] [--accept-encoding "gzip, deflate, br"]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import re
+import statistics
+import tempfile
+import time
+from typing import Dict, NamedTuple, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ASSET_LINK = re.compile(r'(?:src|href)="(/static/[^"]+)"')
+MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class CachedEntry(NamedTuple):
+    body: bytes
+    etag: Optional[str]
+    expires: float
+
+
+class Visit(NamedTuple):
+    requests: int
+    not_modified: int
+    wire_bytes: int
+    elapsed_ms: float
+
+
+class Browser:
+    """HTTP-кэш браузера: max-age, no-cache и ETag"""
+
+    def __init__(self, client, accept_encoding: str):
+        self.client = client
+        self.accept_encoding = accept_encoding
+        self.cache: Dict[str, CachedEntry] = {}
+
+    async def fetch(self, url: str, stats: dict) -> bytes:
+        entry = self.cache.get(url)
+        if entry and entry.expires > time.monotonic():
+            return entry.body
+
+        headers = {"Accept-Encoding": self.accept_encoding}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        response = await self.client.get(url, headers=headers)
+        stats["requests"] += 1
+        stats["wire_bytes"] += response.num_bytes_downloaded
+        if response.status_code == 304:
+            stats["not_modified"] += 1
+            body = entry.body
+        else:
+            response.raise_for_status()
+            body = response.content
+
+        cache_control = response.headers.get("cache-control", "")
+        max_age = MAX_AGE.search(cache_control)
+        expires = time.monotonic() + int(max_age.group(1)) if max_age and "no-cache" not in cache_control else 0.0
+        etag = response.headers.get("etag") or (entry.etag if entry else None)
+        if etag or expires:
+            self.cache[url] = CachedEntry(body, etag, expires)
+        return body
+
+    async def visit(self, path: str) -> Visit:
+        stats = {"requests": 0, "not_modified": 0, "wire_bytes": 0}
+        started = time.perf_counter()
+        html = await self.fetch(path, stats)
+        for url in ASSET_LINK.findall(html.decode("utf-8")):
+            await self.fetch(url, stats)
+        elapsed = (time.perf_counter() - started) * 1000
+        return Visit(stats["requests"], stats["not_modified"], stats["wire_bytes"], elapsed)
+
+
+async def run(args) -> None:
+    import httpx
+    from admin_panel.app import app
+    from database.database import close_db
+
+    print("=" * 72)
+    print(f"Accept-Encoding: {args.accept_encoding}")
+    print("=" * 72)
+    print(f"{'Страница':<12}{'визит':<12}{'запросов':>10}{'из них 304':>12}{'байт':>12}{'время, мс':>12}")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in args.pages:
+            browser = Browser(client, args.accept_encoding)
+            first = await browser.visit(path)
+            repeats = [await browser.visit(path) for _ in range(args.repeat)]
+            repeat = repeats[-1]
+            for label, visit, elapsed in (
+                ("первый", first, first.elapsed_ms),
+                ("повторный", repeat, statistics.median(v.elapsed_ms for v in repeats)),
+            ):
+                print(f"{path:<12}{label:<12}{visit.requests:>10}{visit.not_modified:>12}"
+                      f"{visit.wire_bytes:>12}{elapsed:>12.2f}")
+    await close_db()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default="/,/dialogs", help="пути страниц через запятую")
+    parser.add_argument("--repeat", type=int, default=20, help="повторных визитов")
+    parser.add_argument("--accept-encoding", default="gzip, deflate, br")
+    args = parser.parse_args()
+    args.pages = [path.strip() for path in args.pages.split(",") if path.strip()]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Страницам база не нужна, но admin_panel.app создает движок при импорте
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Два веб-процесса против единого сервиса (server.py)
+
+Запускает на временной базе SQLite и поддельном Bot API:
+- split: admin_panel.app:app и message_server:app отдельными процессами uvicorn
+  (как сейчас: порты 8001 и 8002);
+- unified: server:app одним процессом;
+- unified xN: server:app с --workers N.
+
+Нагрузка - смесь запросов к маршрутам обоих роутеров (списки пользователей и
+диалогов, ответ по делу с уведомлением клиента, /api/notify, пользователь по
+Telegram ID). После нагрузки выводятся суммарный RSS всех процессов сервиса,
+число открытых соединений с файлом базы и число TCP-соединений к Bot API
+(на каждое ли сообщение открывается новое).
+
+Работает только на Linux (читает /proc).
+
+Использование:
+    python benchmarks/bench_web_service.py [--requests 2000] [--concurrency 20] [--workers 2]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import socket
+import subprocess
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def process_tree(pid: int):
+    """PID процесса и всех его потомков"""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    tree, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        tree.append(current)
+        stack.extend(children.get(current, []))
+    return tree
+
+
+def rss_kib(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def db_handles(pid: int, db_path: str) -> int:
+    """Открытые дескрипторы файла базы (соединения SQLite)"""
+    count = 0
+    for fd in os.listdir(f"/proc/{pid}/fd"):
+        try:
+            if os.readlink(f"/proc/{pid}/fd/{fd}") == db_path:
+                count += 1
+        except OSError:
+            pass
+    return count
+
+
+async def start_fake_bot_api(port: int):
+    """Bot API, который отвечает ok на sendMessage и считает TCP-соединения"""
+    from aiohttp import web
+
+    peers = set()
+
+    async def send_message(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        await asyncio.sleep(0.005)
+        return web.json_response({"ok": True, "result": {"message_id": 1}})
+
+    app = web.Application()
+    app.router.add_post("/bot{token}/sendMessage", send_message)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner, peers
+
+
+async def seed(db_path: str) -> int:
+    """Схема, 200 пользователей и дело для ответов; возвращает ID дела"""
+    from database.database import init_db, get_db, close_db
+    from database.models import User, CaseQuestionnaire
+
+    await init_db()
+    async with get_db() as db:
+        users = [User(telegram_id=10 ** 9 + n, first_name=f"Клиент {n}") for n in range(200)]
+        db.add_all(users)
+        await db.flush()
+        case = CaseQuestionnaire(user_id=users[0].id, dispute_subject="Тестовое дело", status="new")
+        db.add(case)
+        await db.flush()
+        case_id = case.id
+    await close_db()
+    return case_id
+
+
+async def wait_ready(client, url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(url)).status_code < 500:
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"Сервис не запустился: {url}")
+
+
+async def load(client, admin_url: str, messaging_url: str, case_id: int, total: int, concurrency: int) -> float:
+    requests = [
+        ("GET", admin_url, "/api/users/list", None),
+        ("GET", admin_url, "/api/dialogs", None),
+        ("POST", admin_url, f"/api/cases/{case_id}/messages", {"content": "Ответ юриста", "sender_id": 0}),
+        ("POST", messaging_url, "/api/notify", {"telegram_id": 10 ** 9 + 1, "message": "Уведомление"}),
+        ("GET", messaging_url, f"/api/users/{10 ** 9 + 2}", None),
+    ]
+    semaphore = asyncio.Semaphore(concurrency)
+    errors = 0
+
+    async def one(n: int):
+        nonlocal errors
+        method, base, path, body = requests[n % len(requests)]
+        async with semaphore:
+            response = await client.request(method, base + path, json=body)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(n) for n in range(total)))
+    elapsed = time.perf_counter() - started
+    if errors:
+        print(f"  ошибок: {errors}")
+    return total / elapsed
+
+
+async def run(args, db_path: str, case_id: int) -> None:
+    import httpx
+
+    api_port = free_port()
+    api_runner, peers = await start_fake_bot_api(api_port)
+
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite+aiosqlite:///{db_path}",
+        TELEGRAM_API_URL=f"http://127.0.0.1:{api_port}",
+        BOT_TOKEN="123:bench",
+        PYTHONPATH=PROJECT_DIR,
+    )
+
+    def uvicorn(target: str, port: int, workers: int = 1):
+        return subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", target, "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(workers), "--log-level", "warning"],
+            cwd=PROJECT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+    setups = [("split", None), ("unified", 1), (f"unified x{args.workers}", args.workers)]
+
+    print("=" * 72)
+    print(f"Запросов: {args.requests}, одновременно: {args.concurrency}")
+    print("=" * 72)
+    print(f"{'Вариант':<14}{'процессов':>10}{'RSS, МБ':>10}{'соед. с БД':>12}{'TCP к Bot API':>15}{'запр./с':>10}")
+
+    async with httpx.AsyncClient(timeout=60) as client:
+        for name, workers in setups:
+            peers.clear()
+            if workers is None:
+                admin_port, messaging_port = free_port(), free_port()
+                processes = [uvicorn("admin_panel.app:app", admin_port), uvicorn("message_server:app", messaging_port)]
+            else:
+                admin_port = messaging_port = free_port()
+                processes = [uvicorn("server:app", admin_port, workers)]
+            admin_url = f"http://127.0.0.1:{admin_port}"
+            messaging_url = f"http://127.0.0.1:{messaging_port}"
+
+            try:
+                await wait_ready(client, admin_url + "/api/users/list")
+                await wait_ready(client, messaging_url + "/health")
+                rate = await load(client, admin_url, messaging_url, case_id, args.requests, args.concurrency)
+
+                pids = [pid for process in processes for pid in process_tree(process.pid)]
+                # Воркеры uvicorn запускаются через multiprocessing: в дереве есть resource_tracker без соединений
+                rss = sum(rss_kib(pid) for pid in pids) / 1024
+                handles = sum(db_handles(pid, db_path) for pid in pids)
+                print(f"{name:<14}{len(pids):>10}{rss:>10.1f}{handles:>12}{len(peers):>15}{rate:>10.1f}")
+            finally:
+                for process in processes:
+                    process.terminate()
+                for process in processes:
+                    process.wait(timeout=30)
+
+    await api_runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=2, help="воркеров uvicorn для варианта unified xN")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        # URL базы должен быть задан до импорта database.database
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+        case_id = asyncio.run(seed(db_path))
+        asyncio.run(run(args, db_path, case_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""
+Нагрузочный тест бота целиком: run_bot.py против поддельного Telegram Bot API
+
+- fake_bot_api.py - Bot API в памяти (getUpdates, sendMessage, getFile, sendDocument, ...)
+- scenarios.py - виртуальные пользователи и сценарии (/start по реферальной
+  ссылке, анкета дела с документами, профиль партнера, выручка)
+- __main__.py - запуск бота на SQLite или PostgreSQL и отчет по шагам
+
+Использование:
+    python -m benchmarks.loadtest [--users 50] [--concurrency 20]
+"""
@@ -0,0 +1,185 @@
+"""
+Поддельный Telegram Bot API для нагрузочного теста
+
+aiohttp-сервер с методами, которые вызывает бот: getMe, deleteWebhook,
+getUpdates (long polling из очереди апдейтов теста), sendMessage,
+sendPhoto, sendDocument, editMessageText, deleteMessage,
+answerCallbackQuery, getFile и скачивание файла по /file/bot<token>/<path>.
+Остальные методы отвечают ok с result=true.
+
+Виртуальные пользователи кладут апдейты через push_update() и ждут
+ответов бота в своем чате через replies(chat_id).
+"""
+import asyncio
+import json
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from aiohttp import web
+
+# Методы, которые отправляют пользователю сообщение
+MESSAGE_METHODS = {"sendMessage", "sendPhoto", "sendDocument", "editMessageText"}
+
+
+class Reply(NamedTuple):
+    """Сообщение бота, полученное поддельным API"""
+    method: str
+    chat_id: int
+    text: str
+    reply_markup: Optional[dict]
+    received_at: float
+
+
+class FakeBotAPI:
+    """Bot API в памяти с фиксированной задержкой ответа"""
+
+    def __init__(self, token: str, latency: float = 0.0, file_size: int = 64 * 1024):
+        self.token = token
+        self.latency = latency
+        self.file_content = b"%PDF-1.4\n" + b"0" * max(0, file_size - 9)
+        self.calls: Counter = Counter()
+        self._updates: List[dict] = []
+        self._update_id = 0
+        self._message_id = 0
+        self._new_updates = asyncio.Event()
+        self._replies: Dict[int, asyncio.Queue] = defaultdict(asyncio.Queue)
+        self._runner: Optional[web.AppRunner] = None
+
+    # ---------- сторона теста ----------
+
+    def push_update(self, update: Dict[str, Any]) -> int:
+        """Ставит апдейт в очередь getUpdates; возвращает update_id"""
+        self._update_id += 1
+        update["update_id"] = self._update_id
+        self._updates.append(update)
+        self._new_updates.set()
+        return self._update_id
+
+    def replies(self, chat_id: int) -> asyncio.Queue:
+        """Очередь сообщений бота в чат"""
+        return self._replies[chat_id]
+
+    def next_message_id(self) -> int:
+        self._message_id += 1
+        return self._message_id
+
+    # ---------- сервер ----------
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Запускает сервер; возвращает базовый URL для TELEGRAM_API_URL"""
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/bot{token}/{method}", self._handle_method)
+        app.router.add_get("/bot{token}/{method}", self._handle_method)
+        app.router.add_get("/file/bot{token}/{path:.+}", self._handle_file)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        # Бот может висеть в getUpdates: будим его, чтобы сервер закрылся сразу
+        self._new_updates.set()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_method(self, request: web.Request) -> web.Response:
+        if request.match_info["token"] != self.token:
+            return web.json_response({"ok": False, "error_code": 401, "description": "Unauthorized"}, status=401)
+
+        method = request.match_info["method"]
+        params = await self._read_params(request)
+        self.calls[method] += 1
+
+        if method == "getUpdates":
+            return web.json_response({"ok": True, "result": await self._get_updates(params)})
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        handler = getattr(self, f"_method_{method}", None)
+        result = handler(params) if handler else True
+        return web.json_response({"ok": True, "result": result})
+
+    async def _read_params(self, request: web.Request) -> Dict[str, Any]:
+        """Параметры метода: aiogram шлет multipart, сложные поля - строками JSON"""
+        if request.content_type == "application/json":
+            return await request.json()
+        params = {}
+        for key, value in (await request.post()).items():
+            if isinstance(value, web.FileField):
+                params[key] = value.filename
+                continue
+            if key in ("reply_markup", "allowed_updates"):
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    pass
+            params[key] = value
+        return params
+
+    async def _get_updates(self, params: Dict[str, Any]) -> List[dict]:
+        offset = int(params.get("offset") or 0)
+        timeout = float(params.get("timeout") or 0)
+        # Подтвержденные апдейты (id < offset) больше не нужны
+        self._updates = [update for update in self._updates if update["update_id"] >= offset]
+        if not self._updates and timeout:
+            self._new_updates.clear()
+            try:
+                await asyncio.wait_for(self._new_updates.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        limit = int(params.get("limit") or 100)
+        return [update for update in self._updates if update["update_id"] >= offset][:limit]
+
+    async def _handle_file(self, request: web.Request) -> web.Response:
+        self.calls["downloadFile"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return web.Response(body=self.file_content, content_type="application/octet-stream")
+
+    # ---------- методы Bot API ----------
+
+    def _method_getMe(self, params) -> dict:
+        return {"id": int(self.token.split(":")[0]), "is_bot": True, "first_name": "Load Test", "username": "loadtest_bot"}
+
+    def _message(self, method: str, params: Dict[str, Any]) -> dict:
+        chat_id = int(params["chat_id"])
+        text = params.get("text") or params.get("caption") or ""
+        reply = Reply(method, chat_id, text, params.get("reply_markup"), time.perf_counter())
+        self._replies[chat_id].put_nowait(reply)
+        message = {
+            "message_id": int(params.get("message_id") or self.next_message_id()),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private" if chat_id > 0 else "supergroup"},
+        }
+        if text:
+            message["text" if method in ("sendMessage", "editMessageText") else "caption"] = text
+        return message
+
+    def _method_sendMessage(self, params) -> dict:
+        return self._message("sendMessage", params)
+
+    def _method_editMessageText(self, params) -> dict:
+        return self._message("editMessageText", params)
+
+    def _method_sendPhoto(self, params) -> dict:
+        message = self._message("sendPhoto", params)
+        message["photo"] = [{"file_id": "photo", "file_unique_id": "photo", "width": 800, "height": 600}]
+        return message
+
+    def _method_sendDocument(self, params) -> dict:
+        message = self._message("sendDocument", params)
+        message["document"] = {"file_id": "document", "file_unique_id": "document"}
+        return message
+
+    def _method_getFile(self, params) -> dict:
+        file_id = params["file_id"]
+        return {
+            "file_id": file_id,
+            "file_unique_id": file_id,
+            "file_size": len(self.file_content),
+            "file_path": f"documents/{file_id}.pdf",
+        }
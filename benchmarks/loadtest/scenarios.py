@@ -0,0 +1,167 @@
+"""
+Сценарии виртуальных пользователей
+
+Виртуальный пользователь пишет боту через поддельный Bot API и после
+каждого шага ждет ответа бота в своем чате. Время шага - от постановки
+апдейта в очередь getUpdates до сообщения бота, подходящего под ожидание
+шага (сообщения приветствия, пришедшие позже, пропускаются).
+
+Сценарии:
+- start: /start с реферальным кодом
+- send_case: анкета дела из 7 этапов, загрузка документов, сводка и отправка
+- profile: мастер профиля партнера (ФИО, компания, телефон, email,
+  специализация, опыт)
+- revenue: добавление выручки (сумма и описание)
+"""
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.loadtest.fake_bot_api import FakeBotAPI, Reply
+
+
+class StepTimeout(Exception):
+    """Бот не ответил на шаг за отведенное время"""
+
+
+class VirtualUser:
+    """Пользователь Telegram, который переписывается с ботом по сценарию"""
+
+    def __init__(self, api: FakeBotAPI, telegram_id: int, results: Dict[str, List[float]],
+                 errors: Dict[str, int], timeout: float):
+        self.api = api
+        self.telegram_id = telegram_id
+        self.results = results
+        self.errors = errors
+        self.timeout = timeout
+        self.started = 0.0
+        self.replies = api.replies(telegram_id)
+
+    @property
+    def user(self) -> dict:
+        return {"id": self.telegram_id, "is_bot": False, "first_name": f"Партнёр {self.telegram_id}",
+                "username": f"vu{self.telegram_id}", "language_code": "ru"}
+
+    def _message(self, **fields) -> dict:
+        return {
+            "message_id": self.api.next_message_id(),
+            "date": int(time.time()),
+            "chat": {"id": self.telegram_id, "type": "private"},
+            "from": self.user,
+            **fields,
+        }
+
+    async def wait_for(self, name: str, started: float, expect: Callable[[Reply], bool]) -> Reply:
+        """Ждет сообщение бота под ожидание и записывает время от started"""
+        deadline = started + self.timeout
+        while True:
+            remaining = deadline - time.perf_counter()
+            try:
+                reply = await asyncio.wait_for(self.replies.get(), max(0.0, remaining))
+            except asyncio.TimeoutError:
+                self.errors[name] += 1
+                raise StepTimeout(name)
+            if expect(reply):
+                self.results[name].append((reply.received_at - started) * 1000)
+                return reply
+
+    async def _step(self, name: str, update: dict, expect: Callable[[Reply], bool]) -> Reply:
+        self.started = time.perf_counter()
+        self.api.push_update(update)
+        return await self.wait_for(name, self.started, expect)
+
+    async def send_text(self, name: str, text: str, expect: Callable[[Reply], bool]) -> Reply:
+        return await self._step(name, {"message": self._message(text=text)}, expect)
+
+    async def send_command(self, name: str, command: str, expect: Callable[[Reply], bool]) -> Reply:
+        message = self._message(text=command, entities=[
+            {"type": "bot_command", "offset": 0, "length": len(command.split(" ")[0])}
+        ])
+        return await self._step(name, {"message": message}, expect)
+
+    async def send_document(self, name: str, file_name: str, size: int, expect: Callable[[Reply], bool]) -> Reply:
+        file_id = f"doc-{self.telegram_id}-{self.api.next_message_id()}"
+        document = {"file_id": file_id, "file_unique_id": file_id, "file_name": file_name,
+                    "mime_type": "application/pdf", "file_size": size}
+        return await self._step(name, {"message": self._message(document=document)}, expect)
+
+    async def press(self, name: str, data: str, expect: Callable[[Reply], bool]) -> Reply:
+        """Нажатие inline-кнопки с callback data"""
+        callback = {
+            "id": f"cb-{self.telegram_id}-{self.api.next_message_id()}",
+            "from": self.user,
+            "chat_instance": str(self.telegram_id),
+            "data": data,
+            "message": {
+                "message_id": self.api.next_message_id(),
+                "date": int(time.time()),
+                "chat": {"id": self.telegram_id, "type": "private"},
+                "from": {"id": 1, "is_bot": True, "first_name": "Load Test"},
+                "text": "...",
+            },
+        }
+        return await self._step(name, {"callback_query": callback}, expect)
+
+
+def contains(text: str) -> Callable[[Reply], bool]:
+    return lambda reply: text in reply.text
+
+
+def any_reply(reply: Reply) -> bool:
+    return True
+
+
+async def scenario_start(user: VirtualUser, referral_code: Optional[str] = None) -> None:
+    """start - первое сообщение бота, start.onboarding - последнее сообщение приветствия"""
+    command = f"/start {referral_code}" if referral_code else "/start"
+    await user.send_command("start", command, any_reply)
+    await user.wait_for("start.onboarding", user.started, contains("как заработать с нами"))
+
+
+async def scenario_send_case(user: VirtualUser, documents: int = 2, document_size: int = 64 * 1024) -> None:
+    await user.send_text("case.open", "💼 Отправить дело на оценку", contains("Этап 1 из 7"))
+    answers = (
+        "Истец - ООО Ромашка (наш клиент), ответчик - ООО Василек",
+        "Взыскание задолженности по договору поставки, 1 200 000 руб.",
+        "Статьи 309, 310, 506 ГК РФ, договор поставки от 01.02.2024",
+        "01.02 - договор, 15.03 - поставка, 15.04 - срок оплаты, оплаты нет",
+        "Договор, УПД, претензия, переписка по email",
+        "Претензия направлена 20.04, ответа нет",
+        "Взыскать долг и неустойку",
+    )
+    for step, answer in enumerate(answers, 1):
+        expect = contains(f"Этап {step + 1} из 7") if step < 7 else contains("Загрузка документов")
+        await user.send_text("case.step", answer, expect)
+    for n in range(documents):
+        await user.send_document("case.upload", f"document_{n + 1}.pdf", document_size, contains("загружен"))
+    await user.send_text("case.summary", "✅ Готово", contains("СВОДКА АНКЕТЫ"))
+    await user.press("case.submit", "q_submit", contains("Анкета успешно отправлена"))
+
+
+async def scenario_profile(user: VirtualUser) -> None:
+    await user.press("profile.open", "profile_update", contains("ФИО"))
+    fields = (
+        ("Иванов Иван Иванович", "компании"),
+        ("ООО Консалт", "телефон"),
+        ("+7 900 000-00-00", "email"),
+        (f"vu{user.telegram_id}@example.com", "специализацию"),
+        ("НДС, зарплата", "опыт"),
+    )
+    for value, next_prompt in fields:
+        await user.send_text("profile.field", value, contains(next_prompt))
+    await user.send_text("profile.save", "7", contains("профиль успешно обновлен"))
+
+
+async def scenario_revenue(user: VirtualUser) -> None:
+    await user.send_text("revenue.open", "💰 Добавить выручку", contains("Добавление выручки"))
+    await user.send_text("revenue.amount", "150000", contains("описание"))
+    await user.send_text("revenue.save", "Консультация по договору поставки", contains("Выручка успешно добавлена"))
+
+
+SCENARIOS = {
+    "start": scenario_start,
+    "profile": scenario_profile,
+    "revenue": scenario_revenue,
+    "send_case": scenario_send_case,
+}
+
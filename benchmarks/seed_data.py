@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Генератор синтетических данных для бенчмарков админ-панели
+
+Заполняет пустую базу (DATABASE_URL) пользователями, профилями партнеров,
+реферальным деревом, выручкой, выплатами, анкетами и перепиской. Распределения
+неравномерные, как в рабочей базе:
+- регистрации смещены к последним месяцам;
+- реферер выбирается пропорционально числу уже приглашенных (у немногих
+  партнеров большие поддеревья, у большинства - ни одного приглашенного);
+- выручка и переписка распределены по закону Ципфа: несколько партнеров и
+  диалогов дают большую часть строк, суммы - логнормальные;
+- выплаты есть у рефереров за последние --payout-months месяцев, старые
+  выплачены, за последний месяц - ожидают.
+
+Замыкание реферального дерева строят триггеры базы при вставке связей.
+Генерация детерминирована (--seed).
+
+Использование:
+    DATABASE_URL=sqlite+aiosqlite:///bench.db python benchmarks/seed_data.py [--users 10000]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Строк в одном executemany
+CHUNK_ROWS = 5000
+
+
+class SeedConfig(NamedTuple):
+    """Объемы и доли синтетических данных"""
+    users: int = 10000
+    partner_share: float = 0.3  # доля пользователей с профилем партнера
+    referral_share: float = 0.6  # доля пользователей, пришедших по реферальной ссылке
+    revenues: int = 20000
+    payout_months: int = 6
+    cases: int = 1000
+    dialog_share: float = 0.2  # доля пользователей, писавших в поддержку
+    messages: int = 50000
+    seed: int = 42
+
+    @classmethod
+    def scaled(cls, users: int, **overrides) -> "SeedConfig":
+        """Объемы остальных таблиц пропорционально числу пользователей"""
+        values = dict(users=users, revenues=users * 2, cases=max(1, users // 10), messages=users * 5)
+        values.update(overrides)
+        return cls(**values)
+
+
+def zipf_cum_weights(count: int, exponent: float = 1.1) -> List[float]:
+    """Накопленные веса рангов 1..count для random.choices"""
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def generate(config: SeedConfig, now: datetime) -> Dict[str, List[dict]]:
+    """Строки всех таблиц; id пользователей - 1..users"""
+    rnd = random.Random(config.seed)
+    user_ids = range(1, config.users + 1)
+
+    # Регистрации: чем новее, тем чаще (квадрат равномерного смещает к нулю)
+    registered = sorted((now - timedelta(days=365 * rnd.random() ** 2) for _ in user_ids))
+    users = [{
+        "id": user_id,
+        "telegram_id": 10 ** 9 + user_id,
+        "username": f"user{user_id}" if rnd.random() < 0.6 else None,
+        "first_name": f"Пользователь {user_id}",
+        "last_name": None,
+        "registered_at": registered[user_id - 1],
+        "is_active": True,
+    } for user_id in user_ids]
+
+    partner_ids = sorted(rnd.sample(user_ids, int(config.users * config.partner_share)))
+    profiles = [{
+        "user_id": user_id,
+        "full_name": f"Партнёр {user_id}",
+        "company_name": f"ООО Компания {user_id % 997}",
+        "phone": f"+7900{user_id:07d}",
+        "email": f"partner{user_id}@example.com",
+        "specialization": rnd.choice(("НДС", "зарплата", "отчетность", "арбитраж", "банкротство")),
+        "experience": rnd.randint(1, 25),
+        "consent_to_share_data": rnd.random() < 0.5,
+        "created_at": registered[user_id - 1],
+        "updated_at": registered[user_id - 1],
+    } for user_id in partner_ids]
+
+    # Предпочтительное присоединение: каждый приглашенный снова кладет реферера в мешок
+    relationships = []
+    bag = [1]
+    for user_id in range(2, config.users + 1):
+        if rnd.random() < config.referral_share:
+            referrer_id = rnd.choice(bag)
+            relationships.append({
+                "referrer_id": referrer_id,
+                "referred_id": user_id,
+                "created_at": registered[user_id - 1],
+            })
+            bag.append(referrer_id)
+        bag.append(user_id)
+
+    earners = partner_ids or list(user_ids)
+    rnd.shuffle(earners)
+    earner_weights = zipf_cum_weights(len(earners))
+    revenues = [{
+        "partner_id": partner_id,
+        "amount": int(rnd.lognormvariate(10, 1)),
+        "description": "Сделка",
+        "client_reference": None,
+        "created_at": now - timedelta(days=365 * rnd.random()),
+    } for partner_id in rnd.choices(earners, cum_weights=earner_weights, k=config.revenues)]
+
+    referrers = sorted({relationship["referrer_id"] for relationship in relationships})
+    payouts = []
+    for months_ago in range(config.payout_months, 0, -1):
+        year, month = divmod(now.year * 12 + now.month - 1 - months_ago, 12)
+        month_start = datetime(year, month + 1, 1)
+        for referrer_id in referrers:
+            if rnd.random() < 0.5:
+                continue
+            status = "pending" if months_ago == 1 else rnd.choices(("paid", "cancelled"), (0.95, 0.05))[0]
+            payouts.append({
+                "referrer_id": referrer_id,
+                "amount": int(rnd.lognormvariate(7, 1)),
+                "month": month_start.month,
+                "year": month_start.year,
+                "status": status,
+                "paid_at": month_start + timedelta(days=40) if status == "paid" else None,
+                "created_at": min(month_start + timedelta(days=31), now),
+            })
+
+    cases = [{
+        "id": case_id,
+        "user_id": rnd.choice(user_ids),
+        "parties_info": "Истец - клиент, ответчик - контрагент",
+        "dispute_subject": f"Взыскание задолженности по договору {case_id}",
+        "legal_basis": "Статьи 309, 310 ГК РФ",
+        "chronology": "Договор, поставка, неоплата",
+        "evidence": "Договор, акты, переписка",
+        "procedural_history": "Претензия без ответа",
+        "client_goal": "Взыскать долг",
+        "status": rnd.choice(("sent", "в работе", "завершено")),
+        "created_at": now - timedelta(days=365 * rnd.random() ** 2),
+        "sent_at": now - timedelta(days=365 * rnd.random() ** 2),
+    } for case_id in range(1, config.cases + 1)]
+
+    dialog_users = rnd.sample(user_ids, max(1, int(config.users * config.dialog_share)))
+    dialog_weights = zipf_cum_weights(len(dialog_users))
+    message_times = sorted(now - timedelta(days=180 * rnd.random()) for _ in range(config.messages))
+    messages = []
+    for created_at, sender_id in zip(message_times, rnd.choices(dialog_users, cum_weights=dialog_weights,
+                                                                 k=config.messages)):
+        sender_type = "client" if rnd.random() < 0.6 else "admin"
+        messages.append({
+            "questionnaire_id": 0,
+            "sender_id": sender_id,
+            "sender_type": sender_type,
+            "message_content": "Добрый день! Подскажите, пожалуйста, по статусу дела" if sender_type == "client"
+            else "Здравствуйте! Дело в работе, юрист свяжется с вами сегодня",
+            # Непрочитанные - только свежие сообщения клиентов
+            "is_read": sender_type == "admin" or created_at < now - timedelta(days=3) or rnd.random() < 0.5,
+            "created_at": created_at,
+        })
+
+    return {
+        "users": users,
+        "partner_profiles": profiles,
+        "referral_relationships": relationships,
+        "partner_revenues": revenues,
+        "referral_payouts": payouts,
+        "case_questionnaires": cases,
+        "case_messages": messages,
+    }
+
+
+async def seed_database(config: SeedConfig) -> Dict[str, int]:
+    """
+    Создает схему и заполняет пустую базу из DATABASE_URL
+
+    Returns:
+        Dict[str, int]: Количество строк по таблицам
+    """
+    from database.database import engine, init_db
+    from database.models import Base
+
+    await init_db()
+    rows = generate(config, datetime.utcnow())
+    async with engine.begin() as conn:
+        for table_name, table_rows in rows.items():
+            table = Base.metadata.tables[table_name]
+            for start in range(0, len(table_rows), CHUNK_ROWS):
+                await conn.execute(table.insert(), table_rows[start:start + CHUNK_ROWS])
+
+        if conn.dialect.name == "postgresql":
+            # id вставлены явно: последовательности должны идти после них
+            for table_name in ("users", "case_questionnaires"):
+                await conn.exec_driver_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 1) FROM {table_name}))"
+                )
+    return {table_name: len(table_rows) for table_name, table_rows in rows.items()}
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Параметры генератора (общие с бенчмарками)"""
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--partner-share", type=float, default=0.3)
+    parser.add_argument("--referral-share", type=float, default=0.6)
+    parser.add_argument("--revenues", type=int, help="по умолчанию 2 на пользователя")
+    parser.add_argument("--payout-months", type=int, default=6)
+    parser.add_argument("--cases", type=int, help="по умолчанию 1 на 10 пользователей")
+    parser.add_argument("--dialog-share", type=float, default=0.2)
+    parser.add_argument("--messages", type=int, help="по умолчанию 5 на пользователя")
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def config_from_args(args: argparse.Namespace) -> SeedConfig:
+    overrides = {
+        name: getattr(args, name)
+        for name in ("partner_share", "referral_share", "revenues", "payout_months", "cases",
+                     "dialog_share", "messages", "seed")
+        if getattr(args, name) is not None
+    }
+    return SeedConfig.scaled(args.users, **overrides)
+
+
+async def run(config: SeedConfig) -> None:
+    from database.database import close_db
+
+    started = time.perf_counter()
+    counts = await seed_database(config)
+    await close_db()
+    for table_name, count in counts.items():
+        print(f"{table_name:<24}{count:>10}")
+    print(f"Готово за {time.perf_counter() - started:.1f} с")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    asyncio.run(run(config_from_args(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
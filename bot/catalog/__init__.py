@@ -0,0 +1,22 @@
+"""
+Каталог юридических услуг
+"""
+from .services import (
+    CATEGORY_CALLBACK_PREFIX,
+    SERVICE_CALLBACK_PREFIX,
+    SERVICE_CATEGORIES,
+    CATEGORY_TITLES,
+    SERVICES,
+    ServiceCard,
+    get_category_buttons,
+)
+
+__all__ = [
+    'CATEGORY_CALLBACK_PREFIX',
+    'SERVICE_CALLBACK_PREFIX',
+    'SERVICE_CATEGORIES',
+    'CATEGORY_TITLES',
+    'SERVICES',
+    'ServiceCard',
+    'get_category_buttons',
+]
@@ -0,0 +1,949 @@
+"""
+Каталог юридических услуг
+Тексты услуг хранятся как данные, HTML-карточки и клавиатуры собираются один раз при импорте
+"""
+from typing import Dict, List, NamedTuple, Tuple
+
+from aiogram.types import InlineKeyboardMarkup
+
+from bot.keyboards.frozen import FrozenInlineKeyboardMarkup, FrozenInlineKeyboardButton
+
+
+# Префиксы callback_data для категорий и карточек услуг
+CATEGORY_CALLBACK_PREFIX = "legal_category_"
+SERVICE_CALLBACK_PREFIX = "service_"
+
+
+# ============================================
+# Данные каталога
+# ============================================
+
+SERVICE_CATEGORIES = {
+    "legal_category_tax": {
+        "name": "Налоговое право и споры",
+        "services": [
+            {
+                "key": "service_tax_consulting",
+                "button": "Налоговый консалтинг и планирование",
+                "title": "📊 Налоговый консалтинг и планирование",
+                "description": (
+                    "Комплексный анализ вашей системы налогообложения, выявление точек оптимизации, "
+                    "разработка законных схем снижения налоговой нагрузки. Консультации по всем аспектам "
+                    "налогового права, подготовка заключений по сложным вопросам."
+                ),
+                "advantages": [
+                    "Экс-сотрудники ФНС в команде",
+                    "Законная оптимизация без рисков",
+                    "Экономия до 40% на налогах",
+                    "Персональная стратегия под ваш бизнес",
+                    "Сопровождение внедрения рекомендаций",
+                ],
+            },
+            {
+                "key": "service_tax_audits_defense",
+                "button": "Защита в налоговых проверках",
+                "title": "🛡️ Защита в налоговых проверках",
+                "description": (
+                    "Полное сопровождение камеральных и выездных налоговых проверок. Подготовка к "
+                    "проверке, участие в мероприятиях контроля, анализ требований инспекции, подготовка "
+                    "возражений на акты проверок. Минимизация доначислений и штрафов."
+                ),
+                "advantages": [
+                    "Успешный опыт 200+ проверок",
+                    "Снижение доначислений в 3-5 раз",
+                    "Работаем на всех стадиях проверки",
+                    "Круглосуточная поддержка клиента",
+                    "Гарантия конфиденциальности",
+                ],
+            },
+            {
+                "key": "service_tax_disputes_appeal",
+                "button": "Обжалование решений ИФНС",
+                "title": "⚖️ Обжалование решений и действий ИФНС",
+                "description": (
+                    "Подготовка и подача жалоб на решения налоговых органов в вышестоящий орган и суд. "
+                    "Оспаривание актов проверок, требований об уплате налогов, решений о привлечении к "
+                    "ответственности. Представительство в судах всех инстанций."
+                ),
+                "advantages": [
+                    "85% выигранных дел",
+                    "Опыт работы в арбитражных судах",
+                    "Глубокое знание налоговой практики",
+                    "Работа без предоплаты (по согласованию)",
+                    "Прозрачная система оплаты",
+                ],
+            },
+            {
+                "key": "service_tax_refunds",
+                "button": "Взыскание излишне уплаченных налогов",
+                "title": "💰 Взыскание излишне уплаченных налогов и пеней",
+                "description": (
+                    "Помощь в возврате переплат по налогам, пеням и штрафам. Проводим сверку с ИФНС, "
+                    "подготавливаем заявления на возврат, оспариваем отказы. Взыскание через суд в случае"
+                    " бездействия налоговой инспекции."
+                ),
+                "advantages": [
+                    "Возвращаем миллионы рублей клиентам",
+                    "Знаем все основания для отказа",
+                    "Работаем по всей России",
+                    "Ускоренный возврат за 30-45 дней",
+                    "Оплата по факту возврата",
+                ],
+            },
+            {
+                "key": "service_tax_bankruptcy_optimization",
+                "button": "Сопровождение банкротства (налоги)",
+                "title": "🏢 Сопровождение банкротства в целях налоговой оптимизации",
+                "description": (
+                    "Правовое сопровождение процедур банкротства с учётом налоговых аспектов. Защита от "
+                    "субсидиарной ответственности, оспаривание требований кредиторов, оптимизация налогов"
+                    " в рамках процедуры."
+                ),
+                "advantages": [
+                    "Защита личных активов собственника",
+                    "Снижение налоговой нагрузки при ликвидации",
+                    "Опыт 50+ успешных банкротств",
+                    "Комплексный подход: юристы + налоговики",
+                    "Конфиденциальность гарантирована",
+                ],
+            },
+            {
+                "key": "service_tax_crimes_defense",
+                "button": "Защита по делам о налоговых преступлениях",
+                "title": "🔒 Защита по делам о налоговых преступлениях",
+                "description": (
+                    "Защита по ст. 198, 199 УК РФ на всех стадиях уголовного процесса. Участие в "
+                    "проверках, допросах, обысках. Подготовка позиции защиты, взаимодействие со "
+                    "следствием, представительство в суде."
+                ),
+                "advantages": [
+                    "Адвокаты с опытом работы в правоохранительных органах",
+                    "90% дел закрыто на досудебной стадии",
+                    "Круглосуточный выезд при задержании",
+                    "Полная защита бизнеса и собственников",
+                    "Строгая конфиденциальность",
+                ],
+            },
+        ],
+    },
+    "legal_category_arbitration": {
+        "name": "Арбитражные споры и исполнительное производство",
+        "services": [
+            {
+                "key": "service_debt_collection",
+                "button": "Взыскание дебиторской задолженности",
+                "title": "💵 Взыскание дебиторской задолженности",
+                "description": (
+                    "Комплексное взыскание долгов в досудебном и судебном порядке. Претензионная работа, "
+                    "подача исков в арбитражный суд, получение исполнительных листов, сопровождение "
+                    "исполнительного производства, розыск имущества должника."
+                ),
+                "advantages": [
+                    "Взыскали более 500 млн рублей",
+                    "Досудебное урегулирование в 60% случаев",
+                    "Работаем по всей России",
+                    "Оплата по факту взыскания (по согласованию)",
+                    "Полное ведение дела «под ключ»",
+                ],
+            },
+            {
+                "key": "service_contract_disputes",
+                "button": "Споры по договорам",
+                "title": "📄 Споры по договорам",
+                "description": (
+                    "Защита интересов в спорах по договорам поставки, подряда, оказания услуг, аренды. "
+                    "Анализ договоров, подготовка правовой позиции, ведение дела в арбитражном суде, "
+                    "исполнение судебного решения."
+                ),
+                "advantages": [
+                    "Специализация на договорном праве",
+                    "Выиграли 90% споров по договорам",
+                    "Глубокий анализ перспектив дела",
+                    "Честная оценка рисков",
+                    "Прозрачное ценообразование",
+                ],
+            },
+            {
+                "key": "service_corporate_disputes",
+                "button": "Корпоративные споры",
+                "title": "🏛️ Корпоративные споры",
+                "description": (
+                    "Защита интересов участников и акционеров в корпоративных конфликтах. Оспаривание "
+                    "решений собраний, выход из состава участников, взыскание убытков с руководителей, "
+                    "разрешение споров о долях в уставном капитале."
+                ),
+                "advantages": [
+                    "Опыт в сложных корпоративных конфликтах",
+                    "Защита миноритарных акционеров",
+                    "Работа с публичными компаниями",
+                    "Конфиденциальность гарантирована",
+                    "Индивидуальная стратегия защиты",
+                ],
+            },
+            {
+                "key": "service_bankruptcy",
+                "button": "Банкротство",
+                "title": "⚖️ Банкротство юридических лиц",
+                "description": (
+                    "Сопровождение процедур банкротства на стороне должника или кредитора. Подготовка "
+                    "заявления о банкротстве, участие в собраниях кредиторов, защита от субсидиарной "
+                    "ответственности, оспаривание сделок должника."
+                ),
+                "advantages": [
+                    "Более 100 успешных процедур",
+                    "Защита от субсидиарной ответственности",
+                    "Работа с крупными долгами (от 100 млн ₽)",
+                    "Команда: юристы + финансовые управляющие",
+                    "Полное сопровождение «под ключ»",
+                ],
+            },
+            {
+                "key": "service_land_valuation_disputes",
+                "button": "Оспаривание кадастровой стоимости",
+                "title": "🏗️ Оспаривание кадастровой стоимости",
+                "description": (
+                    "Снижение кадастровой стоимости недвижимости и земельных участков через комиссию по "
+                    "рассмотрению споров и суд. Подготовка отчёта об оценке, подача заявления, "
+                    "представительство в уполномоченных органах."
+                ),
+                "advantages": [
+                    "Снижение кадастровой стоимости до 70%",
+                    "Экономия на налогах за 3-5 лет",
+                    "Оплата по факту снижения",
+                    "Работаем по всей России",
+                    "Собственная сеть оценщиков",
+                ],
+            },
+            {
+                "key": "service_enforcement_proceedings",
+                "button": "Исполнительное производство",
+                "title": "📋 Исполнительное производство",
+                "description": (
+                    "Контроль работы судебных приставов-исполнителей, розыск имущества и счетов должника,"
+                    " обжалование действий и бездействия приставов, привлечение должника к "
+                    "ответственности, взыскание исполнительского сбора."
+                ),
+                "advantages": [
+                    "Знаем все методы работы приставов",
+                    "Ускоряем исполнительное производство в 2-3 раза",
+                    "Находим скрытое имущество",
+                    "Работаем до фактического исполнения",
+                    "Полное ведение дела",
+                ],
+            },
+        ],
+    },
+    "legal_category_corporate": {
+        "name": "Сопровождение бизнеса (Corporate)",
+        "services": [
+            {
+                "key": "service_business_registration",
+                "button": "Регистрация и ликвидация юрлиц",
+                "title": "🏢 Регистрация и ликвидация юрлиц",
+                "description": (
+                    "Полное сопровождение регистрации ООО, АО, ИП. Подготовка учредительных документов, "
+                    "выбор оптимальной организационно-правовой формы, взаимодействие с регистрирующим "
+                    "органом. Также сопровождаем процедуры ликвидации и реорганизации."
+                ),
+                "advantages": [
+                    "Регистрация за 3-5 рабочих дней",
+                    "Гарантия прохождения госрегистрации",
+                    "Подбор кодов ОКВЭД",
+                    "Консультация по системе налогообложения",
+                    "Сопровождение «под ключ»",
+                ],
+            },
+            {
+                "key": "service_changes_to_egrul",
+                "button": "Внесение изменений в ЕГРЮЛ",
+                "title": "📝 Внесение изменений в ЕГРЮЛ",
+                "description": (
+                    "Подготовка и подача документов на изменение сведений в ЕГРЮЛ: смена юридического "
+                    "адреса, состава участников, размера уставного капитала, генерального директора, "
+                    "кодов ОКВЭД. Получение готовых документов."
+                ),
+                "advantages": [
+                    "Внесение изменений за 5-7 дней",
+                    "Гарантия регистрации изменений",
+                    "Подготовка всех документов",
+                    "Подача без вашего участия",
+                    "Получение готовых документов курьером",
+                ],
+            },
+            {
+                "key": "service_corporate_governance",
+                "button": "Корпоративное право",
+                "title": "📊 Корпоративное право",
+                "description": (
+                    "Разработка и актуализация корпоративных документов: уставов, положений, договоров об"
+                    " управлении. Сопровождение эмиссии акций, регистрация выпусков ценных бумаг в ЦБ РФ,"
+                    " подготовка отчётности."
+                ),
+                "advantages": [
+                    "Опыт работы с ЦБ РФ",
+                    "Разработка индивидуальных уставов",
+                    "Защита от корпоративных захватов",
+                    "Комплексное корпоративное сопровождение",
+                    "Конфиденциальность гарантирована",
+                ],
+            },
+            {
+                "key": "service_corporate_events",
+                "button": "Протоколирование мероприятий",
+                "title": "📋 Протоколирование корпоративных мероприятий",
+                "description": (
+                    "Подготовка и проведение общих собраний участников, заседаний советов директоров. "
+                    "Разработка повестки дня, подготовка проектов решений, ведение протоколов, "
+                    "уведомление участников, обеспечение кворума."
+                ),
+                "advantages": [
+                    "Соответствие всем требованиям закона",
+                    "Защита от оспаривания решений",
+                    "Опыт проведения сложных собраний",
+                    "Полное документальное сопровождение",
+                    "Присутствие на мероприятиях",
+                ],
+            },
+            {
+                "key": "service_legal_outsourcing",
+                "button": "Юридический аутсорсинг",
+                "title": "💼 Юридический аутсорсинг",
+                "description": (
+                    "Абонентское юридическое обслуживание вашего бизнеса. Постоянное сопровождение "
+                    "деятельности, консультации по правовым вопросам, подготовка договоров, претензий, "
+                    "исков, представительство в судах и госорганах."
+                ),
+                "advantages": [
+                    "Экономия до 70% vs штатный юрист",
+                    "Команда экспертов вместо одного специалиста",
+                    "Фиксированная абонентская плата",
+                    "Быстрое реагирование на запросы",
+                    "Полная ответственность за результат",
+                ],
+            },
+            {
+                "key": "service_due_diligence",
+                "button": "Due Diligence",
+                "title": "🔍 Due Diligence (правовая проверка компаний)",
+                "description": (
+                    "Комплексная правовая проверка компании перед сделкой M&A, инвестициями, "
+                    "партнёрством. Анализ учредительных документов, договоров, судебных дел, активов, "
+                    "обязательств. Подготовка отчёта с выявленными рисками и рекомендациями."
+                ),
+                "advantages": [
+                    "Глубокий анализ всех аспектов бизнеса",
+                    "Выявление скрытых рисков",
+                    "Опыт проверки крупных сделок",
+                    "Сжатые сроки (от 5 дней)",
+                    "Практические рекомендации",
+                ],
+            },
+        ],
+    },
+    "legal_category_labor": {
+        "name": "Трудовое право и кадровое делопроизводство",
+        "services": [
+            {
+                "key": "service_labor_agreements",
+                "button": "Подготовка трудовых документов",
+                "title": "📑 Подготовка и аудит трудовых договоров",
+                "description": (
+                    "Разработка и правовая экспертиза трудовых договоров, должностных инструкций, "
+                    "положений об оплате труда, ПВТР. Аудит кадровой документации, выявление нарушений, "
+                    "подготовка рекомендаций по приведению в соответствие с ТК РФ."
+                ),
+                "advantages": [
+                    "Защита от трудовых споров",
+                    "Соответствие требованиям ГИТ",
+                    "Учёт специфики вашего бизнеса",
+                    "Быстрое внесение изменений",
+                    "Консультации по применению документов",
+                ],
+            },
+            {
+                "key": "service_labor_disputes_defense",
+                "button": "Защита в трудовых спорах",
+                "title": "⚖️ Защита в трудовых спорах",
+                "description": (
+                    "Представительство интересов работодателя в судах по трудовым спорам: восстановление "
+                    "на работе, взыскание заработной платы, оспаривание дисциплинарных взысканий, "
+                    "возмещение ущерба, причинённого работником."
+                ),
+                "advantages": [
+                    "80% выигранных дел в пользу работодателя",
+                    "Защита от штрафов ГИТ",
+                    "Опыт в сложных конфликтах",
+                    "Досудебное урегулирование",
+                    "Полное ведение дела",
+                ],
+            },
+            {
+                "key": "service_labor_inspections_accompaniment",
+                "button": "Сопровождение проверок ГИТ",
+                "title": "🛡️ Сопровождение проверок ГИТ",
+                "description": (
+                    "Подготовка к плановым и внеплановым проверкам Государственной инспекции труда. "
+                    "Сопровождение в ходе проверки, подготовка возражений на предписания, обжалование "
+                    "постановлений о привлечении к ответственности."
+                ),
+                "advantages": [
+                    "Знаем критерии риска ГИТ",
+                    "Снижение штрафов в 2-3 раза",
+                    "Минимизация предписаний",
+                    "Оперативная поддержка 24/7",
+                    "Полное сопровождение проверки",
+                ],
+            },
+            {
+                "key": "service_employment_termination",
+                "button": "Увольнение и сокращение",
+                "title": "📤 Увольнение и сокращение штата",
+                "description": (
+                    "Правовое сопровождение процедур увольнения и сокращения численности персонала. "
+                    "Подготовка приказов, уведомлений, расчётов. Соблюдение процедур, минимизация рисков "
+                    "оспаривания увольнений."
+                ),
+                "advantages": [
+                    "Законное сокращение без восстановления",
+                    "Экономия на выходных пособиях",
+                    "Защита от массовых исков",
+                    "Полное документальное сопровождение",
+                    "Консультации по сложным случаям",
+                ],
+            },
+            {
+                "key": "service_migration_law",
+                "button": "Миграционное право",
+                "title": "🌍 Миграционное право",
+                "description": (
+                    "Оформление разрешительных документов для иностранных работников: патенты, разрешения"
+                    " на работу, РВП, ВНЖ. Уведомление МВД о приёме и увольнении, сопровождение проверок,"
+                    " обжалование штрафов."
+                ),
+                "advantages": [
+                    "Знаем все требования миграционного законодательства",
+                    "Быстрое оформление документов",
+                    "Защита от штрафов до 1 млн ₽",
+                    "Сопровождение «под ключ»",
+                    "Работа с ВКС и обычными мигрантами",
+                ],
+            },
+        ],
+    },
+    "legal_category_contract": {
+        "name": "Договорное право и сделки",
+        "services": [
+            {
+                "key": "service_contract_development",
+                "button": "Разработка и экспертиза договоров",
+                "title": "📝 Разработка и экспертиза договоров",
+                "description": (
+                    "Подготовка договоров «под ключ»: поставка, подряд, услуги, аренда, купля-продажа. "
+                    "Правовая экспертиза договоров контрагентов, выявление рисков, подготовка протоколов "
+                    "разногласий, согласование условий."
+                ),
+                "advantages": [
+                    "Индивидуальный подход к каждому договору",
+                    "Защита ваших интересов в спорах",
+                    "Быстрая подготовка (от 1 дня)",
+                    "Глубокий анализ рисков",
+                    "Практические рекомендации",
+                ],
+            },
+            {
+                "key": "service_risk_elimination",
+                "button": "Устранение правовых рисков",
+                "title": "🛡️ Устранение правовых рисков в договорной работе",
+                "description": (
+                    "Анализ договорной практики компании, выявление правовых рисков, разработка мер по их"
+                    " устранению. Подготовка шаблонов договоров, регламентов, инструкций для сотрудников."
+                ),
+                "advantages": [
+                    "Комплексный аудит договорной работы",
+                    "Выявление скрытых рисков",
+                    "Практические рекомендации",
+                    "Обучение сотрудников",
+                    "Снижение судебных споров",
+                ],
+            },
+            {
+                "key": "service_gray_scheme_legalization",
+                "button": "Легализация серых схем",
+                "title": "✅ Легализация «серых» схем",
+                "description": (
+                    "Правовая оптимизация схем ведения бизнеса, легализация неформальных отношений. "
+                    "Разработка корректных правовых конструкций, внедрение документооборота, минимизация "
+                    "налоговых и правовых рисков."
+                ),
+                "advantages": [
+                    "Законная оптимизация без нарушений",
+                    "Сохранение экономической эффективности",
+                    "Конфиденциальность гарантирована",
+                    "Поэтапное внедрение",
+                    "Сопровождение на всех этапах",
+                ],
+            },
+            {
+                "key": "service_real_estate_transactions",
+                "button": "Сопровождение сделок с недвижимостью",
+                "title": "🏢 Сопровождение сделок с недвижимостью",
+                "description": (
+                    "Полное юридическое сопровождение сделок купли-продажи, аренды, залога недвижимости и"
+                    " активов. Проверка юридической чистоты объектов, подготовка договоров, регистрация "
+                    "перехода прав, закрытие сделки."
+                ),
+                "advantages": [
+                    "Проверка всех рисков объекта",
+                    "Сопровождение сделок от 10 млн ₽",
+                    "Опыт работы с крупными портфелями",
+                    "Полная ответственность за результат",
+                    "Быстрое закрытие сделок",
+                ],
+            },
+        ],
+    },
+    "legal_category_ip": {
+        "name": "Интеллектуальная собственность и IT",
+        "services": [
+            {
+                "key": "service_tm_patent_registration",
+                "button": "Регистрация товарных знаков и патентов",
+                "title": "®️ Регистрация товарных знаков и патентов",
+                "description": (
+                    "Регистрация товарных знаков, патентов на изобретения, полезные модели, программное "
+                    "обеспечение. Проверка обозначений, подача заявок в Роспатент, ведение дел до "
+                    "регистрации, продление сроков действия."
+                ),
+                "advantages": [
+                    "95% зарегистрированных товарных знаков",
+                    "Патентные поверенные в штате",
+                    "Международная регистрация",
+                    "Защита от отказа в регистрации",
+                    "Полное сопровождение процесса",
+                ],
+            },
+            {
+                "key": "service_ip_rights_protection",
+                "button": "Защита авторских прав",
+                "title": "⚖️ Защита авторских и смежных прав",
+                "description": (
+                    "Защита прав на произведения науки, литературы, искусства, программы для ЭВМ. "
+                    "Претензионная работа, взыскание компенсаций, блокировка контрафакта, "
+                    "представительство в Суде по интеллектуальным правам."
+                ),
+                "advantages": [
+                    "Опыт взыскания компенсаций до 5 млн ₽",
+                    "Блокировка сайтов с контрафактом",
+                    "Работа с крупными платформами",
+                    "Досудебное урегулирование",
+                    "Полное ведение дела",
+                ],
+            },
+            {
+                "key": "service_it_contracts",
+                "button": "Договоры в сфере IT",
+                "title": "💻 Договоры в сфере IT",
+                "description": (
+                    "Подготовка и экспертиза договоров в сфере информационных технологий: разработка ПО, "
+                    "лицензионные соглашения, SLA, аутсорсинг, облачные сервисы. Учёт специфики IT-"
+                    "бизнеса, защита интеллектуальных прав."
+                ),
+                "advantages": [
+                    "Глубокое понимание IT-бизнеса",
+                    "Защита прав на код и алгоритмы",
+                    "Опыт работы с зарубежными заказчиками",
+                    "Соответствие GDPR и 152-ФЗ",
+                    "Гибкие условия сотрудничества",
+                ],
+            },
+            {
+                "key": "service_digital_project_accompaniment",
+                "button": "Сопровождение digital-проектов",
+                "title": "🚀 Правовое сопровождение digital-проектов",
+                "description": (
+                    "Комплексное правовое сопровождение digital-проектов: от идеи до запуска. Регистрация"
+                    " доменов, защита контента, договоры с подрядчиками и клиентами, соответствие "
+                    "требованиям законодательства о персональных данных."
+                ),
+                "advantages": [
+                    "Опыт сопровождения стартапов",
+                    "Понимание digital-бизнеса",
+                    "Быстрое реагирование на изменения",
+                    "Гибкое ценообразование",
+                    "Полная правовая поддержка",
+                ],
+            },
+        ],
+    },
+    "legal_category_administrative": {
+        "name": "Административное право и защита при проверках",
+        "services": [
+            {
+                "key": "service_authority_inspection_accompaniment",
+                "button": "Сопровождение проверок контролирующих органов",
+                "title": "🛡️ Сопровождение проверок контролирующих органов",
+                "description": (
+                    "Подготовка и сопровождение проверок МЧС, Роспотребнадзора, Роскомнадзора, "
+                    "Росприроднадзора и других органов. Минимизация рисков, подготовка возражений, "
+                    "обжалование предписаний и постановлений."
+                ),
+                "advantages": [
+                    "Знаем критерии риска всех органов",
+                    "Снижение штрафов в 2-5 раз",
+                    "Оперативный выезд при проверке",
+                    "Полное документальное сопровождение",
+                    "Защита от приостановки деятельности",
+                ],
+            },
+            {
+                "key": "service_administrative_offenses_appeal",
+                "button": "Обжалование административных правонарушений",
+                "title": "⚖️ Обжалование протоколов об административных правонарушениях",
+                "description": (
+                    "Подготовка жалоб на протоколы и постановления по делам об административных "
+                    "правонарушениях. Представительство в судах и госорганах, прекращение дел, снижение "
+                    "размеров штрафов."
+                ),
+                "advantages": [
+                    "70% дел прекращено или переквалифицировано",
+                    "Опыт работы со всеми составами",
+                    "Быстрое реагирование",
+                    "Полное ведение дела",
+                    "Прозрачное ценообразование",
+                ],
+            },
+            {
+                "key": "service_administrative_suspension_defense",
+                "button": "Защита от приостановки деятельности",
+                "title": "🚫 Защита от приостановки деятельности",
+                "description": (
+                    "Защита в делах об административных приостановках деятельности предприятия. Срочное "
+                    "обжалование постановлений, подготовка ходатайств о замене вида наказания, "
+                    "представительство в судах."
+                ),
+                "advantages": [
+                    "Срочное реагирование (24/7)",
+                    "Опыт отмены приостановок",
+                    "Замена на штраф в 80% случаев",
+                    "Полное сопровождение процесса",
+                    "Защита бизнеса от убытков",
+                ],
+            },
+        ],
+    },
+    "legal_category_real_estate": {
+        "name": "Недвижимость и строительство",
+        "services": [
+            {
+                "key": "service_real_estate_audit",
+                "button": "Юридический аудит недвижимости",
+                "title": "🔍 Юридический аудит недвижимости",
+                "description": (
+                    "Комплексная проверка юридической чистоты объектов недвижимости: земельные участки, "
+                    "здания, помещения. Анализ правоустанавливающих документов, обременений, прав третьих"
+                    " лиц, подготовка заключения о рисках."
+                ),
+                "advantages": [
+                    "Выявление всех скрытых рисков",
+                    "Опыт аудита крупных портфелей",
+                    "Быстрая подготовка заключения",
+                    "Практические рекомендации",
+                    "Полная ответственность за результат",
+                ],
+            },
+            {
+                "key": "service_commercial_real_estate_transactions",
+                "button": "Сделки с коммерческой недвижимостью",
+                "title": "🏢 Сделки с коммерческой недвижимостью",
+                "description": (
+                    "Полное сопровождение сделок купли-продажи, аренды коммерческой недвижимости: офисы, "
+                    "склады, торговые центры. Проверка объектов, подготовка договоров, регистрация "
+                    "перехода прав, закрытие сделки."
+                ),
+                "advantages": [
+                    "Сопровождение сделок от 50 млн ₽",
+                    "Опыт работы с портфелями недвижимости",
+                    "Полная проверка объектов",
+                    "Быстрое закрытие сделок",
+                    "Защита интересов клиента",
+                ],
+            },
+            {
+                "key": "service_construction_accompaniment",
+                "button": "Сопровождение строительных проектов",
+                "title": "🏗️ Сопровождение строительных проектов",
+                "description": (
+                    "Правовое сопровождение строительства: получение разрешительной документации, "
+                    "согласование проектной документации, сопровождение подрядных договоров, разрешение "
+                    "споров с подрядчиками и заказчиками."
+                ),
+                "advantages": [
+                    "Опыт сопровождения крупных проектов",
+                    "Знаем все требования градостроительства",
+                    "Быстрое получение разрешений",
+                    "Защита от претензий подрядчиков",
+                    "Полное ведение проекта",
+                ],
+            },
+            {
+                "key": "service_land_law",
+                "button": "Земельное право",
+                "title": "🌱 Земельное право",
+                "description": (
+                    "Оформление прав на земельные участки, перевод земель из одной категории в другую, "
+                    "установление разрешённого использования, межевание, постановка на кадастровый учёт. "
+                    "Защита в земельных спорах."
+                ),
+                "advantages": [
+                    "Опыт работы с Росреестром",
+                    "Быстрое оформление документов",
+                    "Решение сложных земельных вопросов",
+                    "Защита от изъятия участков",
+                    "Полное сопровождение процесса",
+                ],
+            },
+        ],
+    },
+    "legal_category_international": {
+        "name": "Международное право и ВЭД",
+        "services": [
+            {
+                "key": "service_international_structuring",
+                "button": "Структурирование международных сделок",
+                "title": "🌐 Структурирование международных сделок",
+                "description": (
+                    "Разработка правовых схем международной торговли и инвестиций. Оптимизация налоговой "
+                    "нагрузки, защита активов за рубежом, выбор юрисдикции, подготовка договорной "
+                    "документации, соблюдение валютного законодательства."
+                ),
+                "advantages": [
+                    "Опыт работы с 20+ юрисдикциями",
+                    "Законная налоговая оптимизация",
+                    "Защита от блокировок счетов",
+                    "Конфиденциальность гарантирована",
+                    "Полное сопровождение сделки",
+                ],
+            },
+            {
+                "key": "service_foreign_company_accompaniment",
+                "button": "Создание и сопровождение зарубежных компаний",
+                "title": "🏢 Создание и сопровождение зарубежных компаний",
+                "description": (
+                    "Регистрация иностранных юридических лиц в оптимальных юрисдикциях. Открытие счетов, "
+                    "получение лицензий, соблюдение требований местного законодательства, бухгалтерское "
+                    "сопровождение, подготовка отчётности."
+                ),
+                "advantages": [
+                    "Партнёры в 30+ странах",
+                    "Быстрая регистрация (от 3 дней)",
+                    "Открытие счетов в надёжных банках",
+                    "Полное администрирование",
+                    "Конфиденциальность бенефициаров",
+                ],
+            },
+            {
+                "key": "service_foreign_trade_accompaniment",
+                "button": "Сопровождение ВЭД",
+                "title": "📦 Сопровождение внешнеэкономической деятельности",
+                "description": (
+                    "Правовое сопровождение ВЭД: подготовка контрактов, соблюдение таможенных требований,"
+                    " валютный контроль, сертификация товаров, защита при проверках. Работа с "
+                    "экспортёрами и импортёрами."
+                ),
+                "advantages": [
+                    "Опыт сопровождения ВЭД контрактов на $100+ млн",
+                    "Знаем требования всех таможенных органов",
+                    "Быстрое решение проблем на таможне",
+                    "Защита от штрафов и блокировок",
+                    "Полное ведение ВЭД",
+                ],
+            },
+        ],
+    },
+    "legal_category_antitrust": {
+        "name": "Антимонопольное право (ФАС)",
+        "services": [
+            {
+                "key": "service_transaction_approval_fas",
+                "button": "Сопровождение сделок с согласованием ФАС",
+                "title": "📋 Согласование сделок с ФАС",
+                "description": (
+                    "Подготовка документов для согласования сделок, требующих антимонопольного "
+                    "согласования. Подача ходатайств в ФАС, получение предварительного и окончательного "
+                    "согласия, обжалование отказов."
+                ),
+                "advantages": [
+                    "Опыт согласования крупных сделок",
+                    "Быстрое получение согласия",
+                    "Защита от штрафов до 500 000 ₽",
+                    "Полное ведение процесса",
+                    "Конфиденциальность гарантирована",
+                ],
+            },
+            {
+                "key": "service_advertising_law_defense",
+                "button": "Защита при проверках соблюдения закона о рекламе",
+                "title": "📺 Защита при проверках рекламы",
+                "description": (
+                    "Сопровождение проверок соблюдения закона о рекламе. Подготовка заключений о "
+                    "соответствии рекламы требованиям, защита от предписаний ФАС, обжалование "
+                    "постановлений о штрафах."
+                ),
+                "advantages": [
+                    "Опыт защиты крупных рекламодателей",
+                    "Снижение штрафов в 2-3 раза",
+                    "Быстрое решение вопросов с ФАС",
+                    "Полное сопровождение проверки",
+                    "Превентивный аудит рекламы",
+                ],
+            },
+            {
+                "key": "service_anti_competition_defense",
+                "button": "Защита от недобросовестной конкуренции",
+                "title": "⚖️ Защита от недобросовестной конкуренции",
+                "description": (
+                    "Защита в делах о картелях, сговорах, недобросовестной конкуренции. Подготовка "
+                    "возражений на обвинения, представительство в ФАС и судах, оспаривание решений, "
+                    "снижение штрафов."
+                ),
+                "advantages": [
+                    "Опыт защиты в картельных делах",
+                    "Снижение штрафов до 90%",
+                    "Защита репутации бизнеса",
+                    "Полное ведение дела",
+                    "Конфиденциальность гарантирована",
+                ],
+            },
+        ],
+    },
+    "legal_category_family_business": {
+        "name": "Семейный бизнес и наследственное планирование",
+        "services": [
+            {
+                "key": "service_asset_structuring",
+                "button": "Структурирование активов",
+                "title": "🏦 Структурирование активов",
+                "description": (
+                    "Разработка схем защиты активов при наследовании, разводе, банкротстве. Создание "
+                    "трастов, фондов, холдинговых структур. Брачные договоры, соглашения о разделе "
+                    "имущества, завещания."
+                ),
+                "advantages": [
+                    "Защита активов от кредиторов",
+                    "Сохранение семейного бизнеса",
+                    "Законная оптимизация налогов",
+                    "Конфиденциальность гарантирована",
+                    "Индивидуальный подход",
+                ],
+            },
+            {
+                "key": "service_trust_fund_creation",
+                "button": "Создание наследственных фондов",
+                "title": "📜 Создание наследственных фондов",
+                "description": (
+                    "Подготовка документов для создания наследственных фондов в РФ и за рубежом. "
+                    "Разработка условий управления активами, защита интересов бенефициаров, налоговое "
+                    "планирование, сопровождение деятельности фонда."
+                ),
+                "advantages": [
+                    "Опыт создания фондов в РФ и офшорах",
+                    "Защита активов наследодателя",
+                    "Контроль за исполнением воли",
+                    "Налоговая оптимизация",
+                    "Полное сопровождение фонда",
+                ],
+            },
+            {
+                "key": "service_business_division",
+                "button": "Раздел имущества супругов",
+                "title": "💔 Раздел бизнеса при разводе",
+                "description": (
+                    "Подготовка соглашений о разделе имущества супругов в отношении бизнеса. Оценка "
+                    "долей, разработка схем раздела, защита интересов в суде, сохранение бизнеса как "
+                    "действующего предприятия."
+                ),
+                "advantages": [
+                    "Сохранение контроля над бизнесом",
+                    "Справедливая оценка долей",
+                    "Минимизация потерь для бизнеса",
+                    "Досудебное урегулирование",
+                    "Полное ведение дела",
+                ],
+            },
+        ],
+    },
+}
+
+
+# ============================================
+# Подготовленные карточки
+# ============================================
+
+class ServiceCard(NamedTuple):
+    """Готовая к отправке карточка услуги"""
+    key: str
+    category_key: str
+    button: str
+    html: str
+    keyboard: InlineKeyboardMarkup
+
+
+def render_service_html(service: dict) -> str:
+    """
+    Формирует HTML-текст карточки услуги
+
+    Args:
+        service: Описание услуги из SERVICE_CATEGORIES
+
+    Returns:
+        str: Текст сообщения в HTML-разметке
+    """
+    advantages = "\n".join(f"✓ {item}" for item in service["advantages"])
+    return (
+        f"<b>{service['title']}</b>\n\n"
+        "<b>Описание услуги:</b>\n"
+        f"{service['description']}\n\n"
+        "<b>Наши преимущества:</b>\n"
+        f"{advantages}"
+    )
+
+
+def get_category_buttons(category_key: str) -> List[Tuple[str, str]]:
+    """
+    Возвращает кнопки услуг категории в формате (текст, callback_data)
+
+    Args:
+        category_key: callback_data категории (legal_category_*)
+
+    Returns:
+        List[Tuple[str, str]]: Список кнопок, пустой для неизвестной категории
+    """
+    category = SERVICE_CATEGORIES.get(category_key)
+    if not category:
+        return []
+    return [(service["button"], service["key"]) for service in category["services"]]
+
+
+# Клавиатура карточки услуги одинакова для всех услуг
+SERVICE_CARD_KEYBOARD = FrozenInlineKeyboardMarkup(
+    inline_keyboard=[[FrozenInlineKeyboardButton(text="🔙 Назад", callback_data="back_to_main")]]
+)
+
+# Заголовки категорий: callback_data -> HTML
+CATEGORY_TITLES: Dict[str, str] = {
+    category_key: f"<b>{category['name']}</b>"
+    for category_key, category in SERVICE_CATEGORIES.items()
+}
+
+# Карточки услуг: callback_data -> ServiceCard
+SERVICES: Dict[str, ServiceCard] = {
+    service["key"]: ServiceCard(
+        key=service["key"],
+        category_key=category_key,
+        button=service["button"],
+        html=render_service_html(service),
+        keyboard=SERVICE_CARD_KEYBOARD,
+    )
+    for category_key, category in SERVICE_CATEGORIES.items()
+    for service in category["services"]
+}
@@ -21,8 +21,10 @@ def register_handlers(dp):
     register_send_case_handlers(dp)
     register_revenue_handlers(dp)
     register_how_to_earn_handlers(dp)
+    # FAQ регистрируется до переписки: иначе текст вопроса для поиска
+    # перехватит обработчик любых сообщений из case_messages
+    register_faq_handlers(dp)
     register_case_messages_handlers(dp)
 
-    register_faq_handlers(dp)
     register_legal_services_handlers(dp)
     register_service_detail_handlers(dp)
\ No newline at end of file
@@ -20,6 +20,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 from bot.keyboards.keyboards import get_main_menu_keyboard
+from config.logging_setup import TRACE_HEADER, trace_id_var, new_trace_id
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
@@ -55,7 +56,7 @@ async def send_message_to_admin(telegram_id: int, message_text: str) -> bool:
         bool: True если сообщение успешно отправлено, иначе False
     """
     if not message_text or not message_text.strip():
-        logger.warning(f"Попытка отправить пустое сообщение от пользователя {telegram_id}")
+        logger.warning("Попытка отправить пустое сообщение от пользователя %s", telegram_id)
         return False
     
     try:
@@ -65,27 +66,29 @@ async def send_message_to_admin(telegram_id: int, message_text: str) -> bool:
                 json={
                     "telegram_id": telegram_id,
                     "content": message_text.strip()
-                }
+                },
+                # Записи админ-панели по этому запросу получат тот же trace_id
+                headers={TRACE_HEADER: trace_id_var.get() or new_trace_id()}
             )
             
             if response.status_code == 200:
-                logger.info(f"Сообщение от пользователя {telegram_id} успешно сохранено")
+                logger.info("Сообщение от пользователя %s успешно сохранено", telegram_id)
                 return True
             else:
                 logger.error(
-                    f"Ошибка сохранения сообщения от {telegram_id}: "
-                    f"status={response.status_code}, response={response.text}"
+                    "Ошибка сохранения сообщения от %s: status=%s, response=%s",
+                    telegram_id, response.status_code, response.text
                 )
                 return False
                 
     except httpx.TimeoutException:
-        logger.error(f"Таймаут при отправке сообщения от пользователя {telegram_id}")
+        logger.error("Таймаут при отправке сообщения от пользователя %s", telegram_id)
         return False
     except httpx.ConnectError:
-        logger.error(f"Не удалось подключиться к админ-панели: {ADMIN_PANEL_URL}")
+        logger.error("Не удалось подключиться к админ-панели: %s", ADMIN_PANEL_URL)
         return False
     except Exception as e:
-        logger.exception(f"Неожиданная ошибка при отправке сообщения от {telegram_id}: {e}")
+        logger.exception("Неожиданная ошибка при отправке сообщения от %s: %s", telegram_id, e)
         return False
 
 
@@ -206,7 +209,7 @@ async def handle_user_message(message: Message, state: FSMContext) -> None:
         )
         return
     
-    logger.info(f"Получено сообщение от пользователя {user_id}: {message_text[:50]}...")
+    logger.info("Получено сообщение от пользователя %s: %.50s...", user_id, message_text)
     
     # Отправляем сообщение администратору
     success = await send_message_to_admin(
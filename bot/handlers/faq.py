@@ -2,11 +2,21 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+import html
+
 from aiogram import Router, F
+from aiogram.filters import Command, CommandObject
+from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 
+from bot.states.states import FaqStates
+from bot.utils.faq_search import get_faq_index
+
 router = Router()
 
+# Количество ответов, показываемых по результатам поиска
+FAQ_SEARCH_LIMIT = 3
+
 # Определяем категории FAQ
 FAQ_CATEGORIES = {
     "faq_partnership": {
@@ -146,6 +156,65 @@ async def faq_main_handler(message: Message) -> None:
     from bot.keyboards.keyboards import get_faq_categories_keyboard
     await message.answer(text, reply_markup=get_faq_categories_keyboard())
 
+def format_search_results(query: str) -> str:
+    """
+    Ищет ответы на вопрос пользователя и формирует текст сообщения с результатами
+
+    Args:
+        query: Текст вопроса
+
+    Returns:
+        str: Текст сообщения в HTML-разметке
+    """
+    results = get_faq_index().search(query, limit=FAQ_SEARCH_LIMIT)
+    if not results:
+        return (
+            "😔 Не нашли подходящего ответа.\n\n"
+            "Попробуйте переформулировать вопрос или напишите в поддержку @legaldecision"
+        )
+
+    text = "<b>🔍 Вот что мы нашли:</b>\n\n"
+    for result in results:
+        entry = result.entry
+        text += f"<b>{html.escape(entry.question)}</b>\n{html.escape(entry.answer)}\n\n"
+    return text
+
+
+@router.callback_query(F.data == "faq_search")
+async def faq_search_start_handler(callback_query: CallbackQuery, state: FSMContext) -> None:
+    """
+    Обработчик кнопки поиска по FAQ - ждем текст вопроса
+    """
+    await state.set_state(FaqStates.waiting_for_query)
+    await callback_query.message.answer("✍️ Напишите ваш вопрос, а мы найдём подходящие ответы:")
+    await callback_query.answer()
+
+
+@router.message(FaqStates.waiting_for_query, F.text)
+async def faq_search_query_handler(message: Message, state: FSMContext) -> None:
+    """
+    Обработка текста вопроса для поиска по FAQ
+    """
+    await state.clear()
+
+    from bot.keyboards.keyboards import get_faq_search_results_keyboard
+    await message.answer(format_search_results(message.text), reply_markup=get_faq_search_results_keyboard())
+
+
+@router.message(Command("faq"))
+async def faq_search_command_handler(message: Message, command: CommandObject, state: FSMContext) -> None:
+    """
+    Команда /faq <вопрос> - поиск по FAQ одной командой
+    """
+    if not command.args:
+        await state.set_state(FaqStates.waiting_for_query)
+        await message.answer("✍️ Напишите ваш вопрос, а мы найдём подходящие ответы:")
+        return
+
+    from bot.keyboards.keyboards import get_faq_search_results_keyboard
+    await message.answer(format_search_results(command.args), reply_markup=get_faq_search_results_keyboard())
+
+
 @router.callback_query(F.data.startswith("faq_"))
 async def faq_category_handler(callback_query: CallbackQuery) -> None:
     """
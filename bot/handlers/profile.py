@@ -20,6 +20,7 @@ from states.states import ProfileStates
 
 # Импортируем настройки
 from config.settings import settings
+from bot.utils.admin_notifications import admin_notifier
 
 router = Router()
 
@@ -125,21 +126,18 @@ async def process_experience(message: Message, state: FSMContext) -> None:
         
         await message.answer("Ваш профиль успешно обновлен!")
         
-        # Отправляем уведомление в чат -1003899118823
-        try:
-            profile_notification = (
-                f"👤 ID пользователя: {message.from_user.id}\n"
-                f"🔗 Ссылка: https://t.me/{message.from_user.username or 'N/A'}\n"
-                f"📝 ФИО: {data['full_name']}\n"
-                f"🏢 Компания: {data['company_name']}\n"
-                f"📞 Телефон: {data['phone']}\n"
-                f"✉️ Email: {data['email']}\n"
-                f"💼 Специализация: {data['specialization']}\n"
-                f"📅 Опыт: {data['experience']} лет"
-            )
-            await message.bot.send_message(-1003899118823, profile_notification)
-        except Exception as e:
-            print(f"Ошибка при отправке уведомления о профиле в чат: {e}")
+        # Уведомление в чат анкет (в фоне, сводками или сразу - см. ADMIN_NOTIFY_MODE)
+        profile_notification = (
+            f"👤 ID пользователя: {message.from_user.id}\n"
+            f"🔗 Ссылка: https://t.me/{message.from_user.username or 'N/A'}\n"
+            f"📝 ФИО: {data['full_name']}\n"
+            f"🏢 Компания: {data['company_name']}\n"
+            f"📞 Телефон: {data['phone']}\n"
+            f"✉️ Email: {data['email']}\n"
+            f"💼 Специализация: {data['specialization']}\n"
+            f"📅 Опыт: {data['experience']} лет"
+        )
+        admin_notifier.notify(message.bot, settings.PROFILE_CHAT_ID, profile_notification, kind="profile")
         
     except ValueError:
         await message.answer("Пожалуйста, введите число лет опыта.")
@@ -231,33 +229,13 @@ async def referral_program_handler(callback_query: CallbackQuery) -> None:
         user = result.scalar_one_or_none()
         
         if user:
-            # Получаем или создаем реферальный код для пользователя
-            from database.models import ReferralLink, ReferralRelationship, ReferralMonthlyStats, PartnerRevenue
+            from database.models import ReferralRelationship, ReferralMonthlyStats, PartnerRevenue
             from bot.utils.referral_calculator import calculate_referral_commission
+            from bot.utils.referral_codes import referral_url
             from datetime import datetime
             
-            result = await db.execute(select(ReferralLink).filter(ReferralLink.partner_id == user.id))
-            referral_link = result.scalar_one_or_none()
-            
-            if not referral_link:
-                import secrets
-                referral_code = secrets.token_urlsafe(8)[:8].upper()  # 8-символьный код
-                
-                # Проверяем, что такой код не существует
-                while True:
-                    result = await db.execute(select(ReferralLink).filter(ReferralLink.referral_code == referral_code))
-                    existing = result.scalar_one_or_none()
-                    if not existing:
-                        break
-                    referral_code = secrets.token_urlsafe(8)[:8].upper()
-                
-                referral_link = ReferralLink(
-                    partner_id=user.id,
-                    referral_code=referral_code
-                )
-                db.add(referral_link)
-                await db.commit()
-                await db.refresh(referral_link)
+            # Реферальный код вычисляется из ID партнёра, без запросов к базе
+            partner_referral_url = referral_url(user.id)
             
             # Получаем список рефералов
             referrals_result = await db.execute(
@@ -316,7 +294,7 @@ async def referral_program_handler(callback_query: CallbackQuery) -> None:
             referral_info = (
                 f"🔗 <b>Реферальная программа</b>\n\n"
                 f"📋 Ваша реферальная ссылка:\n"
-                f"<code>https://t.me/legaldecision_bot?start={referral_link.referral_code}</code>\n\n"
+                f"<code>{partner_referral_url}</code>\n\n"
                 f"━━━━━━━━━━━━━━━━━━━━\n\n"
                 f"📊 <b>Ваша статистика за {month_names[current_month]} {current_year}:</b>\n\n"
                 f"• Всего рефералов: {len(referrals)}\n"
@@ -365,29 +343,22 @@ async def copy_referral_link_handler(callback_query: CallbackQuery) -> None:
     
     async with get_db() as db:
         # Находим пользователя
-        result = await db.execute(select(User).filter(User.telegram_id == user_id))
-        user = result.scalar_one_or_none()
+        result = await db.execute(select(User.id).filter(User.telegram_id == user_id))
+        partner_id = result.scalar_one_or_none()
+    
+    if partner_id:
+        from bot.utils.referral_codes import referral_url
         
-        if user:
-            from database.models import ReferralLink
-            result = await db.execute(select(ReferralLink).filter(ReferralLink.partner_id == user.id))
-            referral_link = result.scalar_one_or_none()
-            
-            if referral_link:
-                referral_url = f"https://t.me/legaldecision_bot?start={referral_link.referral_code}"
-                
-                # Отправляем ссылку в отдельном сообщении для удобного копирования
-                await callback_query.message.answer(
-                    f"📋 <b>Ваша реферальная ссылка:</b>\n\n"
-                    f"<code>{referral_url}</code>\n\n"
-                    f"Нажмите на ссылку выше, чтобы скопировать её.",
-                    parse_mode="HTML"
-                )
-                await callback_query.answer("Ссылка отправлена в сообщении выше!")
-            else:
-                await callback_query.answer("Ошибка: реферальная ссылка не найдена.")
-        else:
-            await callback_query.answer("Ошибка: пользователь не найден.")
+        # Отправляем ссылку в отдельном сообщении для удобного копирования
+        await callback_query.message.answer(
+            f"📋 <b>Ваша реферальная ссылка:</b>\n\n"
+            f"<code>{referral_url(partner_id)}</code>\n\n"
+            f"Нажмите на ссылку выше, чтобы скопировать её.",
+            parse_mode="HTML"
+        )
+        await callback_query.answer("Ссылка отправлена в сообщении выше!")
+    else:
+        await callback_query.answer("Ошибка: пользователь не найден.")
 
 
 @router.callback_query(F.data == "payout_history")
@@ -5,16 +5,18 @@
 import sys
 import os
 import logging
-import asyncio
+from datetime import datetime
+from typing import Tuple
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, FSInputFile
+from aiogram.types import Message, CallbackQuery
 from aiogram.filters import CommandStart
 
-from database.database import get_db
-from database.models import User, ReferralLink, ReferralRelationship, ServiceRequest
+from database.database import get_db, dialect_insert
+from database.models import User, ReferralLink, ReferralRelationship, ReferralClosure, ServiceRequest
+from sqlalchemy import case, exists, func, literal, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -28,6 +30,8 @@ from bot.keyboards.keyboards import (
 )
 
 from bot.handlers.case_messages import get_user_cases, format_cases_list
+from bot.utils.referral_codes import decode_referral_code, referral_url
+from bot.utils.onboarding import OnboardingStep, onboarding_sender
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
@@ -61,6 +65,23 @@ REVENUE_PERCENT_TEXT = (
 )
 
 
+# Изображение перед приветствием (шаг пропускается, если файла нет)
+START_IMAGE_PATH = "/app/uploads/start_image.jpg"
+
+HOW_TO_EARN_PROMPT = (
+    "💡 Хотите узнать, как заработать с нами?\n\n"
+    "Нажмите кнопку ниже, чтобы получить пошаговую инструкцию:"
+)
+
+# Сценарий знакомства после /start: шаги отправляет bot/utils/onboarding.py
+START_ONBOARDING = (
+    OnboardingStep("photo", START_IMAGE_PATH),
+    OnboardingStep("text", WELCOME_TEXT, keyboard=get_main_menu_keyboard, parse_mode=None),
+    OnboardingStep("text", REVENUE_PERCENT_TEXT, parse_mode=None),
+    OnboardingStep("text", HOW_TO_EARN_PROMPT, keyboard=get_how_to_earn_keyboard),
+)
+
+
 # ============================================
 # Вспомогательные функции
 # ============================================
@@ -71,9 +92,15 @@ async def get_or_create_user(
     username: str = None,
     first_name: str = None,
     last_name: str = None
-) -> User:
+) -> Tuple[User, bool]:
     """
-    Получает существующего пользователя или создает нового
+    Создает пользователя или обновляет его данные одним запросом
+    
+    INSERT ... ON CONFLICT (telegram_id) DO UPDATE ... RETURNING: одновременные
+    /start одного пользователя не создают дубликатов и не падают на уникальном
+    индексе. Пустые поля из Telegram не затирают сохраненные значения.
+    updated_at меняется, только если имя действительно изменилось: по нему
+    веб-панель понимает, что кэш списка пользователей устарел.
     
     Args:
         db: Сессия базы данных
@@ -83,76 +110,60 @@ async def get_or_create_user(
         last_name: Фамилия
     
     Returns:
-        User: Объект пользователя
+        Tuple[User, bool]: Пользователь и признак того, что он создан этим запросом
     """
-    result = await db.execute(select(User).filter(User.telegram_id == user_id))
-    user = result.scalar_one_or_none()
+    registered_at = datetime.utcnow()
+    stmt = dialect_insert(User).values(
+        telegram_id=user_id,
+        username=username,
+        first_name=first_name,
+        last_name=last_name,
+        registered_at=registered_at,
+        updated_at=registered_at
+    )
+    names_changed = or_(*(
+        stmt.excluded[name].isnot(None) & stmt.excluded[name].is_distinct_from(User.__table__.c[name])
+        for name in ("username", "first_name", "last_name")
+    ))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.telegram_id],
+        set_={
+            "username": func.coalesce(stmt.excluded.username, User.username),
+            "first_name": func.coalesce(stmt.excluded.first_name, User.first_name),
+            "last_name": func.coalesce(stmt.excluded.last_name, User.last_name),
+            "updated_at": case((names_changed, registered_at), else_=User.updated_at),
+        }
+    ).returning(User)
     
-    if not user:
-        user = User(
-            telegram_id=user_id,
-            username=username,
-            first_name=first_name,
-            last_name=last_name
-        )
-        db.add(user)
-        await db.commit()
-        await db.refresh(user)
-        logger.info(f"Создан новый пользователь: {user_id}")
-        
-        # Отправляем уведомление в чат админов
-        await send_new_user_notification(user)
-    else:
-        # Обновляем данные пользователя если изменились
-        updated = False
-        if username and user.username != username:
-            user.username = username
-            updated = True
-        if first_name and user.first_name != first_name:
-            user.first_name = first_name
-            updated = True
-        if last_name and user.last_name != last_name:
-            user.last_name = last_name
-            updated = True
-        
-        if updated:
-            await db.commit()
-            logger.debug(f"Обновлены данные пользователя: {user_id}")
+    result = await db.execute(stmt, execution_options={"populate_existing": True})
+    user = result.scalar_one()
     
-    return user
+    # registered_at при конфликте не обновляется: совпадение значит, что строка вставлена сейчас
+    return user, user.registered_at == registered_at
 
 
-async def send_new_user_notification(user: User):
+def send_new_user_notification(bot, user: User):
     """
-    Отправляет уведомление в чат админов о новом пользователе
+    Ставит уведомление о новом пользователе в очередь для чата админов
+    
+    Отправка идет в фоне (сводками или сразу, см. bot/utils/admin_notifications.py),
+    обработчик /start ее не ждет.
     
     Args:
+        bot: Экземпляр бота
         user: Объект нового пользователя
     """
-    try:
-        from config.settings import settings
-        from bot.main import bot
-        
-        admin_chat_id = settings.ADMIN_CHAT_ID
-        if admin_chat_id:
-            # Форматируем сообщение
-            user_info = (
-                f"👤 Новый пользователь:\n"
-                f"ID: {user.telegram_id}\n"
-                f"Имя: {user.first_name or 'Не указано'}\n"
-                f"Фамилия: {user.last_name or 'Не указано'}\n"
-                f"Username: @{user.username}" if user.username else "Username: Не указан"
-            )
-            
-            await bot.send_message(
-                chat_id=admin_chat_id,
-                text=user_info
-            )
-            logger.info(f"Уведомление о новом пользователе {user.telegram_id} отправлено в чат админов")
-        else:
-            logger.warning("ADMIN_CHAT_ID не настроен, уведомление не отправлено")
-    except Exception as e:
-        logger.error(f"Ошибка при отправке уведомления о новом пользователе {user.telegram_id}: {e}")
+    from config.settings import settings
+    from bot.utils.admin_notifications import admin_notifier
+    
+    user_info = (
+        f"👤 Новый пользователь:\n"
+        f"ID: {user.telegram_id}\n"
+        f"Имя: {user.first_name or 'Не указано'}\n"
+        f"Фамилия: {user.last_name or 'Не указано'}\n"
+        + (f"Username: @{user.username}" if user.username else "Username: Не указан")
+    )
+    admin_notifier.notify(bot, settings.ADMIN_CHAT_ID, user_info, kind="new_user")
 
 
 async def process_referral(
@@ -163,6 +174,11 @@ async def process_referral(
     """
     Обрабатывает реферальную ссылку
     
+    Проверка реферера, приглашения самого себя и цикла в дереве и вставка связи выполняются
+    одним INSERT ... SELECT ... ON CONFLICT (referred_id) DO NOTHING. Код нового
+    формата декодируется в ID партнёра без таблицы referral_links, прежние
+    коды ищутся в ней.
+    
     Args:
         db: Сессия базы данных
         referral_code: Реферальный код
@@ -174,50 +190,80 @@ async def process_referral(
     if not referral_code:
         return False
     
-    try:
-        # Находим реферальную ссылку
-        result = await db.execute(
-            select(ReferralLink).filter(ReferralLink.referral_code == referral_code)
-        )
-        referral_link = result.scalar_one_or_none()
-        
-        if not referral_link:
-            logger.warning(f"Реферальный код не найден: {referral_code}")
-            return False
-        
-        # Проверяем, что пользователь не приглашает сам себя
-        if referral_link.partner_id == new_user.id:
-            logger.warning(f"Пользователь {new_user.id} пытается использовать свою реферальную ссылку")
-            return False
-        
-        # Проверяем, что связь еще не существует
-        existing = await db.execute(
-            select(ReferralRelationship).filter(
-                ReferralRelationship.referred_id == new_user.id
-            )
+    partner_id = decode_referral_code(referral_code)
+    if partner_id is not None:
+        referrer_id = User.id
+        referrer = select(User.id, literal(new_user.id), literal(datetime.utcnow())).where(
+            User.id == partner_id
         )
-        if existing.scalar_one_or_none():
-            logger.debug(f"Реферальная связь уже существует для пользователя {new_user.id}")
-            return False
-        
-        # Создаем реферальную связь
-        relationship = ReferralRelationship(
-            referrer_id=referral_link.partner_id,
-            referred_id=new_user.id
+    else:
+        referrer_id = ReferralLink.partner_id
+        referrer = select(ReferralLink.partner_id, literal(new_user.id), literal(datetime.utcnow())).where(
+            ReferralLink.referral_code == referral_code
         )
-        db.add(relationship)
-        await db.commit()
-        
-        logger.info(
-            f"Создана реферальная связь: реферер={referral_link.partner_id}, "
-            f"реферал={new_user.id}"
+    
+    # Реферер не может быть самим пользователем или его потомком в дереве (цикл)
+    referrer = referrer.where(
+        referrer_id != new_user.id,
+        ~exists().where(
+            ReferralClosure.ancestor_id == new_user.id,
+            ReferralClosure.descendant_id == referrer_id
         )
-        return True
+    )
     
-    except Exception as e:
-        logger.error(f"Ошибка при обработке реферальной ссылки: {e}")
-        await db.rollback()
+    stmt = dialect_insert(ReferralRelationship).from_select(
+        ["referrer_id", "referred_id", "created_at"],
+        referrer
+    ).on_conflict_do_nothing(
+        index_elements=[ReferralRelationship.referred_id]
+    ).returning(ReferralRelationship.referrer_id)
+    
+    result = await db.execute(stmt)
+    referrer_id = result.scalar_one_or_none()
+    
+    if referrer_id is None:
+        logger.debug(
+            "Реферальная связь для пользователя %s не создана: код %s "
+            "не найден, это собственная ссылка или связь уже существует",
+            new_user.id, referral_code
+        )
         return False
+    
+    logger.info("Создана реферальная связь: реферер=%s, реферал=%s", referrer_id, new_user.id)
+    return True
+
+
+async def register_user(
+    user_id: int,
+    username: str = None,
+    first_name: str = None,
+    last_name: str = None,
+    referral_code: str = None
+) -> Tuple[User, bool]:
+    """
+    Регистрирует пользователя по /start: два запроса в одной транзакции
+    
+    Реферальная связь вставляется в точке сохранения: ошибка (цикл, отклоненный
+    триггером, блокировка, неверный код) откатывает только связь, пользователь
+    сохраняется в любом случае.
+    
+    Returns:
+        Tuple[User, bool]: Пользователь и признак того, что он создан этим запросом
+    """
+    async with get_db() as db:
+        user, is_new_user = await get_or_create_user(
+            db, user_id, username, first_name, last_name
+        )
+        
+        if referral_code:
+            try:
+                async with db.begin_nested():
+                    await process_referral(db, referral_code, user)
+            except Exception as e:
+                logger.error("Ошибка обработки реферального кода %s для пользователя %s: %s",
+                             referral_code, user.id, e)
+    
+    return user, is_new_user
 
 
 # ============================================
@@ -228,94 +274,43 @@ async def process_referral(
 async def command_start_handler(message: Message) -> None:
     """
     Обработчик команды /start
-    Планирует отправку промо-сообщения через 1 час для новых пользователей
+    Регистрирует пользователя, ставит сценарий знакомства в очередь отправки
+    и планирует промо-сообщения для новых пользователей
     """
     user_id = message.from_user.id
     username = message.from_user.username
     first_name = message.from_user.first_name
     last_name = message.from_user.last_name
 
-    logger.info(f"Команда /start от пользователя {user_id}")
+    logger.info("Команда /start от пользователя %s", user_id)
 
-    async with get_db() as db:
-        # Проверяем, существует ли пользователь
-        result = await db.execute(select(User).filter(User.telegram_id == user_id))
-        existing_user = result.scalar_one_or_none()
-        
-        is_new_user = existing_user is None
-        
-        # Создаем или получаем пользователя
-        user = await get_or_create_user(
-            db, user_id, username, first_name, last_name
-        )
+    command_parts = message.text.split(' ')
+    referral_code = command_parts[1] if len(command_parts) > 1 else None
 
-        # Проверяем реферальный код
-        command_parts = message.text.split(' ')
-        if len(command_parts) > 1:
-            referral_code = command_parts[1]
-            await process_referral(db, referral_code, user)
-        
-        # Если пользователь новый - планируем отправку уведомлений
-        if is_new_user:
-            from bot.utils.delayed_notification import (
-                schedule_promo_notification,
-                schedule_earnings_notification
-            )
-            from bot import main as bot_module
-            
-            # Планируем первое уведомление через 1 час
-            await schedule_promo_notification(bot_module.bot, user_id, delay_hours=1)
-            logger.info(f"📅 Промо-сообщение запланировано для нового пользователя {user_id}")
-            
-            # Планируем второе уведомление через 24 часа
-            await schedule_earnings_notification(bot_module.bot, user_id, delay_hours=24)
-            logger.info(f"📅 Уведомление о результатах запланировано для нового пользователя {user_id}")
-
-    # Отправляем изображение (если файл существует)
-    try:
-        image_path = "/app/uploads/start_image.jpg"
-        if os.path.exists(image_path):
-            image = FSInputFile(image_path)
-            await message.answer_photo(photo=image)
-            await asyncio.sleep(0.3)
-        else:
-            logger.warning(f"Файл изображения не найден: {image_path}")
-    except Exception as e:
-        logger.error(f"Ошибка отправки изображения: {e}")
+    user, is_new_user = await register_user(user_id, username, first_name, last_name, referral_code)
 
-    # Отправляем приветствие
-    try:
-        logger.info(f"Отправка приветствия пользователю {user_id}")
-        await message.answer(WELCOME_TEXT, reply_markup=get_main_menu_keyboard(), parse_mode=None)
-        logger.info(f"Приветствие отправлено пользователю {user_id}")
-    except Exception as e:
-        logger.error(f"Ошибка отправки приветствия: {e}")
+    # Если пользователь новый - уведомляем админов и планируем отправку уведомлений
+    if is_new_user:
+        logger.info("Создан новый пользователь: %s", user_id)
+        send_new_user_notification(message.bot, user)
 
-    await asyncio.sleep(0.5)
+        from bot.utils.delayed_notification import (
+            schedule_promo_notification,
+            schedule_earnings_notification
+        )
+        from bot import main as bot_module
 
-    # Отправляем информацию о процентах дохода (третье сообщение)
-    try:
-        logger.info(f"Отправка процентов дохода пользователю {user_id}")
-        await message.answer(REVENUE_PERCENT_TEXT, parse_mode=None)
-        logger.info(f"Проценты дохода отправлены пользователю {user_id}")
-    except Exception as e:
-        logger.error(f"Ошибка отправки процентов дохода: {e}")
+        # Планируем первое уведомление через 1 час
+        await schedule_promo_notification(bot_module.bot, user_id, delay_hours=1)
+        logger.info("📅 Промо-сообщение запланировано для нового пользователя %s", user_id)
 
-    await asyncio.sleep(0.5)
+        # Планируем второе уведомление через 24 часа
+        await schedule_earnings_notification(bot_module.bot, user_id, delay_hours=24)
+        logger.info("📅 Уведомление о результатах запланировано для нового пользователя %s", user_id)
 
-    # Отправляем кнопку с инструкцией после приветствия
-    try:
-        logger.info(f"Отправка кнопки инструкции пользователю {user_id}")
-        await message.answer(
-            "💡 Хотите узнать, как заработать с нами?\n\n"
-            "Нажмите кнопку ниже, чтобы получить пошаговую инструкцию:",
-            reply_markup=get_how_to_earn_keyboard()
-        )
-        logger.info(f"Кнопка инструкции отправлена пользователю {user_id}")
-    except Exception as e:
-        logger.error(f"Ошибка отправки кнопки инструкции: {e}")
-    
-    logger.info(f"✅ Все сообщения отправлены пользователю {user_id}")
+    # Приветствие отправляется в фоне по порядку и с учетом лимитов, обработчик не ждет
+    onboarding_sender.enqueue(message.bot, message.chat.id, START_ONBOARDING, name="start")
+    logger.info("✅ Приветствие поставлено в очередь для пользователя %s", user_id)
 
 
 @router.message(F.text == "📋 Услуги")
@@ -501,33 +496,21 @@ async def get_referral_link_callback_handler(callback_query: CallbackQuery) -> N
     user_id = callback_query.from_user.id
 
     async with get_db() as db:
-        result = await db.execute(select(User).filter(User.telegram_id == user_id))
-        user = result.scalar_one_or_none()
+        result = await db.execute(select(User.id).filter(User.telegram_id == user_id))
+        partner_id = result.scalar_one_or_none()
 
-        if not user:
-            await callback_query.answer("Пользователь не найден", show_alert=True)
-            return
+    if not partner_id:
+        await callback_query.answer("Пользователь не найден", show_alert=True)
+        return
 
-        result = await db.execute(
-            select(ReferralLink).filter(ReferralLink.partner_id == user.id)
-        )
-        referral_link = result.scalar_one_or_none()
-
-        if not referral_link:
-            import random
-            import string
-            referral_code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
-            referral_link = ReferralLink(partner_id=user.id, referral_code=referral_code)
-            db.add(referral_link)
-            await db.commit()
+    # Код вычисляется из ID партнёра, без поиска и создания записи в referral_links
+    bot_username = (await callback_query.bot.get_me()).username
+    link = referral_url(partner_id, bot_username)
 
-        bot_username = (await callback_query.bot.get_me()).username
-        link = f"https://t.me/{bot_username}?start={referral_link.referral_code}"
+    text = f"<b>🔗 Ваша реферальная ссылка</b>\n\nОтправьте друзьям:\n<code>{link}</code>\n\nЗа каждого приглашённого вы будете получать процент!"
 
-        text = f"<b>🔗 Ваша реферальная ссылка</b>\n\nОтправьте друзьям:\n<code>{link}</code>\n\nЗа каждого приглашённого вы будете получать процент!"
-
-        await callback_query.message.answer(text, parse_mode="HTML")
-        await callback_query.answer()
+    await callback_query.message.answer(text, parse_mode="HTML")
+    await callback_query.answer()
 
 @router.callback_query(F.data == "onboarding_instruction")
 async def onboarding_instruction_handler(callback_query: CallbackQuery) -> None:
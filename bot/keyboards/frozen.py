@@ -0,0 +1,63 @@
+"""
+Неизменяемые клавиатуры
+
+Клавиатуры из кэша bot/keyboards/keyboards.py разделяются между всеми апдейтами,
+поэтому отдаются в виде замороженных моделей: попытка изменить поле кнопки
+или разметки приводит к ошибке вместо незаметной порчи общего объекта.
+"""
+from typing import Union
+
+from pydantic import ConfigDict
+from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
+
+
+class FrozenInlineKeyboardButton(InlineKeyboardButton):
+    """Inline-кнопка, запрещающая изменение полей"""
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenInlineKeyboardMarkup(InlineKeyboardMarkup):
+    """Inline-клавиатура, запрещающая изменение полей"""
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenKeyboardButton(KeyboardButton):
+    """Reply-кнопка, запрещающая изменение полей"""
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenReplyKeyboardMarkup(ReplyKeyboardMarkup):
+    """Reply-клавиатура, запрещающая изменение полей"""
+    model_config = ConfigDict(frozen=True)
+
+
+def freeze_markup(
+    markup: Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]
+) -> Union[FrozenInlineKeyboardMarkup, FrozenReplyKeyboardMarkup]:
+    """
+    Возвращает замороженную копию клавиатуры
+
+    Args:
+        markup: Inline или Reply клавиатура
+
+    Returns:
+        Замороженная клавиатура того же вида
+    """
+    if isinstance(markup, (FrozenInlineKeyboardMarkup, FrozenReplyKeyboardMarkup)):
+        return markup
+
+    if isinstance(markup, InlineKeyboardMarkup):
+        return FrozenInlineKeyboardMarkup(
+            inline_keyboard=[
+                [FrozenInlineKeyboardButton(**button.model_dump(exclude_none=True)) for button in row]
+                for row in markup.inline_keyboard
+            ]
+        )
+
+    return FrozenReplyKeyboardMarkup(
+        **markup.model_dump(exclude_none=True, exclude={"keyboard"}),
+        keyboard=[
+            [FrozenKeyboardButton(**button.model_dump(exclude_none=True)) for button in row]
+            for row in markup.keyboard
+        ]
+    )
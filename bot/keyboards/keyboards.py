@@ -4,7 +4,15 @@
 """
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import ReplyKeyboardBuilder, InlineKeyboardBuilder
-from typing import List, Tuple, Optional
+from functools import lru_cache, wraps
+from typing import Callable, List, Tuple, Optional
+
+from bot.catalog import SERVICE_CATEGORIES, get_category_buttons
+from bot.keyboards.frozen import freeze_markup
+
+
+# Размер кэша для клавиатур с параметрами (категории FAQ, категории услуг)
+KEYBOARD_CACHE_SIZE = 64
 
 
 # ============================================
@@ -73,6 +81,29 @@ def create_service_keyboard(
     return create_inline_keyboard(buttons, columns=1)
 
 
+def cached_keyboard(maxsize: Optional[int] = None) -> Callable:
+    """
+    Декоратор: клавиатура строится один раз и дальше отдается из кэша
+
+    Клавиатуры вызываются почти на каждом апдейте, а их содержимое не меняется,
+    поэтому повторная сборка через builder не нужна. Из кэша возвращается
+    замороженная разметка, общая для всех вызовов.
+
+    Args:
+        maxsize: Размер кэша (None - без ограничения, для клавиатур без параметров)
+
+    Returns:
+        Callable: Декоратор функции, возвращающей клавиатуру
+    """
+    def decorator(func: Callable) -> Callable:
+        @lru_cache(maxsize=maxsize)
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return freeze_markup(func(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
 # ============================================
 # Главное меню
 # ============================================
@@ -86,11 +117,13 @@ MAIN_MENU_BUTTONS = [
 ]
 
 
+@cached_keyboard()
 def get_main_menu_keyboard() -> ReplyKeyboardMarkup:
     """Главное меню (Reply - для обычных сообщений)"""
     return create_reply_keyboard(MAIN_MENU_BUTTONS, columns=2)
 
 
+@cached_keyboard()
 def get_main_menu_inline_keyboard() -> InlineKeyboardMarkup:
     """Inline-версия главного меню для использования с edit_text"""
     buttons = [
@@ -107,6 +140,7 @@ def get_main_menu_inline_keyboard() -> InlineKeyboardMarkup:
 # Инструкция "Как заработать"
 # ============================================
 
+@cached_keyboard()
 def get_how_to_earn_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для инструкции 'Как заработать'"""
     buttons = [
@@ -121,6 +155,7 @@ def get_how_to_earn_keyboard() -> InlineKeyboardMarkup:
     return create_inline_keyboard(buttons, columns=1)
 
 
+@cached_keyboard()
 def get_find_clients_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для раздела 'Как найти новых клиентов'"""
     buttons = [
@@ -135,6 +170,7 @@ def get_find_clients_keyboard() -> InlineKeyboardMarkup:
 # Меню услуг
 # ============================================
 
+@cached_keyboard()
 def get_services_keyboard() -> InlineKeyboardMarkup:
     """Меню услуг"""
     buttons = [
@@ -151,6 +187,7 @@ def get_services_keyboard() -> InlineKeyboardMarkup:
 # Меню профиля партнера
 # ============================================
 
+@cached_keyboard()
 def get_partner_profile_keyboard() -> InlineKeyboardMarkup:
     """Меню профиля партнера"""
     buttons = [
@@ -164,6 +201,7 @@ def get_partner_profile_keyboard() -> InlineKeyboardMarkup:
     return create_inline_keyboard(buttons, columns=1)
 
 
+@cached_keyboard()
 def get_referral_program_keyboard() -> InlineKeyboardMarkup:
     """Меню реферальной программы"""
     buttons = [
@@ -178,26 +216,31 @@ def get_referral_program_keyboard() -> InlineKeyboardMarkup:
 # Клавиатуры навигации
 # ============================================
 
+@cached_keyboard()
 def get_back_keyboard() -> InlineKeyboardMarkup:
     """Кнопка назад"""
     return create_inline_keyboard([("🔙 Назад", "back_to_main")])
 
 
+@cached_keyboard()
 def get_cancel_keyboard() -> ReplyKeyboardMarkup:
     """Клавиатура для отмены"""
     return create_reply_keyboard(["❌ Отмена"], columns=1)
 
 
+@cached_keyboard()
 def get_skip_or_finish_keyboard() -> ReplyKeyboardMarkup:
     """Клавиатура для пропуска или завершения"""
     return create_reply_keyboard(["Пропустить", "Завершить"], columns=2)
 
 
+@cached_keyboard()
 def get_finish_keyboard() -> ReplyKeyboardMarkup:
     """Клавиатура для завершения"""
     return create_reply_keyboard(["Завершить"], columns=1)
 
 
+@cached_keyboard()
 def get_confirm_keyboard() -> ReplyKeyboardMarkup:
     """Клавиатура для подтверждения"""
     return create_reply_keyboard(["Отправить", "Назад"], columns=2)
@@ -216,12 +259,24 @@ FAQ_CATEGORIES = [
 ]
 
 
+@cached_keyboard()
 def get_faq_categories_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для категорий FAQ"""
-    buttons = FAQ_CATEGORIES + [("🔙 Назад", "back_to_main")]
+    buttons = FAQ_CATEGORIES + [("🔍 Поиск по вопросам", "faq_search"), ("🔙 Назад", "back_to_main")]
+    return create_inline_keyboard(buttons, columns=1)
+
+
+@cached_keyboard()
+def get_faq_search_results_keyboard() -> InlineKeyboardMarkup:
+    """Клавиатура под результатами поиска по FAQ"""
+    buttons = [
+        ("🔍 Искать ещё", "faq_search"),
+        ("🔙 Назад к категориям", "faq_main_menu")
+    ]
     return create_inline_keyboard(buttons, columns=1)
 
 
+@cached_keyboard(maxsize=KEYBOARD_CACHE_SIZE)
 def get_faq_questions_keyboard(category_key: str) -> InlineKeyboardMarkup:
     """
     Создает клавиатуру с кнопками для каждого вопроса в указанной категории FAQ
@@ -255,21 +310,14 @@ def get_faq_questions_keyboard(category_key: str) -> InlineKeyboardMarkup:
 # Клавиатуры для юридических услуг
 # ============================================
 
+# Меню категорий и услуг собирается из каталога bot/catalog/services.py
 LEGAL_SERVICES = [
-    ("Налоговое право и споры", "legal_category_tax"),
-    ("Арбитражные споры и исполнительное производство", "legal_category_arbitration"),
-    ("Сопровождение бизнеса (Corporate)", "legal_category_corporate"),
-    ("Трудовое право и кадровое делопроизводство", "legal_category_labor"),
-    ("Договорное право и сделки", "legal_category_contract"),
-    ("Интеллектуальная собственность и IT", "legal_category_ip"),
-    ("Административное право и защита при проверках", "legal_category_administrative"),
-    ("Недвижимость и строительство", "legal_category_real_estate"),
-    ("Международное право и ВЭД", "legal_category_international"),
-    ("Антимонопольное право (ФАС)", "legal_category_antitrust"),
-    ("Семейный бизнес и наследственное планирование", "legal_category_family_business"),
+    (category["name"], category_key)
+    for category_key, category in SERVICE_CATEGORIES.items()
 ]
 
 
+@cached_keyboard()
 def get_legal_services_keyboard() -> InlineKeyboardMarkup:
     """Меню юридических услуг"""
     buttons = LEGAL_SERVICES + [("🔙 Назад", "back_to_main")]
@@ -277,137 +325,86 @@ def get_legal_services_keyboard() -> InlineKeyboardMarkup:
 
 
 # Категории услуг
-TAX_SERVICES = [
-    ("Налоговый консалтинг и планирование", "service_tax_consulting"),
-    ("Защита в налоговых проверках", "service_tax_audits_defense"),
-    ("Обжалование решений ИФНС", "service_tax_disputes_appeal"),
-    ("Взыскание излишне уплаченных налогов", "service_tax_refunds"),
-    ("Сопровождение банкротства (налоги)", "service_tax_bankruptcy_optimization"),
-    ("Защита по делам о налоговых преступлениях", "service_tax_crimes_defense"),
-]
-
-ARBITRATION_SERVICES = [
-    ("Взыскание дебиторской задолженности", "service_debt_collection"),
-    ("Споры по договорам", "service_contract_disputes"),
-    ("Корпоративные споры", "service_corporate_disputes"),
-    ("Банкротство", "service_bankruptcy"),
-    ("Оспаривание кадастровой стоимости", "service_land_valuation_disputes"),
-    ("Исполнительное производство", "service_enforcement_proceedings"),
-]
-
-CORPORATE_SERVICES = [
-    ("Регистрация и ликвидация юрлиц", "service_business_registration"),
-    ("Внесение изменений в ЕГРЮЛ", "service_changes_to_egrul"),
-    ("Корпоративное право", "service_corporate_governance"),
-    ("Протоколирование мероприятий", "service_corporate_events"),
-    ("Юридический аутсорсинг", "service_legal_outsourcing"),
-    ("Due Diligence", "service_due_diligence"),
-]
-
-LABOR_SERVICES = [
-    ("Подготовка трудовых документов", "service_labor_agreements"),
-    ("Защита в трудовых спорах", "service_labor_disputes_defense"),
-    ("Сопровождение проверок ГИТ", "service_labor_inspections_accompaniment"),
-    ("Увольнение и сокращение", "service_employment_termination"),
-    ("Миграционное право", "service_migration_law"),
-]
-
-CONTRACT_SERVICES = [
-    ("Разработка и экспертиза договоров", "service_contract_development"),
-    ("Устранение правовых рисков", "service_risk_elimination"),
-    ("Легализация серых схем", "service_gray_scheme_legalization"),
-    ("Сопровождение сделок с недвижимостью", "service_real_estate_transactions"),
-]
-
-IP_SERVICES = [
-    ("Регистрация товарных знаков и патентов", "service_tm_patent_registration"),
-    ("Защита авторских прав", "service_ip_rights_protection"),
-    ("Договоры в сфере IT", "service_it_contracts"),
-    ("Сопровождение digital-проектов", "service_digital_project_accompaniment"),
-]
-
-ADMIN_SERVICES = [
-    ("Сопровождение проверок контролирующих органов", "service_authority_inspection_accompaniment"),
-    ("Обжалование административных правонарушений", "service_administrative_offenses_appeal"),
-    ("Защита от приостановки деятельности", "service_administrative_suspension_defense"),
-]
-
-REAL_ESTATE_SERVICES = [
-    ("Юридический аудит недвижимости", "service_real_estate_audit"),
-    ("Сделки с коммерческой недвижимостью", "service_commercial_real_estate_transactions"),
-    ("Сопровождение строительных проектов", "service_construction_accompaniment"),
-    ("Земельное право", "service_land_law"),
-]
-
-INTERNATIONAL_SERVICES = [
-    ("Структурирование международных сделок", "service_international_structuring"),
-    ("Создание и сопровождение зарубежных компаний", "service_foreign_company_accompaniment"),
-    ("Сопровождение ВЭД", "service_foreign_trade_accompaniment"),
-]
-
-ANTITRUST_SERVICES = [
-    ("Сопровождение сделок с согласованием ФАС", "service_transaction_approval_fas"),
-    ("Защита при проверках соблюдения закона о рекламе", "service_advertising_law_defense"),
-    ("Защита от недобросовестной конкуренции", "service_anti_competition_defense"),
-]
-
-FAMILY_BUSINESS_SERVICES = [
-    ("Структурирование активов", "service_asset_structuring"),
-    ("Создание наследственных фондов", "service_trust_fund_creation"),
-    ("Раздел имущества супругов", "service_business_division"),
-]
-
-
+TAX_SERVICES = get_category_buttons("legal_category_tax")
+ARBITRATION_SERVICES = get_category_buttons("legal_category_arbitration")
+CORPORATE_SERVICES = get_category_buttons("legal_category_corporate")
+LABOR_SERVICES = get_category_buttons("legal_category_labor")
+CONTRACT_SERVICES = get_category_buttons("legal_category_contract")
+IP_SERVICES = get_category_buttons("legal_category_ip")
+ADMIN_SERVICES = get_category_buttons("legal_category_administrative")
+REAL_ESTATE_SERVICES = get_category_buttons("legal_category_real_estate")
+INTERNATIONAL_SERVICES = get_category_buttons("legal_category_international")
+ANTITRUST_SERVICES = get_category_buttons("legal_category_antitrust")
+FAMILY_BUSINESS_SERVICES = get_category_buttons("legal_category_family_business")
+
+
+@cached_keyboard(maxsize=KEYBOARD_CACHE_SIZE)
+def get_service_category_keyboard(category_key: str) -> InlineKeyboardMarkup:
+    """Клавиатура услуг категории по её callback_data"""
+    return create_service_keyboard(get_category_buttons(category_key))
+
+
+@cached_keyboard()
 def get_tax_law_services_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для категории 'Налоговое право и споры'"""
     return create_service_keyboard(TAX_SERVICES)
 
 
+@cached_keyboard()
 def get_arbitration_services_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для категории 'Арбитражные споры'"""
     return create_service_keyboard(ARBITRATION_SERVICES)
 
 
+@cached_keyboard()
 def get_corporate_services_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для категории 'Сопровождение бизнеса'"""
     return create_service_keyboard(CORPORATE_SERVICES)
 
 
+@cached_keyboard()
 def get_labor_law_services_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для категории 'Трудовое право'"""
     return create_service_keyboard(LABOR_SERVICES)
 
 
+@cached_keyboard()
 def get_contract_law_services_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для категории 'Договорное право'"""
     return create_service_keyboard(CONTRACT_SERVICES)
 
 
+@cached_keyboard()
 def get_ip_services_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для категории 'Интеллектуальная собственность'"""
     return create_service_keyboard(IP_SERVICES)
 
 
+@cached_keyboard()
 def get_admin_law_services_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для категории 'Административное право'"""
     return create_service_keyboard(ADMIN_SERVICES)
 
 
+@cached_keyboard()
 def get_real_estate_services_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для категории 'Недвижимость'"""
     return create_service_keyboard(REAL_ESTATE_SERVICES)
 
 
+@cached_keyboard()
 def get_international_law_services_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для категории 'Международное право'"""
     return create_service_keyboard(INTERNATIONAL_SERVICES)
 
 
+@cached_keyboard()
 def get_antitrust_services_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для категории 'Антимонопольное право'"""
     return create_service_keyboard(ANTITRUST_SERVICES)
 
 
+@cached_keyboard()
 def get_family_business_services_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для категории 'Семейный бизнес'"""
     return create_service_keyboard(FAMILY_BUSINESS_SERVICES)
@@ -417,21 +414,25 @@ def get_family_business_services_keyboard() -> InlineKeyboardMarkup:
 # Клавиатуры для анкеты дела
 # ============================================
 
+@cached_keyboard()
 def get_step_documents_keyboard() -> ReplyKeyboardMarkup:
     """Клавиатура для выбора: прикрепить документ или пропустить"""
     return create_reply_keyboard(["📎 Прикрепить документ", "➡️ Далее"], columns=2)
 
 
+@cached_keyboard()
 def get_document_upload_keyboard() -> ReplyKeyboardMarkup:
     """Клавиатура во время загрузки документов"""
     return create_reply_keyboard(["✅ Завершить загрузку", "⏭️ Пропустить"], columns=2)
 
 
+@cached_keyboard()
 def get_simple_documents_keyboard() -> ReplyKeyboardMarkup:
     """Простая клавиатура для загрузки документов без выбора раздела"""
     return create_reply_keyboard(["✅ Готово", "⏭️ Пропустить", "❌ Отмена"], columns=2)
 
 
+@cached_keyboard()
 def get_questionnaire_summary_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура на сводке анкеты"""
     buttons = [
@@ -441,6 +442,7 @@ def get_questionnaire_summary_keyboard() -> InlineKeyboardMarkup:
     return create_inline_keyboard(buttons, columns=1)
 
 
+@cached_keyboard()
 def get_edit_section_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для выбора раздела для редактирования"""
     buttons = [
@@ -456,16 +458,19 @@ def get_edit_section_keyboard() -> InlineKeyboardMarkup:
     return create_inline_keyboard(buttons, columns=1)
 
 
+@cached_keyboard()
 def get_edit_section_actions_keyboard() -> ReplyKeyboardMarkup:
     """Клавиатура при редактировании раздела"""
     return create_reply_keyboard(["📝 Изменить текст", "📎 Изменить документы", "🔙 Отмена"], columns=1)
 
 
+@cached_keyboard()
 def get_cancel_questionnaire_keyboard() -> ReplyKeyboardMarkup:
     """Клавиатура с кнопкой отмены"""
     return create_reply_keyboard(["❌ Отмена"], columns=1)
 
 
+@cached_keyboard()
 def get_documents_section_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для выбора раздела при загрузке документов"""
     buttons = [
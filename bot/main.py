@@ -3,6 +3,8 @@ import logging
 from aiogram import Bot, Dispatcher
 from aiogram.enums import ParseMode
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 
 # Исправленный импорт
 import sys
@@ -10,13 +12,25 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import settings
+from config.logging_setup import setup_logging
 
 # Инициализация логирования
-logging.basicConfig(level=logging.INFO)
+setup_logging("bot")
 logger = logging.getLogger(__name__)
 
+
+def bot_session():
+    """
+    Сессия для Bot API из TELEGRAM_API_URL: локальный сервер telegram-bot-api
+    или поддельный Bot API нагрузочного теста (benchmarks/loadtest)
+    """
+    if settings.TELEGRAM_API_URL.rstrip("/") == "https://api.telegram.org":
+        return None
+    return AiohttpSession(api=TelegramAPIServer.from_base(settings.TELEGRAM_API_URL.rstrip("/")))
+
+
 # Инициализация бота и диспетчера
-bot = Bot(token=settings.BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+bot = Bot(token=settings.BOT_TOKEN, session=bot_session(), default=DefaultBotProperties(parse_mode=ParseMode.HTML))
 dp = Dispatcher()
 
 async def main():
@@ -24,6 +38,10 @@ async def main():
     from .handlers import register_handlers
     register_handlers(dp)
     
+    # Без REFERRAL_CODE_KEY (и не в DEBUG) бот не запускается
+    from .utils.referral_codes import referral_code_key
+    referral_code_key()
+    
     logger.info("Starting bot...")
     await dp.start_polling(bot)
 
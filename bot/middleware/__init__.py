@@ -1,7 +1,7 @@
 """
 Middleware для Telegram бота
 """
-from .logging import LoggingMiddleware
+from .logging import LoggingMiddleware, UpdateContextMiddleware
 from .throttling import ThrottlingMiddleware
 
-__all__ = ['LoggingMiddleware', 'ThrottlingMiddleware']
+__all__ = ['LoggingMiddleware', 'UpdateContextMiddleware', 'ThrottlingMiddleware']
@@ -1,17 +1,41 @@
 """
 Logging Middleware для Telegram бота
-Логирует все входящие сообщения и callback-запросы
+Логирует все входящие сообщения и callback-запросы, проставляет
+update_id и trace_id в записи логов, сделанные во время обработки апдейта
 """
 import logging
 import time
 from typing import Callable, Awaitable, Any
 
 from aiogram import BaseMiddleware
-from aiogram.types import Message, CallbackQuery
+from aiogram.types import Message, CallbackQuery, TelegramObject, Update
+
+from config.logging_setup import update_id_var, trace_id_var, new_trace_id
 
 logger = logging.getLogger(__name__)
 
 
+class UpdateContextMiddleware(BaseMiddleware):
+    """
+    Outer middleware диспетчера (dp.update): update_id и новый trace_id
+    для всех записей логов, сделанных при обработке апдейта
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any]
+    ) -> Any:
+        update_token = update_id_var.set(event.update_id if isinstance(event, Update) else None)
+        trace_token = trace_id_var.set(new_trace_id())
+        try:
+            return await handler(event, data)
+        finally:
+            trace_id_var.reset(trace_token)
+            update_id_var.reset(update_token)
+
+
 class LoggingMiddleware(BaseMiddleware):
     """
     Middleware для логирования входящих сообщений и callback-запросов.
@@ -35,44 +59,42 @@ class LoggingMiddleware(BaseMiddleware):
         Returns:
             Результат обработки
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        # Получаем информацию о пользователе
+        # Строки не собираются здесь: сообщение форматируется в потоке вывода логов,
+        # и только если запись прошла уровень и прореживание
         user = event.from_user
-        user_info = f"id={user.id}, username=@{user.username}" if user.username else f"id={user.id}"
         
         # Логируем в зависимости от типа события
         if isinstance(event, Message):
             event_type = "Message"
-            event_info = f"text='{event.text[:50]}...'" if event.text and len(event.text) > 50 else f"text='{event.text}'" if event.text else "non-text"
+            event_info = event.text[:50] if event.text else "non-text"
         elif isinstance(event, CallbackQuery):
             event_type = "Callback"
-            event_info = f"data='{event.data}'"
+            event_info = event.data
         else:
             event_type = "Unknown"
-            event_info = str(type(event))
+            event_info = type(event).__name__
         
-        logger.info(f"📥 {event_type} from {user_info}: {event_info}")
+        logger.info("📥 %s from id=%s (@%s): %r", event_type, user.id, user.username, event_info)
         
         try:
             # Выполняем обработчик
             result = await handler(event, data)
             
             # Логируем успешную обработку
-            processing_time = time.time() - start_time
             logger.info(
-                f"✅ {event_type} processed for {user_info} "
-                f"in {processing_time:.3f}s"
+                "✅ %s processed for id=%s in %.3fs",
+                event_type, user.id, time.perf_counter() - start_time
             )
             
             return result
             
         except Exception as e:
             # Логируем ошибку
-            processing_time = time.time() - start_time
             logger.error(
-                f"❌ {event_type} failed for {user_info} "
-                f"after {processing_time:.3f}s: {e}",
+                "❌ %s failed for id=%s after %.3fs: %s",
+                event_type, user.id, time.perf_counter() - start_time, e,
                 exc_info=True
             )
             raise
@@ -9,7 +9,7 @@ from collections import defaultdict
 
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery
-from aiogram.exceptions import TelegramAPIException
+from aiogram.exceptions import TelegramAPIError
 
 logger = logging.getLogger(__name__)
 
@@ -110,7 +110,7 @@ class ThrottlingMiddleware(BaseMiddleware):
                     "⚠️ Слишком много запросов. Подождите немного.",
                     show_alert=True
                 )
-        except TelegramAPIException as e:
+        except TelegramAPIError as e:
             logger.warning(f"Не удалось отправить предупреждение о throttling: {e}")
     
     async def __call__(
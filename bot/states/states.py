@@ -41,4 +41,9 @@ class RevenueStates(StatesGroup):
     """Состояния для добавления выручки"""
     waiting_for_amount = State()
     waiting_for_description = State()
-    waiting_for_recipient_name = State()  # Состояние для имени получателя сообщения
\ No newline at end of file
+    waiting_for_recipient_name = State()  # Состояние для имени получателя сообщения
+
+
+class FaqStates(StatesGroup):
+    """Состояния для поиска по FAQ"""
+    waiting_for_query = State()
@@ -0,0 +1,161 @@
+"""
+Уведомления в чаты администраторов
+
+Обработчики не отправляют сообщения в чат админов сами, а кладут событие в
+очередь (admin_notifier.notify) и сразу продолжают работу. Фоновая задача
+отправляет события в одном из режимов (ADMIN_NOTIFY_MODE):
+- digest: события копятся и уходят сводкой раз в ADMIN_DIGEST_INTERVAL секунд
+  или сразу после ADMIN_DIGEST_MAX_EVENTS событий; одиночное событие
+  отправляется как есть, без заголовка сводки;
+- realtime: каждое событие отдельным сообщением (для небольшого потока).
+
+При ответе Telegram «слишком много запросов» (RetryAfter) отправка ждет
+указанное время и повторяется, остальные ошибки пишутся в лог. Очередь,
+остановка и повторы - общие с другими отправителями (config/background.py).
+"""
+import asyncio
+import logging
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple, Union
+
+from config.background import BackgroundQueue, send_with_retries
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Ограничение Telegram на длину одного сообщения
+MAX_MESSAGE_LENGTH = 4096
+
+# Заголовки видов событий в сводке
+EVENT_TITLES = {
+    "new_user": "👤 Новые пользователи",
+    "profile": "📝 Заполненные профили",
+}
+
+ChatId = Union[int, str]
+
+
+class AdminNotifier(BackgroundQueue):
+    """Очередь уведомлений для админов с отправкой сводками в фоне"""
+
+    name = "admin_notifier"
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        interval: Optional[float] = None,
+        max_events: Optional[int] = None
+    ):
+        self.mode = mode or settings.ADMIN_NOTIFY_MODE
+        self.interval = interval if interval is not None else settings.ADMIN_DIGEST_INTERVAL
+        self.max_events = max_events or settings.ADMIN_DIGEST_MAX_EVENTS
+        super().__init__()
+        self._bot = None
+        self.sent_messages = 0
+
+    def notify(self, bot, chat_id: Optional[ChatId], text: str, kind: str = "event") -> None:
+        """
+        Ставит уведомление в очередь, не дожидаясь отправки
+
+        Args:
+            bot: Экземпляр бота (запоминается при первом вызове)
+            chat_id: ID чата; если не задан, уведомление пропускается
+            text: Текст уведомления
+            kind: Вид события для группировки в сводке (new_user, profile)
+        """
+        if not chat_id:
+            logger.warning("Чат для уведомлений '%s' не настроен, уведомление не отправлено", kind)
+            return
+
+        if self._bot is None:
+            self._bot = bot
+        self.put((chat_id, kind, text))
+
+    # ============================================
+    # Фоновая отправка
+    # ============================================
+
+    async def _run(self) -> None:
+        closing = False
+        while not closing:
+            event = await self._queue.get()
+            if event is None:
+                break
+            events = [event]
+
+            if self.mode != "realtime":
+                deadline = time.monotonic() + self.interval
+                while len(events) < self.max_events:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        async with asyncio.timeout(timeout):
+                            event = await self._queue.get()
+                    except TimeoutError:
+                        break
+                    if event is None:
+                        closing = True
+                        break
+                    events.append(event)
+
+            try:
+                await self._flush(events)
+            except Exception as e:
+                logger.error("Ошибка при отправке уведомлений админам: %s", e)
+
+    async def _flush(self, events: List[Tuple[ChatId, str, str]]) -> None:
+        """Отправляет события: по одному сообщению или сводками по чатам"""
+        by_chat: Dict[ChatId, List[Tuple[str, str]]] = defaultdict(list)
+        for chat_id, kind, text in events:
+            by_chat[chat_id].append((kind, text))
+
+        for chat_id, chat_events in by_chat.items():
+            if self.mode == "realtime" or len(chat_events) == 1:
+                messages = [text for _, text in chat_events]
+            else:
+                messages = format_digest(chat_events)
+            for message in messages:
+                await self._send(chat_id, message)
+
+    async def _send(self, chat_id: ChatId, text: str) -> None:
+        error = await send_with_retries(
+            lambda: self._bot.send_message(chat_id=chat_id, text=text, parse_mode=None), chat_id
+        )
+        if error is None:
+            self.sent_messages += 1
+        else:
+            logger.error("Уведомление в чат %s не отправлено: %s", chat_id, error)
+
+
+def format_digest(events: List[Tuple[str, str]]) -> List[str]:
+    """
+    Сводка событий: заголовок с количеством по видам и тексты событий,
+    разбитые на сообщения не длиннее MAX_MESSAGE_LENGTH
+
+    Args:
+        events: Пары (вид события, текст)
+
+    Returns:
+        List[str]: Тексты сообщений
+    """
+    counts = Counter(kind for kind, _ in events)
+    header = f"📬 Сводка: {len(events)} событий\n" + "\n".join(
+        f"{EVENT_TITLES.get(kind, kind)}: {count}" for kind, count in counts.items()
+    )
+
+    messages = []
+    current = header
+    for _, text in events:
+        text = text[:MAX_MESSAGE_LENGTH - 2]
+        if len(current) + len(text) + 2 > MAX_MESSAGE_LENGTH:
+            messages.append(current)
+            current = text
+        else:
+            current += "\n\n" + text
+    messages.append(current)
+    return messages
+
+
+admin_notifier = AdminNotifier()
@@ -0,0 +1,363 @@
+"""
+Полнотекстовый поиск по FAQ
+
+Источники вопросов:
+- статический словарь FAQ_CATEGORIES из bot/handlers/faq.py
+- таблица faqs (модель FAQ)
+
+Индекс строится один раз при запуске бота и пересобирается в фоне,
+когда меняется содержимое таблицы faqs. Поиск идет по инвертированному
+индексу основ слов (упрощенный стеммер Snowball, database/stemmer.py),
+а слова с опечатками сопоставляются со словарем индекса через триграммы.
+"""
+import asyncio
+import logging
+import math
+import re
+import heapq
+from collections import Counter, OrderedDict, defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from config.settings import settings
+from database.stemmer import stem
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================
+# Нормализация
+# ============================================
+
+_WORD_RE = re.compile(r"[a-zа-я0-9]+")
+
+STOP_WORDS = frozenset([
+    "а", "без", "бы", "в", "вам", "вас", "ваш", "ваша", "ваше", "ваши", "во", "вы",
+    "да", "для", "до", "если", "есть", "же", "за", "и", "из", "или", "их", "к",
+    "как", "ко", "ли", "мне", "мой", "мы", "на", "над", "не", "нет", "но", "о",
+    "об", "от", "по", "под", "при", "с", "со", "так", "то", "у", "уже", "что",
+    "чтобы", "это", "я",
+])
+
+def normalize(text: str) -> List[str]:
+    """
+    Разбивает текст на слова: нижний регистр, «ё» -> «е», без знаков и стоп-слов
+
+    Args:
+        text: Произвольный текст
+
+    Returns:
+        List[str]: Список нормализованных слов
+    """
+    text = (text or "").lower().replace("ё", "е")
+    return [word for word in _WORD_RE.findall(text) if word not in STOP_WORDS]
+
+
+def tokenize(text: str) -> List[str]:
+    """Возвращает основы слов текста"""
+    return [stem(word) for word in normalize(text)]
+
+
+def trigrams(term: str) -> List[str]:
+    """Триграммы слова с границами: «$ос», «осн», ..."""
+    padded = f"${term}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Расстояние Левенштейна с ранним выходом, если оно больше limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+# ============================================
+# Индекс
+# ============================================
+
+class FaqEntry(NamedTuple):
+    """Вопрос FAQ из любого источника"""
+    key: str  # "static:<категория>:<номер>" или "db:<id>"
+    question: str
+    answer: str
+    category: str
+    callback_data: Optional[str] = None  # Кнопка для перехода к вопросу в меню FAQ
+
+
+class FaqSearchResult(NamedTuple):
+    """Найденный вопрос и его релевантность"""
+    entry: FaqEntry
+    score: float
+
+
+# Веса полей при подсчете частоты слова в документе
+QUESTION_WEIGHT = 3.0
+ANSWER_WEIGHT = 1.0
+CATEGORY_WEIGHT = 0.5
+
+# Параметры BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Допустимое число опечаток в зависимости от длины слова
+FUZZY_MIN_LENGTH = 4
+FUZZY_MAX_CANDIDATES = 3
+
+# Слов запросов с результатом нечеткого сопоставления в кэше индекса (LRU):
+# слова приходят от пользователей, и без предела кэш рос бы бесконечно
+FUZZY_CACHE_SIZE = 4096
+
+
+def _max_typos(term: str) -> int:
+    if len(term) < FUZZY_MIN_LENGTH:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+class FaqIndex:
+    """
+    Инвертированный индекс вопросов FAQ
+
+    Индекс неизменяем после построения: при обновлении данных строится новый
+    экземпляр и атомарно подменяет старый (см. reload_faq_index).
+    """
+
+    def __init__(self, entries: List[FaqEntry]):
+        self.entries = list(entries)
+        # основа -> [(номер документа, вклад BM25)]
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        # триграмма -> основы, в которых она встречается
+        self._trigrams: Dict[str, List[str]] = {}
+        self._doc_lengths: List[float] = []
+        # Кэш принадлежит индексу: пересобранный индекс начинает с пустого
+        self._fuzzy_cache: "OrderedDict[str, List[Tuple[str, float]]]" = OrderedDict()
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _build(self) -> None:
+        postings = defaultdict(list)
+        for doc_id, entry in enumerate(self.entries):
+            weights = Counter()
+            for field, weight in (
+                (entry.question, QUESTION_WEIGHT),
+                (entry.answer, ANSWER_WEIGHT),
+                (entry.category, CATEGORY_WEIGHT),
+            ):
+                for term in tokenize(field):
+                    weights[term] += weight
+            self._doc_lengths.append(sum(weights.values()))
+            for term, weight in weights.items():
+                postings[term].append((doc_id, weight))
+
+        total = len(self.entries) or 1
+        avg_length = (sum(self._doc_lengths) / total) or 1.0
+        # Индекс неизменяем, поэтому вклад BM25 (idf * насыщенная частота)
+        # считается один раз при построении, а поиск только суммирует его
+        norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length) for length in self._doc_lengths]
+        self._postings = {}
+        for term, docs in postings.items():
+            idf = math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+            self._postings[term] = [
+                (doc_id, idf * tf * (BM25_K1 + 1) / (tf + norms[doc_id])) for doc_id, tf in docs
+            ]
+
+        index = defaultdict(list)
+        for term in self._postings:
+            for gram in set(trigrams(term)):
+                index[gram].append(term)
+        self._trigrams = dict(index)
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """
+        Возвращает основы из индекса, соответствующие слову запроса, с весом
+
+        Точное совпадение имеет вес 1. Если слова нет в индексе, ищутся
+        основы с 1-2 опечатками: кандидаты отбираются по общим триграммам
+        (q-граммная лемма), затем проверяются расстоянием Левенштейна.
+        """
+        if term in self._postings:
+            return [(term, 1.0)]
+
+        cached = self._fuzzy_cache.get(term)
+        if cached is not None:
+            self._fuzzy_cache.move_to_end(term)
+            return cached
+
+        matches = []
+        max_typos = _max_typos(term)
+        if max_typos:
+            grams = trigrams(term)
+            min_common = len(grams) - 3 * max_typos
+            counts = Counter()
+            for gram in set(grams):
+                counts.update(self._trigrams.get(gram, ()))
+            for candidate, common in counts.items():
+                if common < max(min_common, 1):
+                    continue
+                distance = _edit_distance(term, candidate, max_typos)
+                if distance <= max_typos:
+                    matches.append((candidate, 1.0 - distance / (max_typos + 2)))
+            matches = heapq.nlargest(FUZZY_MAX_CANDIDATES, matches, key=lambda item: item[1])
+
+        self._fuzzy_cache[term] = matches
+        if len(self._fuzzy_cache) > FUZZY_CACHE_SIZE:
+            self._fuzzy_cache.popitem(last=False)
+        return matches
+
+    def search(self, query: str, limit: int = 3) -> List[FaqSearchResult]:
+        """
+        Ищет вопросы, наиболее подходящие к тексту запроса
+
+        Args:
+            query: Текст вопроса пользователя
+            limit: Максимальное количество результатов
+
+        Returns:
+            List[FaqSearchResult]: Результаты по убыванию релевантности
+        """
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            for matched, weight in self._expand(term):
+                for doc_id, impact in self._postings[matched]:
+                    scores[doc_id] += weight * impact
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [FaqSearchResult(self.entries[doc_id], score) for doc_id, score in best]
+
+
+# ============================================
+# Источники данных и перезагрузка
+# ============================================
+
+def get_static_entries() -> List[FaqEntry]:
+    """Вопросы из статического словаря FAQ_CATEGORIES"""
+    from bot.handlers.faq import FAQ_CATEGORIES
+
+    entries = []
+    for category_key, category in FAQ_CATEGORIES.items():
+        for i, qa in enumerate(category["questions"]):
+            entries.append(FaqEntry(
+                key=f"static:{category_key}:{i}",
+                question=qa["question"],
+                answer=qa["answer"],
+                category=category["name"],
+                callback_data=f"faq_{category_key}_q{i}"
+            ))
+    return entries
+
+
+async def get_db_entries(db) -> List[FaqEntry]:
+    """Вопросы из таблицы faqs"""
+    from database.models import FAQ
+
+    result = await db.execute(
+        select(FAQ.id, FAQ.question, FAQ.answer, FAQ.category).order_by(FAQ.id)
+    )
+    return [
+        FaqEntry(
+            key=f"db:{row.id}",
+            question=row.question or "",
+            answer=row.answer or "",
+            category=row.category or ""
+        )
+        for row in result
+        if row.question and row.answer
+    ]
+
+
+async def get_faq_table_version(db) -> tuple:
+    """
+    Дешевая метка версии таблицы faqs
+
+    В таблице нет updated_at, поэтому кроме количества строк и максимального id
+    учитывается суммарная длина текстов - так замечаются и правки существующих записей.
+    """
+    from database.models import FAQ
+
+    result = await db.execute(
+        select(
+            func.count(FAQ.id),
+            func.max(FAQ.id),
+            func.sum(func.length(FAQ.question) + func.length(FAQ.answer))
+        )
+    )
+    return tuple(result.one())
+
+
+_faq_index: Optional[FaqIndex] = None
+_faq_version: Optional[tuple] = None
+
+
+def get_faq_index() -> FaqIndex:
+    """
+    Текущий индекс FAQ
+
+    До первой загрузки из базы возвращает индекс по статическим вопросам.
+    """
+    global _faq_index
+    if _faq_index is None:
+        _faq_index = FaqIndex(get_static_entries())
+    return _faq_index
+
+
+async def reload_faq_index(force: bool = False) -> bool:
+    """
+    Пересобирает индекс, если изменилась таблица faqs
+
+    Args:
+        force: Пересобрать независимо от метки версии
+
+    Returns:
+        bool: True если индекс был пересобран
+    """
+    global _faq_index, _faq_version
+    from database.database import get_db
+
+    async with get_db() as db:
+        version = await get_faq_table_version(db)
+        if not force and _faq_index is not None and version == _faq_version:
+            return False
+        db_entries = await get_db_entries(db)
+
+    entries = get_static_entries() + db_entries
+    # Сборка индекса - чистые вычисления, выносим из event loop
+    index = await asyncio.to_thread(FaqIndex, entries)
+
+    _faq_index = index
+    _faq_version = version
+    logger.info(f"Индекс FAQ пересобран: {len(entries)} вопросов ({len(db_entries)} из базы)")
+    return True
+
+
+async def run_faq_index_refresher(interval: Optional[int] = None) -> None:
+    """
+    Фоновая задача: периодически проверяет метку версии таблицы faqs
+    и пересобирает индекс при изменениях
+
+    Args:
+        interval: Период проверки в секундах (по умолчанию settings.FAQ_RELOAD_INTERVAL)
+    """
+    interval = interval or settings.FAQ_RELOAD_INTERVAL
+    while True:
+        try:
+            await reload_faq_index()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Ошибка при обновлении индекса FAQ: {e}")
+        await asyncio.sleep(interval)
@@ -11,10 +11,6 @@ from database.database import get_db
 from database.models import User, PartnerProfile, NotificationLog
 from config.settings import settings
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 # Текст уведомления
@@ -308,4 +304,6 @@ async def main(notification_type: str = "all"):
 
 
 if __name__ == "__main__":
+    from config.logging_setup import setup_logging
+    setup_logging("notifications")
     asyncio.run(main())
@@ -0,0 +1,126 @@
+"""
+Фоновая отправка сценариев знакомства (onboarding)
+
+Сценарий - это кортеж шагов OnboardingStep (фото или текст с клавиатурой).
+Обработчик ставит сценарий в очередь чата (onboarding_sender.enqueue) и
+сразу возвращается, а отправкой занимается фоновая задача этого чата:
+- шаги одного чата уходят строго по порядку, не чаще одного сообщения в
+  ONBOARDING_CHAT_INTERVAL секунд;
+- общий поток всех чатов ограничен ONBOARDING_GLOBAL_RATE сообщений в секунду;
+- при RetryAfter от Telegram шаг повторяется после паузы (на нее же
+  сдвигается общий поток), при другой ошибке шаг пропускается, а сценарий
+  продолжается.
+
+Ограничение частоты и повторы - общие с другими отправителями
+(config/background.py).
+"""
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, NamedTuple, Optional, Tuple
+
+from aiogram.types import FSInputFile
+
+from config.background import RateLimiter, send_with_retries, start_background_task
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class OnboardingStep(NamedTuple):
+    """Шаг сценария знакомства"""
+    kind: str  # "photo" (content - путь к файлу) или "text"
+    content: str
+    keyboard: Optional[Callable] = None  # Фабрика клавиатуры, вызывается при отправке
+    parse_mode: Optional[str] = "HTML"
+
+
+class OnboardingSender:
+    """Очереди сценариев по чатам с ограничением частоты отправки"""
+
+    def __init__(self, chat_interval: Optional[float] = None, global_rate: Optional[float] = None):
+        self.chat_interval = chat_interval if chat_interval is not None else settings.ONBOARDING_CHAT_INTERVAL
+        self.limiter = RateLimiter(global_rate or settings.ONBOARDING_GLOBAL_RATE)
+        self._queues: Dict[int, Deque[Tuple[str, OnboardingStep]]] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+        self.sent_messages = 0
+
+    def enqueue(self, bot, chat_id: int, script: Tuple[OnboardingStep, ...], name: str = "onboarding") -> bool:
+        """
+        Ставит сценарий в очередь чата, не дожидаясь отправки
+
+        Если этот же сценарий для чата еще не отправлен до конца (повторный
+        /start), второй раз он не ставится.
+
+        Returns:
+            bool: True если сценарий поставлен в очередь
+        """
+        queue = self._queues.setdefault(chat_id, deque())
+        if any(script_name == name for script_name, _ in queue):
+            logger.debug("Сценарий '%s' для чата %s уже в очереди", name, chat_id)
+            return False
+
+        queue.extend((name, step) for step in script)
+        if chat_id not in self._workers:
+            self._workers[chat_id] = start_background_task(self._run_chat(bot, chat_id), f"onboarding_{chat_id}")
+        return True
+
+    def pending_chats(self) -> int:
+        """Количество чатов с неотправленными шагами"""
+        return len(self._workers)
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Дожидается отправки поставленных сценариев, затем отменяет оставшиеся"""
+        workers = list(self._workers.values())
+        if not workers:
+            return
+        done, pending = await asyncio.wait(workers, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning("Сценарии знакомства не досланы в %s чатов при остановке", len(pending))
+
+    # ============================================
+    # Фоновая отправка
+    # ============================================
+
+    async def _run_chat(self, bot, chat_id: int) -> None:
+        queue = self._queues[chat_id]
+        try:
+            last_sent = 0.0
+            while queue:
+                name, step = queue[0]
+                delay = last_sent + self.chat_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self.limiter.wait()
+                await self._send_step(bot, chat_id, step)
+                last_sent = time.monotonic()
+                queue.popleft()
+        finally:
+            self._workers.pop(chat_id, None)
+            if not queue:
+                self._queues.pop(chat_id, None)
+
+    async def _send_step(self, bot, chat_id: int, step: OnboardingStep) -> None:
+        if step.kind == "photo" and not os.path.exists(step.content):
+            logger.warning("Файл изображения не найден: %s", step.content)
+            return
+
+        async def send():
+            reply_markup = step.keyboard() if step.keyboard else None
+            if step.kind == "photo":
+                await bot.send_photo(chat_id, FSInputFile(step.content), reply_markup=reply_markup)
+            else:
+                await bot.send_message(chat_id, step.content, reply_markup=reply_markup, parse_mode=step.parse_mode)
+
+        error = await send_with_retries(send, chat_id, self.limiter)
+        if error is None:
+            self.sent_messages += 1
+        else:
+            logger.error("Шаг '%s' сценария знакомства не отправлен в чат %s: %s", step.kind, chat_id, error)
+
+
+onboarding_sender = OnboardingSender()
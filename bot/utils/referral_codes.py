@@ -0,0 +1,125 @@
+"""
+Детерминированные реферальные коды
+
+Код - это ID партнёра (User.id), переставленный ключевой перестановкой
+(сеть Фейстеля на 40 битах с HMAC-SHA256 в раундовой функции) и записанный
+8 символами base32 в нижнем регистре. Код вычисляется без запросов к базе,
+не совпадает у разных партнёров и обратно декодируется в ID партнёра на /start.
+
+Ключ REFERRAL_CODE_KEY - секрет: зная его, коды можно перебрать и
+сопоставить с ID партнёров. Значения по умолчанию нет; без ключа бот не
+запускается, а в режиме DEBUG использует случайный ключ процесса (коды
+действуют до перезапуска).
+
+Прежние коды из таблицы referral_links (случайные, в верхнем регистре) в
+алфавит новых кодов не попадают, поэтому они продолжают работать через
+поиск по таблице.
+"""
+import hashlib
+import hmac
+import logging
+import secrets
+from typing import Optional
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Алфавит base32 в нижнем регистре: не пересекается с прежними кодами (A-Z, 0-9, _, -)
+ALPHABET = "abcdefghijklmnopqrstuvwxyz234567"
+CODE_LENGTH = 8
+
+HALF_BITS = 20
+HALF_MASK = (1 << HALF_BITS) - 1
+ROUNDS = 4
+
+# ID пользователей - Integer; декодированное значение вне диапазона значит опечатку или чужой код
+MAX_PARTNER_ID = 2 ** 31 - 1
+
+_DECODE = {char: index for index, char in enumerate(ALPHABET)}
+
+# Случайный ключ процесса для DEBUG без REFERRAL_CODE_KEY
+_debug_key: Optional[str] = None
+
+
+def referral_code_key() -> str:
+    """
+    Ключ перестановки из REFERRAL_CODE_KEY
+
+    Raises:
+        RuntimeError: Ключ не задан и DEBUG выключен
+    """
+    global _debug_key
+    if settings.REFERRAL_CODE_KEY:
+        return settings.REFERRAL_CODE_KEY
+    if not settings.DEBUG:
+        raise RuntimeError("REFERRAL_CODE_KEY не задан: реферальные коды нельзя выдавать без секретного ключа")
+    if _debug_key is None:
+        _debug_key = secrets.token_urlsafe(32)
+        logger.warning("REFERRAL_CODE_KEY не задан: используется случайный ключ, коды действуют до перезапуска")
+    return _debug_key
+
+
+def _round(key: bytes, round_index: int, value: int) -> int:
+    digest = hmac.new(key, bytes([round_index]) + value.to_bytes(3, "big"), hashlib.sha256).digest()
+    return int.from_bytes(digest[:3], "big") & HALF_MASK
+
+
+def _permute(value: int, key: bytes, decode: bool = False) -> int:
+    """Сеть Фейстеля: перестановка 40-битных чисел, обратная при decode=True"""
+    left, right = value >> HALF_BITS, value & HALF_MASK
+    rounds = range(ROUNDS - 1, -1, -1) if decode else range(ROUNDS)
+    for round_index in rounds:
+        if decode:
+            left, right = right ^ _round(key, round_index, left), left
+        else:
+            left, right = right, left ^ _round(key, round_index, right)
+    return (left << HALF_BITS) | right
+
+
+def encode_referral_code(partner_id: int, key: Optional[str] = None) -> str:
+    """
+    Реферальный код партнёра
+
+    Args:
+        partner_id: ID пользователя (User.id)
+        key: Ключ перестановки (по умолчанию REFERRAL_CODE_KEY)
+    """
+    if not 0 < partner_id <= MAX_PARTNER_ID:
+        raise ValueError(f"Недопустимый ID партнёра: {partner_id}")
+
+    value = _permute(partner_id, (key or referral_code_key()).encode("utf-8"))
+    chars = []
+    for _ in range(CODE_LENGTH):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def decode_referral_code(code: str, key: Optional[str] = None) -> Optional[int]:
+    """
+    ID партнёра по реферальному коду
+
+    Returns:
+        Optional[int]: ID партнёра или None, если код не в новом формате
+        (прежний код из referral_links, опечатка)
+    """
+    if not code or len(code) != CODE_LENGTH:
+        return None
+
+    value = 0
+    for char in code:
+        index = _DECODE.get(char)
+        if index is None:
+            return None
+        value = (value << 5) | index
+
+    partner_id = _permute(value, (key or referral_code_key()).encode("utf-8"), decode=True)
+    if not 0 < partner_id <= MAX_PARTNER_ID:
+        return None
+    return partner_id
+
+
+def referral_url(partner_id: int, bot_username: str = "legaldecision_bot") -> str:
+    """Реферальная ссылка партнёра"""
+    return f"https://t.me/{bot_username}?start={encode_referral_code(partner_id)}"
@@ -10,8 +10,10 @@ import os
 sys.path.insert(0, '/opt/law_bot')
 
 from bot.utils.notification_sender import main
+from config.logging_setup import setup_logging
 
 if __name__ == "__main__":
     # Получаем тип уведомлений из аргумента командной строки
     notification_type = sys.argv[1] if len(sys.argv) > 1 else "all"
+    setup_logging("notifications")
     asyncio.run(main(notification_type))
@@ -1,6 +1,9 @@
-with open('admin_panel/simple_test.html', 'r', encoding='utf-8') as f:
+# Страница админ-панели разнесена на admin_panel/static/index.html и admin.js
+with open('admin_panel/static/index.html', 'r', encoding='utf-8') as f:
     html = f.read()
-if 'switchTab' in html:
+with open('admin_panel/static/admin.js', 'r', encoding='utf-8') as f:
+    script = f.read()
+if 'function switchTab' in script:
     print("Скрипт переключения вкладок добавлен")
     if 'onclick="switchTab' in html:
         print("Обработчики событий добавлены")
@@ -0,0 +1,128 @@
+"""
+Общие части фоновых отправителей бота и веб-сервиса
+
+Очереди уведомлений (bot/utils/admin_notifications.py,
+admin_panel/payout_notifier.py), сценарии знакомства (bot/utils/onboarding.py)
+и очередь записи в БД (database/database.py) устроены одинаково:
+- фоновая задача общая для всех апдейтов и запросов, поэтому запускается в
+  чистом контексте (start_background_task) и не логирует trace_id того
+  апдейта, который ее создал;
+- BackgroundQueue - очередь с одной задачей-обработчиком; close() ставит
+  маркер конца очереди, задача обрабатывает все, что взяла до него, и
+  завершается;
+- RateLimiter - общий поток не чаще rate сообщений в секунду: каждая
+  отправка резервирует ближайший свободный интервал;
+- send_with_retries - отправка с повтором после «слишком много запросов»
+  (исключение с атрибутом retry_after: TelegramRetryAfter aiogram или
+  TelegramSendError веб-сервиса); другие ошибки не повторяются.
+"""
+import asyncio
+import contextvars
+import logging
+import time
+from typing import Any, Awaitable, Callable, Coroutine, Optional
+
+logger = logging.getLogger(__name__)
+
+# Повторы сообщения после RetryAfter
+MAX_RETRIES = 3
+
+
+def start_background_task(coro: Coroutine, name: str) -> asyncio.Task:
+    """Запускает общую фоновую задачу в чистом контексте (без trace_id создателя)"""
+    return asyncio.get_running_loop().create_task(coro, name=name, context=contextvars.Context())
+
+
+class RateLimiter:
+    """Ограничение общего потока отправок: не чаще rate в секунду"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        # Резервируем ближайший свободный интервал (без блокировок: один цикл событий)
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def pause(self, seconds: float) -> None:
+        """Сдвигает все следующие отправки на seconds (лимит Telegram общий для бота)"""
+        self._next_slot = max(self._next_slot, time.monotonic() + seconds)
+
+
+async def send_with_retries(
+    send: Callable[[], Awaitable[Any]],
+    chat_id: Any,
+    limiter: Optional[RateLimiter] = None,
+    retries: int = MAX_RETRIES
+) -> Optional[str]:
+    """
+    Отправляет сообщение, повторяя его после ответа «слишком много запросов»
+
+    Args:
+        send: Корутина-функция отправки одного сообщения
+        chat_id: Получатель (для лога)
+        limiter: Общий поток отправок: на время паузы сдвигаются и остальные
+        retries: Число повторов после retry_after
+
+    Returns:
+        Optional[str]: None если сообщение отправлено, иначе текст ошибки
+    """
+    for attempt in range(retries + 1):
+        try:
+            await send()
+            return None
+        except Exception as e:
+            retry_after = getattr(e, "retry_after", None)
+            if retry_after is None:
+                return str(e) or type(e).__name__
+            logger.warning("Лимит Telegram для чата %s, повтор через %s с", chat_id, retry_after)
+            if limiter is not None:
+                limiter.pause(retry_after)
+            await asyncio.sleep(retry_after)
+    return "не отправлено после повторов"
+
+
+class BackgroundQueue:
+    """
+    Очередь с одной фоновой задачей-обработчиком
+
+    Наследник реализует _run: читает self._queue до маркера None.
+    """
+
+    # Имя фоновой задачи и очереди в логах
+    name = "background_queue"
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def put(self, item: Any) -> None:
+        """Ставит элемент в очередь, при необходимости запуская фоновую задачу"""
+        self._ensure_task()
+        self._queue.put_nowait(item)
+
+    def _ensure_task(self) -> None:
+        if self._task is None or self._task.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._task = start_background_task(self._run(), self.name)
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Дожидается обработки поставленных элементов и останавливает фоновую задачу"""
+        if self._task is None or self._task.done():
+            return
+
+        self._queue.put_nowait(None)
+        try:
+            async with asyncio.timeout(timeout):
+                await self._task
+        except TimeoutError:
+            logger.error("Очередь %s не обработана за %s с при остановке", self.name, timeout)
+            self._task.cancel()
+        self._task = None
+
+    async def _run(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,194 @@
+"""
+Общая настройка логирования бота и веб-сервиса
+
+setup_logging() заменяет logging.basicConfig в точках входа:
+- обработчики корневого логгера пишут в очередь (QueueHandler), а вывод в
+  stdout делает поток QueueListener - цикл событий не ждет записи в канал;
+- запись ставится в очередь без форматирования: сообщение собирается из
+  msg % args и форматируется в потоке слушателя, поэтому в коде логируем
+  logger.info("... %s", value), а не f-строками;
+- к каждой записи добавляются update_id и trace_id текущего апдейта или
+  HTTP-запроса (contextvars), в формате json они выводятся отдельными полями;
+- записи уровня INFO и ниже сверх LOG_SAMPLE_RATE_LIMIT в секунду
+  прореживаются (проходит каждая LOG_SAMPLE_KEEP-я), WARNING и выше не
+  прореживаются никогда; при переполнении очереди запись отбрасывается.
+Число пропущенных записей выводится в поле dropped следующей записи.
+"""
+import atexit
+import contextvars
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from config.settings import settings
+
+# Идентификаторы текущего апдейта бота / HTTP-запроса
+update_id_var: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("update_id", default=None)
+trace_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("trace_id", default=None)
+
+# Заголовок, которым trace_id передается между ботом и веб-сервисом
+TRACE_HEADER = "X-Trace-Id"
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class ContextFilter(logging.Filter):
+    """Добавляет к записи update_id и trace_id; выполняется в потоке, который логирует"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.update_id = update_id_var.get()
+        record.trace_id = trace_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Прореживает записи INFO и ниже под нагрузкой
+
+    В пределах секунды первые rate_limit записей проходят, дальше - каждая
+    keep_every-я. Счетчик пропущенных (и отброшенных очередью) передается в
+    поле dropped первой прошедшей записи.
+    """
+
+    def __init__(self, rate_limit: int, keep_every: int):
+        super().__init__()
+        self.rate_limit = rate_limit
+        self.keep_every = max(1, keep_every)
+        self.window = 0
+        self.count = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        with self._lock:
+            if record.levelno <= logging.INFO and self.rate_limit > 0:
+                window = int(time.monotonic())
+                if window != self.window:
+                    self.window = window
+                    self.count = 0
+                self.count += 1
+                if self.count > self.rate_limit and (self.count - self.rate_limit) % self.keep_every:
+                    self.dropped += 1
+                    return False
+            record.dropped = self.dropped
+            self.dropped = 0
+            return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler без форматирования в вызывающем потоке и без ожидания места в очереди
+
+    Стандартный prepare() форматирует запись, чтобы ее можно было передать в
+    другой процесс; слушатель у нас в том же процессе, поэтому запись уходит
+    в очередь как есть.
+    """
+
+    def __init__(self, log_queue: queue.Queue, sampling: Optional[SamplingFilter] = None):
+        super().__init__(log_queue)
+        self.sampling = sampling
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.sampling is not None:
+                with self.sampling._lock:
+                    self.sampling.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись - одна строка JSON"""
+
+    def __init__(self, service: str):
+        super().__init__()
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "service": self.service,
+            "msg": record.getMessage(),
+        }
+        for field in ("update_id", "trace_id", "dropped"):
+            value = getattr(record, field, None)
+            if value:
+                entry[field] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Прежний текстовый формат с trace_id в конце строки"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        trace_id = getattr(record, "trace_id", None)
+        if trace_id:
+            update_id = getattr(record, "update_id", None)
+            line += f" [trace={trace_id}" + (f" update={update_id}]" if update_id else "]")
+        return line
+
+
+def setup_logging(service: str, level: Optional[str] = None, stream=None) -> None:
+    """
+    Настраивает корневой логгер процесса; повторный вызов ничего не делает
+
+    Args:
+        service: Имя сервиса в записях JSON ("bot", "web")
+        level: Уровень логирования, по умолчанию LOG_LEVEL
+        stream: Куда писать, по умолчанию sys.stdout
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter(service))
+    else:
+        output.setFormatter(TextFormatter(TEXT_FORMAT))
+
+    sampling = SamplingFilter(settings.LOG_SAMPLE_RATE_LIMIT, settings.LOG_SAMPLE_KEEP)
+    handler = NonBlockingQueueHandler(queue.Queue(settings.LOG_QUEUE_SIZE), sampling)
+    handler.addFilter(sampling)
+    handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for old in root.handlers[:]:
+        root.removeHandler(old)
+    root.addHandler(handler)
+    root.setLevel((level or settings.LOG_LEVEL).upper())
+
+    _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Дописывает записи из очереди и останавливает поток вывода"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,233 @@
+"""
+Полнотекстовый поиск по анкетам дел (case_questionnaires)
+
+Индекс зависит от диалекта базы данных:
+- SQLite: внешняя FTS5-таблица case_questionnaires_fts, синхронизируемая триггерами
+- PostgreSQL: вычисляемая колонка search_vector (tsvector) с GIN-индексом
+
+Индекс обновляется самой базой данных при любой записи в case_questionnaires,
+поэтому бот и админ-панель не должны ничего делать дополнительно.
+"""
+import logging
+import re
+from typing import List, Tuple
+
+from sqlalchemy import and_, func, or_, select, text
+
+from database.stemmer import stem
+
+logger = logging.getLogger(__name__)
+
+# Поля анкеты, по которым идет поиск
+CASE_SEARCH_FIELDS = (
+    "parties_info",
+    "dispute_subject",
+    "legal_basis",
+    "chronology",
+    "evidence",
+    "client_goal",
+)
+
+# Веса полей при ранжировании (в порядке CASE_SEARCH_FIELDS)
+SQLITE_FIELD_WEIGHTS = (1.0, 3.0, 2.0, 1.0, 1.0, 2.0)
+POSTGRES_FIELD_WEIGHTS = ("C", "A", "B", "D", "D", "B")
+
+FTS_TABLE = "case_questionnaires_fts"
+
+# Максимальное количество слов запроса, передаваемых в FTS5
+MAX_QUERY_TERMS = 16
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+# ============================================
+# Создание индекса
+# ============================================
+
+def _sqlite_statements() -> List[str]:
+    columns = ", ".join(CASE_SEARCH_FIELDS)
+    new_values = ", ".join(f"new.{field}" for field in CASE_SEARCH_FIELDS)
+    old_values = ", ".join(f"old.{field}" for field in CASE_SEARCH_FIELDS)
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+            {columns},
+            content='case_questionnaires',
+            content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON case_questionnaires BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON case_questionnaires BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END
+        """,
+        # Срабатывает только при изменении текстовых полей, а не статуса
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {columns} ON case_questionnaires BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});
+        END
+        """,
+    ]
+
+
+def _postgres_statements() -> List[str]:
+    vector = " || ".join(
+        f"setweight(to_tsvector('russian'::regconfig, coalesce({field}, '')), '{weight}')"
+        for field, weight in zip(CASE_SEARCH_FIELDS, POSTGRES_FIELD_WEIGHTS)
+    )
+    return [
+        f"""
+        ALTER TABLE case_questionnaires
+        ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS ({vector}) STORED
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS ix_case_questionnaires_search_vector
+        ON case_questionnaires USING GIN (search_vector)
+        """,
+    ]
+
+
+async def init_case_search(conn) -> None:
+    """
+    Создает полнотекстовый индекс по анкетам, если его еще нет
+
+    Вызывается после Base.metadata.create_all в той же транзакции.
+    При первом создании FTS5-таблицы в SQLite индекс заполняется существующими анкетами.
+
+    Args:
+        conn: Асинхронное соединение (AsyncConnection)
+    """
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        result = await conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE}
+        )
+        exists = result.scalar() is not None
+        for statement in _sqlite_statements():
+            await conn.execute(text(statement))
+        if not exists:
+            await conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            logger.info("Создан полнотекстовый индекс анкет (FTS5)")
+    elif dialect == "postgresql":
+        for statement in _postgres_statements():
+            await conn.execute(text(statement))
+    else:
+        logger.warning(f"Полнотекстовый поиск не поддерживается для диалекта {dialect}")
+
+
+# ============================================
+# Поиск
+# ============================================
+
+def build_fts5_query(query: str) -> str:
+    """
+    Преобразует пользовательский запрос в безопасный запрос FTS5
+
+    Каждое слово приводится к основе и ищется по префиксу («договора» -> "договор"*),
+    слова объединяются через AND. Спецсимволы синтаксиса FTS5 отбрасываются.
+
+    Args:
+        query: Текст запроса администратора
+
+    Returns:
+        str: Запрос для оператора MATCH (пустая строка, если слов нет)
+    """
+    terms = []
+    for word in _WORD_RE.findall(query.lower())[:MAX_QUERY_TERMS]:
+        base = stem(word) if len(word) > 3 else word
+        terms.append(f'"{base}"*')
+    return " ".join(terms)
+
+
+async def search_cases(db, query: str, limit: int = 20, offset: int = 0) -> Tuple[int, List[Tuple[int, float]]]:
+    """
+    Ищет анкеты по тексту
+
+    Args:
+        db: Асинхронная сессия базы данных
+        query: Текст запроса
+        limit: Размер страницы
+        offset: Смещение от начала выдачи
+
+    Returns:
+        Tuple[int, List[Tuple[int, float]]]: Общее число найденных анкет и
+        страница пар (id анкеты, релевантность) по убыванию релевантности
+    """
+    dialect = db.bind.dialect.name
+    if dialect == "sqlite":
+        match = build_fts5_query(query)
+        if not match:
+            return 0, []
+        weights = ", ".join(str(weight) for weight in SQLITE_FIELD_WEIGHTS)
+        total = await db.execute(
+            text(f"SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"),
+            {"match": match}
+        )
+        # bm25() возвращает отрицательные значения: чем меньше, тем релевантнее
+        rows = await db.execute(
+            text(f"""
+                SELECT rowid, -bm25({FTS_TABLE}, {weights}) AS rank
+                FROM {FTS_TABLE}
+                WHERE {FTS_TABLE} MATCH :match
+                ORDER BY rank DESC, rowid DESC
+                LIMIT :limit OFFSET :offset
+            """),
+            {"match": match, "limit": limit, "offset": offset}
+        )
+    elif dialect == "postgresql":
+        if not _WORD_RE.search(query):
+            return 0, []
+        total = await db.execute(
+            text("""
+                SELECT COUNT(*) FROM case_questionnaires
+                WHERE search_vector @@ websearch_to_tsquery('russian', :query)
+            """),
+            {"query": query}
+        )
+        rows = await db.execute(
+            text("""
+                SELECT id, ts_rank_cd(search_vector, q) AS rank
+                FROM case_questionnaires, websearch_to_tsquery('russian', :query) AS q
+                WHERE search_vector @@ q
+                ORDER BY rank DESC, id DESC
+                LIMIT :limit OFFSET :offset
+            """),
+            {"query": query, "limit": limit, "offset": offset}
+        )
+    else:
+        return await search_cases_like(db, query, limit, offset)
+
+    return total.scalar() or 0, [(row[0], float(row[1])) for row in rows]
+
+
+async def search_cases_like(db, query: str, limit: int = 20, offset: int = 0) -> Tuple[int, List[Tuple[int, float]]]:
+    """
+    Поиск без полнотекстового индекса (диалекты кроме SQLite и PostgreSQL)
+
+    Каждое слово запроса должно встретиться (ILIKE) хотя бы в одном поле
+    CASE_SEARCH_FIELDS. Релевантность не считается: новые анкеты первыми, rank = 0.
+    """
+    from database.models import CaseQuestionnaire
+
+    words = _WORD_RE.findall(query)[:MAX_QUERY_TERMS]
+    if not words:
+        return 0, []
+    condition = and_(*(
+        or_(*(getattr(CaseQuestionnaire, field).ilike(f"%{word}%") for field in CASE_SEARCH_FIELDS))
+        for word in words
+    ))
+    total = await db.scalar(select(func.count(CaseQuestionnaire.id)).where(condition))
+    rows = await db.execute(
+        select(CaseQuestionnaire.id).where(condition)
+        .order_by(CaseQuestionnaire.id.desc()).limit(limit).offset(offset)
+    )
+    return total or 0, [(case_id, 0.0) for case_id in rows.scalars()]
@@ -5,20 +5,19 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import asyncio
 import logging
-from sqlalchemy import create_engine
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool, NullPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
 from contextlib import asynccontextmanager
+from config.background import start_background_task
 from config.settings import settings
 
-# Настройка логирования
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 
 # Определяем путь к базе данных
 db_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'law_bot.db')
@@ -44,34 +43,123 @@ if "postgresql+asyncpg" in DATABASE_URL:
 #        DATABASE_URL += "&ssl=require"
 
 # Определяем параметры пула в зависимости от типа базы данных
-if DATABASE_URL.startswith("sqlite"):
-    # Для SQLite используем NullPool или QueuePool с ограниченными настройками
-    # SQLite не поддерживает одновременные подключения, поэтому ограничиваем пул
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+# INSERT с on_conflict_do_update / on_conflict_do_nothing для диалекта основной базы
+dialect_insert = sqlite.insert if IS_SQLITE else postgresql.insert
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Профиль SQLite для нескольких процессов (бот, админ-панель, сервер сообщений)
+
+    WAL позволяет читать во время записи, busy_timeout заставляет ждать
+    блокировку вместо ошибки "database is locked", synchronous=NORMAL в WAL
+    безопасен при сбое процесса и не делает fsync на каждый коммит.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}")
+    cursor.close()
+
+
+if IS_SQLITE:
+    # В WAL читатели не блокируют друг друга и писателя, поэтому пул рассчитан на чтение.
+    # Запись внутри процесса можно направить через db_writer (см. ниже).
+    # AsyncAdaptedQueuePool: синхронный QueuePool при исчерпании пула блокирует
+    # поток цикла событий, и процесс зависает
     engine = create_async_engine(
         DATABASE_URL,
-        poolclass=QueuePool,
-        pool_size=5,
-        max_overflow=10,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=settings.SQLITE_READ_POOL_SIZE,
         pool_timeout=30,
         pool_recycle=1800,
         echo=settings.DEBUG,
-        connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+        connect_args={"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT / 1000}
+    )
+    event.listen(engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+    # Отдельное соединение писателя: транзакции начинаются с BEGIN IMMEDIATE
+    # (блокировка на запись берется сразу, а не при первом INSERT), драйвер не
+    # управляет транзакциями сам, поэтому работают SAVEPOINT для группового коммита.
+    write_engine = create_async_engine(
+        DATABASE_URL,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=60,
+        echo=settings.DEBUG,
+        connect_args={"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT / 1000}
     )
-    logger.info("Создан движок SQLite с QueuePool")
+
+    @event.listens_for(write_engine.sync_engine, "connect")
+    def _prepare_writer_connection(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, connection_record)
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(write_engine.sync_engine, "begin")
+    def _begin_immediate(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    logger.info("Создан движок SQLite (WAL) с пулом чтения и отдельным соединением записи")
 else:
-    # Для PostgreSQL и других баз данных используем QueuePool с оптимальными настройками
+    # Для PostgreSQL и других баз данных используем пул соединений с оптимальными настройками
     engine = create_async_engine(
         DATABASE_URL,
-        poolclass=QueuePool,
+        poolclass=AsyncAdaptedQueuePool,
         pool_size=10,
         max_overflow=20,
         pool_timeout=30,
         pool_recycle=1800,
         echo=settings.DEBUG
     )
-    logger.info("Создан движок базы данных с QueuePool")
+    write_engine = None
+    logger.info("Создан движок базы данных с AsyncAdaptedQueuePool")
+
+# Реплика для чтения: списки и отчеты админ-панели, допускающие отставание.
+# Без DATABASE_READ_URL чтение идет через основной движок.
+DATABASE_READ_URL = settings.DATABASE_READ_URL or DATABASE_URL
+
+if DATABASE_READ_URL == DATABASE_URL:
+    read_engine = engine
+elif DATABASE_READ_URL.startswith("sqlite"):
+    read_engine = create_async_engine(
+        DATABASE_READ_URL,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.SQLITE_READ_POOL_SIZE,
+        max_overflow=settings.SQLITE_READ_POOL_SIZE,
+        pool_timeout=30,
+        pool_recycle=1800,
+        echo=settings.DEBUG,
+        connect_args={"check_same_thread": False, "timeout": settings.SQLITE_BUSY_TIMEOUT / 1000}
+    )
+
+    @event.listens_for(read_engine.sync_engine, "connect")
+    def _prepare_read_connection(dbapi_connection, connection_record):
+        apply_sqlite_pragmas(dbapi_connection, connection_record)
+        # Случайная запись в реплику завершится ошибкой, а не разойдется с основной базой
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
 
-# Создаем фабрику сессий
+    logger.info("Создан движок реплики SQLite для чтения")
+else:
+    read_engine = create_async_engine(
+        DATABASE_READ_URL,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=10,
+        max_overflow=20,
+        pool_timeout=30,
+        pool_recycle=1800,
+        echo=settings.DEBUG
+    )
+    logger.info("Создан движок реплики для чтения")
+
+# Создаем фабрики сессий
 AsyncSessionLocal = sessionmaker(
     engine,
     class_=AsyncSession,
@@ -79,6 +167,13 @@ AsyncSessionLocal = sessionmaker(
     autoflush=False
 )
 
+ReadSessionLocal = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False
+)
+
 
 @asynccontextmanager
 async def get_db():
@@ -103,6 +198,30 @@ async def get_db():
         await session.close()
 
 
+@asynccontextmanager
+async def get_read_db():
+    """
+    Асинхронный контекстный менеджер для сессии только для чтения.
+
+    Сессия открывается на реплике (DATABASE_READ_URL), а если реплика не
+    настроена - на основной базе. Данные реплики могут отставать, поэтому
+    чтение сразу после собственной записи (отметка прочитанного, ответ на
+    POST/PUT, переписка) должно идти через get_db. Транзакция не фиксируется.
+
+    Использование:
+        async with get_read_db() as db:
+            result = await db.execute(query)
+    """
+    session = ReadSessionLocal()
+    try:
+        yield session
+    except Exception as e:
+        logger.error(f"Ошибка при чтении из базы данных: {e}")
+        raise
+    finally:
+        await session.close()
+
+
 # Зависимость для FastAPI
 async def get_db_session():
     """
@@ -125,6 +244,127 @@ async def get_db_session():
         await session.close()
 
 
+class DatabaseWriter:
+    """
+    Очередь записи с групповым коммитом
+
+    Операции записи ставятся в очередь и выполняются одной фоновой задачей
+    через единственное соединение писателя. Накопившиеся операции (до
+    DB_WRITER_BATCH_SIZE, с ожиданием до DB_WRITER_BATCH_WINDOW секунд)
+    выполняются в одной транзакции, каждая в своей точке сохранения: ошибка
+    одной операции откатывает только ее, остальные фиксируются одним COMMIT.
+
+    Для PostgreSQL очередь не нужна: операция выполняется сразу в своей сессии.
+
+    Использование:
+        async def save(db):
+            db.add(message)
+            await db.flush()
+            return message.id
+
+        message_id = await db_writer.submit(save)
+    """
+
+    def __init__(self, bind, batch_size: int, batch_window: float):
+        self._bind = bind
+        self._batch_size = batch_size
+        self._batch_window = batch_window
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._session_factory = sessionmaker(
+            bind, class_=AsyncSession, expire_on_commit=False, autoflush=False
+        ) if bind is not None else None
+
+    async def submit(self, operation: Callable[[AsyncSession], Awaitable[Any]]) -> Any:
+        """
+        Выполняет операцию записи и возвращает ее результат
+
+        Args:
+            operation: Корутина-функция, принимающая сессию; коммит делать не нужно
+
+        Raises:
+            Исключение, выброшенное операцией или при коммите группы
+        """
+        if self._session_factory is None:
+            async with get_db() as db:
+                return await operation(db)
+
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((operation, future))
+        return await future
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._queue = asyncio.Queue()
+            self._task = start_background_task(self._run(), "db_writer")
+
+    async def _collect_batch(self) -> List[Optional[Tuple[Callable, asyncio.Future]]]:
+        """Ждет первую операцию и добирает те, что успели прийти за окно группировки"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self._batch_window
+        while len(batch) < self._batch_size and batch[-1] is not None:
+            if self._queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    async with asyncio.timeout(timeout):
+                        batch.append(await self._queue.get())
+                except TimeoutError:
+                    break
+            else:
+                batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            # None - сигнал остановки от close(): операции до него выполняются
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+
+            results = []
+            try:
+                if batch:
+                    async with self._session_factory() as session:
+                        async with session.begin():
+                            for operation, future in batch:
+                                try:
+                                    async with session.begin_nested():
+                                        results.append((future, await operation(session), None))
+                                except Exception as e:
+                                    results.append((future, None, e))
+            except Exception as e:
+                logger.error(f"Ошибка группового коммита ({len(batch)} операций): {e}")
+                results = [(future, None, e) for _, future in batch]
+
+            for future, result, error in results:
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+            if stop:
+                return
+
+    async def close(self) -> None:
+        """Выполняет уже поставленные в очередь операции и останавливает писателя"""
+        if self._task is not None and not self._task.done():
+            await self._queue.put(None)
+            await self._task
+        self._task = None
+
+
+# Общая очередь записи процесса
+db_writer = DatabaseWriter(write_engine, settings.DB_WRITER_BATCH_SIZE, settings.DB_WRITER_BATCH_WINDOW)
+
+
 async def init_db():
     """
     Инициализация базы данных - создание всех таблиц
@@ -132,12 +372,103 @@ async def init_db():
     from database.models import Base
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    await run_startup_steps(engine.begin, schema_steps())
     logger.info("База данных инициализирована")
 
 
+async def run_startup_steps(
+    conn_factory: Callable[[], Any],
+    steps: Iterable[Tuple[Callable[[Any], Awaitable[Any]], str]]
+) -> bool:
+    """
+    Выполняет шаги инициализации схемы, каждый в своей транзакции
+
+    Ошибка шага пишется в лог и не отменяет остальные: например, без FTS5
+    индексы и реферальное дерево все равно создаются.
+
+    Args:
+        conn_factory: Фабрика транзакций (engine.begin)
+        steps: Пары (корутина-функция от соединения, название шага в родительном падеже)
+
+    Returns:
+        bool: True если все шаги выполнены
+    """
+    ok = True
+    for step, title in steps:
+        try:
+            async with conn_factory() as conn:
+                await step(conn)
+        except Exception as e:
+            logger.error("Ошибка создания %s: %s", title, e)
+            ok = False
+    return ok
+
+
+def schema_steps() -> List[Tuple[Callable[[Any], Awaitable[Any]], str]]:
+    """Шаги поверх create_all: недостающие индексы и колонки, полнотекстовый индекс заявок, реферальное дерево"""
+    from database.case_search import init_case_search
+    from database.referral_tree import init_referral_tree
+    return [
+        (ensure_indexes, "индексов"),
+        (init_case_search, "полнотекстового индекса заявок"),
+        (init_referral_tree, "реферального дерева"),
+    ]
+
+
+async def ensure_indexes(conn):
+    """
+    Создает индексы из моделей, которых еще нет в существующих таблицах
+
+    create_all создает индексы только вместе с новыми таблицами, поэтому
+    индексы, добавленные в модели позже, досоздаются здесь. Так же добавляются
+    новые колонки, допускающие NULL (users.updated_at). Таблицы, которых
+    в базе еще нет (веб-сервис запущен раньше бота), пропускаются: их
+    индексы создаст create_all.
+
+    Args:
+        conn: Асинхронное соединение (AsyncConnection)
+    """
+    from database.models import Base
+
+    def create_missing(sync_conn):
+        # Дубликаты связей, появившиеся из-за гонок /start до уникального индекса,
+        # мешают его созданию: оставляем первую связь каждого приглашенного
+        inspector = inspect(sync_conn)
+        if inspector.has_table("referral_relationships"):
+            existing = {index["name"] for index in inspector.get_indexes("referral_relationships")}
+            if "ux_referral_relationships_referred_id" not in existing:
+                result = sync_conn.execute(text(
+                    "DELETE FROM referral_relationships WHERE id NOT IN "
+                    "(SELECT MIN(id) FROM referral_relationships GROUP BY referred_id)"
+                ))
+                if result.rowcount:
+                    logger.warning(f"Удалено дублирующихся реферальных связей: {result.rowcount}")
+
+        tables = set(inspector.get_table_names())
+        for table in Base.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in columns or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=sync_conn.dialect)
+                sync_conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+                logger.info(f"Добавлена колонка {table.name}.{column.name}")
+            for index in table.indexes:
+                index.create(sync_conn, checkfirst=True)
+
+    await conn.run_sync(create_missing)
+
+
 async def close_db():
     """
     Закрытие соединений с базой данных
     """
+    await db_writer.close()
+    if write_engine is not None:
+        await write_engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
     await engine.dispose()
     logger.info("Соединения с базой данных закрыты")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Boolean, ForeignKey, Float
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Boolean, ForeignKey, Float, Index
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
 
@@ -13,6 +13,7 @@ class User(Base):
     first_name = Column(String(255))
     last_name = Column(String(255))
     registered_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     is_active = Column(Boolean, default=True)
 
     # Relationship to partner profile
@@ -116,6 +117,31 @@ class ReferralRelationship(Base):
     referrer = relationship("User", foreign_keys=[referrer_id])
     referred = relationship("User", foreign_keys=[referred_id])
 
+    __table_args__ = (
+        # У партнёра только один пригласивший: цель ON CONFLICT (referred_id) DO NOTHING в /start
+        Index("ux_referral_relationships_referred_id", "referred_id", unique=True),
+    )
+
+class ReferralClosure(Base):
+    """
+    Замыкание реферального дерева: все пары предок - потомок
+    
+    depth = 1 - прямой реферал, 2 - реферал реферала и т.д. Поддерживается
+    триггерами на referral_relationships (см. database/referral_tree.py).
+    """
+    __tablename__ = "referral_closure"
+    
+    ancestor_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    depth = Column(Integer, primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    
+    __table_args__ = (
+        # Первичный ключ (ancestor_id, depth, descendant_id) отдает поддерево по уровням без сортировки,
+        # этот индекс - цепочку предков и проверку цикла
+        Index("ix_referral_closure_descendant", "descendant_id", "ancestor_id"),
+        {"sqlite_with_rowid": False},
+    )
+
 class ReferralMonthlyStats(Base):
     __tablename__ = "referral_monthly_stats"
     
@@ -147,6 +173,11 @@ class PartnerRevenue(Base):
     # Relationship
     partner = relationship("User")
 
+    __table_args__ = (
+        # Выручка партнёров поддерева по уровням и выручка партнёра за период
+        Index("ix_partner_revenues_partner_id_created_at", "partner_id", "created_at"),
+    )
+
 
 class ReferralPayout(Base):
     """История выплат реферерам"""
@@ -234,6 +265,14 @@ class CaseMessage(Base):
     # Relationships
     questionnaire = relationship("CaseQuestionnaire")
     sender = relationship("User")
+    
+    # Постраничная выборка переписки по id (курсор) для диалога и для дела,
+    # поиск непрочитанных сообщений диалога без просмотра всей истории
+    __table_args__ = (
+        Index("ix_case_messages_sender_id_id", "sender_id", "id"),
+        Index("ix_case_messages_questionnaire_id_id", "questionnaire_id", "id"),
+        Index("ix_case_messages_unread", "sender_id", "sender_type", "is_read"),
+    )
 
 class NotificationLog(Base):
     """Журнал отправленных уведомлений"""
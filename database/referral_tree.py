@@ -0,0 +1,196 @@
+"""
+Многоуровневое реферальное дерево (closure table)
+
+Таблица referral_closure хранит все пары (предок, потомок, глубина) для
+связей из referral_relationships и поддерживается самой базой данных:
+- после вставки связи триггер добавляет пары «предки реферера x поддерево
+  приглашенного», поэтому бот, админ-панель и скрипты ничего не делают дополнительно;
+- после удаления связи триггер удаляет эти пары;
+- перед вставкой триггер отклоняет связь, которая замкнула бы цикл.
+
+Проверку цикла нельзя выполнять параллельно: в PostgreSQL (READ COMMITTED)
+две встречные связи (два партнёра одновременно открыли ссылки друг друга)
+не видят незафиксированные пары друг друга и обе проходят проверку. Поэтому
+функции триггеров сначала берут транзакционную advisory-блокировку дерева:
+изменения связей выполняются по очереди, и проверка следующей видит пары,
+зафиксированные предыдущей. В SQLite запись и так последовательна.
+
+Для существующих баз и восстановления после ручных правок есть полная
+перестройка рекурсивным CTE (rebuild_referral_closure).
+"""
+import logging
+from typing import List
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+CLOSURE_TABLE = "referral_closure"
+
+# Блокировка дерева до конца транзакции (PostgreSQL): изменения связей по очереди
+_LOCK_TREE = f"PERFORM pg_advisory_xact_lock(hashtext('{CLOSURE_TABLE}'));"
+
+# Пары, которые добавляет (удаляет) связь new.referrer_id -> new.referred_id:
+# предки реферера вместе с ним самим x потомки приглашенного вместе с ним самим
+_PATHS_THROUGH_EDGE = """
+    SELECT up.node AS ancestor_id, down.node AS descendant_id, up.depth + down.depth + 1 AS depth
+    FROM (
+        SELECT ancestor_id AS node, depth FROM referral_closure WHERE descendant_id = {row}.referrer_id
+        UNION ALL SELECT {row}.referrer_id, 0
+    ) AS up, (
+        SELECT descendant_id AS node, depth FROM referral_closure WHERE ancestor_id = {row}.referred_id
+        UNION ALL SELECT {row}.referred_id, 0
+    ) AS down
+"""
+
+# Связь создает цикл, если реферер уже в поддереве приглашенного (или это один пользователь)
+_CREATES_CYCLE = """
+    {row}.referrer_id = {row}.referred_id OR EXISTS (
+        SELECT 1 FROM referral_closure
+        WHERE descendant_id = {row}.referrer_id AND ancestor_id = {row}.referred_id
+    )
+"""
+
+
+# ============================================
+# Триггеры
+# ============================================
+
+def _sqlite_statements() -> List[str]:
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {CLOSURE_TABLE}_bi BEFORE INSERT ON referral_relationships
+        WHEN {_CREATES_CYCLE.format(row="new")}
+        BEGIN
+            SELECT RAISE(ABORT, 'referral cycle');
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {CLOSURE_TABLE}_ai AFTER INSERT ON referral_relationships BEGIN
+            INSERT OR IGNORE INTO {CLOSURE_TABLE} (ancestor_id, descendant_id, depth)
+            {_PATHS_THROUGH_EDGE.format(row="new")};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {CLOSURE_TABLE}_ad AFTER DELETE ON referral_relationships BEGIN
+            DELETE FROM {CLOSURE_TABLE} WHERE (ancestor_id, depth, descendant_id) IN (
+                SELECT ancestor_id, depth, descendant_id FROM ({_PATHS_THROUGH_EDGE.format(row="old")})
+            );
+        END
+        """,
+    ]
+
+
+def _postgres_statements() -> List[str]:
+    return [
+        f"""
+        CREATE OR REPLACE FUNCTION {CLOSURE_TABLE}_insert() RETURNS trigger AS $$
+        BEGIN
+            {_LOCK_TREE}
+            IF {_CREATES_CYCLE.format(row="NEW")} THEN
+                RAISE EXCEPTION 'referral cycle: % -> %', NEW.referrer_id, NEW.referred_id;
+            END IF;
+            INSERT INTO {CLOSURE_TABLE} (ancestor_id, descendant_id, depth)
+            {_PATHS_THROUGH_EDGE.format(row="NEW")}
+            ON CONFLICT DO NOTHING;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        f"""
+        CREATE OR REPLACE FUNCTION {CLOSURE_TABLE}_delete() RETURNS trigger AS $$
+        BEGIN
+            {_LOCK_TREE}
+            DELETE FROM {CLOSURE_TABLE} WHERE (ancestor_id, depth, descendant_id) IN (
+                SELECT ancestor_id, depth, descendant_id FROM ({_PATHS_THROUGH_EDGE.format(row="OLD")}) AS paths
+            );
+            RETURN OLD;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        f"DROP TRIGGER IF EXISTS {CLOSURE_TABLE}_ai ON referral_relationships",
+        f"""
+        CREATE TRIGGER {CLOSURE_TABLE}_ai AFTER INSERT ON referral_relationships
+        FOR EACH ROW EXECUTE FUNCTION {CLOSURE_TABLE}_insert()
+        """,
+        f"DROP TRIGGER IF EXISTS {CLOSURE_TABLE}_ad ON referral_relationships",
+        f"""
+        CREATE TRIGGER {CLOSURE_TABLE}_ad AFTER DELETE ON referral_relationships
+        FOR EACH ROW EXECUTE FUNCTION {CLOSURE_TABLE}_delete()
+        """,
+    ]
+
+
+async def init_referral_tree(conn) -> None:
+    """
+    Создает таблицу и триггеры замыкания, если их еще нет
+
+    Если таблица пуста, а связи уже есть (база создана до появления дерева),
+    замыкание строится рекурсивным CTE.
+
+    Args:
+        conn: Асинхронное соединение (AsyncConnection)
+    """
+    from database.models import ReferralClosure
+
+    dialect = conn.dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        logger.warning(f"Реферальное дерево не поддерживается для диалекта {dialect}")
+        return
+
+    await conn.run_sync(lambda sync_conn: ReferralClosure.__table__.create(sync_conn, checkfirst=True))
+    for statement in _sqlite_statements() if dialect == "sqlite" else _postgres_statements():
+        await conn.execute(text(statement))
+
+    closure_empty = (await conn.execute(text(f"SELECT 1 FROM {CLOSURE_TABLE} LIMIT 1"))).scalar() is None
+    has_edges = (await conn.execute(text("SELECT 1 FROM referral_relationships LIMIT 1"))).scalar() is not None
+    if closure_empty and has_edges:
+        rows = await rebuild_referral_closure(conn)
+        logger.info(f"Построено замыкание реферального дерева: {rows} пар")
+
+
+# ============================================
+# Перестройка
+# ============================================
+
+async def rebuild_referral_closure(conn) -> int:
+    """
+    Полностью перестраивает referral_closure рекурсивным CTE
+
+    Обход вниз от каждой связи останавливается при возврате в исходного
+    предка, поэтому циклы в старых данных не зацикливают запрос (у каждого
+    пользователя не больше одного реферера, и другой повторной вершины в
+    обходе быть не может). Найденные циклы выводятся в лог.
+
+    Args:
+        conn: Асинхронное соединение (AsyncConnection), транзакцию фиксирует вызывающий
+
+    Returns:
+        int: Количество пар в замыкании
+    """
+    await conn.execute(text(f"DELETE FROM {CLOSURE_TABLE}"))
+    await conn.execute(text(f"""
+        INSERT INTO {CLOSURE_TABLE} (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE paths(ancestor_id, descendant_id, depth) AS (
+            SELECT referrer_id, referred_id, 1
+            FROM referral_relationships
+            WHERE referrer_id IS NOT NULL AND referred_id IS NOT NULL AND referrer_id != referred_id
+            UNION ALL
+            SELECT paths.ancestor_id, rr.referred_id, paths.depth + 1
+            FROM paths
+            JOIN referral_relationships rr ON rr.referrer_id = paths.descendant_id
+            WHERE rr.referred_id != paths.ancestor_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM paths
+    """))
+
+    cycles = (await conn.execute(text(f"""
+        SELECT rr.referrer_id, rr.referred_id
+        FROM referral_relationships rr
+        JOIN {CLOSURE_TABLE} c ON c.descendant_id = rr.referrer_id AND c.ancestor_id = rr.referred_id
+    """))).all()
+    if cycles:
+        edges = ", ".join(f"{referrer_id}->{referred_id}" for referrer_id, referred_id in cycles[:20])
+        logger.warning(f"В реферальных связях найдены циклы ({len(cycles)} связей): {edges}")
+
+    return (await conn.execute(text(f"SELECT COUNT(*) FROM {CLOSURE_TABLE}"))).scalar()
@@ -0,0 +1,137 @@
+"""
+Стеммер русского языка (упрощенный алгоритм Snowball)
+
+Общий для поиска по FAQ в боте (bot/utils/faq_search.py) и полнотекстового
+поиска анкет (database/case_search.py): основы слов в запросах и индексах
+должны получаться одинаково.
+"""
+from functools import lru_cache
+from typing import Optional, Tuple
+
+_VOWELS = "аеиоуыэюя"
+
+_PERFECTIVE_GERUND_1 = ("вшись", "вши", "в")
+_PERFECTIVE_GERUND_2 = ("ившись", "ывшись", "ивши", "ывши", "ив", "ыв")
+_REFLEXIVE = ("ся", "сь")
+_ADJECTIVE = (
+    "ими", "ыми", "его", "ого", "ему", "ому", "ее", "ие", "ые", "ое", "ей", "ий",
+    "ый", "ой", "ем", "им", "ым", "ом", "их", "ых", "ую", "юю", "ая", "яя", "ою", "ею",
+)
+_PARTICIPLE_1 = ("ем", "нн", "вш", "ющ", "щ")
+_PARTICIPLE_2 = ("ивш", "ывш", "ующ")
+_VERB_1 = (
+    "ете", "йте", "ешь", "нно", "ла", "на", "ли", "ем", "ло", "но", "ет", "ют",
+    "ны", "ть", "й", "л", "н",
+)
+_VERB_2 = (
+    "ейте", "уйте", "ила", "ыла", "ена", "ите", "или", "ыли", "ило", "ыло", "ено",
+    "ует", "уют", "ены", "ить", "ыть", "ишь", "ей", "уй", "ил", "ыл", "им", "ым",
+    "ен", "ят", "ит", "ыт", "ую", "ю",
+)
+_NOUN = (
+    "иями", "ями", "ами", "ией", "иям", "ием", "иях", "ев", "ов", "ие", "ье", "еи",
+    "ии", "ей", "ой", "ий", "ям", "ем", "ам", "ом", "ах", "ях", "ию", "ью", "ия",
+    "ья", "а", "е", "и", "й", "о", "у", "ы", "ь", "ю", "я",
+)
+_SUPERLATIVE = ("ейше", "ейш")
+_DERIVATIONAL = ("ость", "ост")
+
+
+def _rv_start(word: str) -> int:
+    """Начало области RV: позиция после первой гласной"""
+    for i, char in enumerate(word):
+        if char in _VOWELS:
+            return i + 1
+    return len(word)
+
+
+def _r2_start(word: str) -> int:
+    """Начало области R2 по правилам Snowball"""
+    def next_region(start: int) -> int:
+        for i in range(start + 1, len(word)):
+            if word[i] not in _VOWELS and word[i - 1] in _VOWELS:
+                return i + 1
+        return len(word)
+    return next_region(next_region(0))
+
+
+def _strip_suffix(
+    word: str,
+    region: int,
+    suffixes: Tuple[str, ...],
+    after_a: Tuple[str, ...] = ()
+) -> Optional[str]:
+    """
+    Удаляет самый длинный подходящий суффикс, целиком лежащий в области region
+
+    Суффиксы из after_a удаляются только после «а» или «я».
+    """
+    best = None
+    for suffix in after_a:
+        cut = len(word) - len(suffix)
+        if word.endswith(suffix) and cut - 1 >= region and word[cut - 1] in "ая":
+            if best is None or len(suffix) > len(best):
+                best = suffix
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= region:
+            if best is None or len(suffix) > len(best):
+                best = suffix
+    if best is None:
+        return None
+    return word[:-len(best)]
+
+
+# Словарь FAQ и запросов ограничен, поэтому основы слов выгодно запоминать
+STEM_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem(word: str) -> str:
+    """
+    Возвращает основу русского слова (упрощенный алгоритм Snowball)
+
+    Args:
+        word: Слово в нижнем регистре
+
+    Returns:
+        str: Основа слова
+    """
+    if len(word) < 3 or not ("а" <= word[0] <= "я"):
+        return word
+
+    rv = _rv_start(word)
+
+    # Шаг 1
+    stripped = _strip_suffix(word, rv, _PERFECTIVE_GERUND_2, _PERFECTIVE_GERUND_1)
+    if stripped is None:
+        word = _strip_suffix(word, rv, _REFLEXIVE) or word
+        stripped = _strip_suffix(word, rv, _ADJECTIVE)
+        if stripped is not None:
+            stripped = _strip_suffix(stripped, rv, _PARTICIPLE_2, _PARTICIPLE_1) or stripped
+        else:
+            stripped = _strip_suffix(word, rv, _VERB_2, _VERB_1)
+            if stripped is None:
+                stripped = _strip_suffix(word, rv, _NOUN)
+    if stripped is not None:
+        word = stripped
+
+    # Шаг 2
+    if word.endswith("и") and len(word) - 1 >= rv:
+        word = word[:-1]
+
+    # Шаг 3
+    word = _strip_suffix(word, max(rv, _r2_start(word)), _DERIVATIONAL) or word
+
+    # Шаг 4
+    if word.endswith("нн") and len(word) - 2 >= rv:
+        word = word[:-1]
+    else:
+        superlative = _strip_suffix(word, rv, _SUPERLATIVE)
+        if superlative is not None:
+            word = superlative
+            if word.endswith("нн"):
+                word = word[:-1]
+        elif word.endswith("ь") and len(word) - 1 >= rv:
+            word = word[:-1]
+
+    return word
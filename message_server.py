@@ -2,6 +2,9 @@
 Сервер для отправки уведомлений клиентам через Telegram
 Запускается на порту 8002
 
+Маршруты объявлены в router и также входят в единый сервис (server.py)
+вместе с админ-панелью.
+
 Использование:
     python message_server.py
 """
@@ -10,42 +13,21 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 import asyncio
-import httpx
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from datetime import datetime
 
 from config.settings import settings
-from database.database import get_db
+from database.database import get_db_session
 from database.models import User, CaseQuestionnaire, CaseMessage
+from admin_panel.application import create_app
+from admin_panel.static_bundle import static_bundle
+from admin_panel.telegram_sender import telegram_sender
 
-# Создаём FastAPI приложение
-app = FastAPI(
-    title="Message Server",
-    description="Сервер для отправки уведомлений клиентам",
-    version="1.0.0"
-)
-
-# Разрешаем CORS для админ-панели
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Подключаем статические файлы из admin_panel
-ADMIN_PANEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "admin_panel")
-app.mount("/static/admin_panel", StaticFiles(directory=ADMIN_PANEL_DIR), name="admin_panel")
-
-# URL Telegram Bot API
-TELEGRAM_API_URL = f"https://api.telegram.org/bot{settings.BOT_TOKEN}"
+# Маршруты сервера сообщений; приложение собирается в конце модуля
+router = APIRouter()
 
 
 # ============ Pydantic Models ============
@@ -60,7 +42,7 @@ class SendMessageRequest(BaseModel):
 
 class SendCaseReplyRequest(BaseModel):
     """Запрос на отправку ответа по делу"""
-    case_id: int
+    case_id: int | None = None  # совпадает с case_id из пути, можно не передавать
     admin_message: str
     admin_id: int = 0
 
@@ -79,24 +61,13 @@ async def send_telegram_message(
     parse_mode: str = "HTML",
     disable_web_page_preview: bool = True
 ) -> dict:
-    """Отправить сообщение через Telegram Bot API"""
-    url = f"{TELEGRAM_API_URL}/sendMessage"
-    
-    payload = {
-        "chat_id": telegram_id,
-        "text": message,
-        "parse_mode": parse_mode,
-        "disable_web_page_preview": disable_web_page_preview
-    }
-    
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(url, json=payload)
-        
-        if response.status_code != 200:
-            error_info = response.json()
-            raise Exception(f"Telegram API error: {error_info.get('description', 'Unknown error')}")
-        
-        return response.json()
+    """Отправить сообщение через Telegram Bot API (общий HTTP-клиент процесса)"""
+    return await telegram_sender.send_message(
+        telegram_id,
+        message,
+        parse_mode=parse_mode,
+        disable_web_page_preview=disable_web_page_preview
+    )
 
 
 async def get_user_by_telegram_id(db: AsyncSession, telegram_id: int) -> User | None:
@@ -117,19 +88,18 @@ async def get_case_by_id(db: AsyncSession, case_id: int) -> CaseQuestionnaire |
 
 # ============ API Endpoints ============
 
-@app.get("/health")
+@router.get("/health")
 async def health_check():
     """Проверка работоспособности сервера"""
     return {
         "status": "healthy",
-        "service": "message_server",
-        "port": 8002,
+        "service": "law_bot_api",
         "timestamp": datetime.utcnow().isoformat()
     }
 
 
-@app.post("/api/notify")
-async def send_notification(request: SendMessageRequest, db: AsyncSession = Depends(get_db)):
+@router.post("/api/notify")
+async def send_notification(request: SendMessageRequest, db: AsyncSession = Depends(get_db_session)):
     """
     Отправить уведомление клиенту
     
@@ -159,12 +129,12 @@ async def send_notification(request: SendMessageRequest, db: AsyncSession = Depe
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/api/cases/{case_id}/reply")
+@router.post("/api/cases/{case_id}/reply")
 async def send_case_reply(
     case_id: int,
     request: SendCaseReplyRequest,
     background_tasks: BackgroundTasks,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_session)
 ):
     """
     Отправить ответ по делу от администратора
@@ -183,8 +153,8 @@ async def send_case_reply(
     if not case:
         raise HTTPException(status_code=404, detail=f"Дело #{case_id} не найдено")
     
-    # Получаем пользователя
-    user = await get_user_by_telegram_id(db, case.user_id)
+    # Получаем пользователя (user_id дела - это users.id, а не Telegram ID)
+    user = await db.get(User, case.user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="Пользователь дела не найден")
@@ -200,6 +170,13 @@ async def send_case_reply(
     await db.commit()
     await db.refresh(new_message)
     
+    # Страница диалогов админ-панели (единый сервис server.py) получает ответ по SSE;
+    # диалоги группируются по отправителю сообщения, как в /api/cases/{case_id}/messages
+    from admin_panel.app import publish_dialog_message
+    sender = await db.get(User, request.admin_id) if request.admin_id else None
+    if sender:
+        publish_dialog_message(sender, new_message)
+    
     # Формируем уведомление для клиента
     notification_text = (
         f"💬 <b>Новое сообщение по вашему делу #{case_id}</b>\n\n"
@@ -231,8 +208,8 @@ async def send_case_reply(
         }
 
 
-@app.post("/api/broadcast")
-async def send_broadcast(request: BroadcastRequest, db: AsyncSession = Depends(get_db)):
+@router.post("/api/broadcast")
+async def send_broadcast(request: BroadcastRequest, db: AsyncSession = Depends(get_db_session)):
     """
     Рассылка сообщений пользователям
     
@@ -290,8 +267,8 @@ async def send_broadcast(request: BroadcastRequest, db: AsyncSession = Depends(g
     }
 
 
-@app.get("/api/users/{telegram_id}")
-async def get_user_info(telegram_id: int, db: AsyncSession = Depends(get_db)):
+@router.get("/api/users/{telegram_id}")
+async def get_user_info(telegram_id: int, db: AsyncSession = Depends(get_db_session)):
     """Получить информацию о пользователе по Telegram ID"""
     user = await get_user_by_telegram_id(db, telegram_id)
     
@@ -309,24 +286,29 @@ async def get_user_info(telegram_id: int, db: AsyncSession = Depends(get_db)):
     }
 
 
+@router.get("/static/admin_panel/{name}")
+async def admin_panel_static(request: Request, name: str):
+    """Файлы админ-панели (message_api.js и тестовые страницы) из списка STATIC_FILES"""
+    return static_bundle.response(request, name)
+
+
 # ============ Запуск сервера ============
 
+app = create_app(
+    router,
+    title="Message Server",
+    description="Сервер для отправки уведомлений клиентам",
+    version="1.0.0"
+)
+
+
 if __name__ == "__main__":
     import uvicorn
     
-    # Простой health endpoint без БД
-    @app.get("/health")
-    async def health_check():
-        return {
-            "status": "healthy",
-            "service": "message_server",
-            "port": 8002
-        }
-    
     print("=" * 50)
     print("🚀 Message Server запускается на порту 8002")
     print("=" * 50)
-    print(f"📡 Telegram Bot API: {TELEGRAM_API_URL}")
+    print(f"📡 Telegram Bot API: {settings.TELEGRAM_API_URL}")
     print("✅ Готов к работе!")
     print("=" * 50)
     
@@ -1,82 +1,249 @@
 #!/usr/bin/env python3
 """
-Скрипт для запуска админ панели и телеграм бота
-"""
+Супервизор: запуск веб-сервиса (админ-панель и сервер сообщений) и телеграм бота
 
-import os
+- вывод всех процессов читается асинхронно и печатается построчно с
+  префиксом процесса ([web-0], [bot-0]), поэтому дочерние процессы никогда
+  не блокируются на записи в переполненный канал;
+- каждый процесс периодически проверяется через /health; после нескольких
+  неудачных проверок подряд он перезапускается;
+- упавший процесс перезапускается с экспоненциальной задержкой (сбрасывается,
+  если процесс проработал дольше --stable-after секунд);
+- по Ctrl+C / SIGTERM всем процессам отправляется SIGTERM, а не
+  завершившиеся за --stop-timeout секунд получают SIGKILL.
+
+Веб-воркер i слушает порт --web-port + i, бот i отдает /health на порту
+--bot-health-port + i. Получать обновления long polling по одному токену
+может только один бот: несколько ботов имеют смысл только с разными токенами
+или в режиме webhook.
+
+Использование:
+    python run.py [--web 1] [--bots 1] [--web-port 8001] [--bot-health-port 10000]
+"""
 import sys
-import subprocess
+import os
+import argparse
+import asyncio
+import signal
 import time
+from typing import Dict, List, NamedTuple, Optional
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+PROJECT_DIR = os.path.abspath(os.path.dirname(__file__))
+
+# Размер блока чтения вывода дочернего процесса
+OUTPUT_CHUNK = 64 * 1024
+
+
+class ServiceSpec(NamedTuple):
+    """Описание дочернего процесса"""
+    name: str
+    command: List[str]
+    env: Dict[str, str]
+    health_url: Optional[str] = None
+
+
+class Child:
+    """Дочерний процесс под наблюдением супервизора"""
+
+    def __init__(self, spec: ServiceSpec, args: argparse.Namespace):
+        self.spec = spec
+        self.args = args
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.stopping = False
+        self.health_task: Optional[asyncio.Task] = None
+
+    def log(self, text: str) -> None:
+        sys.stdout.write(f"[{self.spec.name}] {text}\n")
+        sys.stdout.flush()
+
+    async def start(self) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            *self.spec.command,
+            cwd=PROJECT_DIR,
+            env=self.spec.env,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            # Своя группа процессов: Ctrl+C в терминале не доходит до детей в обход супервизора
+            start_new_session=True,
+        )
+        self.started_at = time.monotonic()
+        self.log(f"запущен (pid {self.process.pid})")
+
+    def write_line(self, line: bytes) -> None:
+        sys.stdout.write(f"[{self.spec.name}] {line.decode('utf-8', errors='replace').rstrip()}\n")
+
+    async def pump_output(self) -> None:
+        """
+        Читает вывод процесса до его завершения
+
+        Вывод читается блоками и делится на строки здесь же: readline падает
+        на строке длиннее лимита StreamReader (64 КиБ), после чего канал
+        больше никто не читает и процесс встает на записи. Строка длиннее
+        OUTPUT_CHUNK печатается частями.
+        """
+        buffer = b""
+        while True:
+            chunk = await self.process.stdout.read(OUTPUT_CHUNK)
+            if not chunk:
+                if buffer:
+                    self.write_line(buffer)
+                    sys.stdout.flush()
+                return
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                self.write_line(line)
+            if len(buffer) >= OUTPUT_CHUNK:
+                self.write_line(buffer)
+                buffer = b""
+            sys.stdout.flush()
+
+    async def stop(self) -> None:
+        """SIGTERM, затем SIGKILL по истечении --stop-timeout"""
+        if self.stopping and self.health_task and self.health_task is not asyncio.current_task():
+            self.health_task.cancel()
+        if self.process is None or self.process.returncode is not None:
+            return
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), self.args.stop_timeout)
+        except asyncio.TimeoutError:
+            self.log(f"не завершился за {self.args.stop_timeout} с, SIGKILL")
+            self.process.kill()
+            await self.process.wait()
+
+    async def probe(self, client) -> bool:
+        try:
+            response = await client.get(self.spec.health_url, timeout=self.args.health_timeout)
+            return response.status_code == 200
+        except Exception:
+            return False
+
+    async def watch_health(self, client) -> None:
+        """Перезапускает процесс после --health-failures неудачных проверок подряд"""
+        await asyncio.sleep(self.args.startup_grace)
+        failures = 0
+        while self.process.returncode is None:
+            if await self.probe(client):
+                failures = 0
+            else:
+                failures += 1
+                self.log(f"/health не отвечает ({failures}/{self.args.health_failures})")
+                if failures >= self.args.health_failures:
+                    self.log("перезапуск по результатам проверки /health")
+                    await self.stop()
+                    return
+            await asyncio.sleep(self.args.health_interval)
+
+    async def supervise(self, client) -> None:
+        """Запускает процесс и перезапускает его с задержкой, пока супервизор работает"""
+        backoff = self.args.backoff_min
+        while not self.stopping:
+            await self.start()
+            if self.spec.health_url:
+                self.health_task = asyncio.create_task(self.watch_health(client))
+            await self.pump_output()
+            code = await self.process.wait()
+            if self.health_task:
+                self.health_task.cancel()
+                self.health_task = None
+            if self.stopping:
+                self.log(f"остановлен (код {code})")
+                return
+
+            if time.monotonic() - self.started_at >= self.args.stable_after:
+                backoff = self.args.backoff_min
+            self.restarts += 1
+            self.log(f"завершился с кодом {code}, перезапуск №{self.restarts} через {backoff:.0f} с")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.args.backoff_max)
+
+
+def build_specs(args: argparse.Namespace) -> List[ServiceSpec]:
+    env = dict(os.environ, PYTHONUNBUFFERED="1", PYTHONIOENCODING="utf-8")
+    specs = []
+    for i in range(args.web):
+        port = args.web_port + i
+        specs.append(ServiceSpec(
+            name=f"web-{i}",
+            command=[sys.executable, "-m", "uvicorn", "server:app", "--host", args.host, "--port", str(port)],
+            env=env,
+            health_url=f"http://127.0.0.1:{port}/health",
+        ))
+    for i in range(args.bots):
+        port = args.bot_health_port + i
+        specs.append(ServiceSpec(
+            name=f"bot-{i}",
+            command=[sys.executable, "run_bot.py"],
+            env=dict(env, PORT=str(port)),
+            health_url=f"http://127.0.0.1:{port}/health",
+        ))
+    return specs
+
+
+async def run(args: argparse.Namespace) -> None:
+    import httpx
 
-def main():
-    # Путь к проекту
-    project_path = os.path.abspath(os.path.dirname(__file__))
-    os.chdir(project_path)
+    children = [Child(spec, args) for spec in build_specs(args)]
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            # Windows (ProactorEventLoop): обычный обработчик сигнала будит цикл событий
+            signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(stop_event.set))
 
     print("=" * 50)
-    print("Запуск админ панели и телеграм бота")
+    print(f"Супервизор: веб-воркеров {args.web}, ботов {args.bots}")
+    for i in range(args.web):
+        print(f"Админ панель: http://127.0.0.1:{args.web_port + i}")
+    print("Нажмите Ctrl+C для остановки")
     print("=" * 50)
-    print()
-
-    try:
-        # Запускаем админ панель
-        print("1. Запускаем админ панель...")
-        admin_process = subprocess.Popen([
-            sys.executable, "admin_panel/app.py"
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-
-        # Ожидаем запуска админ панели
-        time.sleep(2)
-
-        # Проверяем, запустилась ли админ панель
-        admin_process.poll()
-        if admin_process.returncode is not None:
-            raise Exception(f"Админ панель не запустилась (код ошибки: {admin_process.returncode})")
-        print("Админ панель запущена")
-
-        # Запускаем телеграм бот
-        print("\n2. Запускаем телеграм бот...")
-        bot_process = subprocess.Popen([
-            sys.executable, "run_bot.py"
-        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-
-        # Ожидаем запуска бота
-        time.sleep(2)
-
-        # Проверяем, запустился ли бот
-        bot_process.poll()
-        if bot_process.returncode is not None:
-            raise Exception(f"Телеграм бот не запустился (код ошибки: {bot_process.returncode})")
-        print("Телеграм бот запущен")
-
-        print("\n" + "=" * 50)
-        print("Все компоненты запущены успешно!")
-        print("=" * 50)
-        print(f"Админ панель доступна по адресу: http://127.0.0.1:8001")
-        print(f"Логи бота и админ панели выведутся в этом окне")
-        print()
-        print("Нажмите Ctrl+C для остановки")
-
-        # Подождем завершения процессов
-        while True:
-            time.sleep(1)
-
-    except KeyboardInterrupt:
-        print("\n\nЗавершение работы...")
-        admin_process.terminate()
-        bot_process.terminate()
-        admin_process.wait()
-        bot_process.wait()
-        print("✅ Процессы остановлены")
-    except Exception as e:
-        print(f"\nОшибка: {e}")
-        if 'admin_process' in locals():
-            admin_process.terminate()
-            admin_process.wait()
-        if 'bot_process' in locals():
-            bot_process.terminate()
-            bot_process.wait()
-        sys.exit(1)
+
+    async with httpx.AsyncClient() as client:
+        tasks = [asyncio.create_task(child.supervise(client)) for child in children]
+        await stop_event.wait()
+
+        print("\nЗавершение работы...")
+        for child in children:
+            child.stopping = True
+        await asyncio.gather(*(child.stop() for child in children))
+        if tasks:
+            await asyncio.wait(tasks, timeout=args.stop_timeout)
+        for task in tasks:
+            task.cancel()
+
+    print("✅ Процессы остановлены")
+
+
+def main() -> None:
+    from config.settings import settings
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--web", type=int, default=1, help="веб-воркеров (server.py)")
+    parser.add_argument("--bots", type=int, default=1, help="процессов бота (run_bot.py)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--web-port", type=int, default=settings.WEB_PORT)
+    parser.add_argument("--bot-health-port", type=int, default=int(os.environ.get("PORT", 10000)))
+    parser.add_argument("--health-interval", type=float, default=10.0, help="секунд между проверками /health")
+    parser.add_argument("--health-timeout", type=float, default=5.0)
+    parser.add_argument("--health-failures", type=int, default=3, help="неудачных проверок подряд до перезапуска")
+    parser.add_argument("--startup-grace", type=float, default=30.0, help="секунд после запуска без проверок")
+    parser.add_argument("--backoff-min", type=float, default=1.0)
+    parser.add_argument("--backoff-max", type=float, default=60.0)
+    parser.add_argument("--stable-after", type=float, default=60.0, help="секунд работы, после которых задержка сбрасывается")
+    parser.add_argument("--stop-timeout", type=float, default=15.0)
+    args = parser.parse_args()
+
+    os.chdir(PROJECT_DIR)
+    asyncio.run(run(args))
+
 
 if __name__ == "__main__":
     main()
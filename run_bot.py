@@ -13,13 +13,15 @@ from aiogram.client.default import DefaultBotProperties
 from aiogram.exceptions import TelegramUnauthorizedError
 
 from config.settings import settings
+from config.logging_setup import setup_logging
+from bot.main import bot_session
 
-# Инициализация логирования
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Инициализация логирования: вывод в отдельном потоке, JSON с update_id/trace_id
+setup_logging("bot")
 logger = logging.getLogger(__name__)
 
 # Инициализация бота и диспетчера
-bot = Bot(token=settings.BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+bot = Bot(token=settings.BOT_TOKEN, session=bot_session(), default=DefaultBotProperties(parse_mode=ParseMode.HTML))
 dp = Dispatcher()
 
 # HTTP сервер для Render (чтобы детектировал открытый порт)
@@ -62,6 +64,11 @@ async def init_database():
             await conn.run_sync(Base.metadata.create_all)
         
         logger.info("Database tables created successfully")
+
+        # Индексы и колонки, добавленные в модели после создания таблиц, полнотекстовый
+        # индекс анкет и замыкание реферального дерева - каждый шаг в своей транзакции
+        from database.database import run_startup_steps, schema_steps
+        await run_startup_steps(engine.begin, schema_steps())
         
         # Выполняем миграцию telegram_id на BigInteger ПОСЛЕ создания таблиц
         if settings.DATABASE_URL.startswith("postgresql"):
@@ -85,6 +92,8 @@ async def init_database():
 async def main():
     # Импорт хендлеров
     from bot.handlers import register_handlers
+    from bot.middleware import UpdateContextMiddleware
+    dp.update.outer_middleware(UpdateContextMiddleware())
     register_handlers(dp)
 
     # Проверка переменных окружения
@@ -92,6 +101,14 @@ async def main():
     logger.info(f"DATABASE_URL set: {'Yes' if os.environ.get('DATABASE_URL') else 'No'}")
     logger.info(f"PORT: {os.environ.get('PORT', 'Not set')}")
 
+    # Без секретного ключа реферальные коды можно перебрать
+    from bot.utils.referral_codes import referral_code_key
+    try:
+        referral_code_key()
+    except RuntimeError as e:
+        logger.error(f"{e}. Exiting...")
+        return
+
     # Проверка токена бота
     token_valid = await check_bot_token()
     if not token_valid:
@@ -104,6 +121,14 @@ async def main():
         logger.error("Database initialization failed. Exiting...")
         return
 
+    # Строим индекс поиска по FAQ и следим за изменениями таблицы faqs
+    from bot.utils.faq_search import reload_faq_index, run_faq_index_refresher
+    try:
+        await reload_faq_index(force=True)
+    except Exception as e:
+        logger.error(f"FAQ index build error: {e}")
+    faq_refresher = asyncio.create_task(run_faq_index_refresher(), name="faq_index_refresher")
+
     # Отключаем webhook (чтобы избежать конфликтов)
     await bot.delete_webhook(drop_pending_updates=True)
     logger.info("Webhook deleted, starting polling...")
@@ -119,6 +144,13 @@ async def main():
         await dp.start_polling(bot)
     except Exception as e:
         logger.error(f"Polling error: {e}")
+    finally:
+        faq_refresher.cancel()
+        # Досылаем сводку уведомлений админам и поставленные приветствия
+        from bot.utils.admin_notifications import admin_notifier
+        from bot.utils.onboarding import onboarding_sender
+        await admin_notifier.close()
+        await onboarding_sender.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
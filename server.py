@@ -0,0 +1,43 @@
+"""
+Единый веб-сервис: админ-панель и сервер сообщений в одном приложении
+
+Вместо двух процессов (admin_panel/app.py на 8001 и message_server.py на
+8002) с отдельными пулами соединений к одной базе - одно приложение из двух
+роутеров с общим пулом, общим HTTP-клиентом Bot API и одной очередью записи
+на процесс. Маршруты админ-панели подключены первыми и при совпадении путей
+имеют приоритет.
+
+Несколько воркеров uvicorn - это отдельные процессы со своими пулами; события
+страницы диалогов (SSE) доходят только до браузеров, подключенных к тому же
+воркеру, что и запрос, записавший сообщение.
+
+Использование:
+    python server.py
+    uvicorn server:app --host 0.0.0.0 --port 8001 --workers 4
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from admin_panel.application import create_app
+from admin_panel.app import router as admin_router
+from message_server import router as messaging_router
+from config.settings import settings
+
+app = create_app(
+    admin_router,
+    messaging_router,
+    title="Law Bot API",
+    description="Админ-панель и отправка уведомлений клиентам"
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        "server:app",
+        host=settings.WEB_HOST,
+        port=settings.WEB_PORT,
+        workers=settings.WEB_WORKERS,
+        log_level="info"
+    )
@@ -39,7 +39,10 @@ async def test_new_user_notification():
             
             # Импортируем и вызываем функцию отправки уведомления
             from bot.handlers.start import send_new_user_notification
-            await send_new_user_notification(user)
+            from bot.utils.admin_notifications import admin_notifier
+            send_new_user_notification(bot, user)
+            # Уведомление уходит в фоне: дожидаемся отправки очереди
+            await admin_notifier.close()
             
             print("Уведомление отправлено")
             return True